@@ -0,0 +1,343 @@
+"""End-to-end scaling: every command path over a synthetic fleet.
+
+Builds a fleet of N tmux sockets with M teammate panes each, a ``ps -eo``
+process table of P processes (every teammate with nested descendants), one
+drained inbox per teammate, and a handful of ssh control masters and disowned
+strays. tmux and ``ps`` answer through a ``RecordingRunner``, so the timings are
+the package's own work: socket discovery, ``build_report``, a bare ``classify``
+over the snapshot, a ``reap --kill`` round with its batch revalidation, and the
+``strays`` path. Each phase also records how many commands it spawned.
+
+Fleets run from laptop-sized up to 5k panes over 50k processes. Save a run as
+JSON and compare a later commit against it:
+
+    uv run --project agent_reap python agent_reap/benchmarks/bench_fleet.py --save base.json
+    uv run --project agent_reap python agent_reap/benchmarks/bench_fleet.py --compare base.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import socket as socketlib
+import tempfile
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+
+from agent_reap.classify import classify
+from agent_reap.cli import _revalidate_batch, build_report
+from agent_reap.config import Config
+from agent_reap.discover import ProcessTree, discover_panes, find_sockets
+from agent_reap.procfs import process_snapshot
+from agent_reap.reap import reap
+from agent_reap.runner import RecordingRunner, Result
+from agent_reap.strays import control_masters, disowned_descendants
+
+NOW = 1_785_830_000.0
+PER_PANE = 9  # shell, tools and helpers under each teammate
+TEAMS = 25
+MASTERS = 8
+# Above any real pid_max, so the benchmark's own ancestry never lands in the
+# synthetic table and protects part of the fleet.
+FIRST_PID = 5_000_000
+
+
+@dataclass(frozen=True)
+class Fleet:
+    """Shape of one synthetic fleet.
+
+    Attributes:
+        name: Label used in the output.
+        sockets: tmux servers.
+        panes_per_socket: Teammate panes on each server.
+        processes: Total process count, teammates included.
+    """
+
+    name: str
+    sockets: int
+    panes_per_socket: int
+    processes: int
+
+    @property
+    def panes(self) -> int:
+        """Teammate panes across every server.
+
+        Returns:
+            The pane count.
+        """
+        return self.sockets * self.panes_per_socket
+
+
+FLEETS = {
+    fleet.name: fleet
+    for fleet in (
+        Fleet("laptop", sockets=2, panes_per_socket=10, processes=2_000),
+        Fleet("workstation", sockets=10, panes_per_socket=50, processes=10_000),
+        Fleet("fleet", sockets=50, panes_per_socket=100, processes=50_000),
+    )
+}
+
+
+def _pane_row(pane: int, session: str, pid: int) -> str:
+    """One ``list-panes`` row in the discovery format."""
+    return "\t".join(
+        [f"%{pane}", session, str(pane), "0", str(pid), str(int(NOW) - 7200)]
+        + ["1", "0", "2.1.221", "/repo"]
+    )
+
+
+def build(fleet: Fleet, root: Path) -> tuple[Config, RecordingRunner]:
+    """Write the fleet's files and script its commands.
+
+    Args:
+        fleet: Shape to build.
+        root: Empty directory, short enough to hold unix sockets.
+
+    Returns:
+        A config pointed at the fleet and a runner that answers for it.
+    """
+    sockets_dir, teams_dir, ssh_dir = root / "s", root / "teams", root / "ssh"
+    for directory in (sockets_dir, teams_dir, ssh_dir):
+        directory.mkdir()
+
+    rows: list[str] = []
+
+    def add(pid: int, ppid: int, command: str, pgid: int | None = None) -> None:
+        group = pid if pgid is None else pgid
+        rows.append(f"{pid} {ppid} {group} {group} 40000 S 01:40:00 {command}")
+
+    add(FIRST_PID, 1, "/sbin/launchd")
+    add(FIRST_PID + 1, 1, "tmux")
+    responses: dict[str, Result] = {}
+    pid = FIRST_PID + 10
+    for server in range(fleet.sockets):
+        path = sockets_dir / str(server)
+        sock = socketlib.socket(socketlib.AF_UNIX, socketlib.SOCK_STREAM)
+        sock.bind(str(path))
+        sock.close()
+        listing: list[str] = []
+        for pane in range(fleet.panes_per_socket):
+            index = server * fleet.panes_per_socket + pane
+            team = f"s{index % TEAMS}"
+            agent = f"w{index}"
+            add(
+                pid,
+                FIRST_PID + 1,
+                f"claude --agent-id {agent}@session-{team} --agent-name {agent}",
+            )
+            for offset in range(1, PER_PANE + 1):
+                add(pid + offset, pid + offset // 3, "node helper.js", pid + 1)
+            listing.append(_pane_row(pane, f"team{index % TEAMS}", pid))
+            inboxes = teams_dir / f"session-{team}" / "inboxes"
+            inboxes.mkdir(parents=True, exist_ok=True)
+            inbox = inboxes / f"{agent}.json"
+            inbox.write_text("{}", encoding="utf-8")
+            os.utime(inbox, (NOW - 7200, NOW - 7200))
+            pid += PER_PANE + 1
+        responses[f"tmux -S {path} list-panes"] = Result(0, "\n".join(listing))
+        responses[f"tmux -S {path} kill-pane"] = Result(0)
+
+    for master in range(MASTERS):
+        control = ssh_dir / f"cm-host{master}"
+        sock = socketlib.socket(socketlib.AF_UNIX, socketlib.SOCK_STREAM)
+        sock.bind(str(control))
+        sock.close()
+        add(pid, 1, f"ssh: {control} [mux]")
+        pid += 1
+    responses["ssh -O check"] = Result(0)
+
+    while len(rows) < fleet.processes:
+        if pid % 100 == 0:
+            add(pid, 1, "/nix/store/abc-tool/bin/tool --serve")
+        else:
+            add(pid, 1 if pid % 50 == 0 else pid - 1, "/usr/libexec/daemon")
+        pid += 1
+    responses["ps -eo"] = Result(0, "\n".join(rows))
+
+    config = Config(
+        socket_globs=(f"{sockets_dir}/*",),
+        teams_dir=teams_dir,
+        ssh_dir=ssh_dir,
+        stray_command_prefixes=("/nix/store/",),
+        process_backend="ps",
+        discovery_deadline_seconds=60.0,
+    )
+    return config, RecordingRunner(responses=responses)
+
+
+def strays(config: Config, runner: RecordingRunner) -> int:
+    """The ``strays`` command's work, without the printing."""
+    processes = process_snapshot(runner, config.process_backend)
+    pane_pids = {
+        p.pid
+        for p in discover_panes(
+            config.resolved_globs(),
+            runner,
+            workers=config.discovery_workers,
+            deadline_s=config.discovery_deadline_seconds,
+        )
+    }
+    masters = control_masters(config.ssh_dir, processes, runner)
+    disowned = disowned_descendants(
+        processes, pane_pids, config.resolved_stray_prefixes()
+    )
+    return len(masters) + len(disowned)
+
+
+def measure(
+    fn: Callable[[], object], runner: RecordingRunner, repeat: int
+) -> dict[str, float]:
+    """Time a phase, keeping the fastest run, and count its spawns.
+
+    Args:
+        fn: Work to time.
+        runner: The fleet's runner, whose call log is the spawn count.
+        repeat: Number of runs.
+
+    Returns:
+        Fastest wall time in seconds and the commands one run spawned.
+    """
+    best = float("inf")
+    spawns = 0
+    for _ in range(repeat):
+        runner.calls.clear()
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+        spawns = len(runner.calls)
+    return {"s": best, "spawns": spawns}
+
+
+def run(fleet: Fleet, repeat: int) -> dict[str, object]:
+    """Build one fleet and time every phase over it.
+
+    Args:
+        fleet: Shape to build.
+        repeat: Runs per phase.
+
+    Returns:
+        The fleet's shape and per-phase results.
+    """
+    root = Path(tempfile.mkdtemp(prefix="reap-"))
+    try:
+        config, runner = build(fleet, root)
+        report = build_report(config, runner, now=NOW)
+        assert len(report.candidates) == fleet.panes, report.skipped[:1]
+        processes = process_snapshot(runner, config.process_backend)
+        panes = [candidate.pane for candidate in report.candidates]
+        revalidate = partial(
+            _revalidate_batch, config=config, runner=runner, team_scope=None, now=NOW
+        )
+        outcomes = reap(report.candidates, runner, False, None, revalidate)
+        assert all(o.killed for o in outcomes), outcomes[:1]
+        phases = {
+            "find_sockets": measure(
+                partial(find_sockets, config.resolved_globs()), runner, repeat
+            ),
+            "build_report": measure(
+                partial(build_report, config, runner, NOW), runner, repeat
+            ),
+            "classify": measure(
+                lambda: classify(
+                    panes,
+                    processes,
+                    config,
+                    NOW,
+                    protected_pids=set(),
+                    tree=ProcessTree(processes),
+                ),
+                runner,
+                repeat,
+            ),
+            "reap": measure(
+                partial(reap, report.candidates, runner, False, None, revalidate),
+                runner,
+                repeat,
+            ),
+            "strays": measure(partial(strays, config, runner), runner, repeat),
+        }
+    finally:
+        shutil.rmtree(root)
+    return {
+        "fleet": fleet.name,
+        "sockets": fleet.sockets,
+        "panes": fleet.panes,
+        "processes": fleet.processes,
+        "phases": phases,
+    }
+
+
+def compare(results: list[dict[str, object]], baseline_path: Path) -> None:
+    """Print each phase's time as a ratio of a saved run.
+
+    Args:
+        results: This run's fleets.
+        baseline_path: JSON written by an earlier ``--save``.
+    """
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    before = {entry["fleet"]: entry["phases"] for entry in baseline["fleets"]}
+    for entry in results:
+        name = str(entry["fleet"])
+        if name not in before:
+            continue
+        phases = entry["phases"]
+        assert isinstance(phases, dict)
+        print(f"{name} vs {baseline_path.name}")
+        for phase, now in phases.items():
+            then = before[name].get(phase)
+            if then is None:
+                continue
+            print(
+                f"  {phase:<14}{then['s'] * 1000:>9.1f}ms -> {now['s'] * 1000:>9.1f}ms"
+                f"  x{now['s'] / then['s']:.2f}"
+                f"  spawns {then['spawns']:.0f} -> {now['spawns']:.0f}"
+            )
+
+
+def main() -> None:
+    """Run the benchmark and print its rows."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--fleet",
+        action="append",
+        choices=sorted(FLEETS),
+        help="fleet to run; repeatable (default: all)",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", action="store_true", help="emit JSON")
+    parser.add_argument("--save", type=Path, help="also write the JSON to this file")
+    parser.add_argument("--compare", type=Path, help="JSON from an earlier --save")
+    args = parser.parse_args()
+
+    names = args.fleet or list(FLEETS)
+    results = [run(FLEETS[name], args.repeat) for name in names]
+    payload = {"python": platform.python_version(), "fleets": results}
+    if args.save:
+        args.save.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+    if args.json:
+        print(json.dumps(payload, indent=2))
+    elif args.compare:
+        compare(results, args.compare)
+    else:
+        for entry in results:
+            print(
+                f"{entry['fleet']}: {entry['panes']} panes on {entry['sockets']} "
+                f"sockets over {entry['processes']} processes"
+            )
+            phases = entry["phases"]
+            assert isinstance(phases, dict)
+            for phase, result in phases.items():
+                print(
+                    f"  {phase:<14}{result['s'] * 1000:>9.1f}ms"
+                    f"  {result['spawns']:.0f} spawns"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""Process-table snapshot cost: procfs backend against ``ps -eo`` parsing.
+
+Builds a synthetic ``/proc`` tree of 1k/10k/50k processes on the local
+filesystem and times ``proc_process_table`` over it, next to the ``ps`` backend
+parsing the equivalent ``ps -eo`` text through a ``RecordingRunner``. The ``ps``
+column is parse-only: the real backend also pays a fork and the kernel's own walk
+of /proc, which the final line measures once against the live machine. The
+memory columns compare the column-wise snapshot against the same rows held as a
+dict of ``Process`` objects.
+
+    uv run --project agent_reap python agent_reap/benchmarks/bench_process_table.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import shutil
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from functools import partial
+from pathlib import Path
+
+from agent_reap.discover import process_table
+from agent_reap.procfs import available, proc_process_table
+from agent_reap.runner import RecordingRunner, Result, subprocess_runner
+
+SIZES = (1_000, 10_000, 50_000)
+
+
+def _command(pid: int) -> str:
+    """A realistic command line: every tenth process is a teammate."""
+    if pid % 10 == 0:
+        return (
+            "/Users/dev/.local/share/claude/versions/2.1.221 "
+            f"--agent-id worker-{pid}@session-{pid:08x} --agent-name worker-{pid}"
+        )
+    return f"/nix/store/abc-tool/bin/tool --serve --port {pid}"
+
+
+def build_proc(root: Path, count: int) -> str:
+    """Write a fake procfs tree and the matching ``ps -eo`` output.
+
+    Args:
+        root: Directory to populate.
+        count: Number of processes.
+
+    Returns:
+        The ``ps -eo`` text describing the same processes.
+    """
+    (root / "uptime").write_text("864000.00 0.00\n", encoding="utf-8")
+    rows = []
+    for pid in range(2, count + 2):
+        directory = root / str(pid)
+        directory.mkdir()
+        ppid = 1 if pid < 100 else pid // 2
+        fields = [str(pid), "(tool)", "S", str(ppid), str(pid), str(pid), "0"]
+        fields += [str(pid)] + ["0"] * 13 + ["4200", "0", "2500", "0"]
+        (directory / "stat").write_text(" ".join(fields), encoding="utf-8")
+        command = _command(pid)
+        (directory / "cmdline").write_bytes(command.replace(" ", "\0").encode())
+        rows.append(f"{pid} {ppid} {pid} {pid} 10000 S 01:40:24 {command}")
+    return "\n".join(rows)
+
+
+def best_of(fn: Callable[[], object], repeat: int) -> float:
+    """Time a callable, keeping the fastest run.
+
+    Args:
+        fn: Work to time.
+        repeat: Number of runs.
+
+    Returns:
+        Fastest wall time in seconds.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def retained_kb(build: Callable[[], object]) -> float:
+    """Memory still allocated by whatever ``build`` returns.
+
+    Args:
+        build: Constructs the structure to measure.
+
+    Returns:
+        Traced allocations held by the result, in kilobytes.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        kept = build()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del kept
+    return size / 1024
+
+
+def main() -> None:
+    """Run the benchmark and print one row per size."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", action="store_true", help="emit JSON")
+    args = parser.parse_args()
+
+    results: list[dict[str, float]] = []
+    for size in SIZES:
+        root = Path(tempfile.mkdtemp(prefix="bench-proc-"))
+        try:
+            ps_text = build_proc(root, size)
+            runner = RecordingRunner(responses={"ps -eo": Result(0, ps_text)})
+            proc_s = best_of(partial(proc_process_table, root), args.repeat)
+            ps_s = best_of(partial(process_table, runner), args.repeat)
+            snapshot = proc_process_table(root)
+            columns_kb = retained_kb(partial(proc_process_table, root))
+            rows_kb = retained_kb(partial(dict, snapshot.items()))
+        finally:
+            shutil.rmtree(root)
+        results.append(
+            {
+                "processes": size,
+                "proc_s": proc_s,
+                "ps_parse_s": ps_s,
+                "snapshot_kb": columns_kb,
+                "dict_kb": rows_kb,
+            }
+        )
+
+    live: dict[str, float] = {}
+    if available():
+        live = {
+            "processes": len(proc_process_table()),
+            "proc_s": best_of(proc_process_table, args.repeat),
+            "ps_s": best_of(partial(process_table, subprocess_runner), 1),
+        }
+
+    if args.json:
+        print(json.dumps({"synthetic": results, "live": live}, indent=2))
+        return
+    print(
+        f"{'processes':>10} {'procfs':>10} {'ps parse':>10} "
+        f"{'snapshot':>10} {'as dict':>10}"
+    )
+    for row in results:
+        print(
+            f"{row['processes']:>10} {row['proc_s'] * 1000:>8.1f}ms "
+            f"{row['ps_parse_s'] * 1000:>8.1f}ms "
+            f"{row['snapshot_kb'] / 1024:>8.1f}MB {row['dict_kb'] / 1024:>8.1f}MB"
+        )
+    if live:
+        print(
+            f"\nlive machine, {live['processes']:.0f} processes: "
+            f"procfs {live['proc_s'] * 1000:.1f}ms, "
+            f"ps fork+parse {live['ps_s'] * 1000:.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""Per-pane subtree checks: one ``ProcessTree`` against a rebuild per pane.
+
+Synthesizes 500 teammate panes inside a 20k-process table and times the
+descendant checks ``classify`` runs for each surviving teammate — the
+foreground-group test and the running-descendant test. The "per pane" column
+rebuilds the child map for every pane, as classification used to; the
+"tree" column indexes the snapshot once. A final row times a whole ``classify``
+call over the same fleet, with every pane reaching the subtree checks.
+
+    uv run --project agent_reap python agent_reap/benchmarks/bench_process_tree.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+from collections.abc import Callable
+from functools import partial
+from pathlib import Path
+
+from agent_reap.classify import classify
+from agent_reap.config import Config
+from agent_reap.discover import Pane, Process, ProcessTree
+
+PROCESSES = 20_000
+PANES = 500
+PER_PANE = 9  # shell, tools and helpers under each teammate
+NOW = 1_785_830_000.0
+
+
+def build_fleet(
+    processes: int = PROCESSES, panes: int = PANES
+) -> tuple[dict[int, Process], list[Pane]]:
+    """Synthesize a process table holding a fleet of idle teammates.
+
+    Args:
+        processes: Total process count.
+        panes: Teammate panes, each with ``PER_PANE`` sleeping descendants.
+
+    Returns:
+        The process table and the panes whose leaders it contains.
+    """
+    table: dict[int, Process] = {}
+
+    def add(pid: int, ppid: int, command: str, pgid: int | None = None) -> None:
+        group = pid if pgid is None else pgid
+        table[pid] = Process(pid, ppid, group, group, 40_000, "S", 6000, command)
+
+    add(1, 0, "/sbin/launchd")
+    add(2, 1, "tmux")
+    pane_rows: list[Pane] = []
+    pid = 10
+    for index in range(panes):
+        leader = pid
+        add(
+            leader,
+            2,
+            f"claude --agent-id w{index}@session-s{index % 25} --agent-name w{index}",
+        )
+        for offset in range(1, PER_PANE + 1):
+            add(leader + offset, leader + offset // 3, "node helper.js", leader + 1)
+        pane_rows.append(
+            Pane(
+                socket="/tmp/tmux-501/default",
+                pane_id=f"%{index}",
+                session=f"team{index % 25}",
+                window_index=index,
+                pane_index=0,
+                pid=leader,
+                window_activity=int(NOW) - 7200,
+                command="2.1.221",
+                path="/repo",
+            )
+        )
+        pid += PER_PANE + 1
+    while len(table) < processes:
+        add(pid, 1 if pid % 50 == 0 else pid - 1, "/usr/libexec/daemon")
+        pid += 1
+    return table, pane_rows
+
+
+def rebuilt_descendants(pid: int, table: dict[int, Process]) -> set[int]:
+    """The pre-index descendant walk: a fresh child map on every call."""
+    children: dict[int, list[int]] = {}
+    for process in table.values():
+        if process.pid != process.ppid:
+            children.setdefault(process.ppid, []).append(process.pid)
+    found: set[int] = set()
+    pending = list(children.get(pid, ()))
+    while pending:
+        child = pending.pop()
+        if child in found or child == pid:
+            continue
+        found.add(child)
+        pending.extend(children.get(child, ()))
+    return found
+
+
+def per_pane(table: dict[int, Process], panes: list[Pane]) -> int:
+    """The descendant checks with a child-map rebuild for every pane."""
+    hits = 0
+    for pane in panes:
+        leader = table[pane.pid]
+        below = [table[p] for p in rebuilt_descendants(pane.pid, table)]
+        hits += any(p.pgid == leader.tpgid for p in below)
+        hits += any(not p.sleeping for p in below)
+    return hits
+
+
+def with_tree(table: dict[int, Process], panes: list[Pane]) -> int:
+    """The same checks against a single index."""
+    tree = ProcessTree(table)
+    hits = 0
+    for pane in panes:
+        hits += bool(tree.foreground_descendants(pane.pid, table[pane.pid].tpgid))
+        hits += bool(tree.active_descendants(pane.pid))
+    return hits
+
+
+def write_teams(root: Path, panes: int) -> None:
+    """Write one drained, long-quiet inbox per teammate."""
+    for index in range(panes):
+        inboxes = root / f"session-s{index % 25}" / "inboxes"
+        inboxes.mkdir(parents=True, exist_ok=True)
+        inbox = inboxes / f"w{index}.json"
+        inbox.write_text("{}", encoding="utf-8")
+        os.utime(inbox, (NOW - 7200, NOW - 7200))
+
+
+def best_of(fn: Callable[[], object], repeat: int) -> float:
+    """Time a callable, keeping the fastest run.
+
+    Args:
+        fn: Work to time.
+        repeat: Number of runs.
+
+    Returns:
+        Fastest wall time in seconds.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    """Run the benchmark and print its rows."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", action="store_true", help="emit JSON")
+    args = parser.parse_args()
+
+    table, panes = build_fleet()
+    assert per_pane(table, panes) == with_tree(table, panes)
+    root = Path(tempfile.mkdtemp(prefix="bench-tree-"))
+    try:
+        write_teams(root, PANES)
+        config = Config(teams_dir=root, teammate_idle_minutes=30)
+        report = classify(panes, table, config, NOW, protected_pids=set())
+        assert len(report.candidates) == PANES, report.skipped[:1]
+        results = {
+            "processes": len(table),
+            "panes": len(panes),
+            "per_pane_s": best_of(partial(per_pane, table, panes), args.repeat),
+            "tree_s": best_of(partial(with_tree, table, panes), args.repeat),
+            "classify_s": best_of(
+                partial(classify, panes, table, config, NOW, set()), args.repeat
+            ),
+        }
+    finally:
+        shutil.rmtree(root)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(
+        f"{results['panes']:.0f} panes over {results['processes']:.0f} processes\n"
+        f"  subtree checks, per pane: {results['per_pane_s'] * 1000:>8.1f}ms\n"
+        f"  subtree checks, tree:     {results['tree_s'] * 1000:>8.1f}ms\n"
+        f"  full classify:            {results['classify_s'] * 1000:>8.1f}ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""Team-scoped teardown: filtered discovery against the full scan.
+
+The ``SessionEnd`` hook reaps one team. Builds machines of growing size — more
+tmux servers, more panes, more processes — that all host the same five-pane
+team, and times the two discovery stages the hook pays for both ways: every
+server's full ``list-panes -a`` plus a full procfs table, against the tmux-side
+``-f`` filter plus a procfs read of only the team's pane subtrees. tmux answers
+through a ``RecordingRunner`` (the filtered listing returns only the team's
+rows, as tmux would); procfs is a synthetic tree on the local filesystem.
+
+    uv run --project agent_reap python agent_reap/benchmarks/bench_team_scope.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import shutil
+import tempfile
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from functools import partial
+from pathlib import Path
+
+from agent_reap.discover import discover_servers
+from agent_reap.procfs import proc_process_table, proc_subtree_table
+from agent_reap.runner import RecordingRunner, Result
+
+NOW = 1_785_830_000
+TEAM = "abc123"
+TEAM_PANES = 5
+PER_PANE = 9  # shell, tools and helpers under each pane leader
+FIRST_PID = 1_000
+
+
+@dataclass(frozen=True)
+class Machine:
+    """Shape of one synthetic machine.
+
+    Attributes:
+        name: Label used in the output.
+        sockets: tmux servers.
+        panes: Claude panes across every server, the team's included.
+        processes: Total process count.
+    """
+
+    name: str
+    sockets: int
+    panes: int
+    processes: int
+
+
+MACHINES = (
+    Machine("laptop", sockets=2, panes=20, processes=2_000),
+    Machine("workstation", sockets=10, panes=500, processes=10_000),
+    Machine("fleet", sockets=50, panes=5_000, processes=50_000),
+)
+
+
+def _pane_row(pane: int, pid: int) -> str:
+    """One ``list-panes`` row in the discovery format."""
+    return "\t".join(
+        [f"%{pane}", "team", str(pane), "0", str(pid), str(NOW - 7200)]
+        + ["1", "0", "2.1.221", "/repo"]
+    )
+
+
+def _write(root: Path, pid: int, ppid: int, command: str) -> None:
+    """Populate one fake ``/proc/<pid>`` directory."""
+    directory = root / str(pid)
+    directory.mkdir()
+    fields = [str(pid), "(node)", "S", str(ppid), str(pid), str(pid), "0", str(pid)]
+    fields += ["0"] * 13 + ["4200", "0", "2500", "0"]
+    (directory / "stat").write_text(" ".join(fields), encoding="utf-8")
+    (directory / "cmdline").write_bytes(command.replace(" ", "\0").encode())
+
+
+def _children(root: Path, pid: int, children: list[int]) -> None:
+    """Publish one fake process's ``children`` list."""
+    task = root / str(pid) / "task" / str(pid)
+    task.mkdir(parents=True)
+    (task / "children").write_text(" ".join(map(str, children)), encoding="utf-8")
+
+
+def build(machine: Machine, root: Path) -> tuple[RecordingRunner, list[str]]:
+    """Write the machine's procfs tree and script its tmux servers.
+
+    Args:
+        machine: Shape to build.
+        root: Empty directory to hold the fake procfs.
+
+    Returns:
+        A runner answering full and filtered listings, and the socket paths.
+    """
+    (root / "uptime").write_text("864000.00 0.00\n", encoding="utf-8")
+    sockets = [f"/bench/s{server}" for server in range(machine.sockets)]
+    listings: dict[str, list[str]] = {socket: [] for socket in sockets}
+    team_rows: list[str] = []
+    pid = FIRST_PID
+    for pane in range(machine.panes):
+        socket = sockets[pane % machine.sockets]
+        session = TEAM if pane < TEAM_PANES else f"s{pane}"
+        _write(root, pid, 1, f"claude --agent-id w{pane}@session-{session}")
+        helpers = list(range(pid + 1, pid + PER_PANE + 1))
+        for helper in helpers:
+            _write(root, helper, pid, "node helper.js")
+        if pane < TEAM_PANES:
+            _children(root, pid, helpers)
+            for helper in helpers:
+                _children(root, helper, [])
+            team_rows.append(_pane_row(pane, pid))
+        listings[socket].append(_pane_row(pane, pid))
+        pid += PER_PANE + 1
+    while pid < FIRST_PID + machine.processes:
+        _write(root, pid, 1, "/usr/libexec/daemon")
+        pid += 1
+
+    responses: dict[str, Result] = {}
+    for socket, rows in listings.items():
+        responses[f"tmux -S {socket} list-panes -a -F"] = Result(0, "\n".join(rows))
+        mine = team_rows if socket == sockets[0] else []
+        responses[f"tmux -S {socket} list-panes -a -f"] = Result(0, "\n".join(mine))
+    return RecordingRunner(responses=responses), sockets
+
+
+def full(runner: RecordingRunner, sockets: list[str], root: Path) -> int:
+    """The hook's discovery before scoping: list everything, read everything."""
+    servers = discover_servers(sockets, runner)
+    proc_process_table(root)
+    return sum(len(server.panes) for server in servers)
+
+
+def scoped(runner: RecordingRunner, sockets: list[str], root: Path) -> int:
+    """The hook's discovery now: filtered listings, team subtrees only."""
+    servers = discover_servers(sockets, runner, team=TEAM)
+    leaders = [pane.pid for server in servers for pane in server.panes]
+    table = proc_subtree_table(leaders, proc_root=root)
+    assert table is not None and len(table) == TEAM_PANES * (PER_PANE + 1)
+    return len(leaders)
+
+
+def best_of(fn: Callable[[], object], repeat: int) -> float:
+    """Time a callable, keeping the fastest run.
+
+    Args:
+        fn: Work to time.
+        repeat: Number of runs.
+
+    Returns:
+        Fastest wall time in seconds.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    """Run the benchmark and print one row per machine."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", action="store_true", help="emit JSON")
+    args = parser.parse_args()
+
+    results: list[tuple[Machine, float, float]] = []
+    for machine in MACHINES:
+        root = Path(tempfile.mkdtemp(prefix="bench-team-"))
+        try:
+            runner, sockets = build(machine, root)
+            assert full(runner, sockets, root) == machine.panes
+            assert scoped(runner, sockets, root) == TEAM_PANES
+            full_s = best_of(partial(full, runner, sockets, root), args.repeat)
+            scoped_s = best_of(partial(scoped, runner, sockets, root), args.repeat)
+        finally:
+            shutil.rmtree(root)
+        results.append((machine, full_s, scoped_s))
+
+    if args.json:
+        rows = [
+            {**asdict(machine), "full_s": full_s, "scoped_s": scoped_s}
+            for machine, full_s, scoped_s in results
+        ]
+        print(json.dumps(rows, indent=2))
+        return
+    print(f"team of {TEAM_PANES} panes, {PER_PANE + 1} processes each")
+    print(
+        f"{'machine':<12} {'sockets':>7} {'panes':>6} {'processes':>9} "
+        f"{'full':>10} {'scoped':>10}"
+    )
+    for machine, full_s, scoped_s in results:
+        print(
+            f"{machine.name:<12} {machine.sockets:>7} {machine.panes:>6} "
+            f"{machine.processes:>9} {full_s * 1000:>8.1f}ms {scoped_s * 1000:>8.1f}ms"
+            f"  x{full_s / scoped_s:.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""Cold-start import budget for the SessionEnd hook's path.
+
+Runs ``agent-reap reap --team <id>`` the way the hook does — a fresh
+interpreter, a real config file, no tmux servers to find — under
+``python -X importtime`` and checks two things: the modules only other
+subcommands need stay unloaded, and the cumulative import time of
+``agent_reap.cli`` stays within the budget documented in the README. The run is
+repeated and the median kept, after one untimed run that warms the parsed-config
+cache, as every hook after the first finds it. Exits non-zero on a violation so
+CI can run it as a check.
+
+    uv run --project agent_reap python agent_reap/benchmarks/hook_startup.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+# Cumulative import time of ``agent_reap.cli`` the hook path may spend. Local
+# runs measure 80-110 ms; the median of ``--repeat`` runs absorbs the noise, so
+# the budget stays close enough to catch a reintroduced eager import.
+BUDGET_MS = 120.0
+
+# Loaded only by subcommands other than a team teardown, or by a config cache
+# miss; any of them on the hook path is a regression.
+FORBIDDEN = (
+    "asyncio",
+    "concurrent.futures",
+    "ctypes",
+    "http.server",
+    "json",
+    "sqlite3",
+    "tomllib",
+    "agent_reap.budget",
+    "agent_reap.history",
+    "agent_reap.memory",
+    "agent_reap.metrics",
+    "agent_reap.pipeline",
+    "agent_reap.pressure",
+    "agent_reap.registry",
+    "agent_reap.strays",
+    "agent_reap.watch",
+)
+
+
+def parse_importtime(stderr: str) -> dict[str, int]:
+    """Read ``-X importtime`` output.
+
+    Args:
+        stderr: The interpreter's standard error.
+
+    Returns:
+        Cumulative microseconds keyed by module name.
+    """
+    cumulative: dict[str, int] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, total, name = line.removeprefix("import time:").split("|")
+        if total.strip().isdigit():
+            cumulative[name.strip()] = int(total)
+    return cumulative
+
+
+def run_hook(env: dict[str, str]) -> dict[str, int]:
+    """Run one teardown in a fresh interpreter.
+
+    Args:
+        env: Environment pointing at the scratch config and cache.
+
+    Returns:
+        Cumulative import microseconds keyed by module name.
+    """
+    # ``-m agent_reap.cli`` would run the module as ``__main__``, leaving its
+    # own import untimed; the console script imports it like this.
+    entry = "from agent_reap.cli import main; main()"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", entry, "reap", "--team", "deadbeef"],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"hook run failed ({result.returncode}):\n{result.stderr}")
+    return parse_importtime(result.stderr)
+
+
+def main() -> int:
+    """Measure the hook path and report against the budget.
+
+    Returns:
+        Zero when within budget, one otherwise.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS)
+    parser.add_argument("--json", action="store_true", help="emit JSON")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="hook-startup-") as scratch:
+        root = Path(scratch)
+        (root / "sockets").mkdir()
+        (root / "teams").mkdir()
+        config = root / "config.toml"
+        config.write_text(
+            f'socket_globs = ["{root}/sockets/*"]\nteams_dir = "{root}/teams"\n'
+            "kill_enabled = true\n",
+            encoding="utf-8",
+        )
+        env = {
+            **os.environ,
+            "AGENT_REAP_CONFIG": str(config),
+            "XDG_CACHE_HOME": str(root / "cache"),
+            "PYTHONPATH": os.pathsep.join(
+                filter(
+                    None,
+                    [
+                        str(Path(__file__).parents[1] / "src"),
+                        os.environ.get("PYTHONPATH"),
+                    ],
+                )
+            ),
+        }
+        # An installed hook runs from compiled bytecode; let the warm-up write it.
+        env.pop("PYTHONDONTWRITEBYTECODE", None)
+        run_hook(env)
+        runs = [run_hook(env) for _ in range(max(1, args.repeat))]
+
+    cli_ms = statistics.median(run.get("agent_reap.cli", 0) for run in runs) / 1000
+    loaded = sorted({name for run in runs for name in run} & set(FORBIDDEN))
+    ok = cli_ms <= args.budget_ms and not loaded
+
+    if args.json:
+        print(
+            json.dumps(
+                {"cli_ms": cli_ms, "budget_ms": args.budget_ms, "forbidden": loaded}
+            )
+        )
+    else:
+        print(f"agent_reap.cli import: {cli_ms:.1f}ms (budget {args.budget_ms:.0f}ms)")
+        for name in loaded:
+            print(f"loaded on the hook path: {name}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
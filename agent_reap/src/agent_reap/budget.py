@@ -0,0 +1,166 @@
+"""Reclaim budgets: free a given amount of memory with as few kills as possible.
+
+``reap`` takes every candidate. ``reap --reclaim 4G`` takes only enough of them
+to free the target, under an explicit cost model:
+
+1. **Fewest kills first.** Every kill risks a teammate someone still wanted,
+   so the plan uses the smallest number of panes whose combined reclaimable
+   memory meets the target — the largest panes, since no smaller set of size
+   ``k`` can reclaim more than the ``k`` largest.
+2. **Least idle risk second.** Among plans of that size, a pane's cost is its
+   idle risk (``pressure.idle_risk``: the normal idle threshold over its idle
+   time), and chosen panes are swapped for lower-risk ones while the target
+   stays met — so between two panes that would both do, the longer-idle one
+   goes.
+
+When every candidate together falls short the plan takes them all and reports
+the shortfall.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from dataclasses import dataclass
+
+from .classify import Candidate
+from .pressure import idle_risk, rank
+
+_UNITS = {"K": 1, "M": 1024, "G": 1024**2, "T": 1024**3}
+
+# A number, an optional binary unit, and an optional ``B``/``iB``.
+_SIZE_RE = re.compile(
+    r"(?P<number>[-+]?(?:\d+\.?\d*|\.\d+)(?:e[-+]?\d+)?|[-+]?inf(?:inity)?|nan)"
+    r"\s*(?P<unit>[KMGT])?(?P<suffix>i?B)?",
+    re.IGNORECASE,
+)
+
+
+def parse_size(text: str) -> int:
+    """Parse a human memory size such as ``4G`` or ``512M``.
+
+    Units are binary (``G`` is GiB) and may be followed by ``B`` or ``iB``. A
+    lone ``B`` means bytes, and a bare number means megabytes.
+
+    Args:
+        text: Size to parse.
+
+    Returns:
+        The size in kilobytes.
+
+    Raises:
+        ValueError: The text is not a finite size of at least a kilobyte.
+    """
+    match = _SIZE_RE.fullmatch(text.strip())
+    if match is None:
+        raise ValueError(f"not a size: {text!r}")
+    number = float(match["number"])
+    unit = (match["unit"] or "").upper()
+    if unit:
+        kb = number * _UNITS[unit]
+    elif match["suffix"] is None:
+        kb = number * _UNITS["M"]
+    elif match["suffix"].upper() == "B":
+        kb = number / 1024
+    else:
+        raise ValueError(f"not a size: {text!r}")  # "iB" with no unit
+    if not math.isfinite(kb) or kb < 1:
+        raise ValueError(f"not a positive size: {text!r}")
+    return int(kb)
+
+
+@dataclass(frozen=True)
+class Plan:
+    """Which candidates a reclaim budget would kill.
+
+    Attributes:
+        target_kb: Memory asked for.
+        chosen: Candidates to kill, most memory per idle risk first.
+        considered: Candidates the plan chose from.
+        cost: Summed idle risk of the chosen candidates.
+    """
+
+    target_kb: int
+    chosen: tuple[Candidate, ...]
+    considered: int
+    cost: float
+
+    @property
+    def projected_kb(self) -> int:
+        """Memory the chosen kills are expected to free.
+
+        Returns:
+            Summed reclaimable kilobytes.
+        """
+        return sum(c.reclaim_kb for c in self.chosen)
+
+    @property
+    def shortfall_kb(self) -> int:
+        """How far short of the target the plan falls.
+
+        Returns:
+            Kilobytes missing, zero when the target is met.
+        """
+        return max(0, self.target_kb - self.projected_kb)
+
+
+def plan_reclaim(
+    candidates: tuple[Candidate, ...], target_kb: int, threshold_s: float
+) -> Plan:
+    """Choose the smallest, least risky set of candidates meeting a target.
+
+    Args:
+        candidates: Reapable teammates from a report.
+        target_kb: Memory to free.
+        threshold_s: The normal teammate idle threshold in seconds, the unit
+            idle risk is measured against.
+
+    Returns:
+        The plan.
+    """
+    cost = [idle_risk(c, threshold_s) for c in candidates]
+    # Largest first; among equals the longer-idle pane is cheaper to take.
+    order = sorted(
+        range(len(candidates)),
+        key=lambda i: (candidates[i].reclaim_kb, candidates[i].idle_s),
+        reverse=True,
+    )
+    size = 0
+    count = 0
+    for index in order:
+        if size >= target_kb:
+            break
+        size += candidates[index].reclaim_kb
+        count += 1
+    chosen, spare = order[:count], order[count:]
+
+    if size >= target_kb:
+        # Lower the risk at a fixed kill count: swap the riskiest chosen pane
+        # for the cheapest spare one that keeps the target met. Each swap
+        # strictly lowers the total cost, so this terminates.
+        swapped = True
+        while swapped:
+            swapped = False
+            for out in sorted(chosen, key=lambda i: cost[i], reverse=True):
+                slack = size - target_kb
+                replacements = [
+                    i
+                    for i in spare
+                    if cost[i] < cost[out]
+                    and candidates[i].reclaim_kb >= candidates[out].reclaim_kb - slack
+                ]
+                if not replacements:
+                    continue
+                into = min(replacements, key=lambda i: cost[i])
+                chosen[chosen.index(out)] = into
+                spare[spare.index(into)] = out
+                size += candidates[into].reclaim_kb - candidates[out].reclaim_kb
+                swapped = True
+                break
+
+    return Plan(
+        target_kb=target_kb,
+        chosen=rank(tuple(candidates[i] for i in chosen), threshold_s),
+        considered=len(candidates),
+        cost=sum(cost[i] for i in chosen),
+    )
@@ -15,12 +15,20 @@ itself rather than silently omitting things.
 
 from __future__ import annotations
 
+from collections.abc import Iterable, Iterator, Mapping
 from dataclasses import dataclass
 from pathlib import Path
 
 from .config import Config
-from .discover import Pane, Process, Teammate, descendants, parse_teammate
-from .teams import Inbox, read_inbox, session_exists
+from .discover import (
+    Footprint,
+    Pane,
+    Process,
+    ProcessTree,
+    Teammate,
+    parse_teammate,
+)
+from .teams import Inbox, TeamsIndex
 
 # Command names a Claude pane leader reports. Claude Code shows its version as the
 # pane command (e.g. "2.1.221"), so match the version shape as well as the name.
@@ -37,6 +45,7 @@ class Candidate:
         teammate: Parsed teammate identity.
         inbox: Inbox state backing the decision.
         idle_s: Seconds since the inbox last saw traffic.
+        memory: Subtree footprint, when memory accounting measured one.
     """
 
     pane: Pane
@@ -44,16 +53,26 @@ class Candidate:
     teammate: Teammate
     inbox: Inbox
     idle_s: float
+    memory: Footprint | None = None
 
     @property
     def rss_kb(self) -> int:
-        """Resident memory of this candidate.
+        """Resident memory of this candidate's leader.
 
         Returns:
             Resident set size in kilobytes.
         """
         return self.process.rss_kb
 
+    @property
+    def reclaim_kb(self) -> int:
+        """Best estimate of what reaping this pane frees.
+
+        Returns:
+            Subtree PSS when measured, otherwise the leader's RSS.
+        """
+        return self.rss_kb if self.memory is None else self.memory.pss_kb
+
 
 @dataclass(frozen=True)
 class Interactive:
@@ -64,21 +83,32 @@ class Interactive:
         process: Its leader process.
         idle_s: Seconds since the window last showed activity, or None when tmux
             reported no activity timestamp.
+        memory: Subtree footprint, when memory accounting measured one.
     """
 
     pane: Pane
     process: Process
     idle_s: float | None
+    memory: Footprint | None = None
 
     @property
     def rss_kb(self) -> int:
-        """Resident memory of this session.
+        """Resident memory of this session's leader.
 
         Returns:
             Resident set size in kilobytes.
         """
         return self.process.rss_kb
 
+    @property
+    def reclaim_kb(self) -> int:
+        """Best estimate of what closing this session frees.
+
+        Returns:
+            Subtree PSS when measured, otherwise the leader's RSS.
+        """
+        return self.rss_kb if self.memory is None else self.memory.pss_kb
+
 
 @dataclass(frozen=True)
 class Skipped:
@@ -102,21 +132,40 @@ class Report:
         interactive: Idle interactive sessions, report-only.
         skipped: Panes excluded, each with a reason.
         sockets: Sockets that were searched.
+        timed_out: Searched sockets whose server did not answer within the
+            discovery budget. Their panes are missing from this report.
     """
 
     candidates: tuple[Candidate, ...] = ()
     interactive: tuple[Interactive, ...] = ()
     skipped: tuple[Skipped, ...] = ()
     sockets: tuple[str, ...] = ()
+    timed_out: tuple[str, ...] = ()
 
     @property
     def reclaimable_kb(self) -> int:
         """Memory held by reapable teammates.
 
         Returns:
-            Summed resident set size in kilobytes.
+            Summed subtree PSS in kilobytes where measured, leader RSS elsewhere.
+        """
+        return sum(c.reclaim_kb for c in self.candidates)
+
+    @property
+    def private_kb(self) -> int | None:
+        """Memory a reap of every candidate is certain to free.
+
+        Returns:
+            Summed subtree USS in kilobytes, or None unless every candidate was
+            measured.
         """
-        return sum(c.rss_kb for c in self.candidates)
+        if any(c.memory is None for c in self.candidates):
+            return None
+        return sum(c.memory.uss_kb for c in self.candidates if c.memory is not None)
+
+
+# One classified pane, whichever bucket it landed in.
+type Decision = Candidate | Interactive | Skipped
 
 
 def _is_claude_pane(pane: Pane, process: Process) -> bool:
@@ -158,7 +207,7 @@ def _agent_allowed(name: str, config: Config) -> bool:
 
 def classify(
     panes: list[Pane],
-    processes: dict[int, Process],
+    processes: Mapping[int, Process],
     config: Config,
     now: float,
     protected_pids: set[int],
@@ -167,6 +216,9 @@ def classify(
     sockets: tuple[str, ...] = (),
     teams_dir: Path | None = None,
     team_scope: str | None = None,
+    timed_out: tuple[str, ...] = (),
+    tree: ProcessTree | None = None,
+    teams: TeamsIndex | None = None,
 ) -> Report:
     """Sort panes into candidates, interactive sessions, and exclusions.
 
@@ -185,6 +237,8 @@ def classify(
         protected_sessions: Team session ids that must never be reaped, normally
             the caller's own team.
         sockets: Sockets searched, recorded on the report.
+        timed_out: Sockets that missed the discovery budget, recorded on the
+            report.
         teams_dir: Override for the teams root; defaults to the configured path.
         team_scope: Tear down exactly this team session id. Used by the
             ``SessionEnd`` hook, where the team's lifecycle has *ended* — so the
@@ -192,24 +246,79 @@ def classify(
             (they exist to avoid reaping mid-work agents in a *live* team), and
             the own-team guard is deliberately lifted for this id. The pane and
             ancestry guards still hold, so the hook can never kill its own shell.
+        tree: Index over ``processes``, when the caller already built one.
+        teams: Inbox index to answer from; defaults to a fresh one over the
+            teams root.
 
     Returns:
         The classification, with a reason attached to every exclusion.
     """
+    return assemble(
+        iter_classify(
+            panes,
+            processes,
+            config,
+            now,
+            protected_pids,
+            protected_panes=protected_panes,
+            protected_sessions=protected_sessions,
+            teams_dir=teams_dir,
+            team_scope=team_scope,
+            tree=tree,
+            teams=teams,
+        ),
+        sockets=sockets,
+        timed_out=timed_out,
+    )
+
+
+def iter_classify(
+    panes: list[Pane],
+    processes: Mapping[int, Process],
+    config: Config,
+    now: float,
+    protected_pids: set[int],
+    protected_panes: set[tuple[str, str]] | None = None,
+    protected_sessions: set[str] | None = None,
+    teams_dir: Path | None = None,
+    team_scope: str | None = None,
+    tree: ProcessTree | None = None,
+    teams: TeamsIndex | None = None,
+) -> Iterator[Decision]:
+    """Classify panes one at a time, as ``classify`` does, without collecting.
+
+    A streaming caller can hand each decision on as soon as it is made instead
+    of holding the whole report; the arguments mean what they mean for
+    ``classify``.
+
+    Args:
+        panes: Panes discovered across all servers.
+        processes: Process table keyed by pid.
+        config: Effective settings.
+        now: Current unix timestamp.
+        protected_pids: Pids that must never be reaped.
+        protected_panes: (socket, pane_id) pairs that must never be reaped.
+        protected_sessions: Team session ids that must never be reaped.
+        teams_dir: Override for the teams root.
+        team_scope: Tear down exactly this team session id.
+        tree: Index over ``processes``, when the caller already built one.
+        teams: Inbox index to answer from.
+
+    Yields:
+        One decision per reported pane, in pane order. Panes that are not
+        Claude's yield nothing.
+    """
+    tree = ProcessTree(processes) if tree is None else tree
     protected_panes = protected_panes or set()
     protected_sessions = protected_sessions or set()
-    root = (teams_dir or config.teams_dir).expanduser()
+    teams = TeamsIndex(teams_dir or config.teams_dir) if teams is None else teams
     teammate_idle_s = config.teammate_idle_minutes * 60
     interactive_idle_s = config.interactive_idle_minutes * 60
 
-    candidates: list[Candidate] = []
-    interactive: list[Interactive] = []
-    skipped: list[Skipped] = []
-
     for pane in panes:
         process = processes.get(pane.pid)
         if process is None:
-            skipped.append(Skipped(pane, "no process for pane leader"))
+            yield Skipped(pane, "no process for pane leader")
             continue
 
         teammate = parse_teammate(process.command)
@@ -221,7 +330,7 @@ def classify(
                 pane.pid in protected_pids
                 or (pane.socket, pane.pane_id) in protected_panes
             ):
-                skipped.append(Skipped(pane, "this session"))
+                yield Skipped(pane, "this session")
                 continue
             idle = (
                 None
@@ -229,13 +338,13 @@ def classify(
                 else max(0.0, now - pane.window_activity)
             )
             if idle is not None and idle < interactive_idle_s:
-                skipped.append(Skipped(pane, f"interactive, active {int(idle)}s ago"))
+                yield Skipped(pane, f"interactive, active {int(idle)}s ago")
                 continue
-            interactive.append(Interactive(pane=pane, process=process, idle_s=idle))
+            yield Interactive(pane=pane, process=process, idle_s=idle)
             continue
 
         if pane.pid in protected_pids or (pane.socket, pane.pane_id) in protected_panes:
-            skipped.append(Skipped(pane, "this session"))
+            yield Skipped(pane, "this session")
             continue
 
         if team_scope is not None:
@@ -244,33 +353,31 @@ def classify(
             if teammate.session_id != team_scope:
                 continue
             if teammate.agent_name == "team-lead" and not config.include_lead:
-                skipped.append(Skipped(pane, "team lead (use --include-lead)"))
+                yield Skipped(pane, "team lead (use --include-lead)")
                 continue
             if not _agent_allowed(teammate.agent_name, config):
-                skipped.append(Skipped(pane, "excluded by allow/deny list"))
+                yield Skipped(pane, "excluded by allow/deny list")
                 continue
-            candidates.append(
-                Candidate(
-                    pane=pane,
-                    process=process,
-                    teammate=teammate,
-                    inbox=read_inbox(root, teammate.session_id, teammate.agent_name),
-                    idle_s=0.0,
-                )
+            yield Candidate(
+                pane=pane,
+                process=process,
+                teammate=teammate,
+                inbox=teams.inbox(teammate.session_id, teammate.agent_name),
+                idle_s=0.0,
             )
             continue
 
         if teammate.session_id in protected_sessions:
-            skipped.append(Skipped(pane, "own team session"))
+            yield Skipped(pane, "own team session")
             continue
         if teammate.agent_name == "team-lead" and not config.include_lead:
-            skipped.append(Skipped(pane, "team lead (use --include-lead)"))
+            yield Skipped(pane, "team lead (use --include-lead)")
             continue
         if not _agent_allowed(teammate.agent_name, config):
-            skipped.append(Skipped(pane, "excluded by allow/deny list"))
+            yield Skipped(pane, "excluded by allow/deny list")
             continue
-        if not session_exists(root, teammate.session_id):
-            skipped.append(Skipped(pane, "no team dir for session"))
+        if not teams.session_exists(teammate.session_id):
+            yield Skipped(pane, "no team dir for session")
             continue
         window_idle_s = (
             None
@@ -278,69 +385,77 @@ def classify(
             else max(0.0, now - pane.window_activity)
         )
         if window_idle_s is None:
-            skipped.append(Skipped(pane, "window activity unavailable"))
+            yield Skipped(pane, "window activity unavailable")
             continue
         if window_idle_s < teammate_idle_s:
-            skipped.append(
-                Skipped(pane, f"teammate window active {int(window_idle_s)}s ago")
-            )
+            yield Skipped(pane, f"teammate window active {int(window_idle_s)}s ago")
             continue
         if not process.sleeping:
-            skipped.append(Skipped(pane, f"process not idle (state {process.state})"))
+            yield Skipped(pane, f"process not idle (state {process.state})")
             continue
 
-        descendant_processes = [
-            processes[pid]
-            for pid in descendants(pane.pid, processes)
-            if pid in processes
-        ]
-        foreground = [
-            child
-            for child in descendant_processes
-            if process.tpgid > 0 and child.pgid == process.tpgid
-        ]
-        if foreground:
-            skipped.append(
-                Skipped(
-                    pane,
-                    "foreground descendant process group "
-                    f"{process.tpgid} still attached",
-                )
+        if tree.foreground_descendants(pane.pid, process.tpgid):
+            yield Skipped(
+                pane,
+                f"foreground descendant process group {process.tpgid} still attached",
             )
             continue
-        active_descendants = [
-            child for child in descendant_processes if not child.sleeping
-        ]
+        active_descendants = tree.active_descendants(pane.pid)
         if active_descendants:
-            pids = ",".join(str(child.pid) for child in active_descendants[:3])
-            skipped.append(Skipped(pane, f"active descendant process ({pids})"))
+            pids = ",".join(str(pid) for pid in active_descendants[:3])
+            yield Skipped(pane, f"active descendant process ({pids})")
             continue
 
-        inbox = read_inbox(root, teammate.session_id, teammate.agent_name)
+        inbox = teams.inbox(teammate.session_id, teammate.agent_name)
         if not inbox.exists:
-            skipped.append(Skipped(pane, "no inbox file"))
+            yield Skipped(pane, "no inbox file")
             continue
         if not inbox.drained:
-            skipped.append(Skipped(pane, f"inbox has queued work ({inbox.size}b)"))
+            yield Skipped(pane, f"inbox has queued work ({inbox.size}b)")
             continue
         idle_s = inbox.idle_seconds(now) or 0.0
         if idle_s < teammate_idle_s:
-            skipped.append(Skipped(pane, f"drained only {int(idle_s)}s ago"))
+            yield Skipped(pane, f"drained only {int(idle_s)}s ago")
             continue
 
-        candidates.append(
-            Candidate(
-                pane=pane,
-                process=process,
-                teammate=teammate,
-                inbox=inbox,
-                idle_s=idle_s,
-            )
+        yield Candidate(
+            pane=pane,
+            process=process,
+            teammate=teammate,
+            inbox=inbox,
+            idle_s=idle_s,
         )
 
+
+def assemble(
+    decisions: Iterable[Decision],
+    sockets: tuple[str, ...] = (),
+    timed_out: tuple[str, ...] = (),
+) -> Report:
+    """Collect decisions into a report.
+
+    Args:
+        decisions: Classifications, in pane order.
+        sockets: Sockets searched.
+        timed_out: Searched sockets whose server did not answer in time.
+
+    Returns:
+        The report, each bucket in the order its decisions arrived.
+    """
+    candidates: list[Candidate] = []
+    interactive: list[Interactive] = []
+    skipped: list[Skipped] = []
+    for decision in decisions:
+        if isinstance(decision, Candidate):
+            candidates.append(decision)
+        elif isinstance(decision, Interactive):
+            interactive.append(decision)
+        else:
+            skipped.append(decision)
     return Report(
         candidates=tuple(candidates),
         interactive=tuple(interactive),
         skipped=tuple(skipped),
         sockets=sockets,
+        timed_out=timed_out,
     )
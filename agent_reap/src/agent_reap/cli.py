@@ -7,32 +7,77 @@ context worth more than the memory it occupies.
 
 from __future__ import annotations
 
-import argparse
-import json
+import contextlib
+import io
 import os
 import sys
 import time
-from collections.abc import Sequence
-from dataclasses import replace
+from collections.abc import Callable, Iterator, Mapping, Sequence
+from dataclasses import asdict, replace
+from functools import partial
 from pathlib import Path
-from typing import TypedDict
-
-from .classify import Candidate, Report, classify
-from .config import Config, load_config
+from typing import TYPE_CHECKING, TypedDict
+
+from .classify import (
+    Candidate,
+    Decision,
+    Interactive,
+    Report,
+    Skipped,
+    assemble,
+    classify,
+    iter_classify,
+)
+from .config import (
+    DEFAULT_RESYNC_SECONDS,
+    DEFAULT_SCRAPE_INTERVAL_SECONDS,
+    MEMORY_ACCOUNTING,
+    Config,
+    load_config,
+)
 from .discover import (
     Pane,
     Process,
-    ancestry,
-    discover_panes,
+    ProcessTree,
+    Snapshot,
+    TeamIds,
+    discover_servers,
     find_sockets,
-    list_panes,
-    live_sockets,
-    process_table,
     resolve_socket_path,
+    teammate_sessions,
 )
+from .procfs import process_snapshot
 from .reap import Outcome, reap
-from .runner import Runner, subprocess_runner
-from .strays import ControlMaster, control_masters, disowned_descendants
+from .runner import (
+    AsyncRunner,
+    Runner,
+    async_subprocess_runner,
+    subprocess_runner,
+    threaded,
+)
+from .teams import TeamsCache, TeamsIndex
+from .timings import Timings, collect, current, instrument, instrument_async, phase
+
+# Modules only some subcommands need are imported where they are used. The
+# SessionEnd hook runs ``reap --team`` on every session exit, and the async
+# pipeline (asyncio), the history store (sqlite3), the metrics server
+# (http.server), the inotify registry (ctypes), the stray hunt and the watch
+# loop would otherwise all load before it does anything. So would argparse
+# and json, the memory accounting and the pressure and budget policies, none of
+# which a team teardown uses until it parses its command line.
+if TYPE_CHECKING:
+    import argparse
+
+    from .budget import Plan
+    from .coordinator import Reply, Request
+    from .history import Day
+    from .pressure import Pressure
+    from .registry import SocketRegistry
+    from .strays import ControlMaster, Disowned
+    from .watch import Change
+
+# Receives one NDJSON record as soon as it is produced.
+type Emit = Callable[[dict[str, object]], None]
 
 
 class SocketEntry(TypedDict):
@@ -40,6 +85,7 @@ class SocketEntry(TypedDict):
 
     socket: str
     live: bool
+    timed_out: bool
     current: bool
     sessions: list[str]
 
@@ -56,6 +102,26 @@ def _mb(kb: int) -> str:
     return f"{kb / 1024:.0f} MB"
 
 
+def _memory(entry: Candidate | Interactive) -> str:
+    """Render a pane's memory for a report row.
+
+    Args:
+        entry: Candidate or interactive session.
+
+    Returns:
+        Leader RSS, or subtree PSS and USS when memory accounting measured
+        them. A ``~`` marks figures where some process fell back to RSS.
+    """
+    if entry.memory is None:
+        return f"{_mb(entry.rss_kb):>8}"
+    footprint = entry.memory
+    mark = "~" if footprint.estimated else ""
+    return (
+        f"{_mb(footprint.pss_kb):>8} pss{mark}  {_mb(footprint.uss_kb):>8} uss{mark}  "
+        f"{footprint.processes} procs"
+    )
+
+
 def _duration(seconds: float | None) -> str:
     """Render a duration compactly.
 
@@ -75,8 +141,26 @@ def _duration(seconds: float | None) -> str:
     return f"{total // 3600}h{(total % 3600) // 60:02d}m"
 
 
+def _own_pane() -> tuple[str, str] | None:
+    """Identify the pane this process runs in, from its tmux environment.
+
+    Returns:
+        The socket-qualified ``(socket, pane_id)``, or None outside tmux.
+    """
+    # Socket-qualify the pane. $TMUX is "<socket>,<server-pid>,<session>", and a
+    # pane id is unique only WITHIN a server — every server numbers from %0. A
+    # bare id would therefore protect a same-numbered pane on every other socket,
+    # which under-reaps silently. Resolve the socket the same way discovery does
+    # so /tmp and /private/tmp compare equal.
+    tmux_env = os.environ.get("TMUX", "")
+    pane_env = os.environ.get("TMUX_PANE")
+    if not (tmux_env and pane_env):
+        return None
+    return resolve_socket_path(tmux_env.split(",", 1)[0]), pane_env
+
+
 def _self_context(
-    processes: dict[int, Process], runner: Runner
+    tree: ProcessTree, runner: Runner, guests: Sequence[Request] = ()
 ) -> tuple[set[int], set[tuple[str, str]], set[str]]:
     """Determine what belongs to the caller and must never be reaped.
 
@@ -85,27 +169,23 @@ def _self_context(
     pane id, and the caller's own team session.
 
     Args:
-        processes: Process table keyed by pid.
+        tree: Index over the current process table.
         runner: Command executor, unused but kept for symmetry with callers.
+        guests: Runs a coordinator is serving; their ancestry and panes are
+            protected like the caller's own.
 
     Returns:
         Protected pids, protected (socket, pane_id) pairs, and protected team
         session ids.
     """
     del runner
-    pids = ancestry(os.getpid(), processes)
-
-    # Socket-qualify the pane. $TMUX is "<socket>,<server-pid>,<session>", and a
-    # pane id is unique only WITHIN a server — every server numbers from %0. A
-    # bare id would therefore protect a same-numbered pane on every other socket,
-    # which under-reaps silently. Resolve the socket the same way discovery does
-    # so /tmp and /private/tmp compare equal.
-    pane_ids: set[tuple[str, str]] = set()
-    tmux_env = os.environ.get("TMUX", "")
-    pane_env = os.environ.get("TMUX_PANE")
-    if tmux_env and pane_env:
-        socket_path = tmux_env.split(",", 1)[0]
-        pane_ids.add((resolve_socket_path(socket_path), pane_env))
+    pids = tree.ancestry(os.getpid())
+    own = _own_pane()
+    pane_ids: set[tuple[str, str]] = set() if own is None else {own}
+    for guest in guests:
+        pids |= tree.ancestry(guest.pid)
+        if guest.pane is not None:
+            pane_ids.add(guest.pane)
     sessions = {
         s
         for s in (
@@ -124,29 +204,142 @@ def build_report(
     runner: Runner,
     now: float | None = None,
     team_scope: str | None = None,
+    async_runner: AsyncRunner | None = None,
+    emit: Emit | None = None,
 ) -> Report:
     """Discover and classify the current pane population.
 
+    Discovery runs through the async pipeline; this is its synchronous face.
+    A scoped team teardown skips the pipeline: its stages depend on one another
+    and are team-sized, so starting an event loop would cost more than it saves.
+
     Args:
         config: Effective settings.
         runner: Command executor.
         now: Current unix timestamp; defaults to wall clock.
         team_scope: Restrict to one team session id for targeted teardown.
+        async_runner: Executor for the pipeline's tmux and ``ps`` calls;
+            defaults to ``runner`` on worker threads.
+        emit: Receives a record per searched socket once discovery is done,
+            then one per decision as classification makes it.
 
     Returns:
         The classification report.
     """
-    globs = config.resolved_globs()
-    sockets = tuple(live_sockets(find_sockets(globs), runner))
-    panes: list[Pane] = []
-    for socket in sockets:
-        panes.extend(list_panes(socket, runner))
+    if team_scope is not None and config.scoped_team_discovery:
+        taken = _team_snapshot(config, runner, team_scope)
+    else:
+        from .pipeline import snapshot
+
+        taken = snapshot(
+            config, async_runner or threaded(runner), team_scope=team_scope
+        )
+    if emit is not None:
+        for socket in taken.sockets:
+            emit(
+                {
+                    "type": "socket",
+                    "socket": socket,
+                    "timed_out": socket in taken.timed_out,
+                }
+            )
+    return _classify_panes(
+        config,
+        runner,
+        taken.panes,
+        now=now,
+        sockets=taken.sockets,
+        timed_out=taken.timed_out,
+        team_scope=team_scope,
+        processes=taken.processes,
+        teams=taken.teams,
+        emit=emit,
+    )
+
+
+def _team_snapshot(
+    config: Config, runner: Runner, team: TeamIds, anchors: Sequence[int] = ()
+) -> Snapshot:
+    """Gather what a team teardown reads, in order and without asyncio.
 
-    processes = process_table(runner)
-    protected_pids, protected_panes, protected_sessions = _self_context(
-        processes, runner
+    Args:
+        config: Effective settings.
+        runner: Command executor.
+        team: Team session id, or the ids of a coordinated batch.
+        anchors: Further pids whose ancestry the process table must hold.
+
+    Returns:
+        A snapshot of those teams' panes, their subtrees, and their inboxes.
+        With ``scoped_team_discovery`` off, every pane and process.
+    """
+    scoped = team if config.scoped_team_discovery else None
+    servers = discover_servers(
+        find_sockets(config.resolved_globs()),
+        runner,
+        workers=config.discovery_workers,
+        deadline_s=config.discovery_deadline_seconds,
+        team=scoped,
     )
-    return classify(
+    processes = process_snapshot(
+        runner,
+        config.process_backend,
+        roots=None
+        if scoped is None
+        else [pane.pid for server in servers for pane in server.panes],
+        anchors=anchors,
+    )
+    teams = TeamsIndex(config.teams_dir)
+    wanted = {team} if isinstance(team, str) else set(team)
+    leaders = [pane.pid for server in servers for pane in server.panes]
+    teams.prefetch(teammate_sessions(processes, leaders) & wanted)
+    return Snapshot(servers=tuple(servers), processes=processes, teams=teams)
+
+
+def _classify_panes(
+    config: Config,
+    runner: Runner,
+    panes: list[Pane],
+    now: float | None = None,
+    sockets: tuple[str, ...] = (),
+    timed_out: tuple[str, ...] = (),
+    team_scope: str | None = None,
+    teams_cache: TeamsCache | None = None,
+    processes: Mapping[int, Process] | None = None,
+    teams: TeamsIndex | None = None,
+    emit: Emit | None = None,
+    guests: Sequence[Request] = (),
+) -> Report:
+    """Classify already-discovered panes against a fresh process snapshot.
+
+    Args:
+        config: Effective settings.
+        runner: Command executor.
+        panes: Panes to classify.
+        now: Current unix timestamp; defaults to wall clock.
+        sockets: Sockets searched, recorded on the report.
+        timed_out: Sockets that missed the discovery budget.
+        team_scope: Restrict to one team session id for targeted teardown.
+        teams_cache: Inbox listings carried across calls by a long-running
+            caller. Kill revalidation never passes one.
+        processes: A snapshot the caller already took for other work; a fresh
+            one is read when omitted.
+        teams: An inbox index the caller already filled; ``teams_cache``
+            is ignored when it is given.
+        emit: Receives each decision as it is made, already measured under
+            ``memory_accounting = "pss"``.
+        guests: Runs a coordinator is serving, protected like the caller.
+
+    Returns:
+        The classification report.
+    """
+    if processes is None:
+        processes = process_snapshot(runner, config.process_backend)
+    with phase("process-tree"):
+        tree = ProcessTree(processes)
+        protected_pids, protected_panes, protected_sessions = _self_context(
+            tree, runner, guests
+        )
+    decisions = iter_classify(
         panes=panes,
         processes=processes,
         config=config,
@@ -154,9 +347,51 @@ def build_report(
         protected_pids=protected_pids,
         protected_panes=protected_panes,
         protected_sessions=protected_sessions,
-        sockets=sockets,
         team_scope=team_scope,
+        tree=tree,
+        teams=teams or TeamsIndex(config.teams_dir, teams_cache),
     )
+    if emit is not None:
+        with phase("classify"):
+            return assemble(
+                _streamed(decisions, tree, config, emit), sockets, timed_out
+            )
+    with phase("classify"):
+        report = assemble(decisions, sockets, timed_out)
+    if config.memory_accounting == "pss":
+        from .memory import attach_footprints
+
+        with phase("memory"):
+            report = attach_footprints(report, tree)
+    return report
+
+
+def _streamed(
+    decisions: Iterator[Decision], tree: ProcessTree, config: Config, emit: Emit
+) -> Iterator[Decision]:
+    """Emit each decision as it passes through.
+
+    Under PSS accounting each reported pane is measured on its own, so its
+    record carries the footprint a collected report would have attached.
+
+    Args:
+        decisions: Decisions as classification makes them.
+        tree: Index over the snapshot being classified.
+        config: Effective settings.
+        emit: Receives one record per decision.
+
+    Yields:
+        The decisions, measured where the config asks for it.
+    """
+    from .memory import footprints
+
+    for decision in decisions:
+        if config.memory_accounting == "pss" and not isinstance(decision, Skipped):
+            with phase("memory"):
+                measured = footprints([decision.pane.pid], tree)
+            decision = replace(decision, memory=measured.get(decision.pane.pid))
+        emit(_decision_json(decision))
+        yield decision
 
 
 def _revalidate_candidate(
@@ -178,44 +413,118 @@ def _revalidate_candidate(
     Returns:
         Whether the candidate remains valid, plus a rejection reason.
     """
-    fresh_pane = next(
-        (
-            pane
-            for pane in list_panes(candidate.pane.socket, runner)
-            if pane.pane_id == candidate.pane.pane_id
-        ),
-        None,
-    )
-    if fresh_pane is None:
-        return False, "pane no longer exists"
-    if fresh_pane.pid != candidate.pane.pid:
-        return False, "pane leader changed"
+    return _revalidate_batch((candidate,), config, runner, team_scope, now)[0]
+
+
+def _revalidate_batch(
+    candidates: Sequence[Candidate],
+    config: Config,
+    runner: Runner,
+    team_scope: TeamIds | None,
+    now: float | None = None,
+    guests: Sequence[Request] = (),
+) -> list[tuple[bool, str]]:
+    """Confirm a whole kill round against one fresh snapshot.
+
+    Each affected socket is listed once and the process table is read once,
+    however many candidates share them; every candidate is then reclassified
+    against that snapshot. The per-candidate checks are unchanged: a pane whose
+    leader pid differs from the report's is rejected before classification.
+
+    Args:
+        candidates: Snapshot candidates selected by the initial report.
+        config: Effective settings.
+        runner: Command executor.
+        team_scope: Optional targeted teardown session, or the sessions of a
+            coordinated batch.
+        now: Wall clock override for tests.
+        guests: Runs a coordinator is serving, protected like the caller.
 
-    processes = process_table(runner)
-    if fresh_pane.pid not in processes:
-        return False, "pane leader is absent from the fresh process table"
-    protected_pids, protected_panes, protected_sessions = _self_context(
-        processes, runner
+    Returns:
+        One ``(valid, reason)`` verdict per candidate, in order.
+    """
+    scoped = team_scope if config.scoped_team_discovery else None
+    servers = discover_servers(
+        sorted({c.pane.socket for c in candidates}),
+        runner,
+        workers=config.discovery_workers,
+        deadline_s=config.discovery_deadline_seconds,
+        team=scoped,
     )
-    fresh_report = classify(
-        panes=[fresh_pane],
-        processes=processes,
-        config=config,
-        now=time.time() if now is None else now,
-        protected_pids=protected_pids,
-        protected_panes=protected_panes,
-        protected_sessions=protected_sessions,
-        team_scope=team_scope,
+    fresh_panes = {
+        (pane.socket, pane.pane_id): pane for server in servers for pane in server.panes
+    }
+    timed_out = {server.socket for server in servers if server.timed_out}
+    processes = process_snapshot(
+        runner,
+        config.process_backend,
+        roots=None if scoped is None else [p.pid for p in fresh_panes.values()],
+        anchors=[guest.pid for guest in guests],
     )
-    for fresh in fresh_report.candidates:
-        if (
-            fresh.teammate == candidate.teammate
-            and fresh.pane.pid == candidate.pane.pid
-        ):
-            return True, ""
-    if fresh_report.skipped:
-        return False, fresh_report.skipped[0].reason
-    return False, "pane no longer matches the teammate identity"
+
+    verdicts: dict[tuple[str, str], tuple[bool, str]] = {}
+    survivors: list[Pane] = []
+    for candidate in candidates:
+        key = (candidate.pane.socket, candidate.pane.pane_id)
+        fresh_pane = fresh_panes.get(key)
+        if candidate.pane.socket in timed_out:
+            verdicts[key] = (False, "server did not answer")
+        elif fresh_pane is None:
+            verdicts[key] = (False, "pane no longer exists")
+        elif fresh_pane.pid != candidate.pane.pid:
+            verdicts[key] = (False, "pane leader changed")
+        elif fresh_pane.pid not in processes:
+            verdicts[key] = (
+                False,
+                "pane leader is absent from the fresh process table",
+            )
+        else:
+            survivors.append(fresh_pane)
+
+    if survivors:
+        with phase("process-tree"):
+            tree = ProcessTree(processes)
+            protected_pids, protected_panes, protected_sessions = _self_context(
+                tree, runner, guests
+            )
+        # A coordinated batch is reclassified once per team: classification
+        # targets one team at a time and passes over every other team's panes.
+        scopes = team_scope if isinstance(team_scope, tuple) else (team_scope,)
+        fresh_candidates: dict[tuple[str, str], Candidate] = {}
+        reasons: dict[tuple[str, str], str] = {}
+        for scope in scopes:
+            with phase("classify"):
+                fresh_report = classify(
+                    panes=survivors,
+                    processes=processes,
+                    config=config,
+                    now=time.time() if now is None else now,
+                    protected_pids=protected_pids,
+                    protected_panes=protected_panes,
+                    protected_sessions=protected_sessions,
+                    team_scope=scope,
+                    tree=tree,
+                )
+            for c in fresh_report.candidates:
+                fresh_candidates[(c.pane.socket, c.pane.pane_id)] = c
+            for s in fresh_report.skipped:
+                reasons[(s.pane.socket, s.pane.pane_id)] = s.reason
+        for candidate in candidates:
+            key = (candidate.pane.socket, candidate.pane.pane_id)
+            if key in verdicts:
+                continue
+            fresh = fresh_candidates.get(key)
+            if (
+                fresh is not None
+                and fresh.teammate == candidate.teammate
+                and fresh.pane.pid == candidate.pane.pid
+            ):
+                verdicts[key] = (True, "")
+            elif key in reasons:
+                verdicts[key] = (False, reasons[key])
+            else:
+                verdicts[key] = (False, "pane no longer matches the teammate identity")
+    return [verdicts[(c.pane.socket, c.pane.pane_id)] for c in candidates]
 
 
 def _print_report(report: Report, verbose: bool) -> None:
@@ -227,22 +536,25 @@ def _print_report(report: Report, verbose: bool) -> None:
     """
     print(f"sockets searched: {len(report.sockets)}")
     for socket in report.sockets:
-        print(f"  {socket}")
+        mark = "  [timed out, panes not listed]" if socket in report.timed_out else ""
+        print(f"  {socket}{mark}")
 
     print(f"\nreapable teammates: {len(report.candidates)}")
     for c in report.candidates:
         print(
             f"  {c.pane.pane_id:>5} {c.pane.target:<16} {c.teammate.agent_name:<24} "
-            f"idle {_duration(c.idle_s):>7}  {_mb(c.rss_kb):>8}"
+            f"idle {_duration(c.idle_s):>7}  {_memory(c)}"
         )
     if report.candidates:
-        print(f"  → {_mb(report.reclaimable_kb)} reclaimable")
+        private = report.private_kb
+        floor = "" if private is None else f" (at least {_mb(private)} private)"
+        print(f"  → {_mb(report.reclaimable_kb)} reclaimable{floor}")
 
     print(f"\nidle interactive sessions (report-only): {len(report.interactive)}")
     for i in report.interactive:
         print(
             f"  {i.pane.pane_id:>5} {i.pane.target:<16} {i.pane.path:<40} "
-            f"idle {_duration(i.idle_s):>7}  {_mb(i.rss_kb):>8}"
+            f"idle {_duration(i.idle_s):>7}  {_memory(i)}"
         )
 
     if verbose and report.skipped:
@@ -262,44 +574,139 @@ def _report_json(report: Report) -> dict[str, object]:
     """
     return {
         "sockets": list(report.sockets),
-        "candidates": [
-            {
-                "pane_id": c.pane.pane_id,
-                "socket": c.pane.socket,
-                "target": c.pane.target,
-                "pid": c.pane.pid,
-                "agent": c.teammate.agent_name,
-                "session": c.teammate.session_id,
-                "idle_s": int(c.idle_s),
-                "rss_kb": c.rss_kb,
-            }
-            for c in report.candidates
-        ],
-        "interactive": [
-            {
-                "pane_id": i.pane.pane_id,
-                "socket": i.pane.socket,
-                "target": i.pane.target,
-                "session": i.pane.session,
-                "pid": i.pane.pid,
-                "path": i.pane.path,
-                "idle_s": None if i.idle_s is None else int(i.idle_s),
-                "rss_kb": i.rss_kb,
-            }
-            for i in report.interactive
-        ],
-        "skipped": [
-            {
-                "pane_id": s.pane.pane_id,
-                "socket": s.pane.socket,
-                "target": s.pane.target,
-                "session": s.pane.session,
-                "reason": s.reason,
-            }
-            for s in report.skipped
-        ],
+        "timed_out_sockets": list(report.timed_out),
+        "candidates": [_candidate_json(c) for c in report.candidates],
+        "interactive": [_interactive_json(i) for i in report.interactive],
+        "skipped": [_skipped_json(s) for s in report.skipped],
+        "reclaimable_kb": report.reclaimable_kb,
+        "private_kb": report.private_kb,
+    }
+
+
+def _candidate_json(c: Candidate) -> dict[str, object]:
+    """Serialize one reapable teammate."""
+    return {
+        "pane_id": c.pane.pane_id,
+        "socket": c.pane.socket,
+        "target": c.pane.target,
+        "pid": c.pane.pid,
+        "agent": c.teammate.agent_name,
+        "session": c.teammate.session_id,
+        "idle_s": int(c.idle_s),
+        "rss_kb": c.rss_kb,
+        "memory": None if c.memory is None else asdict(c.memory),
+    }
+
+
+def _interactive_json(i: Interactive) -> dict[str, object]:
+    """Serialize one idle interactive session."""
+    return {
+        "pane_id": i.pane.pane_id,
+        "socket": i.pane.socket,
+        "target": i.pane.target,
+        "session": i.pane.session,
+        "pid": i.pane.pid,
+        "path": i.pane.path,
+        "idle_s": None if i.idle_s is None else int(i.idle_s),
+        "rss_kb": i.rss_kb,
+        "memory": None if i.memory is None else asdict(i.memory),
+    }
+
+
+def _skipped_json(s: Skipped) -> dict[str, object]:
+    """Serialize one excluded pane."""
+    return {
+        "pane_id": s.pane.pane_id,
+        "socket": s.pane.socket,
+        "target": s.pane.target,
+        "session": s.pane.session,
+        "reason": s.reason,
+    }
+
+
+def _decision_json(decision: Decision) -> dict[str, object]:
+    """Serialize one decision as a typed NDJSON record.
+
+    Args:
+        decision: A classified pane.
+
+    Returns:
+        The bucket's JSON shape with a leading ``type`` of ``candidate``,
+        ``interactive`` or ``skipped``.
+    """
+    if isinstance(decision, Candidate):
+        return {"type": "candidate", **_candidate_json(decision)}
+    if isinstance(decision, Interactive):
+        return {"type": "interactive", **_interactive_json(decision)}
+    return {"type": "skipped", **_skipped_json(decision)}
+
+
+def _outcomes_json(outcomes: list[Outcome]) -> list[dict[str, object]]:
+    """Serialize reap outcomes.
+
+    Args:
+        outcomes: Per-candidate results.
+
+    Returns:
+        One JSON-ready dictionary per outcome.
+    """
+    return [_outcome_json(o) for o in outcomes]
+
+
+def _outcome_json(o: Outcome) -> dict[str, object]:
+    """Serialize one reap outcome."""
+    return {
+        "pane_id": o.candidate.pane.pane_id,
+        "socket": o.candidate.pane.socket,
+        "target": o.candidate.pane.target,
+        "agent": o.candidate.teammate.agent_name,
+        "session": o.candidate.teammate.session_id,
+        "killed": o.killed,
+        "detail": o.detail,
+    }
+
+
+def _emit_ndjson(record: dict[str, object]) -> None:
+    """Write one NDJSON record and flush it, so a reader sees it now.
+
+    Args:
+        record: JSON-ready object.
+    """
+    import json
+
+    sys.stdout.write(json.dumps(record, separators=(",", ":")) + "\n")
+    sys.stdout.flush()
+
+
+def _summary_json(
+    command: str, report: Report, extra: dict[str, object]
+) -> dict[str, object]:
+    """Build the closing NDJSON record of a run.
+
+    Args:
+        command: ``report`` or ``reap``.
+        report: The run's report.
+        extra: Command-specific members.
+
+    Returns:
+        Bucket counts and memory totals, with timings when collected.
+    """
+    summary: dict[str, object] = {
+        "type": "summary",
+        "command": command,
+        "sockets": len(report.sockets),
+        "timed_out_sockets": len(report.timed_out),
+        "candidates": len(report.candidates),
+        "interactive": len(report.interactive),
+        "skipped": len(report.skipped),
         "reclaimable_kb": report.reclaimable_kb,
+        "private_kb": report.private_kb,
+        **extra,
     }
+    timings = current()
+    if timings is not None:
+        summary["timings"] = timings.as_json()
+    return summary
 
 
 def _print_outcomes(outcomes: list[Outcome]) -> int:
@@ -325,6 +732,58 @@ def _print_outcomes(outcomes: list[Outcome]) -> int:
     return _outcome_status(outcomes)
 
 
+def _achieved_kb(outcomes: list[Outcome]) -> int:
+    """Reclaimable memory of the panes actually killed.
+
+    Args:
+        outcomes: Per-candidate results.
+
+    Returns:
+        Summed kilobytes; panes refused at revalidation or failed count zero.
+    """
+    return sum(o.candidate.reclaim_kb for o in outcomes if o.killed)
+
+
+def _print_plan(plan: Plan) -> None:
+    """Render a reclaim plan ahead of its outcomes.
+
+    Args:
+        plan: The plan.
+    """
+    print(
+        f"plan: {len(plan.chosen)} of {plan.considered} candidates to free "
+        f"{_mb(plan.target_kb)} — projected {_mb(plan.projected_kb)}, "
+        f"idle risk {plan.cost:.2f}"
+    )
+    if plan.shortfall_kb:
+        print(
+            f"  every candidate together falls {_mb(plan.shortfall_kb)} short "
+            "of the target"
+        )
+    print()
+
+
+def _plan_json(plan: Plan, outcomes: list[Outcome]) -> dict[str, object]:
+    """Serialize a reclaim plan with what its kills achieved.
+
+    Args:
+        plan: The plan.
+        outcomes: Results of carrying it out, dry runs included.
+
+    Returns:
+        A JSON-ready dictionary.
+    """
+    return {
+        "target_kb": plan.target_kb,
+        "projected_kb": plan.projected_kb,
+        "achieved_kb": _achieved_kb(outcomes),
+        "shortfall_kb": plan.shortfall_kb,
+        "cost": round(plan.cost, 3),
+        "chosen": len(plan.chosen),
+        "considered": plan.considered,
+    }
+
+
 def _outcome_status(outcomes: list[Outcome]) -> int:
     """Return non-zero when any requested kill failed safety or execution.
 
@@ -337,15 +796,57 @@ def _outcome_status(outcomes: list[Outcome]) -> int:
     return 1 if any(not o.killed and o.detail != "dry-run" for o in outcomes) else 0
 
 
+def _origin(stray: Disowned) -> str:
+    """Describe where a disowned process came from, when the kernel says.
+
+    Args:
+        stray: Disowned process.
+
+    Returns:
+        The pane it escaped, the ended session it outlived, or nothing.
+    """
+    if stray.pane is not None:
+        return f"  [from pane {stray.pane.pane_id} {stray.pane.target}]"
+    if stray.session is not None:
+        return f"  [session {stray.session} ended]"
+    return ""
+
+
+def _is_claude(stray: Disowned) -> bool:
+    """Whether a disowned process is Claude, by argv or resolved executable."""
+    return (
+        "claude" in stray.process.command.lower()
+        or "claude" in (stray.exe or "").lower()
+    )
+
+
+def _disowned_json(stray: Disowned) -> dict[str, object]:
+    """Serialize a disowned process.
+
+    Args:
+        stray: Disowned process.
+
+    Returns:
+        The process row plus its kernel-derived origin, when known.
+    """
+    return {
+        **asdict(stray.process),
+        "exe": stray.exe,
+        "session": stray.session,
+        "pane_id": None if stray.pane is None else stray.pane.pane_id,
+        "pane_socket": None if stray.pane is None else stray.pane.socket,
+    }
+
+
 def _print_strays(
-    masters: list[ControlMaster], disowned: list[Process], verbose: bool
+    masters: list[ControlMaster], disowned: list[Disowned], verbose: bool
 ) -> None:
     """Render the stray inventory.
 
     Args:
         masters: Control-master entries.
         disowned: PPID-1 user processes with no pane.
-        verbose: Whether to print full command lines.
+        verbose: Whether to print full command lines and resolved executables.
     """
     print(f"ssh control masters: {len(masters)}")
     for m in masters:
@@ -354,20 +855,28 @@ def _print_strays(
             bits.append("no socket")
         if m.responding is not None:
             bits.append("responding" if m.responding else "not responding")
+        if m.timed_out:
+            bits.append("check timed out")
         if m.stale:
             bits.append("STALE")
         print(f"  {m.socket}  [{', '.join(bits)}]  age {_duration(m.elapsed_s)}")
 
     print(f"\nuser-owned PPID-1 processes with no pane: {len(disowned)}")
-    for p in disowned:
+    for stray in disowned:
+        p = stray.process
         command = p.command if verbose else p.command[:90]
-        print(f"  pid {p.pid:<8} age {_duration(p.elapsed_s):>7}  {command}")
+        print(
+            f"  pid {p.pid:<8} age {_duration(p.elapsed_s):>7}  {command}"
+            f"{_origin(stray)}"
+        )
+        if verbose and stray.exe is not None:
+            print(f"      exe {stray.exe}")
     if disowned:
         print("  (long-running user daemons legitimately appear here)")
 
     # The Ctrl+D question in one number. A disowned Claude process is the only
     # thing that would show ^D leaving work behind; daemons above are expected.
-    escaped = [p for p in disowned if "claude" in p.command.lower()]
+    escaped = [stray.process for stray in disowned if _is_claude(stray)]
     print(f"\nclaude processes among them: {len(escaped)}")
     if not escaped:
         print("  none — no evidence of Claude processes escaping pane teardown")
@@ -375,10 +884,481 @@ def _print_strays(
         print(f"  pid {p.pid:<8} age {_duration(p.elapsed_s):>7}  {p.command[:90]}")
 
 
+def _print_pressure(pressure: Pressure, config: Config, squeezed: bool) -> None:
+    """Print the memory-pressure reading a report was classified under.
+
+    Args:
+        pressure: The reading.
+        config: Effective settings, tightened when under pressure.
+        squeezed: Whether the policy changed the classification.
+    """
+    psi = (
+        "no PSI"
+        if pressure.psi_some_avg10 is None
+        else f"PSI some avg10 {pressure.psi_some_avg10:.1f}%"
+    )
+    reading = f"{pressure.available_percent:.0f}% available, {psi}"
+    if not squeezed:
+        print(f"memory pressure: none ({reading})\n")
+        return
+    print(
+        f"memory pressure: {reading} — teammates reapable after "
+        f"{config.teammate_idle_minutes}m idle, most memory per idle risk first\n"
+    )
+
+
+def _pressure_json(
+    pressure: Pressure | None, squeezed: bool
+) -> dict[str, object] | None:
+    """Serialize a pressure reading.
+
+    Args:
+        pressure: The reading, or None when unavailable.
+        squeezed: Whether the policy changed the classification.
+
+    Returns:
+        The reading and whether it was acted on, or None.
+    """
+    if pressure is None:
+        return None
+    return {**asdict(pressure), "under_pressure": squeezed}
+
+
+def _read_pressure() -> Pressure | None:
+    """Read the host's memory pressure from procfs.
+
+    Returns:
+        The reading, or None when procfs does not provide one.
+    """
+    from .pressure import read_pressure
+
+    return read_pressure()
+
+
+def _print_json(payload: dict[str, object] | Sequence[object], key: str) -> None:
+    """Print a command's JSON output, with timings attached when collected.
+
+    An object gains a ``timings`` member. A list is wrapped as ``{key: payload,
+    "timings": ...}`` — only under ``--timings``, so the default shape of every
+    command's output never changes.
+
+    Args:
+        payload: The command's JSON-ready output.
+        key: Member name for a list payload when it has to be wrapped.
+    """
+    import json
+
+    timings = current()
+    if timings is not None:
+        if isinstance(payload, dict):
+            payload = {**payload, "timings": timings.as_json()}
+        else:
+            payload = {key: payload, "timings": timings.as_json()}
+    print(json.dumps(payload, indent=2))
+
+
+def _print_timings(timings: Timings) -> None:
+    """Render collected phase timings as a table on stderr.
+
+    Nested phases are indented under their parent; a parent's wall time
+    includes theirs.
+
+    Args:
+        timings: The finished collection.
+    """
+    print(
+        f"\n{'phase':<28} {'wall':>10} {'calls':>6} {'spawns':>7} {'bytes':>10}",
+        file=sys.stderr,
+    )
+    for path, entry in timings.phases.items():
+        depth = path.count("/")
+        name = "  " * depth + path.rsplit("/", 1)[-1]
+        print(
+            f"{name:<28} {entry.wall_s * 1000:>8.1f}ms {entry.calls:>6} "
+            f"{entry.spawns:>7} {entry.bytes:>10}",
+            file=sys.stderr,
+        )
+    print(f"{'total':<28} {timings.total_s * 1000:>8.1f}ms", file=sys.stderr)
+
+
+def _change_json(change: Change) -> dict[str, object]:
+    """Serialize one watch event.
+
+    Args:
+        change: Pane that moved between report buckets.
+
+    Returns:
+        A JSON-ready dictionary.
+    """
+    from .watch import decision_kind
+
+    socket, pane_id = change.key
+    current = change.after or change.before
+    payload: dict[str, object] = {
+        "time": int(time.time()),
+        "socket": socket,
+        "pane_id": pane_id,
+        "target": current.pane.target if current else None,
+        "before": decision_kind(change.before),
+        "after": decision_kind(change.after),
+    }
+    if isinstance(change.after, Candidate):
+        payload["agent"] = change.after.teammate.agent_name
+        payload["rss_kb"] = change.after.rss_kb
+    elif isinstance(change.after, Skipped):
+        payload["reason"] = change.after.reason
+    return payload
+
+
+def _print_change(change: Change) -> None:
+    """Render one watch event as a line of text.
+
+    Args:
+        change: Pane that moved between report buckets.
+    """
+    stamp = time.strftime("%H:%M:%S")
+    _, pane_id = change.key
+    after = change.after
+    if isinstance(after, Candidate):
+        detail = f"reapable  {after.teammate.agent_name}  {_mb(after.rss_kb)}"
+    elif isinstance(after, Interactive):
+        detail = f"idle interactive  {after.pane.path}  {_mb(after.rss_kb)}"
+    elif isinstance(after, Skipped):
+        detail = f"skipped  {after.reason}"
+    else:
+        detail = "gone"
+    current = after or change.before
+    target = current.pane.target if current else ""
+    print(f"{stamp} {pane_id:>5} {target:<16} {detail}")
+
+
+def _watch(args: argparse.Namespace, config: Config, runner: Runner) -> int:
+    """Run the control-mode watch loop until interrupted.
+
+    Args:
+        args: Parsed command line.
+        config: Effective settings.
+        runner: Command executor.
+
+    Returns:
+        Process exit status.
+    """
+    import json
+
+    from .registry import SocketRegistry
+    from .watch import Watcher
+
+    # Inbox listings live one resync period, so an inbox rewritten in place is
+    # noticed within two; kills are revalidated without the cache regardless.
+    teams_cache = TeamsCache(max_age_s=args.resync)
+    watcher = Watcher(
+        config,
+        runner,
+        evaluate=lambda panes: _classify_panes(
+            config, runner, panes, teams_cache=teams_cache
+        ),
+        resync_s=args.resync,
+        registry=SocketRegistry(config.resolved_globs()),
+    )
+    try:
+        while True:
+            changes = watcher.step()
+            for change in changes:
+                # Skips are noise unless they demote a pane that was reported.
+                if (
+                    isinstance(change.after, Skipped)
+                    and not args.verbose
+                    and not isinstance(change.before, (Candidate, Interactive))
+                ):
+                    continue
+                if args.json:
+                    print(json.dumps(_change_json(change)), flush=True)
+                else:
+                    _print_change(change)
+                    sys.stdout.flush()
+            ready = tuple(c.after for c in changes if isinstance(c.after, Candidate))
+            if args.kill and ready:
+                outcomes = reap(
+                    ready,
+                    runner,
+                    dry_run=False,
+                    batch_revalidator=lambda candidates: _revalidate_batch(
+                        candidates, config=config, runner=runner, team_scope=None
+                    ),
+                )
+                _record_kills(config, outcomes)
+                if args.json:
+                    for entry in _outcomes_json(outcomes):
+                        print(json.dumps(entry), flush=True)
+                else:
+                    _print_outcomes(outcomes)
+                    sys.stdout.flush()
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        watcher.close()
+
+
+def _record_kills(config: Config, outcomes: list[Outcome]) -> None:
+    """Add a kill round to the exporter's counters, never failing the reap.
+
+    Args:
+        config: Effective settings.
+        outcomes: Results of the round.
+    """
+    if not outcomes:
+        return
+    from .metrics import COUNTERS_FILE, record_outcomes
+
+    try:
+        record_outcomes(config.state_dir.expanduser() / COUNTERS_FILE, outcomes)
+    except OSError as exc:
+        print(f"metrics: could not record kills: {exc}", file=sys.stderr)
+
+
+def _record_history(
+    config: Config,
+    report: Report,
+    command: str,
+    outcomes: list[Outcome] | None = None,
+) -> None:
+    """Append a run to the history store when enabled, never failing the run.
+
+    Args:
+        config: Effective settings.
+        report: Classification the run acted on.
+        command: Command that produced it.
+        outcomes: Reap results, if the run reaped.
+    """
+    if not config.history_enabled:
+        return
+    import sqlite3
+
+    from .history import HISTORY_FILE, History
+
+    try:
+        with (
+            phase("history"),
+            History(
+                config.state_dir.expanduser() / HISTORY_FILE,
+                config.history_retention_days,
+            ) as store,
+        ):
+            store.record_report(report, command)
+            if outcomes:
+                store.record_outcomes(outcomes)
+    except (sqlite3.Error, OSError) as exc:
+        print(f"history: could not record: {exc}", file=sys.stderr)
+
+
+def _history(args: argparse.Namespace, config: Config) -> int:
+    """Summarize the history store per day, or compact it.
+
+    Args:
+        args: Parsed command line.
+        config: Effective settings.
+
+    Returns:
+        Process exit status.
+    """
+    from .history import HISTORY_FILE, History
+
+    path = config.state_dir.expanduser() / HISTORY_FILE
+    if not path.is_file():
+        print(
+            f"no history at {path}; set history_enabled = true to record it",
+            file=sys.stderr,
+        )
+        return 1
+    with History(path, config.history_retention_days) as store:
+        if args.compact:
+            deleted = store.compact(vacuum=True)
+            print(f"compacted {path}: {deleted} snapshots deleted")
+            return 0
+        days = store.daily(args.days)
+    if args.json:
+        _print_json([asdict(day) for day in days], "days")
+    else:
+        _print_days(days)
+    return 0
+
+
+def _print_days(days: list[Day]) -> None:
+    """Print the per-day history table.
+
+    Args:
+        days: Summaries, oldest first.
+    """
+    if not days:
+        print("no history in range")
+        return
+    print(
+        f"{'day':<10}  {'reports':>7}  {'leaked':>6}  {'reaped':>6}  "
+        f"{'reap p50':>8}  {'reap p90':>8}  {'peak reclaimable':>16}"
+    )
+    for day in days:
+        p50 = "-" if day.reap_p50_s is None else _duration(day.reap_p50_s)
+        p90 = "-" if day.reap_p90_s is None else _duration(day.reap_p90_s)
+        print(
+            f"{day.day:<10}  {day.snapshots:>7}  {day.leaked:>6}  {day.reaped:>6}  "
+            f"{p50:>8}  {p90:>8}  {_mb(day.peak_reclaimable_kb):>16}"
+        )
+
+
+def _scrape(
+    config: Config,
+    runner: Runner,
+    registry: SocketRegistry | None = None,
+    async_runner: AsyncRunner | None = None,
+) -> str:
+    """Gather one snapshot and render it as OpenMetrics text.
+
+    Every server is probed once and the process table is read once; the report
+    and the stray inventory are both computed from that single snapshot.
+
+    Args:
+        config: Effective settings.
+        runner: Command executor.
+        registry: Live socket set kept by a listener between scrapes; a
+            one-shot scrape globs instead.
+        async_runner: Executor for the pipeline's tmux and ``ps`` calls;
+            defaults to ``runner`` on worker threads.
+
+    Returns:
+        The exposition.
+    """
+    from .metrics import COUNTERS_FILE, load_counters, render
+    from .pipeline import snapshot
+    from .strays import find_disowned
+
+    started = time.perf_counter()
+    taken = snapshot(
+        config,
+        async_runner or threaded(runner),
+        sockets=None if registry is None else registry.sockets(),
+        masters=partial(_inventory_masters, config, runner=runner),
+    )
+    report = _classify_panes(
+        config,
+        runner,
+        taken.panes,
+        sockets=taken.sockets,
+        timed_out=taken.timed_out,
+        processes=taken.processes,
+        teams=taken.teams,
+    )
+    with phase("disowned"):
+        disowned = find_disowned(
+            taken.processes,
+            taken.panes,
+            config.stray_backend,
+            config.resolved_stray_prefixes(),
+        )
+    counters = load_counters(config.state_dir.expanduser() / COUNTERS_FILE)
+    return render(
+        list(taken.servers),
+        report,
+        list(taken.masters),
+        disowned,
+        counters,
+        time.perf_counter() - started,
+    )
+
+
+def _metrics(
+    args: argparse.Namespace,
+    config: Config,
+    runner: Runner,
+    async_runner: AsyncRunner,
+) -> int:
+    """Print, write, or serve the OpenMetrics exposition.
+
+    Args:
+        args: Parsed command line.
+        config: Effective settings.
+        runner: Command executor.
+        async_runner: Executor for the discovery pipeline.
+
+    Returns:
+        Process exit status.
+    """
+    from .metrics import Exposition, serve, write_atomic
+    from .registry import SocketRegistry
+
+    if args.listen is None:
+        text = _scrape(config, runner, async_runner=async_runner)
+        if args.textfile is None:
+            sys.stdout.write(text)
+        else:
+            write_atomic(Path(args.textfile).expanduser(), text)
+        return 0
+    host, _, port = args.listen.rpartition(":")
+    # Scrapes are serialized by the exposition, so one registry can serve them.
+    registry = SocketRegistry(config.resolved_globs())
+    exposition = Exposition(
+        partial(_scrape, config, runner, registry, async_runner), args.min_interval
+    )
+    server = serve(host or "127.0.0.1", int(port), exposition)
+    bound_host, bound_port = server.server_address[:2]
+    print(f"serving http://{bound_host!s}:{bound_port}/metrics", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        server.server_close()
+        registry.close()
+    return 0
+
+
+def _listen_address(value: str) -> str:
+    """Validate a ``[HOST:]PORT`` listen address."""
+    _, _, port = value.rpartition(":")
+    if not port.isdigit() or int(port) > 65535:
+        import argparse
+
+        raise argparse.ArgumentTypeError("expected [HOST:]PORT")
+    return value
+
+
+def _positive_float(value: str) -> float:
+    """Parse a CLI duration that must be greater than zero."""
+    parsed = float(value)
+    if parsed <= 0:
+        import argparse
+
+        raise argparse.ArgumentTypeError("must be a positive number")
+    return parsed
+
+
+def _size(value: str) -> int:
+    """Parse a CLI memory size into kilobytes."""
+    import argparse
+
+    from .budget import parse_size
+
+    try:
+        return parse_size(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError("expected a size such as 4G or 512M") from None
+
+
+def _positive_int(value: str) -> int:
+    """Parse a CLI count that must be at least one."""
+    parsed = int(value)
+    if parsed < 1:
+        import argparse
+
+        raise argparse.ArgumentTypeError("must be a positive integer")
+    return parsed
+
+
 def _nonnegative_int(value: str) -> int:
     """Parse a CLI integer that cannot weaken an idle threshold below zero."""
     parsed = int(value)
     if parsed < 0:
+        import argparse
+
         raise argparse.ArgumentTypeError("must be a non-negative integer")
     return parsed
 
@@ -389,12 +1369,25 @@ def build_parser() -> argparse.ArgumentParser:
     Returns:
         The configured parser.
     """
+    import argparse
+
     parser = argparse.ArgumentParser(
         prog="agent-reap",
         description="Find and reap idle Claude teammate panes across every tmux socket.",
     )
     parser.add_argument("--config", help="path to config.toml")
-    parser.add_argument("--json", action="store_true", help="machine-readable output")
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument("--json", action="store_true", help="machine-readable output")
+    output.add_argument(
+        "--ndjson",
+        action="store_true",
+        help="stream one JSON object per line as results arrive (report and reap)",
+    )
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="time each phase (table on stderr, or a timings object with --json)",
+    )
     parser.add_argument(
         "-v", "--verbose", action="store_true", help="include exclusion reasons"
     )
@@ -403,12 +1396,75 @@ def build_parser() -> argparse.ArgumentParser:
         type=_nonnegative_int,
         help="override how long a teammate inbox must be quiet before reaping",
     )
+    parser.add_argument(
+        "--memory",
+        choices=MEMORY_ACCOUNTING,
+        help="override memory_accounting: leader RSS, or subtree PSS/USS",
+    )
     sub = parser.add_subparsers(dest="command")
 
     sub.add_parser("report", help="show reapable teammates and idle sessions (default)")
     sub.add_parser("sockets", help="list every tmux server and its sessions")
     sub.add_parser("strays", help="ssh control masters and disowned descendants")
 
+    watch_cmd = sub.add_parser(
+        "watch",
+        help="follow every tmux server in control mode and print changes",
+    )
+    watch_cmd.add_argument(
+        "--kill",
+        action="store_true",
+        help="reap teammates as they become reapable (requires kill_enabled)",
+    )
+    watch_cmd.add_argument(
+        "--resync",
+        type=_positive_float,
+        default=DEFAULT_RESYNC_SECONDS,
+        metavar="SECONDS",
+        help=(
+            "full re-list and reclassification period; idle thresholds are "
+            "crossed by the clock, not by any tmux event (default: %(default)s)"
+        ),
+    )
+
+    metrics_cmd = sub.add_parser(
+        "metrics", help="OpenMetrics exposition of the pane and stray inventory"
+    )
+    target = metrics_cmd.add_mutually_exclusive_group()
+    target.add_argument(
+        "--textfile",
+        metavar="PATH",
+        help="write atomically to PATH, e.g. for node_exporter's textfile collector",
+    )
+    target.add_argument(
+        "--listen",
+        type=_listen_address,
+        metavar="[HOST:]PORT",
+        help="serve GET /metrics; HOST defaults to 127.0.0.1",
+    )
+    metrics_cmd.add_argument(
+        "--min-interval",
+        type=_positive_float,
+        default=DEFAULT_SCRAPE_INTERVAL_SECONDS,
+        metavar="SECONDS",
+        help="serve the last scrape to requests within this window (default: %(default)s)",
+    )
+
+    history_cmd = sub.add_parser(
+        "history", help="per-day leak rate, time to reap, and peak reclaimable memory"
+    )
+    history_cmd.add_argument(
+        "--days",
+        type=_positive_int,
+        default=14,
+        help="days to summarize, today included (default: %(default)s)",
+    )
+    history_cmd.add_argument(
+        "--compact",
+        action="store_true",
+        help="apply retention now and reclaim the freed disk space",
+    )
+
     reap_cmd = sub.add_parser("reap", help="reap idle teammate panes")
     reap_cmd.add_argument(
         "--kill", action="store_true", help="actually kill (default: dry run)"
@@ -424,15 +1480,30 @@ def build_parser() -> argparse.ArgumentParser:
             "liveness checks, since the team is already over"
         ),
     )
+    reap_cmd.add_argument(
+        "--reclaim",
+        type=_size,
+        metavar="SIZE",
+        help=(
+            "reap only the fewest, longest-idle candidates that free SIZE "
+            "(e.g. 4G, 512M; a bare number is MB)"
+        ),
+    )
     return parser
 
 
-def cli(argv: Sequence[str] | None = None, runner: Runner | None = None) -> int:
+def cli(
+    argv: Sequence[str] | None = None,
+    runner: Runner | None = None,
+    pressure: Callable[[], Pressure | None] | None = None,
+) -> int:
     """Entry point.
 
     Args:
         argv: Argument vector, defaulting to ``sys.argv[1:]``.
         runner: Command executor, defaulting to real subprocesses.
+        pressure: Memory-pressure reader for ``pressure_policy``, defaulting to
+            procfs.
 
     Returns:
         Process exit status.
@@ -447,12 +1518,17 @@ def cli(argv: Sequence[str] | None = None, runner: Runner | None = None) -> int:
     config = loaded.config
     if args.idle_minutes is not None:
         config = replace(config, teammate_idle_minutes=args.idle_minutes)
+    if args.memory is not None:
+        config = replace(config, memory_accounting=args.memory)
     if getattr(args, "include_lead", False):
         config = replace(config, include_lead=True)
 
     command = args.command or "report"
     team_scope: str | None = getattr(args, "team", None)
-    destructive = command == "reap" and bool(getattr(args, "kill", False))
+    if team_scope is not None and getattr(args, "reclaim", None) is not None:
+        print("--reclaim does not apply to a --team teardown", file=sys.stderr)
+        return 2
+    destructive = command in {"reap", "watch"} and bool(getattr(args, "kill", False))
     if destructive and loaded.errors:
         print(
             "config: refusing destructive operation with invalid config",
@@ -465,115 +1541,424 @@ def cli(argv: Sequence[str] | None = None, runner: Runner | None = None) -> int:
             file=sys.stderr,
         )
         return 2
+    if destructive and command == "watch" and not config.kill_enabled:
+        print(
+            "config: unattended watch --kill requires kill_enabled = true",
+            file=sys.stderr,
+        )
+        return 2
+
+    if args.ndjson and command not in {"report", "reap"}:
+        print(f"--ndjson does not apply to {command}", file=sys.stderr)
+        return 2
+
+    if (
+        command == "reap"
+        and team_scope is not None
+        and config.coordinate_teardowns
+        and not (args.ndjson or args.timings)
+    ):
+        return _coordinated_teardown(args, config, run, team_scope)
+
+    if command == "watch":
+        if args.timings:
+            print("--timings does not apply to watch", file=sys.stderr)
+            return 2
+        return _watch(args, config, run)
+
+    # The discovery pipeline spawns asyncio subprocesses in production; an
+    # injected runner is lifted onto worker threads so tests stay hermetic.
+    arun: AsyncRunner = async_subprocess_runner if runner is None else threaded(run)
+    read = pressure or _read_pressure
+    if not args.timings:
+        return _run_command(args, config, run, arun, team_scope, read)
+    with collect() as timings:
+        status = _run_command(
+            args, config, instrument(run), instrument_async(arun), team_scope, read
+        )
+    if not (args.json or args.ndjson):
+        _print_timings(timings)
+    return status
+
 
+def _run_command(
+    args: argparse.Namespace,
+    config: Config,
+    run: Runner,
+    arun: AsyncRunner,
+    team_scope: str | None,
+    read_pressure: Callable[[], Pressure | None],
+) -> int:
+    """Run one of the one-shot commands.
+
+    Args:
+        args: Parsed command line.
+        config: Effective settings.
+        run: Command executor.
+        arun: Executor for the discovery pipeline.
+        team_scope: Restrict to one team session id for targeted teardown.
+        read_pressure: Memory-pressure reader for ``pressure_policy``.
+
+    Returns:
+        Process exit status.
+    """
+    command = args.command or "report"
+    if command == "metrics":
+        return _metrics(args, config, run, arun)
+    if command == "history":
+        return _history(args, config)
     if command == "sockets":
         sockets = find_sockets(config.resolved_globs())
         current_raw = (os.environ.get("TMUX") or "").split(",")[0]
         current = resolve_socket_path(current_raw) if current_raw else ""
         payload: list[SocketEntry] = []
-        for socket in sockets:
-            listing = run(["tmux", "-S", socket, "list-sessions"])
+        for server in discover_servers(
+            sockets,
+            run,
+            workers=config.discovery_workers,
+            deadline_s=config.discovery_deadline_seconds,
+        ):
             payload.append(
                 {
-                    "socket": socket,
-                    "live": listing.ok,
-                    "current": socket == current,
-                    "sessions": listing.stdout.splitlines() if listing.ok else [],
+                    "socket": server.socket,
+                    "live": server.live,
+                    "timed_out": server.timed_out,
+                    "current": server.socket == current,
+                    "sessions": server.sessions,
                 }
             )
         if args.json:
-            print(json.dumps(payload, indent=2))
+            _print_json(payload, "sockets")
         else:
             for entry in payload:
                 mark = " <- $TMUX" if entry["current"] else ""
-                state = "live" if entry["live"] else "stale socket, no server"
+                if entry["timed_out"]:
+                    state = "timed out, server not answering"
+                else:
+                    state = "live" if entry["live"] else "stale socket, no server"
                 print(f"{entry['socket']}  [{state}]{mark}")
                 for line in entry["sessions"]:
                     print(f"    {line}")
         return 0
 
     if command == "strays":
-        processes = process_table(run)
-        pane_pids = {p.pid for p in _all_panes(config, run)}
-        masters = control_masters(config.ssh_dir, processes, run)
-        disowned = disowned_descendants(
-            processes, pane_pids, config.resolved_stray_prefixes()
+        from .pipeline import snapshot
+        from .strays import find_disowned
+
+        taken = snapshot(
+            config,
+            arun,
+            masters=partial(_inventory_masters, config, runner=run),
+            inboxes=False,
         )
+        masters = list(taken.masters)
+        with phase("disowned"):
+            disowned = find_disowned(
+                taken.processes,
+                taken.panes,
+                config.stray_backend,
+                config.resolved_stray_prefixes(),
+            )
         if args.json:
-            print(
-                json.dumps(
-                    {
-                        "control_masters": [m.__dict__ for m in masters],
-                        "disowned": [p.__dict__ for p in disowned],
-                    },
-                    indent=2,
-                )
+            _print_json(
+                {
+                    "control_masters": [asdict(m) for m in masters],
+                    "disowned": [_disowned_json(d) for d in disowned],
+                },
+                "strays",
             )
         else:
             _print_strays(masters, disowned, args.verbose)
         return 0
 
-    report = build_report(config, run, team_scope=team_scope)
+    # A targeted teardown ignores idle thresholds already, so pressure cannot
+    # change it and the hook's path skips the reads.
+    pressure: Pressure | None = None
+    normal_idle_s = config.teammate_idle_minutes * 60
+    if config.pressure_policy and team_scope is None:
+        with phase("pressure"):
+            pressure = read_pressure()
+    squeezed = pressure is not None and pressure.under_pressure(config)
+    if squeezed:
+        from .pressure import rank, tighten
+
+        # Revalidation reclassifies with this config too, so a teammate made
+        # reapable by the tighter threshold is not refused at kill time.
+        config = tighten(config)
+
+    # NDJSON records go out while discovery and classification run; the
+    # collected report still drives ranking, reaping, history and the summary.
+    emit = _emit_ndjson if args.ndjson else None
+    report = build_report(
+        config, run, team_scope=team_scope, async_runner=arun, emit=emit
+    )
+    if squeezed:
+        report = replace(report, candidates=rank(report.candidates, normal_idle_s))
+    if pressure is not None and not (args.json or args.ndjson):
+        _print_pressure(pressure, config, squeezed)
+    summary: dict[str, object] = {}
+    if config.pressure_policy:
+        summary["pressure"] = _pressure_json(pressure, squeezed)
 
     if command == "reap":
+        plan: Plan | None = None
+        doomed = report.candidates
+        if args.reclaim is not None:
+            from .budget import plan_reclaim
+
+            plan = plan_reclaim(report.candidates, args.reclaim, normal_idle_s)
+            doomed = plan.chosen
         outcomes = reap(
-            report.candidates,
+            doomed,
             run,
             dry_run=not args.kill,
-            revalidator=lambda candidate: _revalidate_candidate(
-                candidate,
+            batch_revalidator=lambda candidates: _revalidate_batch(
+                candidates,
                 config=config,
                 runner=run,
                 team_scope=team_scope,
             ),
         )
+        if args.kill:
+            _record_kills(config, outcomes)
+        _record_history(config, report, "reap", outcomes)
+        if emit is not None:
+            # Kills are batched per server, so outcomes are known together.
+            if plan is not None:
+                emit({"type": "plan", **_plan_json(plan, outcomes)})
+            for outcome in outcomes:
+                emit({"type": "outcome", **_outcome_json(outcome)})
+            summary["killed"] = sum(o.killed for o in outcomes)
+            summary["failed"] = sum(
+                not o.killed and o.detail != "dry-run" for o in outcomes
+            )
+            summary["dry_run"] = not args.kill
+            emit(_summary_json("reap", report, summary))
+            return _outcome_status(outcomes)
+        if plan is None:
+            return _print_reap(report, outcomes, args)
         if args.json:
-            print(
-                json.dumps(
-                    [
-                        {
-                            "pane_id": o.candidate.pane.pane_id,
-                            "socket": o.candidate.pane.socket,
-                            "target": o.candidate.pane.target,
-                            "agent": o.candidate.teammate.agent_name,
-                            "session": o.candidate.teammate.session_id,
-                            "killed": o.killed,
-                            "detail": o.detail,
-                        }
-                        for o in outcomes
-                    ],
-                    indent=2,
-                )
+            _print_json(
+                {
+                    "plan": _plan_json(plan, outcomes),
+                    "outcomes": _outcomes_json(outcomes),
+                },
+                "outcomes",
             )
             return _outcome_status(outcomes)
+        _print_plan(plan)
         if not outcomes:
             print("nothing to reap")
             return 0
         status = _print_outcomes(outcomes)
+        projected = plan.projected_kb
         if not args.kill:
+            print(f"\ndry run — {_mb(projected)} would be reclaimed. Pass --kill.")
+        else:
             print(
-                f"\ndry run — {_mb(report.reclaimable_kb)} would be reclaimed. Pass --kill."
+                f"\nreclaimed {_mb(_achieved_kb(outcomes))} of {_mb(projected)} "
+                f"projected (target {_mb(plan.target_kb)})"
             )
         return status
 
-    if args.json:
-        print(json.dumps(_report_json(report), indent=2))
+    _record_history(config, report, "report")
+    if emit is not None:
+        emit(_summary_json("report", report, summary))
+    elif args.json:
+        _print_json({**_report_json(report), **summary}, "report")
     else:
         _print_report(report, args.verbose)
     return 0
 
 
-def _all_panes(config: Config, runner: Runner) -> list[Pane]:
-    """List panes across every live server.
+def _print_reap(
+    report: Report, outcomes: list[Outcome], args: argparse.Namespace
+) -> int:
+    """Render a reap without a reclaim plan, as JSON or text.
+
+    Args:
+        report: The report the candidates came from.
+        outcomes: Results of the reap, dry runs included.
+        args: Parsed command line.
+
+    Returns:
+        Process exit status.
+    """
+    if args.json:
+        _print_json(_outcomes_json(outcomes), "outcomes")
+        return _outcome_status(outcomes)
+    if not outcomes:
+        print("nothing to reap")
+        return 0
+    status = _print_outcomes(outcomes)
+    if not args.kill:
+        print(
+            f"\ndry run — {_mb(report.reclaimable_kb)} would be reclaimed. Pass --kill."
+        )
+    return status
+
+
+def _coordinated_teardown(
+    args: argparse.Namespace, config: Config, runner: Runner, team: str
+) -> int:
+    """Run a ``--team`` teardown through the coalescing coordinator.
 
     Args:
+        args: Parsed command line.
         config: Effective settings.
         runner: Command executor.
+        team: Team session id.
 
     Returns:
-        Every pane found.
+        Process exit status.
     """
-    return discover_panes(config.resolved_globs(), runner)
+    from .coordinator import Request, coordinate
+
+    # The effective config and the output mode decide what a teardown does and
+    # prints; a coordinator serves only runs that agree with it on both.
+    request = Request(
+        team=team,
+        terms=(
+            repr(config),
+            "kill" if args.kill else "dry-run",
+            "json" if args.json else "text",
+        ),
+        pid=os.getpid(),
+        pane=_own_pane(),
+    )
+    reply = coordinate(
+        request,
+        lambda batch: _teardown_batch(args, config, runner, batch),
+        state_dir=config.state_dir.expanduser(),
+        window_s=config.coordinator_window_seconds,
+    )
+    if reply is None:
+        print(
+            f"coordinator: another teardown is still running; {team} left as is",
+            file=sys.stderr,
+        )
+        return 1
+    sys.stdout.write(reply.output)
+    return reply.status
+
+
+def _teardown_batch(
+    args: argparse.Namespace,
+    config: Config,
+    runner: Runner,
+    batch: Sequence[Request],
+) -> list[Reply]:
+    """Serve coordinated teardowns with one snapshot and one kill round.
+
+    Args:
+        args: The coordinating run's command line; every request in the batch
+            agreed with it.
+        config: Effective settings.
+        runner: Command executor.
+        batch: Requests collected in one window, the coordinator's own included.
+
+    Returns:
+        One reply per request, each rendered with only its own team's outcomes.
+    """
+    from .coordinator import Reply
+
+    teams = tuple(dict.fromkeys(request.team for request in batch))
+    guests = [request for request in batch if request.pid != os.getpid()]
+    taken = _team_snapshot(
+        config, runner, teams, anchors=[guest.pid for guest in guests]
+    )
+    reports = {
+        team: _classify_panes(
+            config,
+            runner,
+            taken.panes,
+            sockets=taken.sockets,
+            timed_out=taken.timed_out,
+            team_scope=team,
+            processes=taken.processes,
+            teams=taken.teams,
+            guests=guests,
+        )
+        for team in teams
+    }
+    outcomes = reap(
+        tuple(c for report in reports.values() for c in report.candidates),
+        runner,
+        dry_run=not args.kill,
+        batch_revalidator=lambda candidates: _revalidate_batch(
+            candidates,
+            config=config,
+            runner=runner,
+            team_scope=teams,
+            guests=guests,
+        ),
+    )
+    if args.kill:
+        _record_kills(config, outcomes)
+    replies: dict[str, Reply] = {}
+    for team, report in reports.items():
+        mine = [o for o in outcomes if o.candidate.teammate.session_id == team]
+        _record_history(config, report, "reap", mine)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            status = _print_reap(report, mine, args)
+        replies[team] = Reply(status=status, output=output.getvalue())
+    return [replies[request.team] for request in batch]
+
+
+def _inventory_masters(
+    config: Config, processes: Mapping[int, Process], runner: Runner
+) -> list[ControlMaster]:
+    """Take the control-master inventory as its own timed phase.
+
+    Args:
+        config: Effective settings.
+        processes: Process table keyed by pid.
+        runner: Command executor.
+
+    Returns:
+        The inventory.
+    """
+    with phase("control-masters"):
+        return _control_masters(config, processes, runner)
+
+
+def _control_masters(
+    config: Config, processes: Mapping[int, Process], runner: Runner
+) -> list[ControlMaster]:
+    """Inventory control masters, probing through the shared verdict cache.
+
+    Args:
+        config: Effective settings.
+        processes: Process table keyed by pid.
+        runner: Command executor.
+
+    Returns:
+        The inventory.
+    """
+    from .metrics import write_atomic
+    from .strays import PROBE_CACHE_FILE, ProbeCache, control_masters
+
+    path = config.state_dir.expanduser() / PROBE_CACHE_FILE
+    cache = (
+        ProbeCache.load(path, config.ssh_check_cache_seconds)
+        if config.ssh_check_cache_seconds
+        else None
+    )
+    masters = control_masters(
+        config.ssh_dir,
+        processes,
+        runner,
+        workers=config.ssh_check_workers,
+        deadline_s=config.ssh_check_deadline_seconds,
+        cache=cache,
+    )
+    if cache is not None and cache.dirty:
+        try:
+            write_atomic(path, cache.dumps())
+        except OSError as exc:
+            print(f"strays: could not cache ssh checks: {exc}", file=sys.stderr)
+    return masters
 
 
 def main() -> None:
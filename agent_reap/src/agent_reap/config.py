@@ -3,17 +3,40 @@
 The config is a plain TOML file symlinked out of the dotfiles repo, so edits are
 live with no rebuild. Every field has a working default; a missing file is normal,
 not an error.
+
+The parsed TOML is cached in ``marshal`` form under ``$XDG_CACHE_HOME``, keyed
+by the file's path, inode, mtime and size, so a hook's cold start usually skips
+importing ``tomllib`` and parsing text. The cached table is validated like a
+freshly parsed one, so errors are reported the same either way.
 """
 
 from __future__ import annotations
 
+import marshal
 import os
-import tomllib
 from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Any
 
 DEFAULT_CONFIG_PATH = Path("~/.config/agent-reap/config.toml")
 
+# Bumped whenever the cache entry's shape changes.
+_CACHE_VERSION = 1
+
+# Process-table sources. "auto" prefers Linux procfs and falls back to ps.
+PROCESS_BACKENDS: tuple[str, ...] = ("auto", "proc", "ps")
+
+# Memory figures. "pss" reads smaps_rollup for every pane's whole subtree.
+MEMORY_ACCOUNTING: tuple[str, ...] = ("rss", "pss")
+
+STRAY_BACKENDS: tuple[str, ...] = ("auto", "proc", "command")
+
+# Command-line defaults of the long-running modes, kept here so building the
+# parser does not import the watch loop or the metrics server.
+DEFAULT_RESYNC_SECONDS = 60.0
+# Prometheus' default scrape interval; requests inside it share one scrape.
+DEFAULT_SCRAPE_INTERVAL_SECONDS = 15.0
+
 # Socket locations, in the shapes actually seen on these machines: the stock
 # per-uid directory, the /tmp variant, and z4h's private per-server sockets.
 # "{uid}" is substituted at load time.
@@ -34,7 +57,25 @@ _CONFIG_KEYS = frozenset(
         "allow_agent_names",
         "teams_dir",
         "ssh_dir",
+        "state_dir",
+        "history_enabled",
+        "history_retention_days",
         "stray_command_prefixes",
+        "stray_backend",
+        "process_backend",
+        "memory_accounting",
+        "pressure_policy",
+        "pressure_available_percent",
+        "pressure_psi_percent",
+        "pressure_idle_minutes",
+        "ssh_check_workers",
+        "ssh_check_deadline_seconds",
+        "ssh_check_cache_seconds",
+        "discovery_workers",
+        "discovery_deadline_seconds",
+        "scoped_team_discovery",
+        "coordinate_teardowns",
+        "coordinator_window_seconds",
     }
 )
 
@@ -58,8 +99,51 @@ class Config:
         allow_agent_names: If non-empty, only these agent names are reapable.
         teams_dir: Root holding ``session-<id>/inboxes/<agent>.json``.
         ssh_dir: Directory scanned for ``cm-*`` control-master sockets.
+        state_dir: Where kill counters are kept for the metrics exporter, and
+            the history store when it is enabled.
+        history_enabled: Whether ``report`` and ``reap`` append to the SQLite
+            history store under ``state_dir``.
+        history_retention_days: Days of history kept before old snapshots are
+            deleted.
         stray_command_prefixes: Executable path prefixes treated as user-owned
             when hunting disowned descendants. ``~`` is expanded at use.
+        stray_backend: How disowned descendants are found: ``"proc"`` from
+            kernel data (real uid, session, ``exe``), ``"command"`` from the
+            ``stray_command_prefixes`` allowlist, and ``"auto"`` prefers procfs
+            when it is mounted.
+        process_backend: Where the process table comes from: ``"proc"`` reads
+            Linux procfs directly, ``"ps"`` forks ``ps -eo``, and ``"auto"``
+            prefers procfs when it is mounted.
+        memory_accounting: ``"rss"`` reports each pane leader's resident size;
+            ``"pss"`` sums PSS and USS over the pane's whole subtree from
+            ``/proc/<pid>/smaps_rollup``, falling back to RSS per process where
+            that file is unreadable.
+        pressure_policy: Whether reports read memory pressure and, under it,
+            tighten the teammate idle threshold and rank candidates by memory
+            reclaimed per unit of idle risk.
+        pressure_available_percent: Under pressure when ``MemAvailable`` falls
+            below this share of ``MemTotal``.
+        pressure_psi_percent: Under pressure when PSI ``some avg10`` for memory
+            reaches this percentage.
+        pressure_idle_minutes: Teammate idle threshold while under pressure.
+        ssh_check_workers: Upper bound on ``ssh -O check`` probes run
+            concurrently.
+        ssh_check_deadline_seconds: Budget for probing every control master in
+            one run; a master still silent is reported as timed out.
+        ssh_check_cache_seconds: How long a probe verdict is reused while the
+            socket keeps its inode and mtime; 0 probes every time.
+        discovery_workers: Upper bound on tmux servers probed concurrently.
+        discovery_deadline_seconds: Budget for probing every server in one run.
+            A server still silent when it runs out is reported as timed out
+            instead of stalling the report or the SessionEnd hook.
+        scoped_team_discovery: Whether a ``--team`` run asks tmux for that
+            team's panes only (matched on each pane's start command) and reads
+            procfs only under their leaders, instead of listing everything.
+        coordinate_teardowns: Whether ``--team`` runs hand their teardown to a
+            local coordinator, which batches teardowns arriving together into
+            one snapshot and one kill round.
+        coordinator_window_seconds: How long the coordinator waits for more
+            teardowns before it takes the batch's snapshot.
     """
 
     socket_globs: tuple[str, ...] = DEFAULT_SOCKET_GLOBS
@@ -71,7 +155,25 @@ class Config:
     allow_agent_names: tuple[str, ...] = ()
     teams_dir: Path = Path("~/.claude/teams")
     ssh_dir: Path = Path("~/.ssh")
+    state_dir: Path = Path("~/.local/state/agent-reap")
+    history_enabled: bool = False
+    history_retention_days: int = 90
     stray_command_prefixes: tuple[str, ...] = ("~/", "/nix/store/")
+    stray_backend: str = "auto"
+    process_backend: str = "auto"
+    memory_accounting: str = "rss"
+    pressure_policy: bool = False
+    pressure_available_percent: int = 10
+    pressure_psi_percent: int = 10
+    pressure_idle_minutes: int = 5
+    ssh_check_workers: int = 16
+    ssh_check_deadline_seconds: float = 2.0
+    ssh_check_cache_seconds: int = 300
+    discovery_workers: int = 8
+    discovery_deadline_seconds: float = 5.0
+    scoped_team_discovery: bool = True
+    coordinate_teardowns: bool = False
+    coordinator_window_seconds: float = 0.25
 
     def resolved_stray_prefixes(self) -> tuple[str, ...]:
         """Expand ``~`` in the stray-hunting prefixes.
@@ -135,12 +237,17 @@ def load_config(path: Path | None = None) -> LoadedConfig:
     if not target.is_file():
         return LoadedConfig(config=Config(), path=None)
 
-    try:
-        raw = tomllib.loads(target.read_text(encoding="utf-8"))
-    except (OSError, tomllib.TOMLDecodeError) as exc:
-        return LoadedConfig(
-            config=Config(), path=target, errors=(f"unreadable config: {exc}",)
-        )
+    raw = _cached_table(target)
+    if raw is None:
+        import tomllib
+
+        try:
+            raw = tomllib.loads(target.read_text(encoding="utf-8"))
+        except (OSError, tomllib.TOMLDecodeError) as exc:
+            return LoadedConfig(
+                config=Config(), path=target, errors=(f"unreadable config: {exc}",)
+            )
+        _cache_table(target, raw)
 
     defaults = Config()
     errors = [f"unknown key: {key}" for key in sorted(raw.keys() - _CONFIG_KEYS)]
@@ -152,6 +259,13 @@ def load_config(path: Path | None = None) -> LoadedConfig:
             return fallback
         return value
 
+    def _seconds(key: str, fallback: float) -> float:
+        value = raw.get(key, fallback)
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0:
+            errors.append(f"{key}: expected a positive number, got {value!r}")
+            return fallback
+        return float(value)
+
     def _bool(key: str, fallback: bool) -> bool:
         value = raw.get(key, fallback)
         if not isinstance(value, bool):
@@ -166,6 +280,14 @@ def load_config(path: Path | None = None) -> LoadedConfig:
         errors.append(f"{key}: expected a list of strings, got {value!r}")
         return fallback
 
+    def _choice(key: str, fallback: str, choices: tuple[str, ...]) -> str:
+        value = raw.get(key, fallback)
+        if value not in choices:
+            expected = ", ".join(choices)
+            errors.append(f"{key}: expected one of {expected}, got {value!r}")
+            return fallback
+        return str(value)
+
     def _path(key: str, fallback: Path) -> Path:
         value = raw.get(key)
         if value is None:
@@ -189,8 +311,132 @@ def load_config(path: Path | None = None) -> LoadedConfig:
         allow_agent_names=_strs("allow_agent_names", defaults.allow_agent_names),
         teams_dir=_path("teams_dir", defaults.teams_dir),
         ssh_dir=_path("ssh_dir", defaults.ssh_dir),
+        state_dir=_path("state_dir", defaults.state_dir),
+        history_enabled=_bool("history_enabled", defaults.history_enabled),
+        history_retention_days=max(
+            1, _int("history_retention_days", defaults.history_retention_days)
+        ),
         stray_command_prefixes=_strs(
             "stray_command_prefixes", defaults.stray_command_prefixes
         ),
+        stray_backend=_choice("stray_backend", defaults.stray_backend, STRAY_BACKENDS),
+        process_backend=_choice(
+            "process_backend", defaults.process_backend, PROCESS_BACKENDS
+        ),
+        memory_accounting=_choice(
+            "memory_accounting", defaults.memory_accounting, MEMORY_ACCOUNTING
+        ),
+        pressure_policy=_bool("pressure_policy", defaults.pressure_policy),
+        pressure_available_percent=_int(
+            "pressure_available_percent", defaults.pressure_available_percent
+        ),
+        pressure_psi_percent=_int(
+            "pressure_psi_percent", defaults.pressure_psi_percent
+        ),
+        pressure_idle_minutes=_int(
+            "pressure_idle_minutes", defaults.pressure_idle_minutes
+        ),
+        ssh_check_workers=max(1, _int("ssh_check_workers", defaults.ssh_check_workers)),
+        ssh_check_deadline_seconds=_seconds(
+            "ssh_check_deadline_seconds", defaults.ssh_check_deadline_seconds
+        ),
+        ssh_check_cache_seconds=_int(
+            "ssh_check_cache_seconds", defaults.ssh_check_cache_seconds
+        ),
+        discovery_workers=max(1, _int("discovery_workers", defaults.discovery_workers)),
+        discovery_deadline_seconds=_seconds(
+            "discovery_deadline_seconds", defaults.discovery_deadline_seconds
+        ),
+        scoped_team_discovery=_bool(
+            "scoped_team_discovery", defaults.scoped_team_discovery
+        ),
+        coordinate_teardowns=_bool(
+            "coordinate_teardowns", defaults.coordinate_teardowns
+        ),
+        coordinator_window_seconds=_seconds(
+            "coordinator_window_seconds", defaults.coordinator_window_seconds
+        ),
     )
     return LoadedConfig(config=config, path=target, errors=tuple(errors))
+
+
+def cache_path() -> Path:
+    """Where the parsed config is cached.
+
+    Returns:
+        A file under ``$XDG_CACHE_HOME``, or ``~/.cache`` when it is unset.
+    """
+    root = os.environ.get("XDG_CACHE_HOME") or "~/.cache"
+    return Path(root).expanduser() / "agent-reap" / "config.marshal"
+
+
+def _cache_key(target: Path) -> tuple[int | str, ...] | None:
+    """Identify one version of a config file.
+
+    Args:
+        target: Config file.
+
+    Returns:
+        The key, or None when the file cannot be stat'ed.
+    """
+    try:
+        st = target.stat()
+    except OSError:
+        return None
+    return (_CACHE_VERSION, str(target), st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _cached_table(target: Path) -> dict[str, Any] | None:
+    """Return the cached parse of a config file, if it is still current.
+
+    Args:
+        target: Config file.
+
+    Returns:
+        The parsed TOML table, or None on a miss.
+    """
+    key = _cache_key(target)
+    if key is None:
+        return None
+    try:
+        data = cache_path().read_bytes()
+    except OSError:
+        return None
+    try:
+        entry = marshal.loads(data)
+    except EOFError:
+        return None  # truncated
+    except ValueError:
+        return None  # not marshal data, or from another Python version
+    if not isinstance(entry, tuple) or len(entry) != 2 or entry[0] != key:
+        return None
+    table = entry[1]
+    return table if isinstance(table, dict) else None
+
+
+def _cache_table(target: Path, table: dict[str, Any]) -> None:
+    """Cache a config file's parse, best effort.
+
+    A table holding TOML dates, which ``marshal`` cannot store, is simply not
+    cached. The entry is written to a temporary file and renamed into place, so
+    concurrent hooks never read half of one.
+
+    Args:
+        target: Config file the table was parsed from.
+        table: The parsed TOML table.
+    """
+    key = _cache_key(target)
+    if key is None:
+        return
+    try:
+        data = marshal.dumps((key, table))
+    except ValueError:
+        return
+    path = cache_path()
+    temp = path.with_name(f".{path.name}.{os.getpid()}")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp.write_bytes(data)
+        os.replace(temp, path)
+    except OSError:
+        temp.unlink(missing_ok=True)
@@ -0,0 +1,431 @@
+"""Coalescing coordinator for concurrent team teardowns.
+
+When a lead ends a session, several ``SessionEnd`` hooks can fire within the
+same second. Each runs ``reap --team``, lists the same servers, reads the same
+process table, revalidates, and races the others' kills on the same sockets.
+With ``coordinate_teardowns`` the first of those runs becomes a coordinator for
+the rest. It listens on a unix socket in ``state_dir`` and collects the
+teardowns that arrive within ``coordinator_window_seconds``. The whole batch is
+served with one snapshot and one kill round, and every run is answered with its
+own team's output. The coordinator keeps serving batches while they keep
+coming and exits after one quiet window, so nothing stays resident between
+sessions.
+
+Election is a lockfile. ``flock`` on ``coordinator.lock`` decides which run
+coordinates, and the holder keeps it for as long as its socket exists. No run
+tears down without either a coordinator's answer or the lock: one that can
+neither reach a coordinator nor take the lock retries until one of the two
+works, and gives up without tearing down if the lock is still held when its
+wait runs out. When the socket cannot be bound at all, the lock holder serves
+only its own teardown, so teardowns still run one after another. A coordinator
+declines a request it could not serve faithfully, such as one with another
+config file or kill mode; that run waits for the lock and tears down alone.
+
+This module only moves requests; the caller passes a ``Handler`` that serves a
+batch, as ``watch`` is passed its classifier.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import json
+import os
+import socket as socketlib
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+
+SOCKET_NAME = "coordinator.sock"
+LOCK_NAME = "coordinator.lock"
+
+# The SessionEnd hook runs under a 20 s handler timeout. A run waits at most
+# WAIT_SECONDS for an answer or the lock, and a coordinator opens batches only
+# until LIFETIME_SECONDS after its own run started; either way one last batch
+# follows. That leaves about 10 s for the batch, as much as two discovery
+# deadlines at their default.
+WAIT_SECONDS = 10.0
+LIFETIME_SECONDS = 4.0
+RETRY_SECONDS = 0.02
+
+# A connected run sends its request at once; this bounds a silent one.
+_READ_TIMEOUT_SECONDS = 1.0
+
+
+@dataclass(frozen=True)
+class Request:
+    """One run's teardown, as sent to the coordinator.
+
+    Attributes:
+        team: Team session id to tear down.
+        terms: Everything besides the team that changes what a teardown does
+            or prints, such as the config file and kill mode. A coordinator
+            serves only requests whose terms equal its own.
+        pid: The requesting process. Its ancestry is protected the way the
+            coordinator protects its own.
+        pane: The requesting process's own ``(socket, pane_id)``, when it runs
+            inside tmux.
+    """
+
+    team: str
+    terms: tuple[str, ...]
+    pid: int
+    pane: tuple[str, str] | None = None
+
+
+@dataclass(frozen=True)
+class Reply:
+    """What a run prints and returns once its teardown is served.
+
+    Attributes:
+        status: Process exit status.
+        output: Standard output, already rendered.
+        declined: The coordinator would not serve the request; the run should
+            tear down alone.
+    """
+
+    status: int
+    output: str = ""
+    declined: bool = False
+
+
+# Serves a batch of requests, returning one reply per request, in order.
+type Handler = Callable[[Sequence[Request]], list[Reply]]
+
+
+def encode_request(request: Request) -> bytes:
+    """Serialize a request as one JSON line.
+
+    Args:
+        request: The request.
+
+    Returns:
+        The wire form.
+    """
+    payload = {
+        "team": request.team,
+        "terms": list(request.terms),
+        "pid": request.pid,
+        "pane": None if request.pane is None else list(request.pane),
+    }
+    return json.dumps(payload).encode() + b"\n"
+
+
+def decode_request(line: bytes) -> Request | None:
+    """Parse a request line.
+
+    Args:
+        line: One JSON line from a client.
+
+    Returns:
+        The request, or None when the line is not a well-formed request.
+    """
+    try:
+        payload = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(payload, dict):
+        return None
+    team, terms, pid, pane = (
+        payload.get(key) for key in ("team", "terms", "pid", "pane")
+    )
+    if not isinstance(team, str) or not isinstance(terms, list):
+        return None
+    if not all(isinstance(term, str) for term in terms):
+        return None
+    if isinstance(pid, bool) or not isinstance(pid, int):
+        return None
+    if pane is not None and not (
+        isinstance(pane, list)
+        and len(pane) == 2
+        and all(isinstance(part, str) for part in pane)
+    ):
+        return None
+    return Request(
+        team=team,
+        terms=tuple(terms),
+        pid=pid,
+        pane=None if pane is None else (pane[0], pane[1]),
+    )
+
+
+def encode_reply(reply: Reply) -> bytes:
+    """Serialize a reply as one JSON line.
+
+    Args:
+        reply: The reply.
+
+    Returns:
+        The wire form.
+    """
+    payload = {
+        "status": reply.status,
+        "output": reply.output,
+        "declined": reply.declined,
+    }
+    return json.dumps(payload).encode() + b"\n"
+
+
+def decode_reply(line: bytes) -> Reply | None:
+    """Parse a reply line.
+
+    Args:
+        line: One JSON line from the coordinator.
+
+    Returns:
+        The reply, or None when the line is not a well-formed reply.
+    """
+    try:
+        payload = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(payload, dict):
+        return None
+    status, output, declined = (
+        payload.get(key) for key in ("status", "output", "declined")
+    )
+    if isinstance(status, bool) or not isinstance(status, int):
+        return None
+    if not isinstance(output, str) or not isinstance(declined, bool):
+        return None
+    return Reply(status=status, output=output, declined=declined)
+
+
+def submit(
+    request: Request, path: Path, timeout_s: float = WAIT_SECONDS
+) -> Reply | None:
+    """Hand a request to a running coordinator and wait for its answer.
+
+    Args:
+        request: The teardown to serve.
+        path: Coordinator socket.
+        timeout_s: How long to wait for the answer.
+
+    Returns:
+        The reply, or None when no coordinator answered. A coordinator that
+        was shutting down closes the connection unanswered, which is also None.
+    """
+    try:
+        with socketlib.socket(socketlib.AF_UNIX, socketlib.SOCK_STREAM) as sock:
+            sock.settimeout(timeout_s)
+            sock.connect(str(path))
+            sock.sendall(encode_request(request))
+            with sock.makefile("rb") as stream:
+                line = stream.readline()
+    except OSError:
+        return None
+    return decode_reply(line) if line else None
+
+
+def coordinate(
+    request: Request,
+    handler: Handler,
+    state_dir: Path,
+    window_s: float,
+    wait_s: float = WAIT_SECONDS,
+) -> Reply | None:
+    """Serve a teardown through the coordinator, becoming it if there is none.
+
+    Args:
+        request: This run's teardown.
+        handler: Serves a batch; also used to tear down alone.
+        state_dir: Directory holding the socket and the lockfile.
+        window_s: How long a batch stays open for more requests.
+        wait_s: How long to keep trying to be answered by a coordinator or to
+            take the lock.
+
+    Returns:
+        This run's reply, or None when another run still held the lock after
+        ``wait_s`` and this teardown was not run.
+    """
+    path = state_dir / SOCKET_NAME
+    try:
+        state_dir.mkdir(parents=True, exist_ok=True)
+        lock = os.open(state_dir / LOCK_NAME, os.O_RDWR | os.O_CREAT, 0o600)
+    except OSError:
+        return handler([request])[0]
+    started = time.monotonic()
+    give_up = started + wait_s
+    declined = False
+    try:
+        while True:
+            if not declined:
+                # A coordinator in the middle of a batch answers late; wait for
+                # it rather than tearing down beside it.
+                remaining = max(RETRY_SECONDS, give_up - time.monotonic())
+                reply = submit(request, path, timeout_s=remaining)
+                if reply is not None and not reply.declined:
+                    return reply
+                declined = reply is not None
+            if _try_lock(lock):
+                lifetime = max(0.0, started + LIFETIME_SECONDS - time.monotonic())
+                return serve(request, handler, path, window_s, lifetime_s=lifetime)
+            if time.monotonic() >= give_up:
+                return None
+            time.sleep(RETRY_SECONDS)
+    finally:
+        os.close(lock)  # releases the flock along with the descriptor
+
+
+def _try_lock(fd: int) -> bool:
+    """Take the coordinator lock without waiting.
+
+    Args:
+        fd: Open lockfile descriptor.
+
+    Returns:
+        Whether this process now holds the lock.
+    """
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return False
+    return True
+
+
+def serve(
+    first: Request,
+    handler: Handler,
+    path: Path,
+    window_s: float,
+    lifetime_s: float = LIFETIME_SECONDS,
+) -> Reply:
+    """Coordinate batches until a window passes with no request.
+
+    The caller must hold the coordinator lock: any socket already at ``path``
+    is then stale and is replaced.
+
+    Args:
+        first: The coordinating run's own request, which opens the first batch.
+        handler: Serves a batch.
+        path: Where to listen.
+        window_s: How long a batch stays open after its first request.
+        lifetime_s: Stop opening new batches after this long; the first batch
+            is always served.
+
+    Returns:
+        The reply to ``first``.
+    """
+    try:
+        listener = _listen(path)
+    except OSError:
+        # The lockfile alone still keeps teardowns from racing.
+        return handler([first])[0]
+    own: Reply | None = None
+    stop = time.monotonic() + lifetime_s
+    batch: list[tuple[Request, socketlib.socket | None]] = [(first, None)]
+    try:
+        while batch:
+            close = time.monotonic() + window_s
+            while (arrival := _accept(listener, close - time.monotonic())) is not None:
+                batch.append(arrival)
+            for (_, conn), reply in zip(
+                batch, _serve_batch(handler, batch, first.terms), strict=True
+            ):
+                if conn is None:
+                    own = reply
+                else:
+                    _answer(conn, reply)
+            batch = []
+            if time.monotonic() < stop:
+                arrival = _accept(listener, window_s)
+                batch = [] if arrival is None else [arrival]
+    finally:
+        path.unlink(missing_ok=True)
+        listener.close()
+        for _, conn in batch:
+            if conn is not None:
+                conn.close()
+    assert own is not None  # the first batch always holds ``first``
+    return own
+
+
+def _listen(path: Path) -> socketlib.socket:
+    """Bind the coordinator socket, replacing a stale one.
+
+    Args:
+        path: Socket path.
+
+    Returns:
+        The listening socket, readable and writable by its owner only.
+    """
+    path.unlink(missing_ok=True)
+    listener = socketlib.socket(socketlib.AF_UNIX, socketlib.SOCK_STREAM)
+    try:
+        listener.bind(str(path))
+        os.chmod(path, 0o600)
+        listener.listen()
+    except OSError:
+        listener.close()
+        raise
+    return listener
+
+
+def _accept(
+    listener: socketlib.socket, timeout_s: float
+) -> tuple[Request, socketlib.socket] | None:
+    """Wait for one well-formed request.
+
+    Args:
+        listener: Listening socket.
+        timeout_s: How long to wait.
+
+    Returns:
+        The request and its connection, or None once the time is up.
+    """
+    deadline = time.monotonic() + timeout_s
+    while (remaining := deadline - time.monotonic()) > 0:
+        listener.settimeout(remaining)
+        try:
+            conn, _ = listener.accept()
+        except OSError:
+            return None  # timed out
+        conn.settimeout(_READ_TIMEOUT_SECONDS)
+        try:
+            with conn.makefile("rb") as stream:
+                request = decode_request(stream.readline())
+        except OSError:
+            request = None
+        if request is not None:
+            conn.settimeout(None)
+            return request, conn
+        conn.close()
+    return None
+
+
+def _serve_batch(
+    handler: Handler,
+    batch: Sequence[tuple[Request, socketlib.socket | None]],
+    terms: tuple[str, ...],
+) -> list[Reply]:
+    """Serve every request that shares the coordinator's terms in one call.
+
+    Args:
+        handler: Serves a batch.
+        batch: Requests collected in one window, with their connections.
+        terms: The coordinator's own terms.
+
+    Returns:
+        One reply per request, in order; others' terms are declined.
+    """
+    accepted = [request for request, _ in batch if request.terms == terms]
+    served = iter(handler(accepted))
+    return [
+        next(served) if request.terms == terms else Reply(status=0, declined=True)
+        for request, _ in batch
+    ]
+
+
+def _answer(conn: socketlib.socket, reply: Reply) -> None:
+    """Send a reply and hang up, ignoring a client that already left.
+
+    Args:
+        conn: The requesting run's connection.
+        reply: Its reply.
+    """
+    try:
+        conn.sendall(encode_reply(reply))
+    except OSError:
+        pass
+    finally:
+        conn.close()
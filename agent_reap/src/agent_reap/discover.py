@@ -12,15 +12,32 @@ from __future__ import annotations
 import glob
 import re
 import stat
-from collections.abc import Iterable, Sequence
+import sys
+from array import array
+from collections.abc import Generator, Iterable, Iterator, Mapping, Sequence
 from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
+from typing import TYPE_CHECKING
 
+from .pool import DEFAULT_WORKERS, run_bounded
 from .runner import Result, Runner
+from .timings import phase
+
+if TYPE_CHECKING:
+    from .strays import ControlMaster
+    from .teams import TeamsIndex
+
+# One row per process; ``command`` last for the same reason as below.
+PS_ARGV = ("ps", "-eo", "pid=,ppid=,pgid=,tpgid=,rss=,state=,etime=,command=")
 
 # Tab-delimited. Free-form fields (command, path) come last so a tab inside a path
 # cannot shift the earlier columns — the parser splits with a bounded maxsplit and
 # lets the trailing field keep whatever it contains.
+#
+# Session metadata rides along on every pane row so one ``list-panes -a`` per
+# server answers liveness, the session inventory, and the pane listing together;
+# a separate ``list-sessions`` probe would double the tmux spawns per socket.
 _PANE_FORMAT = (
     "#{pane_id}\t"
     "#{session_name}\t"
@@ -28,11 +45,33 @@ _PANE_FORMAT = (
     "#{pane_index}\t"
     "#{pane_pid}\t"
     "#{window_activity}\t"
+    "#{session_windows}\t"
+    "#{session_attached}\t"
     "#{pane_current_command}\t"
     "#{pane_current_path}"
 )
 
-_PANE_FIELDS = 8
+_PANE_FIELDS = 10
+
+# Session ids safe to splice into a tmux format and an fnmatch pattern.
+_TEAM_ID_RE = re.compile(r"^[A-Za-z0-9_.-]+$")
+
+# One team session id, or several teams torn down together.
+type TeamIds = str | tuple[str, ...]
+
+# One server probe: yields each command to run, is sent its result, and returns
+# the server. ``probe_server`` and the async pipeline both drive it.
+type ProbeSteps = Generator[list[str], Result, Server]
+
+# A pane with no start command whose current command is one Claude reports:
+# its name, ``node``, or its version string. Mirrors ``classify``'s check.
+_TYPED_IN_FILTER = (
+    "#{&&:#{==:#{pane_start_command},},"
+    "#{m/r:^(claude|node|[0-9]+[.][0-9.]+)$,#{pane_current_command}}}"
+)
+
+# What tmux says when it does not know ``list-panes -f`` (before 3.2).
+_FILTER_REJECTED = ("unknown option", "usage:")
 
 # Matches the teammate shape observed in the wild:
 #   --agent-id docs-readme@session-d50ed876 --agent-name docs-readme
@@ -60,6 +99,8 @@ class Pane:
         window_activity: Unix timestamp of the window's last activity, or None.
         command: Pane's current command name (not the full argv).
         path: Pane's current working directory.
+        session_windows: Window count of the owning session.
+        session_attached: Number of clients attached to the owning session.
     """
 
     socket: str
@@ -71,6 +112,8 @@ class Pane:
     window_activity: int | None
     command: str
     path: str
+    session_windows: int = 0
+    session_attached: int = 0
 
     @property
     def target(self) -> str:
@@ -83,9 +126,95 @@ class Pane:
 
 
 @dataclass(frozen=True)
+class Server:
+    """One tmux server, as seen by a single ``list-panes -a`` probe.
+
+    Attributes:
+        socket: Server socket path.
+        live: Whether the server answered. A socket file outlives its server, so
+            existence is not liveness; a successful listing is.
+        panes: Every pane on the server.
+        timed_out: Whether the probe missed the run's discovery budget. Such a
+            server is unknown rather than dead: it may well be alive, just
+            wedged.
+    """
+
+    socket: str
+    live: bool
+    panes: tuple[Pane, ...] = ()
+    timed_out: bool = False
+
+    @property
+    def sessions(self) -> list[str]:
+        """Session summaries in the spirit of ``tmux list-sessions``.
+
+        Returns:
+            One ``name: N windows`` line per session, in listing order, marked
+            ``(attached)`` when a client is attached.
+        """
+        seen: dict[str, str] = {}
+        for pane in self.panes:
+            if pane.session in seen:
+                continue
+            attached = " (attached)" if pane.session_attached else ""
+            seen[pane.session] = (
+                f"{pane.session}: {pane.session_windows} windows{attached}"
+            )
+        return list(seen.values())
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """Everything one report reads from the machine.
+
+    Attributes:
+        servers: Every probed server, live, dead, or timed out, in socket order.
+        processes: Process table.
+        teams: Inbox index, already holding the sessions of every teammate
+            process in the table.
+        masters: Control-master inventory, when one was asked for.
+    """
+
+    servers: tuple[Server, ...]
+    processes: ProcessSnapshot
+    teams: TeamsIndex
+    masters: tuple[ControlMaster, ...] = ()
+
+    @property
+    def panes(self) -> list[Pane]:
+        """Panes of every server that answered, in socket order.
+
+        Returns:
+            The panes.
+        """
+        return [pane for server in self.servers for pane in server.panes]
+
+    @property
+    def sockets(self) -> tuple[str, ...]:
+        """Sockets a report should list as searched.
+
+        Returns:
+            Live and timed-out sockets.
+        """
+        return tuple(s.socket for s in self.servers if s.live or s.timed_out)
+
+    @property
+    def timed_out(self) -> tuple[str, ...]:
+        """Sockets that missed the discovery budget.
+
+        Returns:
+            Their paths.
+        """
+        return tuple(s.socket for s in self.servers if s.timed_out)
+
+
+@dataclass(frozen=True, slots=True)
 class Process:
     """A row from the process table.
 
+    Snapshots store rows column-wise (see ``ProcessSnapshot``); a ``Process`` is
+    the view handed out per lookup.
+
     Attributes:
         pid: Process id.
         ppid: Parent process id.
@@ -117,6 +246,172 @@ class Process:
         return bool(self.state) and self.state[0] in {"S", "I"}
 
 
+@dataclass(frozen=True, slots=True)
+class Footprint:
+    """Memory held by a pane's whole process subtree.
+
+    RSS counts every shared page once per process that maps it, so summing it
+    across a pane's Node processes overstates what a kill frees. PSS splits each
+    shared page among its mappers; USS counts only pages no other process maps,
+    which is what a kill is certain to return.
+
+    Attributes:
+        rss_kb: Summed resident set size.
+        pss_kb: Summed proportional set size.
+        uss_kb: Summed private (unique) set size.
+        processes: Processes in the subtree, its root included.
+        estimated: Processes whose ``smaps_rollup`` was unreadable; their RSS
+            stands in for both PSS and USS.
+    """
+
+    rss_kb: int
+    pss_kb: int
+    uss_kb: int
+    processes: int
+    estimated: int = 0
+
+
+class ProcessSnapshot(Mapping[int, Process]):
+    """A whole process table, stored column-wise.
+
+    A dict of ``Process`` objects costs an object, a decoded command string,
+    and their GC bookkeeping for every process on the box, although a report
+    only ever looks at pane leaders, their descendants, and the caller's
+    ancestry. Here numeric fields live in parallel ``array`` columns indexed by
+    row, command lines sit undecoded in one shared byte buffer until a row is
+    looked up, and ``Process`` rows are built on access.
+
+    Behaves as a read-only ``Mapping[int, Process]`` keyed by pid.
+    """
+
+    __slots__ = (
+        "_argv",
+        "_argv_end",
+        "_argv_start",
+        "_elapsed",
+        "_rows",
+        "_states",
+        "_tpgids",
+        "pgids",
+        "pids",
+        "ppids",
+        "rss_kb",
+    )
+
+    def __init__(self) -> None:
+        """Create an empty snapshot."""
+        self._rows: dict[int, int] = {}
+        self.pids = array("q")
+        self.ppids = array("q")
+        self.pgids = array("q")
+        self._tpgids = array("q")
+        self.rss_kb = array("q")
+        self._elapsed = array("q")
+        self._states: list[str] = []
+        self._argv = bytearray()
+        self._argv_start = array("q")
+        self._argv_end = array("q")
+
+    def add(
+        self,
+        pid: int,
+        ppid: int,
+        pgid: int,
+        tpgid: int,
+        rss_kb: int,
+        state: str,
+        elapsed_s: int,
+        command: bytes | str,
+    ) -> None:
+        """Append one row; a pid seen twice keeps its latest row.
+
+        Args:
+            pid: Process id.
+            ppid: Parent process id.
+            pgid: Process-group id.
+            tpgid: Foreground process-group id of the controlling terminal.
+            rss_kb: Resident set size in kilobytes.
+            state: State code.
+            elapsed_s: Seconds since the process started.
+            command: Command line, or a raw NUL-separated argv to be decoded
+                on first access.
+        """
+        start = len(self._argv)
+        self._argv += command if isinstance(command, bytes) else command.encode()
+        row = self._rows.get(pid)
+        if row is not None:
+            self.ppids[row], self.pgids[row], self._tpgids[row] = ppid, pgid, tpgid
+            self.rss_kb[row], self._elapsed[row] = rss_kb, elapsed_s
+            self._states[row] = sys.intern(state)
+            self._argv_start[row], self._argv_end[row] = start, len(self._argv)
+            return
+        self._rows[pid] = len(self.pids)
+        self.pids.append(pid)
+        self.ppids.append(ppid)
+        self.pgids.append(pgid)
+        self._tpgids.append(tpgid)
+        self.rss_kb.append(rss_kb)
+        self._elapsed.append(elapsed_s)
+        # A box has a handful of distinct state codes; share one string each.
+        self._states.append(sys.intern(state))
+        self._argv_start.append(start)
+        self._argv_end.append(len(self._argv))
+
+    def sleeping(self, row: int) -> bool:
+        """Whether the process in a row is idle, without building a view.
+
+        Args:
+            row: Row index into the columns.
+
+        Returns:
+            The same answer as ``Process.sleeping``.
+        """
+        state = self._states[row]
+        return bool(state) and state[0] in {"S", "I"}
+
+    def command(self, pid: int) -> str:
+        """Decode one command line.
+
+        Args:
+            pid: Process id.
+
+        Returns:
+            The command line, arguments separated by spaces.
+
+        Raises:
+            KeyError: When the pid is not in the snapshot.
+        """
+        row = self._rows[pid]
+        raw = self._argv[self._argv_start[row] : self._argv_end[row]]
+        return raw.rstrip(b"\0").replace(b"\0", b" ").decode("utf-8", "replace")
+
+    def __getitem__(self, pid: int) -> Process:
+        """Build the view for one pid."""
+        row = self._rows[pid]
+        return Process(
+            pid=pid,
+            ppid=self.ppids[row],
+            pgid=self.pgids[row],
+            tpgid=self._tpgids[row],
+            rss_kb=self.rss_kb[row],
+            state=self._states[row],
+            elapsed_s=self._elapsed[row],
+            command=self.command(pid),
+        )
+
+    def __contains__(self, pid: object) -> bool:
+        """Whether a pid is present, without building a view."""
+        return pid in self._rows
+
+    def __iter__(self) -> Iterator[int]:
+        """Iterate pids in row order."""
+        return iter(self.pids)
+
+    def __len__(self) -> int:
+        """Number of processes."""
+        return len(self.pids)
+
+
 @dataclass(frozen=True)
 class Teammate:
     """Identity parsed out of a teammate's command line.
@@ -184,14 +479,15 @@ def find_sockets(globs: Iterable[str]) -> list[str]:
         Sorted, de-duplicated, symlink-resolved paths that are unix sockets.
     """
     found: set[str] = set()
-    for pattern in globs:
-        for hit in glob.glob(pattern):
-            try:
-                path = Path(resolve_socket_path(hit))
-                if stat.S_ISSOCK(path.stat().st_mode):
-                    found.add(str(path))
-            except OSError:
-                continue
+    with phase("sockets"):
+        for pattern in globs:
+            for hit in glob.glob(pattern):
+                try:
+                    path = Path(resolve_socket_path(hit))
+                    if stat.S_ISSOCK(path.stat().st_mode):
+                        found.add(str(path))
+                except OSError:
+                    continue
     return sorted(found)
 
 
@@ -211,45 +507,158 @@ def resolve_socket_path(path: str) -> str:
         return path
 
 
-def live_sockets(sockets: Sequence[str], runner: Runner) -> list[str]:
-    """Filter sockets down to those with a server actually answering.
+def probe_server(socket: str, runner: Runner, team: TeamIds | None = None) -> Server:
+    """Probe one tmux server with a single spawn.
 
-    A socket file outlives its server, so existence is not liveness.
+    A successful ``list-panes -a`` is the liveness proof and the pane listing at
+    once. A server with no sessions exits, so a live server always has panes.
 
     Args:
-        sockets: Candidate socket paths.
+        socket: Server socket path.
         runner: Command executor.
+        team: Team session id, or ids, to filter the listing to, server side.
 
     Returns:
-        Paths whose server responded to a session listing.
+        The server, with ``live=False`` and no panes when nothing answered.
     """
-    return [s for s in sockets if runner(["tmux", "-S", s, "list-sessions"]).ok]
+    steps = probe_steps(socket, team)
+    argv = next(steps)
+    while True:
+        try:
+            argv = steps.send(runner(argv))
+        except StopIteration as done:
+            server: Server = done.value
+            return server
 
 
-def list_panes(socket: str, runner: Runner) -> list[Pane]:
-    """List every pane on one tmux server.
+def probe_steps(socket: str, team: TeamIds | None = None) -> ProbeSteps:
+    """Probe one tmux server, leaving the spawning to the caller.
 
     Args:
         socket: Server socket path.
-        runner: Command executor.
+        team: Team session id, or ids, to filter the listing to, server side.
+
+    Yields:
+        Each command to run; the caller sends back its result.
 
     Returns:
-        Panes on that server; empty when the server is gone or has none.
+        The server, with ``live=False`` and no panes when nothing answered.
+    """
+    result = yield probe_argv(socket, team)
+    if filter_rejected(result, team):
+        result = yield probe_argv(socket)
+    return parse_probe(socket, result)
+
+
+def team_filter(team: TeamIds | None) -> str | None:
+    """Build the tmux format filter that keeps one team's panes.
+
+    A teammate pane is started with the agent's own command line, so tmux
+    records ``--agent-id <name>@session-<id>`` as the pane's start command and
+    can drop every other pane before anything is sent back. The match is loose
+    (a prefix of the id matches too); classification still compares exactly.
+    A teammate typed into a shell pane has no start command to match, so any
+    pane without one whose current command looks like Claude is kept as well.
+    The alternatives are joined with tmux's binary ``#{||:a,b}``, nested.
+
+    Args:
+        team: Team session id, or ids.
+
+    Returns:
+        A ``list-panes -f`` filter, or None when there is no team or an id
+        cannot be spliced into a format safely.
+    """
+    teams = (team,) if isinstance(team, str) else team
+    if not teams or not all(_TEAM_ID_RE.match(t) for t in teams):
+        return None
+    *rest, last = [
+        *(f"#{{m:*@session-{t}*,#{{pane_start_command}}}}" for t in teams),
+        _TYPED_IN_FILTER,
+    ]
+    pattern = last
+    for match in reversed(rest):
+        pattern = f"#{{||:{match},{pattern}}}"
+    return pattern
+
+
+def probe_argv(socket: str, team: TeamIds | None = None) -> list[str]:
+    """Build the single command that probes one server.
+
+    Args:
+        socket: Server socket path.
+        team: Team session id, or ids, to filter the listing to, server side.
+
+    Returns:
+        The ``list-panes -a`` argv.
+    """
+    argv = ["tmux", "-S", socket, "list-panes", "-a"]
+    pattern = team_filter(team)
+    if pattern is not None:
+        argv += ["-f", pattern]
+    return [*argv, "-F", _PANE_FORMAT]
+
+
+def filter_rejected(result: Result, team: TeamIds | None) -> bool:
+    """Whether a filtered probe failed only because tmux lacks ``-f``.
+
+    Args:
+        result: Result of ``probe_argv(socket, team)``.
+        team: The team, or teams, the probe was filtered to.
+
+    Returns:
+        True when the probe should be repeated unfiltered.
+    """
+    if result.ok or team_filter(team) is None:
+        return False
+    return any(marker in result.stderr for marker in _FILTER_REJECTED)
+
+
+def parse_probe(socket: str, result: Result) -> Server:
+    """Turn a probe's result into a server.
+
+    Args:
+        socket: Server socket path.
+        result: Result of the ``probe_argv`` command.
+
+    Returns:
+        The server, with ``live=False`` and no panes when nothing answered.
     """
-    result: Result = runner(
-        ["tmux", "-S", socket, "list-panes", "-a", "-F", _PANE_FORMAT]
-    )
     if not result.ok:
-        return []
+        return Server(socket=socket, live=False)
+    return Server(
+        socket=socket, live=True, panes=tuple(parse_panes(socket, result.stdout))
+    )
+
+
+def parse_panes(socket: str, output: str) -> list[Pane]:
+    """Parse ``list-panes`` output rows.
 
+    Args:
+        socket: Server socket the rows came from.
+        output: Raw output in ``_PANE_FORMAT``.
+
+    Returns:
+        Parsed panes; short or non-numeric rows are dropped rather than raising.
+    """
     panes: list[Pane] = []
-    for line in result.stdout.splitlines():
+    for line in output.splitlines():
         if not line.strip():
             continue
         parts = line.split("\t", _PANE_FIELDS - 1)
         if len(parts) < _PANE_FIELDS:
             continue
-        pane_id, session, window, index, pid, activity, command, path = parts
+        (
+            pane_id,
+            session,
+            window,
+            index,
+            pid,
+            activity,
+            windows,
+            attached,
+            command,
+            path,
+        ) = parts
         try:
             panes.append(
                 Pane(
@@ -262,6 +671,8 @@ def list_panes(socket: str, runner: Runner) -> list[Pane]:
                     window_activity=int(activity) if activity.strip() else None,
                     command=command,
                     path=path,
+                    session_windows=int(windows or 0),
+                    session_attached=int(attached or 0),
                 )
             )
         except ValueError:
@@ -269,23 +680,95 @@ def list_panes(socket: str, runner: Runner) -> list[Pane]:
     return panes
 
 
-def discover_panes(globs: Iterable[str], runner: Runner) -> list[Pane]:
+def discover_servers(
+    sockets: Sequence[str],
+    runner: Runner,
+    workers: int = DEFAULT_WORKERS,
+    deadline_s: float | None = None,
+    team: TeamIds | None = None,
+) -> list[Server]:
+    """Probe every candidate socket concurrently, one spawn each.
+
+    A wedged server — one that accepts the connection and never answers — costs
+    the whole command timeout. Probed serially, every such server adds that
+    timeout to the run; probed concurrently under a budget, it costs at most the
+    budget once and is reported as timed out.
+
+    Args:
+        sockets: Candidate socket paths.
+        runner: Command executor. Called from worker threads.
+        workers: Upper bound on concurrent probes.
+        deadline_s: Overall budget in seconds for the whole batch, or None to
+            wait for every probe.
+        team: Team session id, or ids; each server then lists only those
+            teams' panes, as ``team_filter`` selects them.
+
+    Returns:
+        One entry per socket, live, dead, or timed out, in input order.
+    """
+    with phase("list-panes"):
+        probed = run_bounded(
+            partial(probe_server, runner=runner, team=team),
+            sockets,
+            workers,
+            deadline_s,
+        )
+    return [
+        Server(socket=socket, live=False, timed_out=True) if server is None else server
+        for socket, server in zip(sockets, probed, strict=True)
+    ]
+
+
+def live_sockets(sockets: Sequence[str], runner: Runner) -> list[str]:
+    """Filter sockets down to those with a server actually answering.
+
+    Args:
+        sockets: Candidate socket paths.
+        runner: Command executor.
+
+    Returns:
+        Paths whose server responded to a pane listing.
+    """
+    return [s.socket for s in discover_servers(sockets, runner) if s.live]
+
+
+def list_panes(socket: str, runner: Runner) -> list[Pane]:
+    """List every pane on one tmux server.
+
+    Args:
+        socket: Server socket path.
+        runner: Command executor.
+
+    Returns:
+        Panes on that server; empty when the server is gone or has none.
+    """
+    return list(probe_server(socket, runner).panes)
+
+
+def discover_panes(
+    globs: Iterable[str],
+    runner: Runner,
+    workers: int = DEFAULT_WORKERS,
+    deadline_s: float | None = None,
+) -> list[Pane]:
     """List panes across every live tmux server.
 
     Args:
         globs: Socket glob patterns.
         runner: Command executor.
+        workers: Upper bound on concurrent probes.
+        deadline_s: Overall probe budget in seconds, or None for no budget.
 
     Returns:
-        Panes from all servers, in socket order.
+        Panes from all servers that answered in time, in socket order.
     """
     panes: list[Pane] = []
-    for socket in live_sockets(find_sockets(globs), runner):
-        panes.extend(list_panes(socket, runner))
+    for server in discover_servers(find_sockets(globs), runner, workers, deadline_s):
+        panes.extend(server.panes)
     return panes
 
 
-def process_table(runner: Runner) -> dict[int, Process]:
+def process_table(runner: Runner) -> ProcessSnapshot:
     """Snapshot the process table.
 
     Args:
@@ -294,17 +777,22 @@ def process_table(runner: Runner) -> dict[int, Process]:
     Returns:
         Processes keyed by pid; empty when ``ps`` fails.
     """
-    result = runner(
-        [
-            "ps",
-            "-eo",
-            "pid=,ppid=,pgid=,tpgid=,rss=,state=,etime=,command=",
-        ]
-    )
+    return parse_process_table(runner(list(PS_ARGV)))
+
+
+def parse_process_table(result: Result) -> ProcessSnapshot:
+    """Parse the output of ``PS_ARGV``.
+
+    Args:
+        result: Result of the ``ps`` command.
+
+    Returns:
+        Processes keyed by pid; empty when ``ps`` failed.
+    """
+    table = ProcessSnapshot()
     if not result.ok:
-        return {}
+        return table
 
-    table: dict[int, Process] = {}
     for line in result.stdout.splitlines():
         parts = line.split(maxsplit=7)
         if len(parts) < 8:
@@ -318,20 +806,227 @@ def process_table(runner: Runner) -> dict[int, Process]:
             rss = int(rss_s)
         except ValueError:
             continue
-        table[pid] = Process(
-            pid=pid,
-            ppid=ppid,
-            pgid=pgid,
-            tpgid=tpgid,
-            rss_kb=rss,
-            state=state,
-            elapsed_s=parse_etime(etime_s),
-            command=command,
-        )
+        table.add(pid, ppid, pgid, tpgid, rss, state, parse_etime(etime_s), command)
     return table
 
 
-def ancestry(pid: int, table: dict[int, Process]) -> set[int]:
+class ProcessTree:
+    """Parent/child index over one process-table snapshot.
+
+    Built once per snapshot so per-pane questions — who descends from this
+    leader, is any of them running, does one own the terminal — stop costing a
+    rebuild of the whole child map each. The tree is laid out in depth-first
+    order: every pid's subtree is one contiguous slice, and running prefix sums
+    over that order answer subtree RSS and "any descendant running" with two
+    lookups.
+
+    Processes caught in a parent cycle (malformed ``ps`` output) are unreachable
+    from any root and never enter the order; queries about them fall back to a
+    bounded walk of the child map.
+    """
+
+    def __init__(self, table: Mapping[int, Process]) -> None:
+        """Index a process table.
+
+        Args:
+            table: Process table keyed by pid.
+        """
+        self.table = table
+        pids: Sequence[int]
+        ppids: Sequence[int]
+        pgids: Sequence[int]
+        rss_kb: Sequence[int]
+        if isinstance(table, ProcessSnapshot):
+            # Read the columns directly: no per-row view is built.
+            pids, ppids, pgids, rss_kb = (
+                table.pids,
+                table.ppids,
+                table.pgids,
+                table.rss_kb,
+            )
+            busy = [not table.sleeping(row) for row in range(len(pids))]
+        else:
+            rows = list(table.values())
+            pids = [p.pid for p in rows]
+            ppids = [p.ppid for p in rows]
+            pgids = [p.pgid for p in rows]
+            rss_kb = [p.rss_kb for p in rows]
+            busy = [not p.sleeping for p in rows]
+        row_of = {pid: row for row, pid in enumerate(pids)}
+
+        self._children: dict[int, list[int]] = {}
+        self._groups: dict[int, list[int]] = {}
+        for pid, ppid, pgid in zip(pids, ppids, pgids, strict=True):
+            self._groups.setdefault(pgid, []).append(pid)
+            if pid != ppid:
+                self._children.setdefault(ppid, []).append(pid)
+
+        order: list[int] = []
+        enter: dict[int, int] = {}
+        leave: dict[int, int] = {}
+        for root, parent in zip(pids, ppids, strict=True):
+            if parent in row_of and parent != root:
+                continue
+            # ~pid marks "subtree finished"; pids are never negative.
+            stack = [root]
+            while stack:
+                pid = stack.pop()
+                if pid < 0:
+                    leave[~pid] = len(order)
+                    continue
+                enter[pid] = len(order)
+                order.append(pid)
+                stack.append(~pid)
+                stack.extend(reversed(self._children.get(pid, ())))
+
+        rss_sums = [0]
+        busy_sums = [0]
+        for pid in order:
+            row = row_of[pid]
+            rss_sums.append(rss_sums[-1] + rss_kb[row])
+            busy_sums.append(busy_sums[-1] + busy[row])
+        self._order = order
+        self._enter = enter
+        self._leave = leave
+        self._rss = rss_sums
+        self._busy = busy_sums
+        self._row_of = row_of
+        self._running = busy
+
+    def children(self, pid: int) -> list[int]:
+        """Direct children of a pid.
+
+        Args:
+            pid: Parent process id.
+
+        Returns:
+            Child pids, in table order.
+        """
+        return list(self._children.get(pid, ()))
+
+    def group(self, pgid: int) -> list[int]:
+        """Members of a process group.
+
+        Args:
+            pgid: Process-group id.
+
+        Returns:
+            Pids whose process group is ``pgid``.
+        """
+        return list(self._groups.get(pgid, ()))
+
+    def ancestry(self, pid: int) -> set[int]:
+        """Collect a pid and all of its ancestors.
+
+        Args:
+            pid: Starting process id.
+
+        Returns:
+            The pid plus every ancestor pid reachable from it.
+        """
+        return ancestry(pid, self.table)
+
+    def descendants(self, pid: int) -> set[int]:
+        """Collect every process descended from a pid.
+
+        Args:
+            pid: Root process id, which is not included in the result.
+
+        Returns:
+            All reachable descendant pids.
+        """
+        return set(self._subtree(pid))
+
+    def descendant_processes(self, pid: int) -> list[Process]:
+        """Rows for every descendant of a pid, in depth-first order.
+
+        Args:
+            pid: Root process id, which is not included in the result.
+
+        Returns:
+            Descendant processes.
+        """
+        return [self.table[child] for child in self._subtree(pid)]
+
+    def subtree_rss_kb(self, pid: int) -> int:
+        """Resident size of a pid and everything below it.
+
+        Args:
+            pid: Root process id.
+
+        Returns:
+            Summed RSS in kilobytes; 0 for a pid not in the table.
+        """
+        if pid in self._enter:
+            return self._rss[self._leave[pid]] - self._rss[self._enter[pid]]
+        own = self.table[pid].rss_kb if pid in self.table else 0
+        return own + sum(self.table[child].rss_kb for child in self._subtree(pid))
+
+    def foreground_descendants(self, pid: int, tpgid: int) -> list[int]:
+        """Descendants in the terminal's foreground process group.
+
+        Only the group's members are examined, not the whole subtree.
+
+        Args:
+            pid: Root process id, which is not included in the result.
+            tpgid: Foreground process-group id; 0 or -1 when unavailable.
+
+        Returns:
+            Descendant pids whose process group is ``tpgid``.
+        """
+        if tpgid <= 0:
+            return []
+        if pid not in self._enter:
+            subtree = set(self._subtree(pid))
+            return [member for member in self.group(tpgid) if member in subtree]
+        low, high = self._enter[pid], self._leave[pid]
+        return [
+            member
+            for member in self._groups.get(tpgid, ())
+            if member in self._enter and low < self._enter[member] < high
+        ]
+
+    def active_descendants(self, pid: int) -> list[int]:
+        """Descendants that are running rather than sleeping.
+
+        Args:
+            pid: Root process id, which is not included in the result.
+
+        Returns:
+            Pids of non-sleeping descendants, in depth-first order.
+        """
+        if pid in self._enter:
+            low, high = self._enter[pid] + 1, self._leave[pid]
+            if self._busy[high] == self._busy[low]:
+                return []
+        return [
+            child for child in self._subtree(pid) if self._running[self._row_of[child]]
+        ]
+
+    def _subtree(self, pid: int) -> list[int]:
+        """Descendant pids of a pid, excluding the pid itself.
+
+        Args:
+            pid: Root process id.
+
+        Returns:
+            A slice of the depth-first order, or — for pids inside a parent
+            cycle — the result of a walk that terminates on revisits.
+        """
+        if pid in self._enter:
+            return self._order[self._enter[pid] + 1 : self._leave[pid]]
+        found: dict[int, None] = {}
+        pending = list(self._children.get(pid, ()))
+        while pending:
+            child = pending.pop()
+            if child in found or child == pid:
+                continue
+            found[child] = None
+            pending.extend(self._children.get(child, ()))
+        return list(found)
+
+
+def ancestry(pid: int, table: Mapping[int, Process]) -> set[int]:
     """Collect a pid and all of its ancestors.
 
     This is the tool's primary self-protection: any pane whose leader appears in
@@ -356,9 +1051,12 @@ def ancestry(pid: int, table: dict[int, Process]) -> set[int]:
     return seen
 
 
-def descendants(pid: int, table: dict[int, Process]) -> set[int]:
+def descendants(pid: int, table: Mapping[int, Process]) -> set[int]:
     """Collect every process descended from a pid.
 
+    Indexes the whole table for one answer; build a ``ProcessTree`` once when
+    asking about many pids.
+
     Args:
         pid: Root process id, which is not included in the result.
         table: Process table to walk.
@@ -366,18 +1064,27 @@ def descendants(pid: int, table: dict[int, Process]) -> set[int]:
     Returns:
         All reachable descendant pids. Malformed cycles terminate safely.
     """
-    children: dict[int, list[int]] = {}
-    for process in table.values():
-        if process.pid == process.ppid:
-            continue
-        children.setdefault(process.ppid, []).append(process.pid)
+    return ProcessTree(table).descendants(pid)
 
-    found: set[int] = set()
-    pending = list(children.get(pid, ()))
-    while pending:
-        child = pending.pop()
-        if child in found or child == pid:
+
+def teammate_sessions(processes: ProcessSnapshot, leaders: Iterable[int]) -> set[str]:
+    """Team sessions named by pane leaders' command lines.
+
+    Classification identifies a teammate by its pane leader alone, so only
+    those rows are decoded; the rest of the table keeps its argv undecoded.
+
+    Args:
+        processes: Process table.
+        leaders: Pane leader pids.
+
+    Returns:
+        Session ids whose inboxes a report may look up.
+    """
+    sessions: set[str] = set()
+    for pid in leaders:
+        if pid not in processes:
             continue
-        found.add(child)
-        pending.extend(children.get(child, ()))
-    return found
+        teammate = parse_teammate(processes.command(pid))
+        if teammate is not None:
+            sessions.add(teammate.session_id)
+    return sessions
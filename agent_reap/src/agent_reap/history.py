@@ -0,0 +1,423 @@
+"""Opt-in SQLite history of reports and reap outcomes.
+
+A report answers "what is leaking now"; trends need every report kept. With
+``history_enabled`` each ``report`` and ``reap`` run appends one snapshot: a row
+per classified pane carrying its decision, reason, memory and idle time, and a
+row per reap outcome. Panes, teammates and reasons are interned into their own
+tables so a snapshot costs a few small integer rows per pane.
+
+Retention runs at most once a day as a side effect of recording: snapshots past
+``history_retention_days`` are dropped, and those older than a week are thinned
+to the one per hour with the most reclaimable memory, which keeps every daily
+peak while bounding the file. ``agent-reap history`` reads the store back as a
+per-day table of leak rate, time to reap, and peak reclaimable memory.
+"""
+
+from __future__ import annotations
+
+import re
+import sqlite3
+import statistics
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from types import TracebackType
+from typing import Self
+
+from .classify import Candidate, Interactive, Report, Skipped
+from .discover import Pane, Teammate
+from .reap import Outcome
+
+HISTORY_FILE = "history.sqlite3"
+
+# Snapshots younger than this keep full granularity; older ones are thinned.
+FULL_DETAIL_DAYS = 7
+
+_COMPACT_EVERY_S = 86400.0
+
+# Reason text embeds counts and ages ("active 93s ago"); interning the template
+# instead of the rendered string keeps the reasons table to a few dozen rows.
+_NUMBER = re.compile(r"\d+")
+
+_CANDIDATE, _INTERACTIVE, _SKIPPED = 0, 1, 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    taken REAL NOT NULL,
+    command TEXT NOT NULL,
+    reclaimable_kb INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS snapshots_taken ON snapshots (taken);
+CREATE TABLE IF NOT EXISTS panes (
+    id INTEGER PRIMARY KEY,
+    socket TEXT NOT NULL,
+    pane_id TEXT NOT NULL,
+    pid INTEGER NOT NULL,
+    UNIQUE (socket, pane_id, pid)
+);
+CREATE TABLE IF NOT EXISTS teammates (
+    id INTEGER PRIMARY KEY,
+    session_id TEXT NOT NULL,
+    agent_name TEXT NOT NULL,
+    UNIQUE (session_id, agent_name)
+);
+CREATE TABLE IF NOT EXISTS reasons (
+    id INTEGER PRIMARY KEY,
+    text TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS observations (
+    snapshot INTEGER NOT NULL REFERENCES snapshots (id) ON DELETE CASCADE,
+    pane INTEGER NOT NULL REFERENCES panes (id),
+    teammate INTEGER REFERENCES teammates (id),
+    decision INTEGER NOT NULL,
+    reason INTEGER REFERENCES reasons (id),
+    rss_kb INTEGER,
+    idle_s INTEGER,
+    PRIMARY KEY (snapshot, pane)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS observations_pane ON observations (pane, decision);
+CREATE TABLE IF NOT EXISTS outcomes (
+    id INTEGER PRIMARY KEY,
+    taken REAL NOT NULL,
+    pane INTEGER NOT NULL REFERENCES panes (id),
+    teammate INTEGER REFERENCES teammates (id),
+    killed INTEGER NOT NULL,
+    reason INTEGER REFERENCES reasons (id)
+);
+CREATE INDEX IF NOT EXISTS outcomes_taken ON outcomes (taken);
+"""
+
+
+@dataclass(frozen=True)
+class Day:
+    """One day of history.
+
+    Attributes:
+        day: Local calendar date, ``YYYY-MM-DD``.
+        snapshots: Reports recorded that day.
+        leaked: Panes first seen reapable that day.
+        reaped: Panes killed that day.
+        reap_p50_s: Median seconds from first reapable sighting to kill, for
+            that day's kills; None without kills.
+        reap_p90_s: 90th percentile of the same; None without kills.
+        peak_reclaimable_kb: Largest reclaimable total any snapshot recorded.
+    """
+
+    day: str
+    snapshots: int
+    leaked: int
+    reaped: int
+    reap_p50_s: float | None
+    reap_p90_s: float | None
+    peak_reclaimable_kb: int
+
+
+class History:
+    """A history store, open for recording and queries."""
+
+    def __init__(
+        self,
+        path: Path,
+        retention_days: int,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """Open (and create if needed) the store.
+
+        Args:
+            path: SQLite file.
+            retention_days: Days of snapshots to keep.
+            clock: Wall clock, injectable for tests.
+
+        Raises:
+            sqlite3.Error: The file exists but is not a usable database.
+            OSError: Its directory cannot be created.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.retention_days = retention_days
+        self._clock = clock
+        # Concurrent SessionEnd hooks append at once: WAL lets them, and the
+        # busy timeout queues a writer behind another instead of failing it.
+        self._db = sqlite3.connect(path, timeout=5.0)
+        self._db.execute("PRAGMA journal_mode = WAL")
+        self._db.execute("PRAGMA foreign_keys = ON")
+        self._db.executescript(_SCHEMA)
+        self._interned: dict[tuple[str, tuple[object, ...]], int] = {}
+
+    def __enter__(self) -> Self:
+        """Use the store as a context manager.
+
+        Returns:
+            The store itself.
+        """
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close the store."""
+        self.close()
+
+    def close(self) -> None:
+        """Close the connection."""
+        self._db.close()
+
+    def _intern(
+        self, table: str, columns: tuple[str, ...], values: tuple[object, ...]
+    ) -> int:
+        """Return the id of a row in an interning table, inserting it once."""
+        key = (table, values)
+        cached = self._interned.get(key)
+        if cached is not None:
+            return cached
+        where = " AND ".join(f"{column} = ?" for column in columns)
+        self._db.execute(
+            f"INSERT OR IGNORE INTO {table} ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' for _ in columns)})",
+            values,
+        )
+        row = self._db.execute(
+            f"SELECT id FROM {table} WHERE {where}", values
+        ).fetchone()
+        self._interned[key] = int(row[0])
+        return self._interned[key]
+
+    def _pane(self, pane: Pane) -> int:
+        return self._intern(
+            "panes", ("socket", "pane_id", "pid"), (pane.socket, pane.pane_id, pane.pid)
+        )
+
+    def _teammate(self, teammate: Teammate) -> int:
+        return self._intern(
+            "teammates",
+            ("session_id", "agent_name"),
+            (teammate.session_id, teammate.agent_name),
+        )
+
+    def _reason(self, text: str) -> int:
+        return self._intern("reasons", ("text",), (_NUMBER.sub("#", text),))
+
+    def record_report(self, report: Report, command: str) -> int:
+        """Append one snapshot.
+
+        Args:
+            report: Classification to keep.
+            command: What produced it, e.g. ``"report"`` or ``"reap --team"``.
+
+        Returns:
+            The snapshot id.
+        """
+        now = self._clock()
+        rows: list[tuple[int, int | None, int, int | None, int | None, int | None]] = []
+        with self._db:
+            cursor = self._db.execute(
+                "INSERT INTO snapshots (taken, command, reclaimable_kb) VALUES (?, ?, ?)",
+                (now, command, report.reclaimable_kb),
+            )
+            snapshot = int(cursor.lastrowid or 0)
+            entry: Candidate | Interactive | Skipped
+            for entry in report.candidates:
+                rows.append(
+                    (
+                        self._pane(entry.pane),
+                        self._teammate(entry.teammate),
+                        _CANDIDATE,
+                        None,
+                        entry.rss_kb,
+                        int(entry.idle_s),
+                    )
+                )
+            for entry in report.interactive:
+                rows.append(
+                    (
+                        self._pane(entry.pane),
+                        None,
+                        _INTERACTIVE,
+                        None,
+                        entry.rss_kb,
+                        None if entry.idle_s is None else int(entry.idle_s),
+                    )
+                )
+            for entry in report.skipped:
+                rows.append(
+                    (
+                        self._pane(entry.pane),
+                        None,
+                        _SKIPPED,
+                        self._reason(entry.reason),
+                        None,
+                        None,
+                    )
+                )
+            self._db.executemany(
+                "INSERT OR REPLACE INTO observations "
+                "(snapshot, pane, teammate, decision, reason, rss_kb, idle_s) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(snapshot, *row) for row in rows],
+            )
+        self._maybe_compact(now)
+        return snapshot
+
+    def record_outcomes(self, outcomes: Iterable[Outcome]) -> None:
+        """Append the results of a kill round. Dry runs are not recorded.
+
+        Args:
+            outcomes: Per-candidate results.
+        """
+        now = self._clock()
+        with self._db:
+            self._db.executemany(
+                "INSERT INTO outcomes (taken, pane, teammate, killed, reason) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (
+                        now,
+                        self._pane(o.candidate.pane),
+                        self._teammate(o.candidate.teammate),
+                        int(o.killed),
+                        None if o.killed else self._reason(o.detail),
+                    )
+                    for o in outcomes
+                    if o.killed or o.detail != "dry-run"
+                ],
+            )
+
+    def _maybe_compact(self, now: float) -> None:
+        """Run retention when the last run is a day old."""
+        row = self._db.execute(
+            "SELECT value FROM meta WHERE key = 'compacted'"
+        ).fetchone()
+        if row is not None and now - float(row[0]) < _COMPACT_EVERY_S:
+            return
+        self.compact()
+
+    def compact(self, vacuum: bool = False) -> int:
+        """Apply retention and thin old snapshots.
+
+        Args:
+            vacuum: Also rebuild the file to return freed pages to the disk.
+
+        Returns:
+            Snapshots deleted.
+        """
+        now = self._clock()
+        expired = now - self.retention_days * 86400
+        thinned = now - FULL_DETAIL_DAYS * 86400
+        with self._db:
+            deleted = self._db.execute(
+                "DELETE FROM snapshots WHERE taken < ?", (expired,)
+            ).rowcount
+            # Past the full-detail window keep one snapshot per hour: the one
+            # with the most reclaimable memory, so daily peaks survive.
+            deleted += self._db.execute(
+                """
+                DELETE FROM snapshots WHERE taken < ? AND id NOT IN (
+                    SELECT id FROM (
+                        SELECT id, ROW_NUMBER() OVER (
+                            PARTITION BY CAST(taken / 3600 AS INTEGER)
+                            ORDER BY reclaimable_kb DESC, taken DESC
+                        ) AS rank
+                        FROM snapshots WHERE taken < ?
+                    ) WHERE rank = 1
+                )
+                """,
+                (thinned, thinned),
+            ).rowcount
+            self._db.execute("DELETE FROM outcomes WHERE taken < ?", (expired,))
+            self._db.execute(
+                "DELETE FROM panes WHERE id NOT IN (SELECT pane FROM observations) "
+                "AND id NOT IN (SELECT pane FROM outcomes)"
+            )
+            self._db.execute(
+                "DELETE FROM teammates "
+                "WHERE id NOT IN (SELECT teammate FROM observations "
+                "WHERE teammate IS NOT NULL) "
+                "AND id NOT IN (SELECT teammate FROM outcomes WHERE teammate IS NOT NULL)"
+            )
+            self._db.execute(
+                "DELETE FROM reasons "
+                "WHERE id NOT IN (SELECT reason FROM observations WHERE reason IS NOT NULL) "
+                "AND id NOT IN (SELECT reason FROM outcomes WHERE reason IS NOT NULL)"
+            )
+            self._db.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('compacted', ?)",
+                (repr(now),),
+            )
+        self._interned.clear()
+        if vacuum:
+            self._db.execute("VACUUM")
+        return deleted
+
+    def daily(self, days: int) -> list[Day]:
+        """Summarize the last ``days`` calendar days, oldest first.
+
+        Args:
+            days: How many days back to report, today included.
+
+        Returns:
+            One entry per day that recorded anything.
+        """
+        since = self._clock() - days * 86400
+        local = "date({}, 'unixepoch', 'localtime')"
+        summary: dict[str, dict[str, int]] = {}
+        for day, count, peak in self._db.execute(
+            f"SELECT {local.format('taken')}, COUNT(*), MAX(reclaimable_kb) "
+            "FROM snapshots WHERE taken >= ? GROUP BY 1",
+            (since,),
+        ):
+            summary.setdefault(day, {})["snapshots"] = count
+            summary[day]["peak"] = peak
+        first_seen = (
+            "SELECT o.pane, MIN(s.taken) AS first FROM observations o "
+            "JOIN snapshots s ON s.id = o.snapshot "
+            f"WHERE o.decision = {_CANDIDATE} GROUP BY o.pane"
+        )
+        for day, count in self._db.execute(
+            f"SELECT {local.format('first')}, COUNT(*) FROM ({first_seen}) "
+            "WHERE first >= ? GROUP BY 1",
+            (since,),
+        ):
+            summary.setdefault(day, {})["leaked"] = count
+        # A kill whose first sighting was already thinned away has no known
+        # wait; it counts as reaped but stays out of the percentiles.
+        reaped: dict[str, int] = {}
+        waits: dict[str, list[float]] = {}
+        for day, wait in self._db.execute(
+            f"SELECT {local.format('k.taken')}, k.taken - f.first FROM outcomes k "
+            f"LEFT JOIN ({first_seen}) f ON f.pane = k.pane "
+            "WHERE k.killed = 1 AND k.taken >= ?",
+            (since,),
+        ):
+            reaped[day] = reaped.get(day, 0) + 1
+            if wait is not None:
+                waits.setdefault(day, []).append(max(0.0, wait))
+            summary.setdefault(day, {})
+        return [
+            Day(
+                day=day,
+                snapshots=entry.get("snapshots", 0),
+                leaked=entry.get("leaked", 0),
+                reaped=reaped.get(day, 0),
+                reap_p50_s=_percentile(waits.get(day, []), 50),
+                reap_p90_s=_percentile(waits.get(day, []), 90),
+                peak_reclaimable_kb=entry.get("peak", 0),
+            )
+            for day, entry in sorted(summary.items())
+        ]
+
+
+def _percentile(values: list[float], pct: int) -> float | None:
+    """Inclusive percentile of a sample, or None when it is empty."""
+    if not values:
+        return None
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[pct - 1]
@@ -0,0 +1,86 @@
+"""Subtree memory accounting from ``smaps_rollup``.
+
+A report's default memory figure is the pane leader's RSS from the process
+table. That is wrong in both directions: it ignores the MCP servers, shells and
+tools running under the leader, and it counts Node's shared pages in full for
+every process that maps them. With ``memory_accounting = "pss"`` each reported
+pane's whole subtree is measured instead — PSS as the fair-share estimate of
+what a kill frees, USS as the floor it is certain to free.
+"""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from pathlib import Path
+
+from .classify import Report
+from .discover import Footprint, ProcessTree
+from .procfs import PROC_ROOT, smaps_rollups
+
+
+def footprints(
+    roots: list[int], tree: ProcessTree, proc_root: Path = PROC_ROOT
+) -> dict[int, Footprint]:
+    """Measure the subtree under each root with one batch of procfs reads.
+
+    Args:
+        roots: Subtree roots, normally pane leader pids.
+        tree: Index over the snapshot the roots came from.
+        proc_root: procfs mount point.
+
+    Returns:
+        One footprint per root present in the snapshot.
+    """
+    members = {
+        root: [root, *tree.descendants(root)] for root in roots if root in tree.table
+    }
+    rollups = smaps_rollups(
+        (pid for pids in members.values() for pid in pids), proc_root
+    )
+    measured: dict[int, Footprint] = {}
+    for root, pids in members.items():
+        pss = uss = estimated = 0
+        for pid in pids:
+            rollup = rollups.get(pid)
+            if rollup is None:
+                rss = tree.table[pid].rss_kb
+                pss, uss, estimated = pss + rss, uss + rss, estimated + 1
+            else:
+                pss, uss = pss + rollup[0], uss + rollup[1]
+        measured[root] = Footprint(
+            rss_kb=tree.subtree_rss_kb(root),
+            pss_kb=pss,
+            uss_kb=uss,
+            processes=len(pids),
+            estimated=estimated,
+        )
+    return measured
+
+
+def attach_footprints(
+    report: Report, tree: ProcessTree, proc_root: Path = PROC_ROOT
+) -> Report:
+    """Measure every candidate and idle interactive session in a report.
+
+    Skipped panes are not measured: nothing would act on their numbers.
+
+    Args:
+        report: Classification to annotate.
+        tree: Index over the snapshot the report was classified against.
+        proc_root: procfs mount point.
+
+    Returns:
+        The report with a footprint on each candidate and interactive session.
+    """
+    roots = [c.pane.pid for c in report.candidates]
+    roots += [i.pane.pid for i in report.interactive]
+    measured = footprints(roots, tree, proc_root)
+    return replace(
+        report,
+        candidates=tuple(
+            replace(c, memory=measured.get(c.pane.pid)) for c in report.candidates
+        ),
+        interactive=tuple(
+            replace(i, memory=measured.get(i.pane.pid)) for i in report.interactive
+        ),
+    )
@@ -0,0 +1,316 @@
+"""OpenMetrics exposition of the pane, teammate, and stray inventory.
+
+Graphing accumulation means sampling the same numbers a report prints, on a
+schedule. A scrape renders one snapshot — one probe per server, one process
+table — into the OpenMetrics text format, either for node_exporter's textfile
+collector or served over HTTP on a local port.
+
+Kill counts are the exception: they happen in other processes (the SessionEnd
+hook, ``reap --kill``, ``watch --kill``), so every kill round adds its totals to
+a small counter file under the state directory and scrapes read it back.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import fcntl
+import json
+import os
+import tempfile
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .classify import Report
+from .discover import Server
+from .reap import Outcome
+
+if TYPE_CHECKING:
+    # The kill path only records counters; it should not pay for an HTTP stack.
+    from http.server import HTTPServer
+
+    from .strays import ControlMaster, Disowned
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+COUNTERS_FILE = "counters.json"
+
+
+@dataclass(frozen=True)
+class Counters:
+    """Kill totals accumulated across every process that reaped.
+
+    Attributes:
+        kills: Panes killed.
+        failures: Kills requested but not carried out, revalidation refusals
+            included.
+    """
+
+    kills: int = 0
+    failures: int = 0
+
+
+@contextlib.contextmanager
+def _locked(path: Path) -> Iterator[None]:
+    """Hold an exclusive lock beside ``path`` for a read-modify-write."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(f"{path}.lock", os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)
+
+
+def load_counters(path: Path) -> Counters:
+    """Read the kill totals.
+
+    Args:
+        path: Counter file.
+
+    Returns:
+        The totals; zeros when the file is missing or unreadable.
+    """
+    try:
+        raw = json.loads(path.read_text(encoding="utf-8"))
+    except OSError:
+        return Counters()
+    except ValueError:
+        return Counters()
+    if not isinstance(raw, dict):
+        return Counters()
+    kills, failures = raw.get("kills"), raw.get("failures")
+    if not isinstance(kills, int) or not isinstance(failures, int):
+        return Counters()
+    return Counters(kills=kills, failures=failures)
+
+
+def record_outcomes(path: Path, outcomes: Iterable[Outcome]) -> Counters:
+    """Add a kill round's results to the totals.
+
+    Dry-run outcomes are not kills and are not counted.
+
+    Args:
+        path: Counter file, created on first use.
+        outcomes: Results of one reap.
+
+    Returns:
+        The updated totals.
+    """
+    killed = failed = 0
+    for outcome in outcomes:
+        if outcome.killed:
+            killed += 1
+        elif outcome.detail != "dry-run":
+            failed += 1
+    if not killed and not failed:
+        return load_counters(path)
+    with _locked(path):
+        before = load_counters(path)
+        after = Counters(before.kills + killed, before.failures + failed)
+        write_atomic(
+            path, json.dumps({"kills": after.kills, "failures": after.failures})
+        )
+    return after
+
+
+def write_atomic(path: Path, text: str) -> None:
+    """Replace a file's contents so no reader ever sees a partial write.
+
+    Args:
+        path: Destination.
+        text: New contents.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.write(text)
+        os.chmod(temp, 0o644)
+        os.replace(temp, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(temp)
+        raise
+
+
+def _label(value: str) -> str:
+    """Escape a label value for the text format."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render(
+    servers: list[Server],
+    report: Report,
+    masters: list[ControlMaster],
+    disowned: list[Disowned],
+    counters: Counters,
+    scrape_s: float,
+) -> str:
+    """Render one snapshot in the OpenMetrics text format.
+
+    Args:
+        servers: Every probed server, live or not.
+        report: Classification of the same snapshot.
+        masters: ssh control-master inventory.
+        disowned: PPID-1 user processes with no pane.
+        counters: Kill totals so far.
+        scrape_s: Time taken to gather the snapshot.
+
+    Returns:
+        The exposition, ending in ``# EOF``.
+    """
+    lines: list[str] = []
+
+    def family(name: str, kind: str, help_text: str, unit: str = "") -> None:
+        lines.append(f"# TYPE {name} {kind}")
+        if unit:
+            lines.append(f"# UNIT {name} {unit}")
+        lines.append(f"# HELP {name} {help_text}")
+
+    family("agent_reap_server_up", "gauge", "Whether a tmux server answered.")
+    for server in servers:
+        lines.append(
+            f'agent_reap_server_up{{socket="{_label(server.socket)}"}} {int(server.live)}'
+        )
+    family(
+        "agent_reap_server_timed_out",
+        "gauge",
+        "Whether a tmux server missed the discovery budget.",
+    )
+    for server in servers:
+        lines.append(
+            f'agent_reap_server_timed_out{{socket="{_label(server.socket)}"}} '
+            f"{int(server.timed_out)}"
+        )
+    family("agent_reap_panes", "gauge", "Panes on each tmux server.")
+    for server in servers:
+        if server.live:
+            lines.append(
+                f'agent_reap_panes{{socket="{_label(server.socket)}"}} '
+                f"{len(server.panes)}"
+            )
+
+    family("agent_reap_candidates", "gauge", "Reapable teammate panes.")
+    lines.append(f"agent_reap_candidates {len(report.candidates)}")
+    family("agent_reap_interactive_idle", "gauge", "Idle interactive Claude sessions.")
+    lines.append(f"agent_reap_interactive_idle {len(report.interactive)}")
+    family("agent_reap_skipped", "gauge", "Claude panes excluded from reaping.")
+    lines.append(f"agent_reap_skipped {len(report.skipped)}")
+    family(
+        "agent_reap_reclaimable_bytes",
+        "gauge",
+        "Memory held by reapable teammates.",
+        unit="bytes",
+    )
+    lines.append(f"agent_reap_reclaimable_bytes {report.reclaimable_kb * 1024}")
+
+    family("agent_reap_control_masters", "gauge", "ssh control masters, stale or not.")
+    lines.append(
+        f'agent_reap_control_masters{{stale="false"}} {sum(not m.stale for m in masters)}'
+    )
+    lines.append(
+        f'agent_reap_control_masters{{stale="true"}} {sum(m.stale for m in masters)}'
+    )
+    family(
+        "agent_reap_disowned_processes",
+        "gauge",
+        "User-owned PPID-1 processes no pane accounts for.",
+    )
+    lines.append(f"agent_reap_disowned_processes {len(disowned)}")
+
+    family("agent_reap_kills", "counter", "Panes killed by any reap.")
+    lines.append(f"agent_reap_kills_total {counters.kills}")
+    family(
+        "agent_reap_kill_failures",
+        "counter",
+        "Kills requested but not carried out.",
+    )
+    lines.append(f"agent_reap_kill_failures_total {counters.failures}")
+
+    family(
+        "agent_reap_scrape_duration_seconds",
+        "gauge",
+        "Time taken to gather this snapshot.",
+        unit="seconds",
+    )
+    lines.append(f"agent_reap_scrape_duration_seconds {scrape_s:.6f}")
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+class Exposition:
+    """Scrape results shared by HTTP requests, at most one scrape per interval.
+
+    A scrape lists every tmux server and reads the whole process table, so a
+    busy Prometheus (or several) must not multiply that cost. Requests inside
+    ``min_interval_s`` of the last scrape get its text, and concurrent requests
+    wait for one scrape rather than starting their own.
+    """
+
+    def __init__(
+        self,
+        scrape: Callable[[], str],
+        min_interval_s: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Wrap a scrape function.
+
+        Args:
+            scrape: Produces a fresh exposition.
+            min_interval_s: Minimum seconds between scrapes.
+            clock: Monotonic clock, injectable for tests.
+        """
+        self._scrape = scrape
+        self._min_interval_s = min_interval_s
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._text: str | None = None
+        self._taken = 0.0
+
+    def text(self) -> str:
+        """Return the current exposition, scraping when it is stale.
+
+        Returns:
+            OpenMetrics text.
+        """
+        with self._lock:
+            now = self._clock()
+            if self._text is None or now - self._taken >= self._min_interval_s:
+                self._text = self._scrape()
+                self._taken = now
+            return self._text
+
+
+def serve(host: str, port: int, exposition: Exposition) -> HTTPServer:
+    """Build an HTTP server answering ``GET /metrics``.
+
+    Args:
+        host: Address to bind; keep it local.
+        port: Port to bind; 0 picks a free one.
+        exposition: Shared scrape results.
+
+    Returns:
+        The bound server; the caller runs ``serve_forever``.
+    """
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = exposition.text().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: object) -> None:
+            del format, args
+
+    return HTTPServer((host, port), Handler)
@@ -0,0 +1,220 @@
+"""Async discovery pipeline.
+
+A report needs inputs that do not wait on one another: the socket glob and the
+pane listing of every server on one side, the process table on the other. The
+ssh control-master inventory needs only the process table; inbox stats need
+both, since a pane leader's command line names its team session. Fetched in
+sequence each stage pays for the one before it; here they overlap. tmux and ``ps`` run
+as asyncio subprocesses through an ``AsyncRunner``, and the filesystem work —
+the glob, procfs, inbox ``stat`` calls, ssh probes — runs on worker threads.
+
+``snapshot`` wraps the whole thing in ``asyncio.run`` for the synchronous
+commands, which otherwise classify exactly as before.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Sequence
+from pathlib import Path
+
+from .config import Config
+from .discover import (
+    PS_ARGV,
+    ProcessSnapshot,
+    Server,
+    Snapshot,
+    TeamIds,
+    find_sockets,
+    parse_process_table,
+    probe_steps,
+    teammate_sessions,
+)
+from .pool import DEFAULT_WORKERS
+from .procfs import PROC_ROOT, procfs_snapshot
+from .runner import AsyncRunner
+from .strays import ControlMaster
+from .teams import TeamsCache, TeamsIndex
+from .timings import phase
+
+# Inventories control masters from a process table, off the event loop.
+type MasterProbe = Callable[[ProcessSnapshot], list[ControlMaster]]
+
+
+async def discover_servers_async(
+    sockets: Sequence[str],
+    runner: AsyncRunner,
+    workers: int = DEFAULT_WORKERS,
+    deadline_s: float | None = None,
+    team: TeamIds | None = None,
+) -> list[Server]:
+    """Probe every candidate socket concurrently, one spawn each.
+
+    The async form of ``discover_servers``: the same results, with probes still
+    in flight at the deadline cancelled rather than abandoned on a thread.
+
+    Args:
+        sockets: Candidate socket paths.
+        runner: Async command executor.
+        workers: Upper bound on concurrent probes.
+        deadline_s: Overall budget in seconds for the whole batch, or None to
+            wait for every probe.
+        team: Team session id, or ids; each server then lists only those
+            teams' panes.
+
+    Returns:
+        One entry per socket, live, dead, or timed out, in input order.
+    """
+    if not sockets:
+        return []
+    limit = asyncio.Semaphore(max(1, workers))
+
+    async def probe(socket: str) -> Server:
+        async with limit:
+            steps = probe_steps(socket, team)
+            argv = next(steps)
+            while True:
+                try:
+                    argv = steps.send(await runner(argv))
+                except StopIteration as done:
+                    server: Server = done.value
+                    return server
+
+    with phase("list-panes"):
+        tasks = [asyncio.create_task(probe(socket)) for socket in sockets]
+        _, pending = await asyncio.wait(tasks, timeout=deadline_s)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+    return [
+        Server(socket=socket, live=False, timed_out=True)
+        if task in pending
+        else task.result()
+        for socket, task in zip(sockets, tasks, strict=True)
+    ]
+
+
+async def process_snapshot_async(
+    runner: AsyncRunner,
+    backend: str = "auto",
+    proc_root: Path = PROC_ROOT,
+) -> ProcessSnapshot:
+    """Snapshot the process table with the configured backend.
+
+    The async form of ``process_snapshot``: the same procfs read, on a worker
+    thread, and the same ``ps`` parse.
+
+    Args:
+        runner: Async command executor, used by the ``ps`` backend.
+        backend: ``"proc"``, ``"ps"``, or ``"auto"``.
+        proc_root: procfs mount point.
+
+    Returns:
+        Processes keyed by pid.
+    """
+    with phase("processes"):
+        table = await asyncio.to_thread(procfs_snapshot, backend, proc_root)
+        if table is None:
+            table = parse_process_table(await runner(list(PS_ARGV)))
+        return table
+
+
+async def snapshot_async(
+    config: Config,
+    runner: AsyncRunner,
+    sockets: Sequence[str] | None = None,
+    teams_cache: TeamsCache | None = None,
+    masters: MasterProbe | None = None,
+    team_scope: str | None = None,
+    inboxes: bool = True,
+) -> Snapshot:
+    """Gather a snapshot with independent stages overlapping.
+
+    Args:
+        config: Effective settings.
+        runner: Async command executor.
+        sockets: Sockets to probe; globbed from ``config`` when omitted.
+        teams_cache: Inbox listings carried across snapshots.
+        masters: Control-master inventory to take from the process table;
+            skipped when omitted.
+        team_scope: The one team session a targeted teardown will look at;
+            other sessions' inboxes are not prefetched.
+        inboxes: Prefetch teammate inboxes for classification. A caller that
+            classifies nothing, like ``strays``, skips the ``stat`` calls.
+
+    Returns:
+        The snapshot.
+    """
+    teams = TeamsIndex(config.teams_dir, teams_cache)
+
+    async def servers() -> list[Server]:
+        found = (
+            await asyncio.to_thread(find_sockets, config.resolved_globs())
+            if sockets is None
+            else sockets
+        )
+        return await discover_servers_async(
+            found,
+            runner,
+            workers=config.discovery_workers,
+            deadline_s=config.discovery_deadline_seconds,
+        )
+
+    async def inventory(table: ProcessSnapshot) -> list[ControlMaster]:
+        return [] if masters is None else await asyncio.to_thread(masters, table)
+
+    def prefetch(listed: list[Server], table: ProcessSnapshot) -> None:
+        leaders = [pane.pid for server in listed for pane in server.panes]
+        sessions = teammate_sessions(table, leaders)
+        if team_scope is not None:
+            sessions &= {team_scope}
+        teams.prefetch(sessions)
+
+    listing = asyncio.create_task(servers())
+    table = await process_snapshot_async(runner, config.process_backend)
+    found = asyncio.create_task(inventory(table))
+    listed = await listing
+    if inboxes:
+        await asyncio.to_thread(prefetch, listed, table)
+    return Snapshot(
+        servers=tuple(listed),
+        processes=table,
+        teams=teams,
+        masters=tuple(await found),
+    )
+
+
+def snapshot(
+    config: Config,
+    runner: AsyncRunner,
+    sockets: Sequence[str] | None = None,
+    teams_cache: TeamsCache | None = None,
+    masters: MasterProbe | None = None,
+    team_scope: str | None = None,
+    inboxes: bool = True,
+) -> Snapshot:
+    """Run ``snapshot_async`` to completion from synchronous code.
+
+    Args:
+        config: Effective settings.
+        runner: Async command executor.
+        sockets: Sockets to probe; globbed from ``config`` when omitted.
+        teams_cache: Inbox listings carried across snapshots.
+        masters: Control-master inventory to take from the process table.
+        team_scope: Restricts inbox prefetching to one team session.
+        inboxes: Prefetch teammate inboxes for classification.
+
+    Returns:
+        The snapshot.
+    """
+    return asyncio.run(
+        snapshot_async(
+            config,
+            runner,
+            sockets=sockets,
+            teams_cache=teams_cache,
+            masters=masters,
+            team_scope=team_scope,
+            inboxes=inboxes,
+        )
+    )
@@ -0,0 +1,99 @@
+"""Bounded fan-out with a deadline.
+
+Probing tmux servers one at a time lets a single wedged server stall a whole run
+for the full command timeout, once per phase. This runs independent calls on a
+small worker pool and stops waiting when the budget is spent.
+
+Workers are daemon threads rather than a ``ThreadPoolExecutor``: the executor
+joins its threads at interpreter exit, so a call that missed the deadline would
+still hold the process open until it returned — exactly the stall the deadline
+exists to prevent, moved to shutdown.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import queue
+import threading
+import time
+from collections.abc import Callable, Sequence
+
+DEFAULT_WORKERS = 8
+
+
+def run_bounded[T, R](
+    fn: Callable[[T], R],
+    items: Sequence[T],
+    workers: int = DEFAULT_WORKERS,
+    deadline_s: float | None = None,
+) -> list[R | None]:
+    """Apply ``fn`` to every item concurrently, within an overall budget.
+
+    Each call runs in a copy of the caller's ``contextvars`` context, so
+    context-scoped state (such as timing instrumentation) follows the work onto
+    the worker threads.
+
+    Args:
+        fn: Work to run per item. Must be safe to call from several threads.
+        items: Inputs, one call each.
+        workers: Upper bound on concurrent calls.
+        deadline_s: Seconds to wait for the whole batch, or None to wait for
+            every call.
+
+    Returns:
+        One result per item, in input order. An item whose call had not finished
+        when the budget ran out — or never started — yields None.
+
+    Raises:
+        BaseException: The first exception raised by ``fn``, re-raised in the
+            caller once the batch settles.
+    """
+    if not items:
+        return []
+    results: list[R | None] = [None] * len(items)
+    errors: list[BaseException] = []
+    pending: queue.SimpleQueue[int] = queue.SimpleQueue()
+    for index in range(len(items)):
+        pending.put(index)
+    context = contextvars.copy_context()
+    settled = threading.Condition()
+    remaining = len(items)
+    expired = threading.Event()
+
+    def work() -> None:
+        nonlocal remaining
+        while not expired.is_set():
+            try:
+                index = pending.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                value = context.copy().run(fn, items[index])
+            except BaseException as exc:  # noqa: BLE001 - re-raised by the caller
+                with settled:
+                    errors.append(exc)
+                    remaining -= 1
+                    settled.notify_all()
+                continue
+            with settled:
+                results[index] = value
+                remaining -= 1
+                settled.notify_all()
+
+    for _ in range(max(1, min(workers, len(items)))):
+        threading.Thread(target=work, daemon=True).start()
+
+    limit = None if deadline_s is None else time.monotonic() + deadline_s
+    with settled:
+        while remaining:
+            if limit is None:
+                settled.wait()
+                continue
+            left = limit - time.monotonic()
+            if left <= 0:
+                break
+            settled.wait(left)
+        expired.set()
+        if errors:
+            raise errors[0]
+        return list(results)
@@ -0,0 +1,202 @@
+"""Memory-pressure policy: reap sooner when the machine is short on memory.
+
+Idle thresholds are tuned for a machine with headroom, where the cost of a
+wrongly reaped teammate (lost work) outweighs the memory it holds. When memory
+runs short that trade flips. With ``pressure_policy = true`` each report reads
+``MemAvailable`` from ``/proc/meminfo`` and the ``some avg10`` stall share from
+``/proc/pressure/memory`` (PSI). If either crosses its configured line, the
+teammate idle threshold drops to ``pressure_idle_minutes`` and candidates are
+ranked by memory reclaimed per unit of idle risk, so the biggest, longest-idle
+teammates go first. Without pressure, or without procfs, nothing changes.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+from .classify import Candidate
+from .config import Config
+from .procfs import PROC_ROOT
+
+# Any source of raw file contents: a procfs read in production, a constant in
+# tests.
+Reader = Callable[[], bytes]
+
+
+@dataclass(frozen=True)
+class Pressure:
+    """One reading of the machine's memory state.
+
+    Attributes:
+        total_kb: ``MemTotal``.
+        available_kb: ``MemAvailable``, the kernel's estimate of memory
+            obtainable without swapping.
+        psi_some_avg10: Share of the last 10 seconds in which some task stalled
+            on memory, in percent; None when the kernel has no PSI.
+    """
+
+    total_kb: int
+    available_kb: int
+    psi_some_avg10: float | None = None
+
+    @property
+    def available_percent(self) -> float:
+        """``MemAvailable`` as a share of ``MemTotal``.
+
+        Returns:
+            Percent, 0 to 100.
+        """
+        return 100.0 * self.available_kb / self.total_kb if self.total_kb else 100.0
+
+    def under_pressure(self, config: Config) -> bool:
+        """Whether either configured line has been crossed.
+
+        Args:
+            config: Effective settings.
+
+        Returns:
+            True when available memory is low or memory stalls are high.
+        """
+        if self.available_percent < config.pressure_available_percent:
+            return True
+        return (
+            self.psi_some_avg10 is not None
+            and self.psi_some_avg10 >= config.pressure_psi_percent
+        )
+
+
+def parse_meminfo(data: bytes) -> tuple[int, int] | None:
+    """Pull ``MemTotal`` and ``MemAvailable`` out of ``/proc/meminfo``.
+
+    Args:
+        data: Raw file contents.
+
+    Returns:
+        ``(total_kb, available_kb)``, or None when either is missing —
+        ``MemAvailable`` needs Linux 3.14.
+    """
+    fields: dict[bytes, int] = {}
+    for line in data.splitlines():
+        key, _, rest = line.partition(b":")
+        value = rest.split()[:1]
+        if key in (b"MemTotal", b"MemAvailable") and value and value[0].isdigit():
+            fields[key] = int(value[0])
+    if len(fields) < 2:
+        return None
+    return fields[b"MemTotal"], fields[b"MemAvailable"]
+
+
+def parse_psi(data: bytes) -> float | None:
+    """Pull ``some avg10`` out of ``/proc/pressure/memory``.
+
+    Args:
+        data: Raw file contents, e.g. ``some avg10=1.53 avg60=0.40 ...``.
+
+    Returns:
+        The percentage, or None when the line is absent or malformed.
+    """
+    for line in data.splitlines():
+        if not line.strip():
+            continue
+        kind, *pairs = line.split()
+        if kind != b"some":
+            continue
+        for pair in pairs:
+            key, _, value = pair.partition(b"=")
+            if key == b"avg10":
+                try:
+                    return float(value)
+                except ValueError:
+                    return None
+    return None
+
+
+def read_pressure(
+    read_meminfo: Reader | None = None,
+    read_psi: Reader | None = None,
+    proc_root: Path = PROC_ROOT,
+) -> Pressure | None:
+    """Take one pressure reading.
+
+    Args:
+        read_meminfo: Source of ``/proc/meminfo``; reads procfs by default.
+        read_psi: Source of ``/proc/pressure/memory``; reads procfs by default.
+        proc_root: procfs mount point for the default readers.
+
+    Returns:
+        The reading, or None when meminfo is unavailable (macOS, hidden
+        procfs). A missing PSI file only leaves ``psi_some_avg10`` unset.
+    """
+    read_meminfo = read_meminfo or (proc_root / "meminfo").read_bytes
+    read_psi = read_psi or (proc_root / "pressure" / "memory").read_bytes
+    try:
+        meminfo = parse_meminfo(read_meminfo())
+    except OSError:
+        return None
+    if meminfo is None:
+        return None
+    try:
+        psi = parse_psi(read_psi())
+    except OSError:
+        psi = None
+    return Pressure(total_kb=meminfo[0], available_kb=meminfo[1], psi_some_avg10=psi)
+
+
+def tighten(config: Config) -> Config:
+    """Apply the pressure idle threshold.
+
+    Only ever lowers the teammate threshold; a pressure threshold configured
+    above the normal one is ignored rather than making reaping more cautious.
+
+    Args:
+        config: Effective settings.
+
+    Returns:
+        Settings to classify and revalidate with while under pressure.
+    """
+    return replace(
+        config,
+        teammate_idle_minutes=min(
+            config.teammate_idle_minutes, config.pressure_idle_minutes
+        ),
+    )
+
+
+def idle_risk(candidate: Candidate, threshold_s: float) -> float:
+    """How likely a candidate is still wanted, relative to the normal threshold.
+
+    Exactly at the normal idle threshold the risk is 1; a teammate idle for
+    twice that is half as risky, and one reapable only because pressure lowered
+    the threshold is riskier than 1.
+
+    Args:
+        candidate: Reapable teammate.
+        threshold_s: The normal (untightened) idle threshold in seconds.
+
+    Returns:
+        A positive risk weight.
+    """
+    return max(threshold_s, 60.0) / max(candidate.idle_s, 60.0)
+
+
+def rank(
+    candidates: tuple[Candidate, ...], threshold_s: float
+) -> tuple[Candidate, ...]:
+    """Order candidates by memory reclaimed per unit of idle risk, best first.
+
+    Args:
+        candidates: Reapable teammates.
+        threshold_s: The normal (untightened) idle threshold in seconds.
+
+    Returns:
+        The same candidates, reordered; ties keep report order.
+    """
+    return tuple(
+        sorted(
+            candidates,
+            key=lambda c: c.reclaim_kb / idle_risk(c, threshold_s),
+            reverse=True,
+        )
+    )
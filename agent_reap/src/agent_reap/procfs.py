@@ -0,0 +1,536 @@
+"""Process-table backends.
+
+``ps -eo`` is portable but costs a fork plus a text parse of every row, and on a
+Linux box with 10k+ processes that dominates a report. Linux exposes the same
+rows directly under ``/proc``, so the table can be read without spawning
+anything. ``ps`` remains the fallback: macOS has no ``/proc``, and a restricted
+container may hide it.
+
+Both backends fill the same column-wise ``ProcessSnapshot``, so nothing
+downstream knows which one ran.
+"""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+from .discover import Process, ProcessSnapshot, process_table
+from .runner import Runner
+from .timings import parsed, phase
+
+PROC_ROOT = Path("/proc")
+
+# Offsets into /proc/<pid>/stat *after* the ")" that closes the comm field. The
+# comm field may itself contain spaces and parentheses, so the line is split on
+# the LAST ")" and counted from there: field 3 of proc(5) is offset 0.
+_STATE = 0
+_PPID = 1
+_PGRP = 2
+_SESSION = 3
+_TPGID = 5
+_STARTTIME = 19
+_RSS_PAGES = 21
+
+# Larger than any stat line and most argvs; longer cmdlines take extra reads.
+_READ_CHUNK = 8192
+
+
+def available(proc_root: Path = PROC_ROOT) -> bool:
+    """Whether a readable procfs is mounted.
+
+    Args:
+        proc_root: procfs mount point.
+
+    Returns:
+        True when ``/proc/uptime`` is present.
+    """
+    return (proc_root / "uptime").is_file()
+
+
+def _read_bytes(path: str) -> bytes:
+    """Read a small procfs file, usually in one ``read`` syscall.
+
+    Raw ``os.open``/``os.read`` rather than ``open()``: building a buffered file
+    object per file is a measurable share of a 50k-process scan.
+
+    Args:
+        path: File to read.
+
+    Returns:
+        Raw contents.
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        data = os.read(fd, _READ_CHUNK)
+        if len(data) < _READ_CHUNK:
+            return data
+        chunks = [data]
+        while chunk := os.read(fd, _READ_CHUNK):
+            chunks.append(chunk)
+        return b"".join(chunks)
+    finally:
+        os.close(fd)
+
+
+def _add_stat(
+    table: ProcessSnapshot,
+    pid: int,
+    stat: bytes,
+    cmdline: bytes,
+    uptime_s: float,
+    clock_ticks: int,
+    page_kb: int,
+) -> bool:
+    """Append a row built from raw ``stat`` and ``cmdline`` contents.
+
+    The argv is stored undecoded; the snapshot decodes it only if the row is
+    ever looked up.
+
+    Args:
+        table: Snapshot to append to.
+        pid: Process id the files belong to.
+        stat: Contents of ``/proc/<pid>/stat``.
+        cmdline: Contents of ``/proc/<pid>/cmdline``, NUL-separated.
+        uptime_s: Seconds since boot, from ``/proc/uptime``.
+        clock_ticks: Kernel clock ticks per second (``SC_CLK_TCK``).
+        page_kb: Page size in kilobytes.
+
+    Returns:
+        False when ``stat`` is malformed and nothing was added.
+    """
+    head, sep, tail = stat.rpartition(b")")
+    if not sep:
+        return False
+    fields = tail.split()
+    if len(fields) <= _RSS_PAGES:
+        return False
+    try:
+        ppid = int(fields[_PPID])
+        pgid = int(fields[_PGRP])
+        tpgid = int(fields[_TPGID])
+        started = int(fields[_STARTTIME]) / clock_ticks
+        rss_kb = int(fields[_RSS_PAGES]) * page_kb
+    except ValueError:
+        return False
+
+    command: bytes | str = cmdline
+    if not cmdline.rstrip(b"\0"):
+        # Kernel threads and zombies have no argv; ps shows "[comm]" for them.
+        comm = head.partition(b"(")[2].decode("utf-8", errors="replace")
+        command = f"[{comm}]"
+    table.add(
+        pid,
+        ppid,
+        pgid,
+        tpgid,
+        rss_kb,
+        fields[_STATE].decode("ascii", errors="replace"),
+        max(0, int(uptime_s - started)),
+        command,
+    )
+    return True
+
+
+def parse_smaps_rollup(data: bytes) -> tuple[int, int] | None:
+    """Pull PSS and USS out of ``/proc/<pid>/smaps_rollup``.
+
+    Args:
+        data: Raw file contents.
+
+    Returns:
+        ``(pss_kb, uss_kb)``, or None when the file carries no ``Pss`` line —
+        kernel threads and zombies map nothing.
+    """
+    pss: int | None = None
+    uss = 0
+    for line in data.splitlines():
+        key, _, rest = line.partition(b":")
+        value = rest.split()[:1]
+        if not value or not value[0].isdigit():
+            continue
+        if key == b"Pss":
+            pss = int(value[0])
+        elif key in (b"Private_Clean", b"Private_Dirty"):
+            uss += int(value[0])
+    return None if pss is None else (pss, uss)
+
+
+def smaps_rollups(
+    pids: Iterable[int], proc_root: Path = PROC_ROOT
+) -> dict[int, tuple[int, int]]:
+    """Read PSS and USS for many processes, one ``read`` per pid.
+
+    ``smaps_rollup`` (Linux 4.14+) is the kernel's pre-summed form of
+    ``smaps``; reading it costs one small file per process instead of a line
+    per mapping.
+
+    Args:
+        pids: Processes to measure; duplicates are read once.
+        proc_root: procfs mount point.
+
+    Returns:
+        ``(pss_kb, uss_kb)`` keyed by pid. Pids whose file is missing,
+        unreadable (another user's process), or empty are left out.
+    """
+    root = str(proc_root)
+    found: dict[int, tuple[int, int]] = {}
+    read = 0
+    for pid in set(pids):
+        try:
+            data = _read_bytes(f"{root}/{pid}/smaps_rollup")
+        except OSError:
+            continue
+        read += len(data)
+        rollup = parse_smaps_rollup(data)
+        if rollup is not None:
+            found[pid] = rollup
+    parsed(read)
+    return found
+
+
+@dataclass(frozen=True, slots=True)
+class Identity:
+    """What the kernel knows about a process that its argv cannot fake.
+
+    Attributes:
+        uid: Real user id, from ``status``.
+        session: Session id, inherited from the shell that spawned it unless it
+            called ``setsid`` itself.
+        start_ticks: Start time in clock ticks since boot.
+        exe: Resolved executable path; a rewritten argv does not change it.
+    """
+
+    uid: int
+    session: int
+    start_ticks: int
+    exe: str
+
+
+def parse_session(stat: bytes) -> tuple[int, int] | None:
+    """Pull the session id and start time out of ``/proc/<pid>/stat``.
+
+    Args:
+        stat: Raw file contents.
+
+    Returns:
+        ``(session, start_ticks)``, or None when the line is malformed.
+    """
+    fields = stat.rpartition(b")")[2].split()
+    if len(fields) <= _STARTTIME:
+        return None
+    session, start = fields[_SESSION], fields[_STARTTIME]
+    if not session.isdigit() or not start.isdigit():
+        return None
+    return int(session), int(start)
+
+
+def parse_status_uid(status: bytes) -> int | None:
+    """Pull the real uid out of ``/proc/<pid>/status``.
+
+    Args:
+        status: Raw file contents; ``Uid:`` lists real, effective, saved and
+            filesystem ids, real first.
+
+    Returns:
+        The real uid, or None when the line is absent.
+    """
+    for line in status.splitlines():
+        if line.startswith(b"Uid:"):
+            ids = line.split()[1:2]
+            return int(ids[0]) if ids and ids[0].isdigit() else None
+    return None
+
+
+def identities(pids: Iterable[int], proc_root: Path = PROC_ROOT) -> dict[int, Identity]:
+    """Read kernel identity for a few processes.
+
+    Three small reads per pid — ``stat``, ``status`` and the ``exe`` link — so
+    callers narrow the pids from a snapshot first.
+
+    Args:
+        pids: Processes to read; duplicates are read once.
+        proc_root: procfs mount point.
+
+    Returns:
+        Identity keyed by pid. A process that exited, or whose ``exe`` is
+        unreadable (another user's, a kernel thread, a zombie), is left out.
+    """
+    root = str(proc_root)
+    found: dict[int, Identity] = {}
+    read = 0
+    for pid in set(pids):
+        try:
+            stat = _read_bytes(f"{root}/{pid}/stat")
+            status = _read_bytes(f"{root}/{pid}/status")
+            exe = os.readlink(f"{root}/{pid}/exe")
+        except OSError:
+            continue
+        read += len(stat) + len(status)
+        session = parse_session(stat)
+        uid = parse_status_uid(status)
+        if session is None or uid is None:
+            continue
+        found[pid] = Identity(
+            uid=uid, session=session[0], start_ticks=session[1], exe=exe
+        )
+    parsed(read)
+    return found
+
+
+def start_ticks(pids: Iterable[int], proc_root: Path = PROC_ROOT) -> dict[int, int]:
+    """Read start times, any owner's, from ``stat`` alone.
+
+    Args:
+        pids: Processes to read.
+        proc_root: procfs mount point.
+
+    Returns:
+        Start time in clock ticks since boot, keyed by pid.
+    """
+    root = str(proc_root)
+    found: dict[int, int] = {}
+    for pid in set(pids):
+        try:
+            session = parse_session(_read_bytes(f"{root}/{pid}/stat"))
+        except OSError:
+            continue
+        if session is not None:
+            found[pid] = session[1]
+    return found
+
+
+def parse_stat(
+    pid: int,
+    stat: bytes,
+    cmdline: bytes,
+    uptime_s: float,
+    clock_ticks: int,
+    page_kb: int,
+) -> Process | None:
+    """Build a process row from raw ``stat`` and ``cmdline`` contents.
+
+    Args:
+        pid: Process id the files belong to.
+        stat: Contents of ``/proc/<pid>/stat``.
+        cmdline: Contents of ``/proc/<pid>/cmdline``, NUL-separated.
+        uptime_s: Seconds since boot, from ``/proc/uptime``.
+        clock_ticks: Kernel clock ticks per second (``SC_CLK_TCK``).
+        page_kb: Page size in kilobytes.
+
+    Returns:
+        The process, or None when ``stat`` is malformed.
+    """
+    table = ProcessSnapshot()
+    if not _add_stat(table, pid, stat, cmdline, uptime_s, clock_ticks, page_kb):
+        return None
+    return table[pid]
+
+
+def proc_process_table(proc_root: Path = PROC_ROOT) -> ProcessSnapshot:
+    """Snapshot the process table straight from procfs.
+
+    Start time comes from the boot clock (``stat`` field 22 against
+    ``/proc/uptime``) rather than a formatted ``etime`` string. Resident size
+    comes from ``stat`` as well, which carries the same page count as ``statm``
+    and saves an open per process.
+
+    Args:
+        proc_root: procfs mount point.
+
+    Returns:
+        Processes keyed by pid; empty when procfs is unreadable. A process that
+        exits mid-scan is dropped rather than raising.
+    """
+    root = str(proc_root)
+    table = ProcessSnapshot()
+    try:
+        uptime = _read_bytes(f"{root}/uptime").split()
+        names = os.listdir(root)
+    except OSError:
+        return table
+    if not uptime:
+        return table
+    try:
+        uptime_s = float(uptime[0])
+    except ValueError:
+        return table
+    clock_ticks = os.sysconf("SC_CLK_TCK")
+    page_kb = os.sysconf("SC_PAGE_SIZE") // 1024
+
+    read = 0
+    for name in names:
+        if not name.isdigit():
+            continue
+        try:
+            stat = _read_bytes(f"{root}/{name}/stat")
+            cmdline = _read_bytes(f"{root}/{name}/cmdline")
+        except OSError:
+            continue
+        read += len(stat) + len(cmdline)
+        _add_stat(table, int(name), stat, cmdline, uptime_s, clock_ticks, page_kb)
+    parsed(read)
+    return table
+
+
+def _children(root: str, pid: int) -> list[int] | None:
+    """List a process's children from its per-thread ``children`` files.
+
+    Args:
+        root: procfs mount point.
+        pid: Process id.
+
+    Returns:
+        Child pids; empty when the process is gone. None when the kernel does
+        not publish ``children`` (built without ``CONFIG_PROC_CHILDREN``).
+    """
+    try:
+        tids = os.listdir(f"{root}/{pid}/task")
+    except OSError:
+        tids = []
+    if str(pid) not in tids:
+        # Gone since its stat was read, or a procfs with no per-thread view.
+        return None if os.path.isdir(f"{root}/{pid}") else []
+    found: list[int] = []
+    for tid in tids:
+        try:
+            data = _read_bytes(f"{root}/{pid}/task/{tid}/children")
+        except FileNotFoundError:
+            if tid == str(pid):
+                return None
+            continue
+        except OSError:
+            continue
+        found.extend(int(c) for c in data.split() if c.isdigit())
+    return found
+
+
+def proc_subtree_table(
+    roots: Iterable[int],
+    anchors: Iterable[int] = (),
+    proc_root: Path = PROC_ROOT,
+) -> ProcessSnapshot | None:
+    """Read only the processes one team's teardown looks at.
+
+    Every process under ``roots`` is read, walking down through the kernel's
+    ``children`` lists, and so is the ancestry of each anchor — the caller's
+    own, which the self-guards need. The cost follows the subtrees, not the
+    machine.
+
+    Args:
+        roots: Pane leader pids.
+        anchors: Pids whose ancestry must be present, up to pid 1.
+        proc_root: procfs mount point.
+
+    Returns:
+        Those processes keyed by pid, or None when procfs cannot list children
+        and a full table is needed instead.
+    """
+    root = str(proc_root)
+    table = ProcessSnapshot()
+    try:
+        uptime = _read_bytes(f"{root}/uptime").split()
+    except OSError:
+        return None
+    if not uptime:
+        return None
+    try:
+        uptime_s = float(uptime[0])
+    except ValueError:
+        return None
+    clock_ticks = os.sysconf("SC_CLK_TCK")
+    page_kb = os.sysconf("SC_PAGE_SIZE") // 1024
+    read = 0
+
+    def add(pid: int) -> bool:
+        nonlocal read
+        if pid in table:
+            return True
+        try:
+            stat = _read_bytes(f"{root}/{pid}/stat")
+            cmdline = _read_bytes(f"{root}/{pid}/cmdline")
+        except OSError:
+            return False
+        read += len(stat) + len(cmdline)
+        return _add_stat(table, pid, stat, cmdline, uptime_s, clock_ticks, page_kb)
+
+    pending = list(roots)
+    seen: set[int] = set()
+    while pending:
+        pid = pending.pop()
+        if pid in seen:
+            continue
+        seen.add(pid)
+        if not add(pid):
+            continue
+        children = _children(root, pid)
+        if children is None:
+            return None
+        pending.extend(children)
+    for pid in anchors:
+        while pid > 0 and add(pid):
+            parent = table[pid].ppid
+            if parent == pid or parent in seen:
+                break
+            seen.add(pid)
+            pid = parent
+    parsed(read)
+    return table
+
+
+def process_snapshot(
+    runner: Runner,
+    backend: str = "auto",
+    proc_root: Path = PROC_ROOT,
+    roots: Iterable[int] | None = None,
+    anchors: Iterable[int] = (),
+) -> ProcessSnapshot:
+    """Snapshot the process table with the configured backend.
+
+    Args:
+        runner: Command executor, used by the ``ps`` backend.
+        backend: ``"proc"``, ``"ps"``, or ``"auto"`` to prefer procfs when it is
+            mounted and fall back to ``ps`` otherwise.
+        proc_root: procfs mount point.
+        roots: Pane leaders to restrict the snapshot to. procfs then reads only
+            their subtrees and the caller's ancestry; ``ps`` cannot select a
+            subtree portably and still lists everything.
+        anchors: Further pids whose ancestry a procfs subtree read keeps, as
+            it always keeps the caller's.
+
+    Returns:
+        Processes keyed by pid.
+    """
+    with phase("processes"):
+        table = procfs_snapshot(backend, proc_root, roots, anchors)
+        return process_table(runner) if table is None else table
+
+
+def procfs_snapshot(
+    backend: str = "auto",
+    proc_root: Path = PROC_ROOT,
+    roots: Iterable[int] | None = None,
+    anchors: Iterable[int] = (),
+) -> ProcessSnapshot | None:
+    """The procfs half of ``process_snapshot``, shared with the async pipeline.
+
+    Args:
+        backend: ``"proc"``, ``"ps"``, or ``"auto"``.
+        proc_root: procfs mount point.
+        roots: Pane leaders to restrict the snapshot to.
+        anchors: Further pids whose ancestry a subtree read keeps.
+
+    Returns:
+        Processes keyed by pid, or None when the backend calls for ``ps``.
+    """
+    if backend == "proc" or (backend == "auto" and available(proc_root)):
+        if roots is not None:
+            scoped = proc_subtree_table(roots, (os.getpid(), *anchors), proc_root)
+            if scoped is not None:
+                return scoped
+        table = proc_process_table(proc_root)
+        if table or backend == "proc":
+            return table
+    return None
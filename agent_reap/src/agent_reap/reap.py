@@ -8,15 +8,29 @@ code dressed as a safety net.
 Panes are addressed by pane *id* (``%68``), never by index. Indices are positional
 and renumber as panes die, so an index-based loop kills the wrong pane partway
 through.
+
+All kills for one server go out as a single ``kill-pane ; kill-pane ...`` command
+list, and servers are handled concurrently, so tearing down a large team costs
+one tmux client per server rather than one per pane. tmux runs such a list in
+order and abandons it at the first failing command, which is what makes
+per-pane attribution possible after a partial failure.
 """
 
 from __future__ import annotations
 
+import re
+from collections.abc import Sequence
 from dataclasses import dataclass
 from typing import Protocol
 
 from .classify import Candidate
+from .discover import probe_server
+from .pool import DEFAULT_WORKERS, run_bounded
 from .runner import Runner
+from .timings import phase
+
+# tmux names the target it could not resolve, e.g. "can't find pane: %12".
+_MISSING_PANE = re.compile(r"can't find pane:? (%\d+)")
 
 
 @dataclass(frozen=True)
@@ -42,6 +56,14 @@ class Revalidator(Protocol):
         ...
 
 
+class BatchRevalidator(Protocol):
+    """Callable that confirms a whole kill round against one fresh snapshot."""
+
+    def __call__(self, candidates: Sequence[Candidate]) -> list[tuple[bool, str]]:
+        """Return one ``(valid, reason)`` verdict per candidate, in order."""
+        ...
+
+
 def kill_pane(socket: str, pane_id: str, runner: Runner) -> tuple[bool, str]:
     """Destroy one pane.
 
@@ -59,11 +81,62 @@ def kill_pane(socket: str, pane_id: str, runner: Runner) -> tuple[bool, str]:
     )
 
 
+def kill_panes(
+    socket: str, pane_ids: Sequence[str], runner: Runner
+) -> dict[str, tuple[bool, str]]:
+    """Destroy several panes on one server with a single tmux client.
+
+    On failure the chain is attributed pane by pane. When tmux names the pane it
+    could not find, everything before it in the chain was killed, it failed, and
+    the rest never ran and are sent again. Otherwise the server is re-listed:
+    requested panes that are gone were killed, and each survivor is retried on
+    its own so its error is its own.
+
+    Args:
+        socket: Server socket the panes live on.
+        pane_ids: Stable tmux pane ids, killed in this order.
+        runner: Command executor.
+
+    Returns:
+        ``(killed, detail)`` per pane id.
+    """
+    if len(pane_ids) <= 1:
+        return {pane_id: kill_pane(socket, pane_id, runner) for pane_id in pane_ids}
+    argv = ["tmux", "-S", socket]
+    for index, pane_id in enumerate(pane_ids):
+        argv.extend([";"] if index else [])
+        argv.extend(["kill-pane", "-t", pane_id])
+    result = runner(argv)
+    if result.ok:
+        return {pane_id: (True, "") for pane_id in pane_ids}
+    detail = result.stderr or f"exit {result.returncode}"
+
+    match = _MISSING_PANE.search(result.stderr)
+    if match and match.group(1) in pane_ids:
+        failed = list(pane_ids).index(match.group(1))
+        outcomes = {pane_id: (True, "") for pane_id in pane_ids[:failed]}
+        outcomes[pane_ids[failed]] = (False, detail)
+        outcomes.update(kill_panes(socket, pane_ids[failed + 1 :], runner))
+        return outcomes
+
+    server = probe_server(socket, runner)
+    if not server.live:
+        return {pane_id: (False, detail) for pane_id in pane_ids}
+    survivors = {pane.pane_id for pane in server.panes}
+    return {
+        pane_id: kill_pane(socket, pane_id, runner)
+        if pane_id in survivors
+        else (True, "")
+        for pane_id in pane_ids
+    }
+
+
 def reap(
     candidates: tuple[Candidate, ...],
     runner: Runner,
     dry_run: bool = True,
     revalidator: Revalidator | None = None,
+    batch_revalidator: BatchRevalidator | None = None,
 ) -> list[Outcome]:
     """Reap candidates, or report what a reap would do.
 
@@ -71,20 +144,36 @@ def reap(
         candidates: Panes classified as reapable.
         runner: Command executor.
         dry_run: When True, nothing is killed and every outcome is a no-op.
-        revalidator: Fresh safety check run immediately before each real kill.
-            A real reap fails closed when no revalidator is provided.
+        revalidator: Fresh safety check run per candidate before the kills.
+        batch_revalidator: Fresh safety check run once for the whole round,
+            before the first kill; takes precedence over ``revalidator``. A real
+            reap fails closed when neither is provided.
 
     Returns:
         One outcome per candidate, in order.
     """
-    outcomes: list[Outcome] = []
-    for candidate in candidates:
+    verdicts: list[tuple[bool, str]] | None = None
+    if not dry_run and batch_revalidator is not None and candidates:
+        with phase("revalidate"):
+            verdicts = batch_revalidator(candidates)
+    outcomes: list[Outcome | None] = []
+    doomed: dict[str, list[int]] = {}
+    for index, candidate in enumerate(candidates):
         if dry_run:
             outcomes.append(
                 Outcome(candidate=candidate, killed=False, detail="dry-run")
             )
             continue
-        if revalidator is None:
+        if verdicts is not None:
+            valid, reason = (
+                verdicts[index]
+                if index < len(verdicts)
+                else (False, "no verdict for this candidate")
+            )
+        elif revalidator is not None:
+            with phase("revalidate"):
+                valid, reason = revalidator(candidate)
+        else:
             outcomes.append(
                 Outcome(
                     candidate=candidate,
@@ -93,7 +182,6 @@ def reap(
                 )
             )
             continue
-        valid, reason = revalidator(candidate)
         if not valid:
             outcomes.append(
                 Outcome(
@@ -103,8 +191,23 @@ def reap(
                 )
             )
             continue
-        killed, detail = kill_pane(
-            candidate.pane.socket, candidate.pane.pane_id, runner
+        doomed.setdefault(candidate.pane.socket, []).append(index)
+        outcomes.append(None)
+
+    sockets = sorted(doomed)
+    with phase("kill"):
+        results = run_bounded(
+            lambda socket: kill_panes(
+                socket, [candidates[i].pane.pane_id for i in doomed[socket]], runner
+            ),
+            sockets,
+            workers=DEFAULT_WORKERS,
         )
-        outcomes.append(Outcome(candidate=candidate, killed=killed, detail=detail))
-    return outcomes
+    for socket, killed_by_id in zip(sockets, results, strict=True):
+        for index in doomed[socket]:
+            candidate = candidates[index]
+            killed, detail = (killed_by_id or {}).get(
+                candidate.pane.pane_id, (False, "kill not attempted")
+            )
+            outcomes[index] = Outcome(candidate=candidate, killed=killed, detail=detail)
+    return [outcome for outcome in outcomes if outcome is not None]
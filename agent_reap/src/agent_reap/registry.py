@@ -0,0 +1,313 @@
+"""Live tmux socket set for long-running modes.
+
+``find_sockets`` globs every pattern, resolves every hit, and stats it — cheap
+once, wasteful every few seconds for the life of ``watch`` or a metrics
+listener. ``SocketRegistry`` keeps the set instead. On Linux it watches each
+glob's directory (``/tmp/tmux-<uid>``, ``/tmp`` for z4h sockets) with inotify
+and updates the set one path at a time as sockets are bound and unlinked; a
+slow periodic glob still runs as a safety net for lost events and for socket
+directories that did not exist yet. Where inotify is unavailable — macOS, a
+glob whose directory part is itself a pattern, an exhausted watch limit — the
+registry falls back to globbing on a timer, which is what ``watch`` always did.
+
+One-shot runs do not use this; they glob once, as before.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import fnmatch
+import os
+import re
+import stat
+import struct
+import sys
+import time
+from collections.abc import Callable, Iterable
+from pathlib import Path
+
+from .discover import find_sockets, resolve_socket_path
+from .timings import phase
+
+DEFAULT_RESCAN_SECONDS = 10.0
+DEFAULT_VERIFY_SECONDS = 300.0
+
+# linux/inotify.h
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+
+_WATCH_MASK = (
+    IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE_SELF | IN_MOVE_SELF
+)
+# Events after which the incremental set can no longer be trusted.
+_RESCAN_EVENTS = IN_Q_OVERFLOW | IN_IGNORED | IN_DELETE_SELF | IN_MOVE_SELF
+_ARRIVALS = IN_CREATE | IN_MOVED_TO
+
+_EVENT = struct.Struct("iIII")
+_MAGIC = re.compile(r"[*?[]")
+
+
+class Inotify:
+    """Minimal non-blocking inotify instance over libc."""
+
+    def __init__(self) -> None:
+        """Open an instance.
+
+        Raises:
+            OSError: The platform or libc has no inotify, or the per-user
+                instance limit is reached.
+        """
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify needs Linux")
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._add_watch.restype = ctypes.c_int
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self._fd: int = fd
+
+    def fileno(self) -> int:
+        """Return the descriptor that turns readable when events are queued."""
+        return self._fd
+
+    def add_watch(self, path: str, mask: int) -> int:
+        """Watch a directory.
+
+        Args:
+            path: Directory to watch.
+            mask: ``IN_*`` event bits.
+
+        Returns:
+            The watch descriptor; the same one again for a path already watched.
+
+        Raises:
+            OSError: The path is missing or the watch limit is reached.
+        """
+        wd = self._add_watch(self._fd, os.fsencode(path), mask)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), path)
+        return int(wd)
+
+    def read(self) -> list[tuple[int, int, str]]:
+        """Drain queued events without blocking.
+
+        Returns:
+            ``(wd, mask, name)`` per event, oldest first; empty when none are
+            queued.
+        """
+        events: list[tuple[int, int, str]] = []
+        while True:
+            try:
+                data = os.read(self._fd, 65536)
+            except BlockingIOError:
+                return events
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, size = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size
+                name = os.fsdecode(data[offset : offset + size].rstrip(b"\0"))
+                offset += size
+                events.append((wd, mask, name))
+
+    def close(self) -> None:
+        """Close the instance, dropping every watch."""
+        try:
+            os.close(self._fd)
+        except OSError:
+            pass
+
+
+def _split(pattern: str) -> tuple[str, str] | None:
+    """Split a glob into a literal directory and a basename pattern.
+
+    Args:
+        pattern: Socket glob with ``{uid}`` already expanded.
+
+    Returns:
+        ``(directory, name_pattern)``, or None when the directory part has
+        wildcards and so cannot be watched.
+    """
+    directory, _, name = pattern.rpartition("/")
+    if not directory or _MAGIC.search(directory):
+        return None
+    return directory, name
+
+
+class SocketRegistry:
+    """The set of tmux sockets matching some globs, kept current over time."""
+
+    def __init__(
+        self,
+        globs: Iterable[str],
+        clock: Callable[[], float] = time.monotonic,
+        rescan_s: float = DEFAULT_RESCAN_SECONDS,
+        verify_s: float = DEFAULT_VERIFY_SECONDS,
+        notify: bool = True,
+    ) -> None:
+        """Prepare a registry; nothing is globbed until the first ``sockets``.
+
+        Args:
+            globs: Socket glob patterns, ``{uid}`` already expanded.
+            clock: Monotonic clock driving the periodic globs.
+            rescan_s: Seconds between globs when polling.
+            verify_s: Seconds between safety-net globs when inotify is active.
+            notify: Whether to try inotify at all.
+        """
+        self._globs = tuple(globs)
+        self._clock = clock
+        self._rescan_s = rescan_s
+        self._verify_s = verify_s
+        self._hits: dict[str, str] = {}
+        self._watches: dict[int, str] = {}
+        self._next_scan = 0.0
+        self._inotify: Inotify | None = None
+        split = [_split(pattern) for pattern in self._globs]
+        if notify and all(s is not None for s in split):
+            self._patterns = [s for s in split if s is not None]
+            try:
+                self._inotify = Inotify()
+            except OSError:
+                self._inotify = None
+
+    @property
+    def incremental(self) -> bool:
+        """Whether inotify is keeping the set current between globs."""
+        return self._inotify is not None
+
+    @property
+    def deadline(self) -> float:
+        """Clock time of the next scheduled glob."""
+        return self._next_scan
+
+    def fileno(self) -> int:
+        """Return the inotify descriptor, for callers that select on it.
+
+        Raises:
+            ValueError: The registry is polling and has no descriptor.
+        """
+        if self._inotify is None:
+            raise ValueError("registry is polling")
+        return self._inotify.fileno()
+
+    def sockets(self) -> list[str]:
+        """Return the live set, globbing only when due.
+
+        Returns:
+            Sorted, de-duplicated, symlink-resolved socket paths, as
+            ``find_sockets`` would return them.
+        """
+        if self._inotify is not None and self._drain(self._inotify):
+            self._next_scan = 0.0
+        now = self._clock()
+        if now >= self._next_scan:
+            self._scan()
+            period = self._verify_s if self._inotify is not None else self._rescan_s
+            self._next_scan = now + period
+        return sorted(set(self._hits.values()))
+
+    def close(self) -> None:
+        """Stop watching."""
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    def _scan(self) -> None:
+        """Glob every pattern and (re)arm watches on directories now present."""
+        if self._inotify is None:
+            self._hits = {path: path for path in find_sockets(self._globs)}
+            return
+        self._arm(self._inotify)
+        hits: dict[str, str] = {}
+        with phase("sockets"):
+            for directory, name in self._patterns:
+                try:
+                    entries = os.listdir(directory)
+                except OSError:
+                    continue
+                for entry in fnmatch.filter(entries, name):
+                    path = f"{directory}/{entry}"
+                    resolved = self._check(path)
+                    if resolved is not None:
+                        hits[path] = resolved
+        self._hits = hits
+
+    def _arm(self, inotify: Inotify) -> None:
+        """Watch each socket directory, or its parent while it is missing.
+
+        A watch on the parent only notices the socket directory being created
+        (tmux makes ``/tmp/tmux-<uid>`` on its first start); the glob that
+        follows then watches the directory itself.
+
+        Args:
+            inotify: Instance to add watches to.
+        """
+        for directory, _ in self._patterns:
+            for target in (directory, os.path.dirname(directory)):
+                try:
+                    wd = inotify.add_watch(target, _WATCH_MASK | IN_ONLYDIR)
+                except OSError:
+                    continue
+                self._watches[wd] = target
+                break
+
+    def _drain(self, inotify: Inotify) -> bool:
+        """Apply queued events to the set.
+
+        Args:
+            inotify: Instance to read from.
+
+        Returns:
+            True when an event calls for a full glob: a lost event, a watched
+            directory going away, or a socket directory appearing.
+        """
+        rescan = False
+        for wd, mask, name in inotify.read():
+            if mask & _RESCAN_EVENTS:
+                if mask & IN_IGNORED:
+                    self._watches.pop(wd, None)
+                rescan = True
+                continue
+            directory = self._watches.get(wd)
+            if directory is None or not name:
+                continue
+            path = f"{directory}/{name}"
+            for watched, pattern in self._patterns:
+                if path == watched:
+                    rescan = True
+                elif directory == watched and fnmatch.fnmatch(name, pattern):
+                    resolved = self._check(path) if mask & _ARRIVALS else None
+                    if resolved is None:
+                        self._hits.pop(path, None)
+                    else:
+                        self._hits[path] = resolved
+        return rescan
+
+    @staticmethod
+    def _check(path: str) -> str | None:
+        """Resolve a path if it is a unix socket.
+
+        Args:
+            path: Candidate socket path.
+
+        Returns:
+            The resolved path, or None when it is missing or not a socket.
+        """
+        try:
+            resolved = resolve_socket_path(path)
+            if stat.S_ISSOCK(Path(resolved).stat().st_mode):
+                return resolved
+        except OSError:
+            pass
+        return None
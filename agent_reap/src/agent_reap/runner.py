@@ -3,12 +3,19 @@
 Every external command in this package goes through a ``Runner``. Tests inject a
 recorded runner so no test ever shells out to a real tmux or signals a real
 process — a hard requirement for a tool whose job is killing things.
+
+``AsyncRunner`` is the same seam for the async discovery pipeline: tmux probes
+and ``ps`` run as concurrent asyncio subprocesses instead of on threads, and
+``threaded`` lifts any ``Runner`` — a recorded one included — onto it.
+``asyncio`` is imported only once an async runner is actually called: it is
+the single most expensive import in the package, and the ``SessionEnd`` hook's
+team-scoped path never needs it.
 """
 
 from __future__ import annotations
 
 import subprocess
-from collections.abc import Sequence
+from collections.abc import Awaitable, Sequence
 from dataclasses import dataclass, field
 from typing import Protocol
 
@@ -54,6 +61,21 @@ class Runner(Protocol):
         ...
 
 
+class AsyncRunner(Protocol):
+    """Awaitable counterpart of ``Runner``."""
+
+    def __call__(self, argv: Sequence[str]) -> Awaitable[Result]:
+        """Execute a command.
+
+        Args:
+            argv: Full argument vector, program first.
+
+        Returns:
+            An awaitable of the command's result.
+        """
+        ...
+
+
 def subprocess_runner(argv: Sequence[str]) -> Result:
     """Execute a command with ``subprocess``.
 
@@ -88,6 +110,91 @@ def subprocess_runner(argv: Sequence[str]) -> Result:
     )
 
 
+async def async_subprocess_runner(argv: Sequence[str]) -> Result:
+    """Execute a command as an asyncio subprocess.
+
+    Results match ``subprocess_runner``, timeouts and missing executables
+    included. A cancelled call — a probe that missed a discovery deadline —
+    kills its child instead of leaving it running past the caller.
+
+    Args:
+        argv: Full argument vector, program first.
+
+    Returns:
+        The command's result.
+    """
+    import asyncio
+
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *argv,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+    except (FileNotFoundError, PermissionError) as exc:
+        return Result(returncode=127, stderr=str(exc))
+    try:
+        stdout, stderr = await asyncio.wait_for(
+            proc.communicate(), COMMAND_TIMEOUT_SECONDS
+        )
+        returncode = await proc.wait()
+    except TimeoutError:
+        return Result(
+            returncode=124,
+            stderr=f"command timed out after {COMMAND_TIMEOUT_SECONDS:g}s",
+        )
+    finally:
+        if proc.returncode is None:
+            proc.kill()
+            await asyncio.shield(proc.wait())
+    return Result(
+        returncode=returncode,
+        stdout=stdout.decode(errors="replace").strip("\n"),
+        stderr=stderr.decode(errors="replace").strip("\n"),
+    )
+
+
+def threaded(runner: Runner) -> AsyncRunner:
+    """Run a synchronous runner on the default executor.
+
+    A cancelled call stops being awaited, but the thread finishes its command;
+    the event loop's shutdown waits for it.
+
+    Args:
+        runner: Command executor to adapt.
+
+    Returns:
+        An async runner delegating to ``runner``.
+    """
+
+    async def run(argv: Sequence[str]) -> Result:
+        import asyncio
+
+        return await asyncio.to_thread(runner, argv)
+
+    return run
+
+
+def _best_match[V](table: dict[str, V], argv: Sequence[str]) -> V | None:
+    """Look up the longest joined-argv prefix in a table.
+
+    Args:
+        table: Joined argv prefixes mapped to values.
+        argv: Full argument vector, program first.
+
+    Returns:
+        The value for the longest matching prefix, or None when none match.
+    """
+    joined = " ".join(argv)
+    best: V | None = None
+    best_len = -1
+    for prefix, value in table.items():
+        if joined.startswith(prefix) and len(prefix) > best_len:
+            best, best_len = value, len(prefix)
+    return best
+
+
 @dataclass
 class RecordingRunner:
     """Test double that replays canned output and records every invocation.
@@ -115,10 +222,43 @@ class RecordingRunner:
         """
         argv = list(argv)
         self.calls.append(argv)
-        joined = " ".join(argv)
-        best: Result | None = None
-        best_len = -1
-        for prefix, result in self.responses.items():
-            if joined.startswith(prefix) and len(prefix) > best_len:
-                best, best_len = result, len(prefix)
+        best = _best_match(self.responses, argv)
+        return best if best is not None else self.default
+
+
+@dataclass
+class AsyncRecordingRunner:
+    """Async test double: ``RecordingRunner`` semantics plus per-command delays.
+
+    Attributes:
+        responses: Maps a joined argv prefix to the result to return; the
+            longest matching prefix wins.
+        delays: Maps a joined argv prefix to seconds to wait before answering,
+            standing in for a slow or wedged command; the longest match wins.
+        calls: Every argv this runner was asked to execute, in order.
+        default: Result returned when no prefix matches.
+    """
+
+    responses: dict[str, Result] = field(default_factory=dict)
+    delays: dict[str, float] = field(default_factory=dict)
+    calls: list[list[str]] = field(default_factory=list)
+    default: Result = Result(returncode=1)
+
+    async def __call__(self, argv: Sequence[str]) -> Result:
+        """Record the call, wait out any delay, and return the canned result.
+
+        Args:
+            argv: Full argument vector, program first.
+
+        Returns:
+            The canned result for the longest matching prefix, else ``default``.
+        """
+        argv = list(argv)
+        self.calls.append(argv)
+        delay = _best_match(self.delays, argv)
+        if delay is not None:
+            import asyncio
+
+            await asyncio.sleep(delay)
+        best = _best_match(self.responses, argv)
         return best if best is not None else self.default
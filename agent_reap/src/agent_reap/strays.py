@@ -8,22 +8,39 @@ of process escape that entirely:
   closing the pane does nothing to it.
 * **disowned or nohup'd descendants** — the only measured path by which ``^D``
   can leave something behind. A plain ``sleep &`` is SIGHUP'd and does *not*
-  survive; ``disown``/``nohup`` reparent to init and do.
+  survive; ``disown``/``nohup`` reparent to init and do. On Linux they are found
+  from kernel data (``kernel_disowned``); elsewhere from an argv allowlist
+  (``disowned_descendants``).
 
 Both are report-only. The second doubles as an instrument: a non-zero count is the
 evidence that would revive the "Ctrl+D orphans processes" hypothesis, which
 otherwise measures as false.
+
+Each live control socket is probed with ``ssh -O check``, and a master whose
+peer has gone away can take the full command timeout to answer. Probes therefore
+run concurrently under one deadline, and verdicts are cached by socket inode and
+mtime: a master restarted on the same path gets a new socket, so a cached verdict
+can never describe a different process.
 """
 
 from __future__ import annotations
 
+import json
+import os
 import re
-from collections.abc import Sequence
-from dataclasses import dataclass
+import time
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass, replace
+from functools import partial
 from pathlib import Path
 
-from .discover import Process
+from .discover import Pane, Process, ProcessSnapshot
+from .pool import DEFAULT_WORKERS, run_bounded
+from .procfs import PROC_ROOT, available, identities, start_ticks
 from .runner import Runner
+from .timings import phase
+
+PROBE_CACHE_FILE = "ssh-checks.json"
 
 _MUX_RE = re.compile(r"^ssh: (?P<path>\S+) \[mux\]")
 
@@ -40,6 +57,8 @@ class ControlMaster:
         pid: Owning ``[mux]`` process id, when one is running.
         elapsed_s: Age of the master process in seconds.
         responding: Whether ``ssh -O check`` succeeded, when probed.
+        timed_out: Whether the probe missed the deadline; ``responding`` is then
+            None.
     """
 
     socket: str
@@ -47,6 +66,7 @@ class ControlMaster:
     pid: int | None = None
     elapsed_s: int = 0
     responding: bool | None = None
+    timed_out: bool = False
 
     @property
     def stale(self) -> bool:
@@ -58,10 +78,140 @@ class ControlMaster:
         return self.socket_exists != (self.pid is not None)
 
 
+class ProbeCache:
+    """``ssh -O check`` verdicts kept across runs.
+
+    An entry is valid while the socket keeps the inode and mtime it had when
+    probed, and for at most ``ttl_s`` seconds. Timed-out probes are never
+    cached: the next run asks again.
+    """
+
+    def __init__(
+        self,
+        ttl_s: float,
+        entries: Mapping[str, tuple[int, int, float, bool]] | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """Create a cache.
+
+        Args:
+            ttl_s: Longest a verdict is trusted without a fresh probe.
+            entries: Verdicts keyed by socket path, as ``(inode, mtime_ns,
+                probed_at, responding)``.
+            clock: Wall clock; verdicts outlive the process that took them.
+        """
+        self._ttl_s = ttl_s
+        self._clock = clock
+        self._entries = dict(entries or {})
+        self.dirty = False
+
+    @classmethod
+    def load(
+        cls, path: Path, ttl_s: float, clock: Callable[[], float] = time.time
+    ) -> ProbeCache:
+        """Read a cache file.
+
+        Args:
+            path: Cache file.
+            ttl_s: Longest a verdict is trusted without a fresh probe.
+            clock: Wall clock.
+
+        Returns:
+            The cache; empty when the file is missing or unreadable.
+        """
+        try:
+            raw = json.loads(path.read_text(encoding="utf-8"))
+        except OSError:
+            raw = {}
+        except ValueError:
+            raw = {}
+        entries: dict[str, tuple[int, int, float, bool]] = {}
+        if isinstance(raw, dict):
+            for socket, entry in raw.items():
+                if (
+                    isinstance(entry, list)
+                    and len(entry) == 4
+                    and all(isinstance(v, (int, float)) for v in entry[:3])
+                    and isinstance(entry[3], bool)
+                ):
+                    inode, mtime_ns, probed_at, responding = entry
+                    entries[socket] = (
+                        int(inode),
+                        int(mtime_ns),
+                        float(probed_at),
+                        responding,
+                    )
+        return cls(ttl_s, entries, clock)
+
+    def get(self, socket: str, inode: int, mtime_ns: int) -> bool | None:
+        """Return a verdict still valid for this socket.
+
+        Args:
+            socket: Control socket path.
+            inode: Its current inode.
+            mtime_ns: Its current mtime.
+
+        Returns:
+            Whether it responded, or None when absent, changed, or expired.
+        """
+        entry = self._entries.get(socket)
+        if entry is None:
+            return None
+        seen_inode, seen_mtime_ns, probed_at, responding = entry
+        if (seen_inode, seen_mtime_ns) != (inode, mtime_ns):
+            return None
+        if self._clock() - probed_at > self._ttl_s:
+            return None
+        return responding
+
+    def put(self, socket: str, inode: int, mtime_ns: int, responding: bool) -> None:
+        """Remember a fresh verdict.
+
+        Args:
+            socket: Control socket path.
+            inode: Its inode when probed.
+            mtime_ns: Its mtime when probed.
+            responding: Whether ``ssh -O check`` succeeded.
+        """
+        self._entries[socket] = (inode, mtime_ns, self._clock(), responding)
+        self.dirty = True
+
+    def dumps(self) -> str:
+        """Serialize the unexpired verdicts.
+
+        Returns:
+            JSON text for the cache file.
+        """
+        now = self._clock()
+        return json.dumps(
+            {
+                socket: list(entry)
+                for socket, entry in sorted(self._entries.items())
+                if now - entry[2] <= self._ttl_s
+            }
+        )
+
+
+def check_master(socket: str, runner: Runner) -> bool:
+    """Ask a control master whether it is alive.
+
+    Args:
+        socket: Control socket path.
+        runner: Command executor. Called from worker threads.
+
+    Returns:
+        Whether ``ssh -O check`` succeeded.
+    """
+    return runner(["ssh", "-O", "check", "-o", f"ControlPath={socket}", "dummy"]).ok
+
+
 def control_masters(
     ssh_dir: Path,
-    processes: dict[int, Process],
+    processes: Mapping[int, Process],
     runner: Runner | None = None,
+    workers: int = DEFAULT_WORKERS,
+    deadline_s: float | None = None,
+    cache: ProbeCache | None = None,
 ) -> list[ControlMaster]:
     """Inventory ssh control masters from both directions.
 
@@ -73,6 +223,10 @@ def control_masters(
         processes: Process table keyed by pid.
         runner: Optional executor; when given, each live socket is probed with
             ``ssh -O check``.
+        workers: Upper bound on concurrent probes.
+        deadline_s: Budget for every probe together, or None to wait for all.
+            A master still silent when it runs out is marked timed out.
+        cache: Verdicts to answer from and record into.
 
     Returns:
         One entry per socket or ``[mux]`` process, sorted by socket path.
@@ -101,23 +255,171 @@ def control_masters(
         )
 
     if runner is not None:
-        for path, master in list(by_socket.items()):
+        stamps: dict[str, tuple[int, int]] = {}
+        unprobed: list[str] = []
+        for path, master in by_socket.items():
             if not master.socket_exists:
                 continue
-            ok = runner(["ssh", "-O", "check", "-o", f"ControlPath={path}", "dummy"]).ok
-            by_socket[path] = ControlMaster(
-                socket=master.socket,
-                socket_exists=master.socket_exists,
-                pid=master.pid,
-                elapsed_s=master.elapsed_s,
-                responding=ok,
+            try:
+                st = os.stat(path)
+            except OSError:
+                unprobed.append(path)
+                continue
+            stamps[path] = (st.st_ino, st.st_mtime_ns)
+            cached = None if cache is None else cache.get(path, *stamps[path])
+            if cached is None:
+                unprobed.append(path)
+            else:
+                by_socket[path] = replace(master, responding=cached)
+        with phase("ssh-check"):
+            verdicts = run_bounded(
+                partial(check_master, runner=runner), unprobed, workers, deadline_s
             )
+        for path, ok in zip(unprobed, verdicts, strict=True):
+            if ok is None:
+                by_socket[path] = replace(by_socket[path], timed_out=True)
+                continue
+            by_socket[path] = replace(by_socket[path], responding=ok)
+            if cache is not None and path in stamps:
+                cache.put(path, *stamps[path], ok)
 
     return [by_socket[k] for k in sorted(by_socket)]
 
 
+@dataclass(frozen=True)
+class Disowned:
+    """A user-owned process reparented to init that no pane accounts for.
+
+    Attributes:
+        process: The process row.
+        exe: Resolved executable, when read from procfs.
+        session: Session id it inherited from the shell that spawned it, when
+            read from procfs.
+        pane: The live pane whose leader heads that session, when there is one.
+            None with a session means the spawning shell has exited: the pane
+            it ran in is gone, and this is what it left behind.
+    """
+
+    process: Process
+    exe: str | None = None
+    session: int | None = None
+    pane: Pane | None = None
+
+
+def _user_manager(process: Process | None) -> bool:
+    """Whether a process is a per-user ``systemd``, which adopts orphans."""
+    if process is None:
+        return False
+    argv = process.command.split()
+    return bool(argv) and Path(argv[0]).name == "systemd" and "--user" in argv
+
+
+def kernel_disowned(
+    processes: Mapping[int, Process],
+    panes: Sequence[Pane],
+    uid: int,
+    proc_root: Path = PROC_ROOT,
+) -> list[Disowned]:
+    """Find disowned descendants from kernel data rather than argv.
+
+    The argv allowlist misses a process that rewrites its argv and cannot tell a
+    daemon from an orphan. The kernel can: an orphan keeps the session id of
+    the shell that spawned it, while a daemon calls ``setsid`` and leads its own
+    session. So a stray here is a process adopted by init (or a ``systemd
+    --user`` subreaper) that is not a pane leader, is owned by ``uid`` per its
+    real uid, resolves to an executable, and does not lead its session.
+    Session 0 belongs to processes started outside any login or terminal, so
+    those are not shell descendants either.
+
+    The session then links it back to a pane: a live pane whose leader heads
+    that session — and started no later than the stray, so a recycled pid
+    cannot match — is the one it escaped from.
+
+    Args:
+        processes: Process table keyed by pid, the one pass over every row.
+        panes: Live panes; their leaders head the sessions strays come from.
+        uid: Real user id that owns strays.
+        proc_root: procfs mount point.
+
+    Returns:
+        Strays sorted by pid.
+    """
+    leaders = {pane.pid: pane for pane in panes}
+    if isinstance(processes, ProcessSnapshot):
+        rows: Sequence[tuple[int, int]] = list(
+            zip(processes.pids, processes.ppids, strict=True)
+        )
+    else:
+        rows = [(p.pid, p.ppid) for p in processes.values()]
+    adopters: dict[int, bool] = {1: True}
+    orphans = []
+    for pid, ppid in rows:
+        if pid in leaders or pid == ppid:
+            continue
+        if ppid not in adopters:
+            adopters[ppid] = _user_manager(processes.get(ppid))
+        if adopters[ppid]:
+            orphans.append(pid)
+
+    found = identities(orphans, proc_root)
+    mine = {
+        pid: identity
+        for pid, identity in found.items()
+        if identity.uid == uid and identity.session not in (0, pid)
+    }
+    starts = start_ticks(
+        {i.session for i in mine.values() if i.session in leaders}, proc_root
+    )
+    strays: list[Disowned] = []
+    for pid in sorted(mine):
+        identity = mine[pid]
+        pane = leaders.get(identity.session)
+        started = starts.get(identity.session)
+        if started is None or started > identity.start_ticks:
+            pane = None
+        strays.append(
+            Disowned(
+                process=processes[pid],
+                exe=identity.exe,
+                session=identity.session,
+                pane=pane,
+            )
+        )
+    return strays
+
+
+def find_disowned(
+    processes: Mapping[int, Process],
+    panes: Sequence[Pane],
+    backend: str,
+    interest_prefixes: Sequence[str],
+    proc_root: Path = PROC_ROOT,
+) -> list[Disowned]:
+    """Find disowned descendants with the configured backend.
+
+    Args:
+        processes: Process table keyed by pid.
+        panes: Live panes.
+        backend: ``"proc"`` for kernel data, ``"command"`` for the argv
+            allowlist, or ``"auto"`` to prefer kernel data when procfs is
+            mounted.
+        interest_prefixes: Executable path prefixes for the allowlist.
+        proc_root: procfs mount point.
+
+    Returns:
+        Strays sorted by pid.
+    """
+    if backend == "proc" or (backend == "auto" and available(proc_root)):
+        return kernel_disowned(processes, panes, os.getuid(), proc_root)
+    pane_pids = {pane.pid for pane in panes}
+    return [
+        Disowned(process)
+        for process in disowned_descendants(processes, pane_pids, interest_prefixes)
+    ]
+
+
 def disowned_descendants(
-    processes: dict[int, Process],
+    processes: Mapping[int, Process],
     pane_pids: set[int],
     interest_prefixes: Sequence[str],
 ) -> list[Process]:
@@ -9,9 +9,14 @@ had traffic. Both conditions are required before a pane is reapable: drained but
 
 from __future__ import annotations
 
+import os
+import time
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass
 from pathlib import Path
 
+from .timings import phase
+
 # An empty JSON container ("{}" or "[]"). Anything larger is queued work.
 DRAINED_MAX_BYTES = 2
 
@@ -90,3 +95,181 @@ def session_exists(teams_dir: Path, session_id: str) -> bool:
         True when the session directory exists.
     """
     return (teams_dir.expanduser() / f"session-{session_id}").is_dir()
+
+
+# Inbox file stem -> (size, mtime).
+type _Entries = dict[str, tuple[int, float]]
+
+
+class TeamsCache:
+    """Inbox listings kept across reports by a long-running caller.
+
+    A listing is reused while its ``inboxes/`` directory keeps the same mtime —
+    creating, deleting, or renaming an inbox changes it, so one ``stat`` of the
+    directory replaces a scan. Rewriting an inbox *in place* does not touch the
+    directory, so listings also expire after ``max_age_s``, which bounds how
+    stale a size or mtime can get.
+    """
+
+    def __init__(
+        self, max_age_s: float, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        """Create an empty cache.
+
+        Args:
+            max_age_s: Longest a listing is trusted without a rescan.
+            clock: Monotonic clock for listing age.
+        """
+        self._max_age_s = max_age_s
+        self._clock = clock
+        self._listings: dict[str, tuple[int, float, _Entries]] = {}
+
+    def get(self, session_id: str, mtime_ns: int) -> _Entries | None:
+        """Return a listing still valid for this directory mtime.
+
+        Args:
+            session_id: Team session id.
+            mtime_ns: Current mtime of the session's ``inboxes/`` directory.
+
+        Returns:
+            The cached entries, or None when absent, changed, or expired.
+        """
+        cached = self._listings.get(session_id)
+        if cached is None:
+            return None
+        seen_mtime_ns, scanned_at, entries = cached
+        if seen_mtime_ns != mtime_ns or self._clock() - scanned_at > self._max_age_s:
+            return None
+        return entries
+
+    def put(self, session_id: str, mtime_ns: int, entries: _Entries) -> None:
+        """Remember a fresh listing.
+
+        Args:
+            session_id: Team session id.
+            mtime_ns: Mtime of the ``inboxes/`` directory when scanned.
+            entries: Inbox stems mapped to size and mtime.
+        """
+        self._listings[session_id] = (mtime_ns, self._clock(), entries)
+
+
+class TeamsIndex:
+    """Inbox state for every teammate of a report, one scan per session.
+
+    ``read_inbox`` and ``session_exists`` cost a path build plus a ``stat`` or
+    ``is_dir`` per pane; on a network-mounted home each is a round trip. This
+    lists each referenced session's ``inboxes/`` once with ``os.scandir`` and
+    answers from memory. The entries are stat'ed during the scan, while an NFS
+    client still holds the attributes ``READDIRPLUS`` returned with the listing.
+    """
+
+    def __init__(self, teams_dir: Path, cache: TeamsCache | None = None) -> None:
+        """Prepare an index; nothing is read until the first lookup.
+
+        Args:
+            teams_dir: Root holding ``session-<id>/inboxes/``.
+            cache: Listings shared across indexes, for long-running callers.
+        """
+        self.root = teams_dir.expanduser()
+        self._cache = cache
+        self._entries: dict[str, _Entries | None] = {}
+        self._sessions: dict[str, bool] = {}
+
+    def session_exists(self, session_id: str) -> bool:
+        """Whether a team session directory is present.
+
+        Args:
+            session_id: Team session id.
+
+        Returns:
+            True when the session directory exists.
+        """
+        if self._listing(session_id) is not None:
+            return True
+        if session_id not in self._sessions:
+            self._sessions[session_id] = (self.root / f"session-{session_id}").is_dir()
+        return self._sessions[session_id]
+
+    def inbox(self, session_id: str, agent_name: str) -> Inbox:
+        """Look up one teammate's inbox state.
+
+        Args:
+            session_id: Team session id.
+            agent_name: Teammate name, matching the inbox filename.
+
+        Returns:
+            The same state ``read_inbox`` would report.
+        """
+        path = self.root / f"session-{session_id}" / "inboxes" / f"{agent_name}.json"
+        entry = (self._listing(session_id) or {}).get(agent_name)
+        if entry is None:
+            return Inbox(path=path, exists=False)
+        size, mtime = entry
+        return Inbox(path=path, exists=True, size=size, mtime=mtime)
+
+    def prefetch(self, session_ids: Iterable[str]) -> None:
+        """Scan several sessions ahead of the lookups that will need them.
+
+        Lets a caller move the inbox stats off its own thread while other
+        discovery is still in flight.
+
+        Args:
+            session_ids: Team session ids.
+        """
+        for session_id in session_ids:
+            self._listing(session_id)
+
+    def _listing(self, session_id: str) -> _Entries | None:
+        """Scan a session's inboxes once, or reuse a still-valid listing.
+
+        Args:
+            session_id: Team session id.
+
+        Returns:
+            Inbox stems mapped to size and mtime, or None when the session has
+            no readable ``inboxes/`` directory.
+        """
+        if session_id in self._entries:
+            return self._entries[session_id]
+        directory = self.root / f"session-{session_id}" / "inboxes"
+        entries: _Entries | None = None
+        try:
+            with phase("inboxes"):
+                if self._cache is None:
+                    entries = _scan(directory)
+                else:
+                    mtime_ns = os.stat(directory).st_mtime_ns
+                    entries = self._cache.get(session_id, mtime_ns)
+                    if entries is None:
+                        entries = _scan(directory)
+                        self._cache.put(session_id, mtime_ns, entries)
+        except OSError:
+            entries = None
+        self._entries[session_id] = entries
+        return entries
+
+
+def _scan(directory: Path) -> _Entries:
+    """List the inbox files of one session.
+
+    Args:
+        directory: A session's ``inboxes/`` directory.
+
+    Returns:
+        Inbox stems mapped to size and mtime. Files that vanish mid-scan are
+        left out.
+
+    Raises:
+        OSError: When the directory itself cannot be listed.
+    """
+    entries: _Entries = {}
+    with os.scandir(directory) as listing:
+        for entry in listing:
+            if not entry.name.endswith(".json"):
+                continue
+            try:
+                info = entry.stat()
+            except OSError:
+                continue
+            entries[entry.name.removesuffix(".json")] = (info.st_size, info.st_mtime)
+    return entries
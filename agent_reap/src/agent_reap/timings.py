@@ -0,0 +1,250 @@
+"""Per-phase timing instrumentation.
+
+A slow ``SessionEnd`` hook could be spending its time in the socket glob, the
+tmux probes, ``ps``, classification, inbox stats, or revalidation, and nothing
+in the output says which. Phases are marked where the work happens; while a
+collection is active, each phase records its wall time, how often it ran, the
+commands it spawned, and the bytes it parsed.
+
+State lives in ``contextvars``, so ``run_bounded`` carries the active collection
+and the enclosing phase onto its worker threads. Phases nest: a probe made
+during revalidation is recorded under ``revalidate/list-panes``, apart from the
+report's own ``list-panes``. With no collection active, ``phase`` hands back a
+shared no-op context manager and nothing is recorded, so instrumented code pays
+one context-variable lookup per phase.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import threading
+import time
+from collections.abc import Iterator, Sequence
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+from types import TracebackType
+
+from .runner import AsyncRunner, Result, Runner
+
+
+@dataclass
+class Phase:
+    """Totals for one phase across every time it ran.
+
+    Attributes:
+        wall_s: Summed wall time, nested phases included.
+        calls: Times the phase was entered.
+        spawns: Commands run while it was the innermost phase.
+        bytes: Output bytes parsed while it was the innermost phase.
+    """
+
+    wall_s: float = 0.0
+    calls: int = 0
+    spawns: int = 0
+    bytes: int = 0
+
+
+class Timings:
+    """Phase totals for one collection, safe to update from worker threads."""
+
+    def __init__(self) -> None:
+        """Start an empty collection on the current clock."""
+        self.started = time.perf_counter()
+        self.phases: dict[str, Phase] = {}
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        path: str,
+        wall_s: float = 0.0,
+        calls: int = 0,
+        spawns: int = 0,
+        nbytes: int = 0,
+    ) -> None:
+        """Add to a phase's totals, creating it on first use.
+
+        Args:
+            path: Slash-joined phase path.
+            wall_s: Wall time to add.
+            calls: Entries to add.
+            spawns: Spawned commands to add.
+            nbytes: Parsed bytes to add.
+        """
+        with self._lock:
+            phase = self.phases.setdefault(path, Phase())
+            phase.wall_s += wall_s
+            phase.calls += calls
+            phase.spawns += spawns
+            phase.bytes += nbytes
+
+    @property
+    def total_s(self) -> float:
+        """Wall time since the collection started.
+
+        Returns:
+            Elapsed seconds.
+        """
+        return time.perf_counter() - self.started
+
+    def as_json(self) -> dict[str, object]:
+        """Serialize the collection.
+
+        Returns:
+            Total wall time and each phase's totals, in first-seen order.
+        """
+        with self._lock:
+            phases = {
+                path: {
+                    "wall_ms": round(phase.wall_s * 1000, 3),
+                    "calls": phase.calls,
+                    "spawns": phase.spawns,
+                    "bytes": phase.bytes,
+                }
+                for path, phase in self.phases.items()
+            }
+        return {"total_ms": round(self.total_s * 1000, 3), "phases": phases}
+
+
+_active: ContextVar[Timings | None] = ContextVar("agent_reap_timings", default=None)
+_path: ContextVar[str] = ContextVar("agent_reap_phase", default="")
+
+
+class _Timed:
+    """Context manager recording one entry into a phase."""
+
+    __slots__ = ("_name", "_path", "_start", "_timings", "_token")
+
+    def __init__(self, timings: Timings, name: str) -> None:
+        """Bind the phase to a collection."""
+        self._timings = timings
+        self._name = name
+        self._path = ""
+        self._start = 0.0
+        self._token: Token[str] | None = None
+
+    def __enter__(self) -> None:
+        """Start timing and make this the innermost phase."""
+        parent = _path.get()
+        self._path = f"{parent}/{self._name}" if parent else self._name
+        # Counted on entry, so a parent is listed ahead of its nested phases.
+        self._timings.record(self._path, calls=1)
+        self._token = _path.set(self._path)
+        self._start = time.perf_counter()
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Add the elapsed time and restore the enclosing phase."""
+        self._timings.record(self._path, wall_s=time.perf_counter() - self._start)
+        if self._token is not None:
+            _path.reset(self._token)
+
+
+_NOOP = contextlib.nullcontext()
+
+
+def phase(name: str) -> contextlib.AbstractContextManager[None]:
+    """Mark a block of work as a named phase.
+
+    Args:
+        name: Phase name, nested under any enclosing phase.
+
+    Returns:
+        A context manager; a shared no-op when no collection is active.
+    """
+    timings = _active.get()
+    if timings is None:
+        return _NOOP
+    return _Timed(timings, name)
+
+
+def parsed(nbytes: int) -> None:
+    """Credit parsed input that did not come from a spawned command.
+
+    Args:
+        nbytes: Bytes read and parsed, e.g. from procfs.
+    """
+    timings = _active.get()
+    if timings is not None:
+        timings.record(_path.get() or "other", nbytes=nbytes)
+
+
+def current() -> Timings | None:
+    """The active collection, if any.
+
+    Returns:
+        The collection, or None when timing is off.
+    """
+    return _active.get()
+
+
+@contextlib.contextmanager
+def collect() -> Iterator[Timings]:
+    """Activate a collection for the enclosed block.
+
+    Yields:
+        The collection, filled in as instrumented phases run.
+    """
+    timings = Timings()
+    token = _active.set(timings)
+    try:
+        yield timings
+    finally:
+        _active.reset(token)
+
+
+def instrument(runner: Runner) -> Runner:
+    """Wrap a runner so each command is credited to the innermost phase.
+
+    Only wrap when timing is wanted; the wrapper is what makes spawn and byte
+    counts visible, and an unwrapped runner costs nothing.
+
+    Args:
+        runner: Command executor to wrap.
+
+    Returns:
+        A runner recording one spawn and the output size per call.
+    """
+
+    def timed(argv: Sequence[str]) -> Result:
+        result = runner(argv)
+        _spawned(result)
+        return result
+
+    return timed
+
+
+def instrument_async(runner: AsyncRunner) -> AsyncRunner:
+    """Async counterpart of ``instrument``.
+
+    Args:
+        runner: Async command executor to wrap.
+
+    Returns:
+        An async runner recording one spawn and the output size per call.
+    """
+
+    async def timed(argv: Sequence[str]) -> Result:
+        result = await runner(argv)
+        _spawned(result)
+        return result
+
+    return timed
+
+
+def _spawned(result: Result) -> None:
+    """Credit one spawned command to the innermost phase.
+
+    Args:
+        result: The command's result.
+    """
+    timings = _active.get()
+    if timings is not None:
+        timings.record(
+            _path.get() or "other",
+            spawns=1,
+            nbytes=len(result.stdout.encode()),
+        )
@@ -0,0 +1,472 @@
+"""Long-running watch mode driven by tmux control-mode notifications.
+
+A one-shot run rescans everything: every socket, every pane, the whole process
+table. ``watch`` instead attaches one control-mode client (``tmux -C``) per
+server and keeps an in-memory pane model. A structural notification marks that
+server dirty; one ``list-panes -a`` then refreshes its model, and only panes
+whose row actually changed are classified again.
+
+Control mode has a blind spot this module works around rather than hides: tmux
+sends ``%layout-change`` — the notification a pane exit produces while its
+window survives — solely for windows linked to the client's own session. A
+teammate split dying in some *other* session's window is silent unless it
+happened to be the active pane. So a periodic
+resync re-lists every server and reclassifies every pane. It does double duty:
+idle thresholds are crossed by the clock, not by any event, and only a
+reclassification notices that.
+
+Nothing here kills. Callers receive classification changes and decide; a kill
+still goes through the normal revalidated path.
+"""
+
+from __future__ import annotations
+
+import os
+import selectors
+import subprocess
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from typing import Protocol
+
+from .classify import Candidate, Decision, Interactive, Report, Skipped
+from .config import DEFAULT_RESYNC_SECONDS, Config
+from .discover import Pane, Server, probe_server
+from .registry import DEFAULT_RESCAN_SECONDS, SocketRegistry
+from .runner import Runner
+
+# Notifications after which the pane population of a server may differ. Pane
+# exits surface as %layout-change (window survives) or a window close (it was
+# the last pane); new panes as %layout-change or a window add.
+STRUCTURAL_NOTIFICATIONS = frozenset(
+    {
+        "%layout-change",
+        "%window-add",
+        "%window-close",
+        "%unlinked-window-add",
+        "%unlinked-window-close",
+        "%window-pane-changed",
+        "%sessions-changed",
+        "%session-changed",
+        "%session-window-changed",
+    }
+)
+
+# Read-only so the watcher can never type into a pane, ignore-size so it never
+# shrinks a window to its own notional terminal, no-output so pane output is
+# not streamed to it.
+CONTROL_FLAGS = "read-only,ignore-size,no-output"
+
+type PaneKey = tuple[str, str]
+
+
+class Channel(Protocol):
+    """A source of control-mode lines for one server."""
+
+    def fileno(self) -> int:
+        """Return the descriptor to wait on for readable output."""
+        ...
+
+    def read_lines(self) -> list[str] | None:
+        """Read whatever complete lines are available.
+
+        Returns:
+            Complete lines, possibly none, or None once the stream has ended.
+        """
+        ...
+
+    def close(self) -> None:
+        """Release the channel."""
+        ...
+
+
+class FdChannel:
+    """Line splitting over a readable file descriptor.
+
+    ``read_lines`` is only called once a selector reports the descriptor
+    readable, so a single ``os.read`` never blocks. Buffering happens here
+    rather than in a file object: a buffered ``readline`` can swallow several
+    lines into its private buffer, after which the selector — which only sees
+    the kernel pipe — never fires for them.
+    """
+
+    def __init__(self, fd: int) -> None:
+        """Wrap a descriptor.
+
+        Args:
+            fd: Readable descriptor, owned by this channel from now on.
+        """
+        self._fd = fd
+        self._pending = b""
+
+    def fileno(self) -> int:
+        """Return the wrapped descriptor."""
+        return self._fd
+
+    def read_lines(self) -> list[str] | None:
+        """Read available output and split off complete lines.
+
+        Returns:
+            Complete lines, or None at end of stream.
+        """
+        data = os.read(self._fd, 65536)
+        if not data:
+            return None
+        *lines, self._pending = (self._pending + data).split(b"\n")
+        return [line.decode("utf-8", errors="replace") for line in lines]
+
+    def close(self) -> None:
+        """Close the descriptor."""
+        try:
+            os.close(self._fd)
+        except OSError:
+            pass
+
+
+class ControlChannel(FdChannel):
+    """A ``tmux -C`` client attached to one server."""
+
+    def __init__(self, socket: str) -> None:
+        """Attach a read-only control-mode client.
+
+        Args:
+            socket: Server socket path.
+        """
+        # stdin stays open for the channel's lifetime: EOF on it detaches the
+        # control client.
+        self._proc = subprocess.Popen(
+            [
+                "tmux",
+                "-S",
+                socket,
+                "-C",
+                "attach-session",
+                "-f",
+                CONTROL_FLAGS,
+            ],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        stdout = self._proc.stdout
+        if stdout is None:
+            raise RuntimeError("control-mode client has no stdout pipe")
+        super().__init__(os.dup(stdout.fileno()))
+        stdout.close()
+
+    def close(self) -> None:
+        """Detach the client and reap its process."""
+        super().close()
+        if self._proc.poll() is None:
+            self._proc.terminate()
+            try:
+                self._proc.wait(timeout=1)
+            except subprocess.TimeoutExpired:
+                self._proc.kill()
+                self._proc.wait()
+        if self._proc.stdin is not None:
+            self._proc.stdin.close()
+
+
+def notification(line: str) -> str | None:
+    """Extract the notification name from a control-mode line.
+
+    Args:
+        line: One line of control-mode output.
+
+    Returns:
+        The ``%name`` token, or None for command output inside a
+        ``%begin``/``%end`` block.
+    """
+    if not line.startswith("%"):
+        return None
+    return line.split(" ", 1)[0]
+
+
+def decision_kind(decision: Decision | None) -> str | None:
+    """Name the report bucket a decision falls into.
+
+    Args:
+        decision: A classification, or None for a pane that is not reported.
+
+    Returns:
+        ``"reapable"``, ``"interactive"``, ``"skipped"``, or None.
+    """
+    if isinstance(decision, Candidate):
+        return "reapable"
+    if isinstance(decision, Interactive):
+        return "interactive"
+    if isinstance(decision, Skipped):
+        return "skipped"
+    return None
+
+
+@dataclass(frozen=True)
+class Change:
+    """A pane that moved between report buckets.
+
+    Attributes:
+        key: ``(socket, pane_id)`` of the pane.
+        before: Previous classification, or None when it was not reported.
+        after: New classification, or None when it left the report.
+    """
+
+    key: PaneKey
+    before: Decision | None
+    after: Decision | None
+
+
+@dataclass
+class _Watched:
+    """Per-server state.
+
+    Attributes:
+        channel: Control-mode client for this server.
+        panes: Last listing, keyed by pane id.
+        dirty: Whether a notification arrived since the last listing.
+        listing: The liveness probe taken on attach, consumed by the first
+            refresh instead of listing the server a second time.
+    """
+
+    channel: Channel
+    panes: dict[str, Pane] = field(default_factory=dict)
+    dirty: bool = True
+    listing: Server | None = None
+
+
+class Watcher:
+    """In-memory pane model kept current from control-mode notifications."""
+
+    def __init__(
+        self,
+        config: Config,
+        runner: Runner,
+        evaluate: Callable[[list[Pane]], Report],
+        spawn: Callable[[str], Channel] = ControlChannel,
+        clock: Callable[[], float] = time.monotonic,
+        resync_s: float = DEFAULT_RESYNC_SECONDS,
+        rescan_s: float = DEFAULT_RESCAN_SECONDS,
+        registry: SocketRegistry | None = None,
+    ) -> None:
+        """Prepare a watcher; nothing is attached until the first ``step``.
+
+        Args:
+            config: Effective settings; ``socket_globs`` decide which servers
+                are watched.
+            runner: Command executor for pane listings.
+            evaluate: Classifies a batch of panes against a fresh process
+                snapshot. Called only with panes whose state changed.
+            spawn: Opens a control-mode channel for a socket.
+            clock: Monotonic clock driving resync and rescan schedules.
+            resync_s: Seconds between full re-lists and reclassifications.
+            rescan_s: Seconds between socket globs, which notice servers
+                appearing and disappearing. Ignored when ``registry`` is
+                given.
+            registry: Socket set to follow. Defaults to one that polls on
+                ``rescan_s``; an inotify-backed registry attaches to a new
+                server as soon as its socket is bound.
+        """
+        self._config = config
+        self._runner = runner
+        self._evaluate = evaluate
+        self._spawn = spawn
+        self._clock = clock
+        self._resync_s = resync_s
+        self._registry = registry or SocketRegistry(
+            config.resolved_globs(), clock=clock, rescan_s=rescan_s, notify=False
+        )
+        self._selector = selectors.DefaultSelector()
+        if self._registry.incremental:
+            # Registered with no data: readable means sockets came or went.
+            self._selector.register(self._registry, selectors.EVENT_READ)
+        self._servers: dict[str, _Watched] = {}
+        self._decisions: dict[PaneKey, Decision] = {}
+        self._next_resync = 0.0
+
+    @property
+    def sockets(self) -> tuple[str, ...]:
+        """Servers currently watched.
+
+        Returns:
+            Socket paths, sorted.
+        """
+        return tuple(sorted(self._servers))
+
+    def report(self) -> Report:
+        """Assemble a report from the current model without touching tmux.
+
+        Returns:
+            The latest classification of every watched pane.
+        """
+        ordered = [self._decisions[key] for key in sorted(self._decisions)]
+        return Report(
+            candidates=tuple(d for d in ordered if isinstance(d, Candidate)),
+            interactive=tuple(d for d in ordered if isinstance(d, Interactive)),
+            skipped=tuple(d for d in ordered if isinstance(d, Skipped)),
+            sockets=self.sockets,
+        )
+
+    def rescan(self) -> None:
+        """Attach to new servers and drop vanished ones."""
+        found = set(self._registry.sockets())
+        for socket in set(self._servers) - found:
+            self._drop(socket)
+        for socket in sorted(found - set(self._servers)):
+            server = probe_server(socket, self._runner)
+            if server.live:
+                channel = self._spawn(socket)
+                self._servers[socket] = _Watched(channel=channel, listing=server)
+                self._selector.register(channel, selectors.EVENT_READ, socket)
+
+    def step(self, timeout: float | None = None) -> list[Change]:
+        """Wait for notifications once and bring the model up to date.
+
+        Args:
+            timeout: Longest wait for a notification, in seconds. Capped by the
+                registry's next glob and the next resync.
+
+        Returns:
+            Panes whose report bucket changed, in key order.
+        """
+        before = dict(self._decisions)
+        now = self._clock()
+        # Cheap unless a glob is due: the registry only re-globs on its own
+        # schedule, and between globs it applies inotify events or nothing.
+        self.rescan()
+        resync = now >= self._next_resync
+        if resync:
+            self._next_resync = now + self._resync_s
+            for watched in self._servers.values():
+                watched.dirty = True
+
+        due = min(self._registry.deadline, self._next_resync) - now
+        wait = max(0.0, due if timeout is None else min(timeout, due))
+        if not any(w.dirty for w in self._servers.values()) and (
+            self._servers or self._registry.incremental
+        ):
+            for key, _ in self._selector.select(wait):
+                if key.data is not None:
+                    self._read(str(key.data))
+        elif not self._servers:
+            time.sleep(wait)
+
+        changed: list[Pane] = []
+        for socket in sorted(self._servers):
+            if self._servers[socket].dirty:
+                changed.extend(self._refresh(socket))
+        if resync:
+            changed = [p for w in self._servers.values() for p in w.panes.values()]
+        self._classify(changed)
+        return [
+            Change(key=key, before=before.get(key), after=self._decisions.get(key))
+            for key in sorted(before.keys() | self._decisions.keys())
+            if decision_kind(before.get(key)) != decision_kind(self._decisions.get(key))
+        ]
+
+    def close(self) -> None:
+        """Detach from every server."""
+        for socket in list(self._servers):
+            self._drop(socket)
+        self._selector.close()
+        self._registry.close()
+
+    def _read(self, socket: str) -> None:
+        """Consume a server's pending notifications.
+
+        Args:
+            socket: Server whose channel is readable.
+        """
+        watched = self._servers[socket]
+        lines = watched.channel.read_lines()
+        if lines is None:
+            self._reattach(socket)
+            return
+        for line in lines:
+            name = notification(line)
+            if name == "%exit":
+                self._reattach(socket)
+                return
+            if name in STRUCTURAL_NOTIFICATIONS:
+                watched.dirty = True
+
+    def _reattach(self, socket: str) -> None:
+        """Replace a control client that exited, if its server is still up.
+
+        A control client exits with its server, but also when the session it
+        attached to is destroyed (``detach-on-destroy``) — and a teammate
+        teardown destroys exactly such sessions. Only a failed probe means the
+        server is gone.
+
+        Args:
+            socket: Server whose client exited.
+        """
+        watched = self._servers[socket]
+        self._selector.unregister(watched.channel)
+        watched.channel.close()
+        server = probe_server(socket, self._runner)
+        if not server.live:
+            self._servers.pop(socket)
+            for pane_id in watched.panes:
+                self._decisions.pop((socket, pane_id), None)
+            return
+        watched.channel = self._spawn(socket)
+        watched.listing = server
+        watched.dirty = True
+        self._selector.register(watched.channel, selectors.EVENT_READ, socket)
+
+    def _refresh(self, socket: str) -> list[Pane]:
+        """Re-list one server and diff it against the model.
+
+        Args:
+            socket: Server to re-list.
+
+        Returns:
+            Panes that are new or whose row changed.
+        """
+        watched = self._servers[socket]
+        server = watched.listing or probe_server(socket, self._runner)
+        watched.listing = None
+        if not server.live:
+            self._drop(socket)
+            return []
+        fresh = {pane.pane_id: pane for pane in server.panes}
+        for pane_id in watched.panes.keys() - fresh.keys():
+            self._decisions.pop((socket, pane_id), None)
+        changed = [p for p in fresh.values() if watched.panes.get(p.pane_id) != p]
+        watched.panes = fresh
+        watched.dirty = False
+        return changed
+
+    def _classify(self, panes: Sequence[Pane]) -> None:
+        """Reclassify panes, replacing their previous decisions.
+
+        Args:
+            panes: Panes to classify.
+        """
+        if not panes:
+            return
+        report = self._evaluate(list(panes))
+        for pane in panes:
+            self._decisions.pop((pane.socket, pane.pane_id), None)
+        decisions: list[Decision] = [
+            *report.candidates,
+            *report.interactive,
+            *report.skipped,
+        ]
+        for decision in decisions:
+            key = (decision.pane.socket, decision.pane.pane_id)
+            self._decisions[key] = decision
+
+    def _drop(self, socket: str) -> None:
+        """Forget a server and detach its channel.
+
+        Args:
+            socket: Server to forget.
+        """
+        watched = self._servers.pop(socket, None)
+        if watched is None:
+            return
+        self._selector.unregister(watched.channel)
+        watched.channel.close()
+        for pane_id in watched.panes:
+            self._decisions.pop((socket, pane_id), None)
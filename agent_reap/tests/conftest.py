@@ -11,19 +11,23 @@ import json
 import os
 import socket as socketlib
 import tempfile
-from collections.abc import Iterator
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
 from pathlib import Path
 
 import pytest
 
+from agent_reap.classify import Candidate, Report, classify
 from agent_reap.config import Config
-from agent_reap.discover import Pane, Process
+from agent_reap.discover import Pane, Process, Teammate
 from agent_reap.runner import RecordingRunner, Result
+from agent_reap.teams import Inbox
+from agent_reap.watch import Channel, FdChannel
 
 NOW = 1_785_830_000.0
 
 # One tab-delimited pane row, matching the format string in discover.py.
-PANE_FORMAT_FIELDS = 8
+PANE_FORMAT_FIELDS = 10
 
 
 def pane_line(
@@ -35,6 +39,8 @@ def pane_line(
     activity: int | str,
     command: str,
     path: str,
+    session_windows: int = 1,
+    session_attached: int = 0,
 ) -> str:
     """Build one tmux ``list-panes`` output row.
 
@@ -47,6 +53,8 @@ def pane_line(
         activity: Window activity timestamp, or "" when absent.
         command: Pane current command.
         path: Pane current path.
+        session_windows: Window count of the owning session.
+        session_attached: Clients attached to the owning session.
 
     Returns:
         A tab-delimited row.
@@ -59,12 +67,18 @@ def pane_line(
             str(index),
             str(pid),
             str(activity),
+            str(session_windows),
+            str(session_attached),
             command,
             path,
         ]
     )
 
 
+# The teammate pane a watcher sees: %2, led by the process ``make_process`` builds.
+TEAMMATE = pane_line("%2", "devbox", 1, 2, 200, 10, "2.1.221", "/repo")
+
+
 def make_pane(
     pane_id: str = "%2",
     pid: int = 200,
@@ -142,6 +156,91 @@ def make_process(
     )
 
 
+def make_candidate(pane_id: str = "%2", socket: str = "/tmp/s") -> Candidate:
+    """Construct a reapable candidate for kill-path and bookkeeping tests.
+
+    Args:
+        pane_id: Stable pane id.
+        socket: Owning socket.
+
+    Returns:
+        A candidate wrapping synthetic pane and process rows.
+    """
+    return Candidate(
+        pane=make_pane(pane_id=pane_id, socket=socket),
+        process=make_process(),
+        teammate=Teammate(agent_name="docs-readme", session_id="abc123"),
+        inbox=Inbox(path=Path("/tmp/inbox.json"), exists=True, size=2, mtime=0.0),
+        idle_s=5400.0,
+    )
+
+
+def stat_line(
+    pid: int,
+    comm: str = "claude",
+    state: str = "S",
+    ppid: int = 100,
+    pgid: int | None = None,
+    tpgid: int | None = None,
+    start_ticks: int = 0,
+    rss_pages: int = 1000,
+) -> bytes:
+    """Build a ``/proc/<pid>/stat`` line with the fields the backend reads.
+
+    Args:
+        pid: Process id.
+        comm: Executable name, written inside parentheses.
+        state: Single-letter state.
+        ppid: Parent pid.
+        pgid: Process group; defaults to ``pid``.
+        tpgid: Terminal foreground group; defaults to the process group.
+        start_ticks: Start time in clock ticks since boot.
+        rss_pages: Resident pages.
+
+    Returns:
+        The raw stat contents.
+    """
+    group = pid if pgid is None else pgid
+    fields = [str(pid), f"({comm})", state, str(ppid), str(group), str(group), "0"]
+    fields.append(str(group if tpgid is None else tpgid))
+    fields.extend(["0"] * 13)  # flags .. itrealvalue
+    fields.extend([str(start_ticks), "0", str(rss_pages), "0"])
+    return (" ".join(fields) + "\n").encode()
+
+
+def write_proc(
+    root: Path, pid: int, stat: bytes, cmdline: bytes = b"claude\0--ide\0"
+) -> None:
+    """Populate one fake ``/proc/<pid>`` directory.
+
+    Args:
+        root: Fake procfs root.
+        pid: Process id.
+        stat: Raw stat contents.
+        cmdline: Raw NUL-separated argv.
+    """
+    directory = root / str(pid)
+    directory.mkdir(parents=True)
+    (directory / "stat").write_bytes(stat)
+    (directory / "cmdline").write_bytes(cmdline)
+
+
+@pytest.fixture(autouse=True)
+def config_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Keep the parsed-config cache out of the real ``~/.cache``.
+
+    Args:
+        tmp_path: Pytest temporary directory.
+        monkeypatch: Fixture used to point ``XDG_CACHE_HOME`` at it.
+
+    Returns:
+        The cache root.
+    """
+    root = tmp_path / "cache"
+    monkeypatch.setenv("XDG_CACHE_HOME", str(root))
+    return root
+
+
 @pytest.fixture
 def teams_dir(tmp_path: Path) -> Path:
     """Create a fake teams root.
@@ -242,3 +341,159 @@ def make_socket(path: Path) -> Path:
     sock.bind(str(path))
     sock.close()
     return path
+
+
+@dataclass(frozen=True)
+class Machine:
+    """A fully stubbed machine for CLI tests.
+
+    Attributes:
+        config_path: Config file wired to the fake socket and teams dirs.
+        runner: Runner stubbed for this machine's tmux and ps output.
+        socket: Path of the fake tmux socket.
+    """
+
+    config_path: Path
+    runner: RecordingRunner
+    socket: Path
+
+
+@pytest.fixture
+def wired(
+    tmp_path: Path, short_tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> Machine:
+    """Build a fake machine: one socket, one teammate pane, one drained inbox.
+
+    Args:
+        tmp_path: Pytest temporary directory for files.
+        short_tmp_path: Short directory, required for binding a unix socket.
+        monkeypatch: Fixture used to clear inherited session env vars.
+
+    Returns:
+        The stubbed machine.
+    """
+    monkeypatch.delenv("TMUX_PANE", raising=False)
+    monkeypatch.delenv("CLAUDE_SESSION_ID", raising=False)
+    monkeypatch.delenv("CODEX_COMPANION_SESSION_ID", raising=False)
+    monkeypatch.delenv("TMUX", raising=False)
+
+    sockets_dir = short_tmp_path / "s"
+    sockets_dir.mkdir()
+    sock_path = make_socket(sockets_dir / "default")
+
+    teams = tmp_path / "teams"
+    teams.mkdir()
+    write_inbox(teams, "abc123", "docs-readme", mtime=1.0)
+
+    config_path = tmp_path / "config.toml"
+    config_path.write_text(
+        "\n".join(
+            [
+                f'socket_globs = ["{sockets_dir}/*"]',
+                f'teams_dir = "{teams}"',
+                f'ssh_dir = "{tmp_path / "ssh"}"',
+                f'state_dir = "{tmp_path / "state"}"',
+                "teammate_idle_minutes = 30",
+                # The runner stubs ps; procfs would read the real machine.
+                'process_backend = "ps"',
+                'stray_backend = "command"',
+            ]
+        ),
+        encoding="utf-8",
+    )
+
+    row = pane_line(
+        "%2", "devbox", 1, 2, 200, 10, "2.1.221", "/repo", session_windows=3
+    )
+    runner = RecordingRunner(
+        responses={
+            f"tmux -S {sock_path} list-panes": Result(0, row),
+            "ps -eo": Result(
+                0,
+                "200 100 200 200 400000 Ss+ 01:40:24 "
+                "claude --agent-id docs-readme@session-abc123",
+            ),
+            f"tmux -S {sock_path} kill-pane": Result(0),
+        }
+    )
+    return Machine(config_path=config_path, runner=runner, socket=sock_path)
+
+
+@dataclass
+class Pipes:
+    """Fake control-mode clients: one pipe per attached socket.
+
+    Attributes:
+        writers: Write end of each socket's pipe, keyed by socket path.
+    """
+
+    writers: dict[str, int] = field(default_factory=dict)
+
+    def spawn(self, socket: str) -> Channel:
+        """Attach a fake client to ``socket``."""
+        read_fd, write_fd = os.pipe()
+        self.writers[socket] = write_fd
+        return FdChannel(read_fd)
+
+    def send(self, socket: str, *lines: str) -> None:
+        """Emit control-mode lines on ``socket``'s client."""
+        os.write(self.writers[socket], "".join(f"{line}\n" for line in lines).encode())
+
+    def close(self) -> None:
+        """Close every write end still open."""
+        for fd in self.writers.values():
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+
+@dataclass
+class Clock:
+    """Hand-advanced monotonic clock.
+
+    Attributes:
+        now: Current reading.
+    """
+
+    now: float = 1000.0
+
+    def __call__(self) -> float:
+        """Return the current reading."""
+        return self.now
+
+
+@pytest.fixture
+def pipes() -> Iterator[Pipes]:
+    """Provide fake control-mode clients, closed on teardown.
+
+    Yields:
+        The pipe registry.
+    """
+    registry = Pipes()
+    yield registry
+    registry.close()
+
+
+def make_evaluator(
+    config: Config, seen: list[list[str]]
+) -> Callable[[list[Pane]], Report]:
+    """Build a watcher's classifier over a fixed process table.
+
+    Args:
+        config: Effective settings.
+        seen: Receives the sorted pane ids of every batch classified.
+
+    Returns:
+        The classifier.
+    """
+
+    def evaluate(panes: list[Pane]) -> Report:
+        seen.append(sorted(p.pane_id for p in panes))
+        processes = {
+            200: make_process(pid=200),
+            300: make_process(pid=300, command="-zsh", rss_kb=10_000),
+        }
+        return classify(panes, processes, config, NOW, protected_pids=set())
+
+    return evaluate
@@ -0,0 +1,105 @@
+"""Reclaim budgets: size parsing, the cost model, and ``reap --reclaim``."""
+
+from __future__ import annotations
+
+import json
+from dataclasses import replace
+
+import pytest
+
+from agent_reap.budget import parse_size, plan_reclaim
+from agent_reap.classify import Candidate
+from agent_reap.cli import cli
+
+from .conftest import Machine, make_candidate, make_process
+
+GB = 1024**2
+
+
+def _sized(pane_id: str, gb: float, idle_s: float = 7200.0) -> Candidate:
+    """A candidate holding ``gb`` gigabytes, idle for ``idle_s``."""
+    return replace(
+        make_candidate(pane_id),
+        process=make_process(rss_kb=int(gb * GB)),
+        idle_s=idle_s,
+    )
+
+
+@pytest.mark.parametrize(
+    ("text", "kb"),
+    [
+        ("4G", 4 * GB),
+        ("4GiB", 4 * GB),
+        ("512mb", 512 * 1024),
+        ("1.5g", 3 * GB // 2),
+        ("4096B", 4),
+        ("1e3K", 1000),
+    ],
+)
+def test_sizes_are_binary_units(text: str, kb: int) -> None:
+    """Suffixes are binary and case-insensitive; ``B``/``iB`` are optional."""
+    assert parse_size(text) == kb
+
+
+def test_bare_numbers_are_megabytes_and_junk_is_refused() -> None:
+    """A bare number means MB; zero and text are errors."""
+    assert parse_size("300") == 300 * 1024
+    for bad in ("0G", "lots", "", "inf", "1e400", "nan", "4iB", "-1G", "512B"):
+        with pytest.raises(ValueError):
+            parse_size(bad)
+
+
+def test_plan_uses_fewest_kills_then_least_idle_risk() -> None:
+    """Two kills suffice; the fresh 3 GB pane is swapped for an older 2 GB one."""
+    candidates = (
+        _sized("%1", 3, idle_s=1800.0),
+        _sized("%2", 2),
+        _sized("%3", 2, idle_s=14400.0),
+        _sized("%4", 1),
+    )
+    plan = plan_reclaim(candidates, 4 * GB, threshold_s=1800.0)
+    assert [c.pane.pane_id for c in plan.chosen] == ["%3", "%2"]
+    assert plan.projected_kb == 4 * GB
+    assert plan.shortfall_kb == 0
+    assert plan.cost == pytest.approx(0.125 + 0.25)
+
+
+def test_plan_prefers_the_largest_pane_when_one_kill_is_enough() -> None:
+    """A single pane meeting the target beats any pair."""
+    candidates = (_sized("%1", 1), _sized("%2", 1), _sized("%3", 5))
+    plan = plan_reclaim(candidates, 2 * GB, threshold_s=1800.0)
+    assert [c.pane.pane_id for c in plan.chosen] == ["%3"]
+
+
+def test_plan_takes_everything_and_reports_the_shortfall() -> None:
+    """An unreachable target takes every candidate."""
+    plan = plan_reclaim((_sized("%1", 1), _sized("%2", 1)), 4 * GB, 1800.0)
+    assert len(plan.chosen) == plan.considered == 2
+    assert plan.shortfall_kb == 2 * GB
+    assert plan_reclaim((), GB, 1800.0).shortfall_kb == GB
+
+
+def test_reclaim_shows_the_plan_then_reports_what_was_achieved(
+    wired: Machine, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Dry run prints the plan; a kill reports achieved against projected."""
+    argv = ["--config", str(wired.config_path)]
+    assert cli([*argv, "reap", "--reclaim", "100M"], runner=wired.runner) == 0
+    out = capsys.readouterr().out
+    assert "plan: 1 of 1 candidates to free 100 MB — projected 391 MB" in out
+    assert "dry run — 391 MB would be reclaimed" in out
+    assert not any("kill-pane" in call for call in wired.runner.calls)
+
+    status = cli(
+        [*argv, "--json", "reap", "--reclaim", "100M", "--kill"], runner=wired.runner
+    )
+    assert status == 0
+    payload = json.loads(capsys.readouterr().out)
+    assert payload["plan"]["projected_kb"] == payload["plan"]["achieved_kb"] == 400_000
+    assert [o["killed"] for o in payload["outcomes"]] == [True]
+
+
+def test_reclaim_refuses_a_team_teardown(wired: Machine) -> None:
+    """A team teardown kills the whole team; a budget makes no sense there."""
+    argv = ["--config", str(wired.config_path), "reap", "--team", "abc123"]
+    assert cli([*argv, "--reclaim", "1G"], runner=wired.runner) == 2
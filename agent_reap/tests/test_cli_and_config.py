@@ -2,88 +2,27 @@
 
 from __future__ import annotations
 
+import argparse
 import json
-from dataclasses import dataclass
+import os
+from dataclasses import replace
 from pathlib import Path
 
 import pytest
 
-from agent_reap.cli import _revalidate_candidate, build_report, cli
+from agent_reap.cli import (
+    _revalidate_batch,
+    _revalidate_candidate,
+    _team_snapshot,
+    _teardown_batch,
+    build_report,
+    cli,
+)
 from agent_reap.config import Config, load_config
-from agent_reap.runner import RecordingRunner, Result
+from agent_reap.coordinator import Request
+from agent_reap.runner import Result
 
-from .conftest import NOW, make_socket, pane_line, write_inbox
-
-
-@dataclass(frozen=True)
-class Machine:
-    """A fully stubbed machine for CLI tests.
-
-    Attributes:
-        config_path: Config file wired to the fake socket and teams dirs.
-        runner: Runner stubbed for this machine's tmux and ps output.
-        socket: Path of the fake tmux socket.
-    """
-
-    config_path: Path
-    runner: RecordingRunner
-    socket: Path
-
-
-@pytest.fixture
-def wired(
-    tmp_path: Path, short_tmp_path: Path, monkeypatch: pytest.MonkeyPatch
-) -> Machine:
-    """Build a fake machine: one socket, one teammate pane, one drained inbox.
-
-    Args:
-        tmp_path: Pytest temporary directory for files.
-        short_tmp_path: Short directory, required for binding a unix socket.
-        monkeypatch: Fixture used to clear inherited session env vars.
-
-    Returns:
-        The stubbed machine.
-    """
-    monkeypatch.delenv("TMUX_PANE", raising=False)
-    monkeypatch.delenv("CLAUDE_SESSION_ID", raising=False)
-    monkeypatch.delenv("CODEX_COMPANION_SESSION_ID", raising=False)
-    monkeypatch.delenv("TMUX", raising=False)
-
-    sockets_dir = short_tmp_path / "s"
-    sockets_dir.mkdir()
-    sock_path = make_socket(sockets_dir / "default")
-
-    teams = tmp_path / "teams"
-    teams.mkdir()
-    write_inbox(teams, "abc123", "docs-readme", mtime=1.0)
-
-    config_path = tmp_path / "config.toml"
-    config_path.write_text(
-        "\n".join(
-            [
-                f'socket_globs = ["{sockets_dir}/*"]',
-                f'teams_dir = "{teams}"',
-                f'ssh_dir = "{tmp_path / "ssh"}"',
-                "teammate_idle_minutes = 30",
-            ]
-        ),
-        encoding="utf-8",
-    )
-
-    row = pane_line("%2", "devbox", 1, 2, 200, 10, "2.1.221", "/repo")
-    runner = RecordingRunner(
-        responses={
-            f"tmux -S {sock_path} list-sessions": Result(0, "devbox: 3 windows"),
-            f"tmux -S {sock_path} list-panes": Result(0, row),
-            "ps -eo": Result(
-                0,
-                "200 100 200 200 400000 Ss+ 01:40:24 "
-                "claude --agent-id docs-readme@session-abc123",
-            ),
-            f"tmux -S {sock_path} kill-pane": Result(0),
-        }
-    )
-    return Machine(config_path=config_path, runner=runner, socket=sock_path)
+from .conftest import NOW, Machine, pane_line, write_inbox
 
 
 def test_report_lists_the_candidate(
@@ -131,6 +70,14 @@ def test_reap_with_kill_flag_kills_by_pane_id(wired: Machine) -> None:
     assert kills[0][-1] == "%2"
 
 
+def test_report_spawns_one_tmux_client_per_socket(wired: Machine) -> None:
+    """A pane listing doubles as the liveness probe; nothing else asks tmux."""
+    cli(["--config", str(wired.config_path), "report"], runner=wired.runner)
+
+    tmux_calls = [c for c in wired.runner.calls if c[0] == "tmux"]
+    assert [c[3] for c in tmux_calls] == ["list-panes"]
+
+
 def test_revalidation_observes_activity_after_initial_report(wired: Machine) -> None:
     """Fresh output between reporting and killing invalidates the candidate."""
     config = load_config(wired.config_path).config
@@ -153,6 +100,59 @@ def test_revalidation_observes_activity_after_initial_report(wired: Machine) ->
     assert "window active" in reason
 
 
+def _second_teammate(wired: Machine, leader_pid: int = 201) -> None:
+    """Add a second idle teammate, %3, to the wired machine's only socket."""
+    config = load_config(wired.config_path).config
+    write_inbox(config.teams_dir, "abc123", "docs-api", mtime=1.0)
+    rows = [
+        pane_line("%2", "devbox", 1, 2, 200, 10, "2.1.221", "/repo"),
+        pane_line("%3", "devbox", 1, 3, leader_pid, 10, "2.1.221", "/repo"),
+    ]
+    wired.runner.responses[f"tmux -S {wired.socket} list-panes"] = Result(
+        0, "\n".join(rows)
+    )
+    wired.runner.responses["ps -eo"] = Result(
+        0,
+        "200 100 200 200 400000 Ss+ 01:40:24 "
+        "claude --agent-id docs-readme@session-abc123\n"
+        "201 100 201 201 300000 Ss+ 01:40:24 "
+        "claude --agent-id docs-api@session-abc123",
+    )
+
+
+def test_reap_round_takes_one_fresh_snapshot(wired: Machine) -> None:
+    """Revalidating several kills on one socket lists it once and reads ps once."""
+    _second_teammate(wired)
+
+    status = cli(
+        ["--config", str(wired.config_path), "reap", "--kill"], runner=wired.runner
+    )
+
+    calls = [" ".join(c) for c in wired.runner.calls]
+    assert status == 0
+    # One listing and one ps for the report, one of each for revalidation.
+    assert sum("list-panes" in c for c in calls) == 2
+    assert sum(c.startswith("ps ") for c in calls) == 2
+    kills = [c for c in calls if "kill-pane" in c]
+    assert len(kills) == 1
+    assert kills[0].count("kill-pane") == 2
+
+
+def test_batch_revalidation_rejects_a_replaced_leader(wired: Machine) -> None:
+    """A pane whose leader changed since the report is spared; its peer is not."""
+    _second_teammate(wired)
+    config = load_config(wired.config_path).config
+    initial = build_report(config, wired.runner, now=NOW)
+    assert [c.pane.pane_id for c in initial.candidates] == ["%2", "%3"]
+
+    _second_teammate(wired, leader_pid=999)
+    verdicts = _revalidate_batch(
+        initial.candidates, config=config, runner=wired.runner, team_scope=None, now=NOW
+    )
+
+    assert verdicts == [(True, ""), (False, "pane leader changed")]
+
+
 def test_json_reap_failure_is_nonzero_and_socket_qualified(
     wired: Machine, capsys: pytest.CaptureFixture[str]
 ) -> None:
@@ -221,6 +221,113 @@ def test_team_kill_runs_when_unattended_policy_is_enabled(wired: Machine) -> Non
     assert sum("kill-pane" in call for call in map(" ".join, wired.runner.calls)) == 1
 
 
+def test_team_snapshot_lists_only_the_team(wired: Machine) -> None:
+    """A teardown sends a filtered listing and no unfiltered one."""
+    config = load_config(wired.config_path).config
+
+    taken = _team_snapshot(config, wired.runner, "abc123")
+
+    listings = [c for c in wired.runner.calls if "list-panes" in c]
+    assert len(listings) == 1
+    assert "-f" in listings[0]
+    assert [pane.pane_id for pane in taken.panes] == ["%2"]
+
+
+def test_team_snapshot_can_list_everything(wired: Machine) -> None:
+    """With scoped discovery off a teardown lists servers as a report does."""
+    config = replace(load_config(wired.config_path).config, scoped_team_discovery=False)
+
+    _team_snapshot(config, wired.runner, "abc123")
+
+    assert all("-f" not in call for call in wired.runner.calls)
+
+
+def _second_team(wired: Machine) -> None:
+    """Add another team's teammate, %4, and a hook process under %2's leader."""
+    rows = [
+        pane_line("%2", "devbox", 1, 2, 200, 10, "2.1.221", "/repo"),
+        pane_line("%4", "devbox", 2, 1, 202, 10, "2.1.221", "/repo"),
+    ]
+    wired.runner.responses[f"tmux -S {wired.socket} list-panes"] = Result(
+        0, "\n".join(rows)
+    )
+    wired.runner.responses["ps -eo"] = Result(
+        0,
+        "200 100 200 200 400000 Ss+ 01:40:24 "
+        "claude --agent-id docs-readme@session-abc123\n"
+        "202 100 202 202 300000 Ss+ 01:40:24 "
+        "claude --agent-id docs-api@session-def456\n"
+        "300 200 300 200 1000 S+ 00:01 /bin/sh session-end.sh",
+    )
+
+
+def test_coordinated_teams_share_a_snapshot_and_a_kill_round(wired: Machine) -> None:
+    """Two teardowns batched together list once, read ps once, kill once."""
+    _second_team(wired)
+    config = load_config(wired.config_path).config
+    batch = [
+        Request(team="abc123", terms=(), pid=os.getpid()),
+        Request(team="def456", terms=(), pid=os.getpid()),
+    ]
+
+    replies = _teardown_batch(
+        argparse.Namespace(kill=True, json=True), config, wired.runner, batch
+    )
+
+    calls = [" ".join(c) for c in wired.runner.calls]
+    listings = [c for c in calls if "list-panes" in c]
+    # One listing and one ps for the batch, one of each for revalidation.
+    assert len(listings) == 2
+    assert all("#{||:" in c for c in listings)
+    assert sum(c.startswith("ps ") for c in calls) == 2
+    kills = [c for c in calls if "kill-pane" in c]
+    assert len(kills) == 1
+    assert kills[0].count("kill-pane") == 2
+    sessions = [[o["session"] for o in json.loads(r.output)] for r in replies]
+    assert sessions == [["abc123"], ["def456"]]
+    assert [r.status for r in replies] == [0, 0]
+
+
+def test_coordinator_protects_the_runs_it_serves(wired: Machine) -> None:
+    """A served hook's ancestry is as untouchable as the coordinator's own."""
+    _second_team(wired)
+    config = load_config(wired.config_path).config
+
+    replies = _teardown_batch(
+        argparse.Namespace(kill=True, json=True),
+        config,
+        wired.runner,
+        [Request(team="abc123", terms=(), pid=300)],
+    )
+
+    assert json.loads(replies[0].output) == []
+    assert not any("kill-pane" in call for call in map(" ".join, wired.runner.calls))
+
+
+def test_coordinated_team_kill_prints_like_a_lone_one(
+    wired: Machine, short_tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """With coordination on, a lone hook becomes the coordinator and kills."""
+    text = wired.config_path.read_text(encoding="utf-8")
+    state = next(line for line in text.splitlines() if line.startswith("state_dir"))
+    wired.config_path.write_text(
+        text.replace(state, f'state_dir = "{short_tmp_path / "st"}"')
+        + "\nkill_enabled = true\ncoordinate_teardowns = true\n"
+        + "coordinator_window_seconds = 0.05\n",
+        encoding="utf-8",
+    )
+
+    status = cli(
+        ["--config", str(wired.config_path), "reap", "--team", "abc123", "--kill"],
+        runner=wired.runner,
+    )
+
+    assert status == 0
+    assert "docs-readme" in capsys.readouterr().out
+    assert sum("kill-pane" in call for call in map(" ".join, wired.runner.calls)) == 1
+    assert not (short_tmp_path / "st" / "coordinator.sock").exists()
+
+
 def test_idle_minutes_override_spares_a_fresh_inbox(
     wired: Machine, capsys: pytest.CaptureFixture[str]
 ) -> None:
@@ -327,6 +434,63 @@ def test_unknown_config_key_is_reported(tmp_path: Path) -> None:
     assert loaded.errors == ("unknown key: deny_agent_name",)
 
 
+def test_unchanged_config_is_not_reparsed(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A hook's second load answers from the cache without parsing TOML."""
+    path = tmp_path / "config.toml"
+    path.write_text("interactive_idle_minutes = 15\n", encoding="utf-8")
+    load_config(path)
+
+    def parse(_text: str) -> None:
+        raise AssertionError("reparsed")
+
+    monkeypatch.setattr("tomllib.loads", parse)
+
+    assert load_config(path).config.interactive_idle_minutes == 15
+
+
+def test_edited_config_invalidates_the_cache(tmp_path: Path) -> None:
+    """A new mtime or size is a new file."""
+    path = tmp_path / "config.toml"
+    path.write_text("interactive_idle_minutes = 15\n", encoding="utf-8")
+    load_config(path)
+
+    path.write_text("interactive_idle_minutes = 150\n", encoding="utf-8")
+
+    assert load_config(path).config.interactive_idle_minutes == 150
+
+
+def test_cached_config_is_still_validated(tmp_path: Path) -> None:
+    """Errors are reported on a cache hit, not only on the first load."""
+    path = tmp_path / "config.toml"
+    path.write_text("deny_agent_name = []\n", encoding="utf-8")
+    load_config(path)
+
+    assert load_config(path).errors == ("unknown key: deny_agent_name",)
+
+
+def test_corrupt_cache_is_a_miss(tmp_path: Path, config_cache: Path) -> None:
+    """A truncated or foreign cache file means parsing the config again."""
+    path = tmp_path / "config.toml"
+    path.write_text("interactive_idle_minutes = 15\n", encoding="utf-8")
+    (config_cache / "agent-reap").mkdir(parents=True)
+    (config_cache / "agent-reap" / "config.marshal").write_bytes(b"\xff\x00")
+
+    assert load_config(path).config.interactive_idle_minutes == 15
+
+
+def test_dates_in_config_skip_the_cache(tmp_path: Path, config_cache: Path) -> None:
+    """A table ``marshal`` cannot store is parsed every time instead."""
+    path = tmp_path / "config.toml"
+    path.write_text("when = 2026-01-01\n", encoding="utf-8")
+
+    loaded = load_config(path)
+
+    assert loaded.errors == ("unknown key: when",)
+    assert not (config_cache / "agent-reap" / "config.marshal").exists()
+
+
 def test_destructive_mode_fails_closed_on_config_error(
     wired: Machine, capsys: pytest.CaptureFixture[str]
 ) -> None:
@@ -372,3 +536,128 @@ def test_explicit_config_beats_the_env_var(
     monkeypatch.setenv("AGENT_REAP_CONFIG", str(env))
 
     assert load_config(explicit).config.teammate_idle_minutes == 99
+
+
+def test_unknown_process_backend_falls_back(tmp_path: Path) -> None:
+    """A misspelled backend degrades to ``auto`` and is reported."""
+    path = tmp_path / "config.toml"
+    path.write_text('process_backend = "procfs"\n', encoding="utf-8")
+
+    loaded = load_config(path)
+
+    assert loaded.config.process_backend == "auto"
+    assert any("process_backend" in e for e in loaded.errors)
+
+
+def test_discovery_deadline_must_be_positive(tmp_path: Path) -> None:
+    """A zero budget would time out every server; it falls back instead."""
+    path = tmp_path / "config.toml"
+    path.write_text(
+        "discovery_deadline_seconds = 0\ndiscovery_workers = 4\n", encoding="utf-8"
+    )
+
+    loaded = load_config(path)
+
+    assert loaded.config.discovery_deadline_seconds == 5.0
+    assert loaded.config.discovery_workers == 4
+    assert any("discovery_deadline_seconds" in e for e in loaded.errors)
+
+
+def test_timings_table_goes_to_stderr(
+    wired: Machine, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """``--timings`` leaves stdout alone and credits each spawn to its phase."""
+    cli(["--config", str(wired.config_path), "--timings"], runner=wired.runner)
+
+    captured = capsys.readouterr()
+    assert "reapable teammates: 1" in captured.out
+    rows = {line.split()[0]: line.split() for line in captured.err.splitlines()[2:]}
+    assert rows["list-panes"][3] == "1"
+    assert rows["processes"][3] == "1"
+    assert "total" in rows
+
+
+def test_timings_attach_to_json_output(
+    wired: Machine, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """A list payload is wrapped only when timings are requested."""
+    argv = ["--config", str(wired.config_path), "--json", "--timings", "reap", "--kill"]
+    status = cli(argv, runner=wired.runner)
+
+    payload = json.loads(capsys.readouterr().out)
+    assert status == 0
+    assert payload["outcomes"][0]["killed"] is True
+    phases = payload["timings"]["phases"]
+    assert phases["revalidate/list-panes"]["spawns"] == 1
+    assert phases["kill"]["spawns"] == 1
+
+
+def test_timings_do_not_apply_to_watch(
+    wired: Machine, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """The watch loop never finishes, so it has no table to print."""
+    argv = ["--config", str(wired.config_path), "--timings", "watch"]
+    assert cli(argv, runner=wired.runner) == 2
+    assert "--timings" in capsys.readouterr().err
+    assert wired.runner.calls == []
+
+
+def test_ndjson_report_streams_records_then_a_summary(
+    wired: Machine, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Every line parses alone, and the summary closes the stream."""
+    argv = ["--config", str(wired.config_path), "--ndjson", "report"]
+    assert cli(argv, runner=wired.runner) == 0
+
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [r["type"] for r in records] == ["socket", "candidate", "summary"]
+    assert records[0]["socket"] == str(wired.socket)
+    assert records[1]["pane_id"] == "%2"
+    assert records[2]["candidates"] == 1
+    assert records[2]["reclaimable_kb"] == 400_000
+
+
+def test_ndjson_reap_streams_outcomes(
+    wired: Machine, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """A reap adds one outcome line per candidate before its summary."""
+    argv = ["--config", str(wired.config_path), "--ndjson", "reap", "--kill"]
+    assert cli(argv, runner=wired.runner) == 0
+
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [r["type"] for r in records] == [
+        "socket",
+        "candidate",
+        "outcome",
+        "summary",
+    ]
+    assert records[2]["killed"] is True
+    assert (records[3]["killed"], records[3]["dry_run"]) == (1, False)
+
+
+def test_ndjson_excludes_json(wired: Machine) -> None:
+    """The two machine formats cannot be combined."""
+    argv = ["--config", str(wired.config_path), "--json", "--ndjson", "report"]
+    with pytest.raises(SystemExit):
+        cli(argv, runner=wired.runner)
+
+
+def test_ndjson_applies_only_to_report_and_reap(
+    wired: Machine, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Other commands have nothing to stream and say so."""
+    argv = ["--config", str(wired.config_path), "--ndjson", "strays"]
+    assert cli(argv, runner=wired.runner) == 2
+    assert "--ndjson" in capsys.readouterr().err
+    assert wired.runner.calls == []
+
+
+def test_unknown_memory_accounting_falls_back(tmp_path: Path) -> None:
+    """A typo keeps the cheap RSS figures rather than failing the report."""
+    path = tmp_path / "config.toml"
+    path.write_text('memory_accounting = "uss"\n', encoding="utf-8")
+
+    loaded = load_config(path)
+
+    assert loaded.config.memory_accounting == "rss"
+    assert any("memory_accounting" in e for e in loaded.errors)
@@ -0,0 +1,166 @@
+"""Coalescing coordinator for concurrent team teardowns."""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections.abc import Sequence
+from pathlib import Path
+
+from agent_reap.coordinator import (
+    SOCKET_NAME,
+    Reply,
+    Request,
+    coordinate,
+    decode_reply,
+    decode_request,
+    encode_reply,
+    encode_request,
+)
+
+from .conftest import make_socket
+
+TERMS = ("config", "kill", "text")
+
+
+class Recorder:
+    """Handler that answers every request with its own team's name."""
+
+    def __init__(self, hold_s: float = 0.0) -> None:
+        """Start with no batches served.
+
+        Args:
+            hold_s: How long each batch takes, to expose overlapping batches.
+        """
+        self.batches: list[list[str]] = []
+        self.overlapped = False
+        self._hold_s = hold_s
+        self._active = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, batch: Sequence[Request]) -> list[Reply]:
+        """Record the batch and answer it."""
+        with self._lock:
+            self.batches.append([request.team for request in batch])
+            self._active += 1
+            self.overlapped |= self._active > 1
+        time.sleep(self._hold_s)
+        with self._lock:
+            self._active -= 1
+        return [Reply(status=0, output=f"{request.team}\n") for request in batch]
+
+
+def _request(team: str, terms: tuple[str, ...] = TERMS) -> Request:
+    return Request(team=team, terms=terms, pid=os.getpid())
+
+
+def _run_all(
+    requests: list[tuple[Request, float]], handler: Recorder, state_dir: Path
+) -> dict[str, Reply]:
+    """Submit each request from its own thread after its delay."""
+    replies: dict[str, Reply] = {}
+
+    def run(request: Request, delay: float) -> None:
+        time.sleep(delay)
+        reply = coordinate(request, handler, state_dir, window_s=0.5)
+        assert reply is not None
+        replies[request.team] = reply
+
+    threads = [threading.Thread(target=run, args=pair) for pair in requests]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return replies
+
+
+def test_request_and_reply_round_trip() -> None:
+    """The wire format carries everything the coordinator needs."""
+    request = Request(team="abc123", terms=TERMS, pid=42, pane=("/s", "%1"))
+    reply = Reply(status=1, output="failed\n")
+
+    assert decode_request(encode_request(request)) == request
+    assert decode_reply(encode_reply(reply)) == reply
+    assert decode_request(b'{"team": "abc123", "terms": [], "pid": true}') is None
+    assert decode_reply(b"not json") is None
+
+
+def test_teardowns_in_one_window_share_a_batch(short_tmp_path: Path) -> None:
+    """Three hooks firing together are served by one handler call."""
+    handler = Recorder()
+
+    replies = _run_all(
+        [(_request("a"), 0.0), (_request("b"), 0.1), (_request("c"), 0.15)],
+        handler,
+        short_tmp_path,
+    )
+
+    assert handler.batches == [["a", "b", "c"]]
+    assert {team: reply.output for team, reply in replies.items()} == {
+        "a": "a\n",
+        "b": "b\n",
+        "c": "c\n",
+    }
+    assert not (short_tmp_path / SOCKET_NAME).exists()
+
+
+def test_a_stale_socket_is_replaced(short_tmp_path: Path) -> None:
+    """A coordinator that died leaves a socket nobody answers on."""
+    make_socket(short_tmp_path / SOCKET_NAME)
+    handler = Recorder()
+
+    reply = coordinate(_request("a"), handler, short_tmp_path, window_s=0.05)
+
+    assert reply is not None
+    assert reply.output == "a\n"
+    assert handler.batches == [["a"]]
+
+
+def test_other_terms_are_declined_and_run_alone(short_tmp_path: Path) -> None:
+    """A teardown the coordinator cannot serve runs after it, not beside it."""
+    handler = Recorder(hold_s=0.2)
+
+    replies = _run_all(
+        [(_request("a"), 0.0), (_request("b", ("other", "kill", "text")), 0.1)],
+        handler,
+        short_tmp_path,
+    )
+
+    assert sorted(handler.batches) == [["a"], ["b"]]
+    assert not handler.overlapped
+    assert replies["b"] == Reply(status=0, output="b\n")
+
+
+def test_a_late_answer_is_waited_for_not_raced(short_tmp_path: Path) -> None:
+    """A run whose coordinator is mid-batch gives up rather than go solo."""
+    handler = Recorder(hold_s=1.0)
+    served: list[Reply | None] = []
+    coordinator = threading.Thread(
+        target=lambda: served.append(
+            coordinate(_request("a"), handler, short_tmp_path, window_s=0.05)
+        )
+    )
+    coordinator.start()
+    time.sleep(0.2)
+
+    reply = coordinate(_request("b"), handler, short_tmp_path, 0.05, wait_s=0.3)
+    coordinator.join()
+
+    assert reply is None
+    assert not handler.overlapped
+    assert served == [Reply(status=0, output="a\n")]
+
+
+def test_without_a_socket_the_lock_still_serializes(tmp_path: Path) -> None:
+    """A state dir too deep for a unix socket falls back to the lockfile."""
+    state_dir = tmp_path / ("d" * 120)
+    handler = Recorder(hold_s=0.2)
+
+    replies = _run_all(
+        [(_request("a"), 0.0), (_request("b"), 0.05)], handler, state_dir
+    )
+
+    assert sorted(handler.batches) == [["a"], ["b"]]
+    assert not handler.overlapped
+    assert replies["a"].output == "a\n"
@@ -2,22 +2,36 @@
 
 from __future__ import annotations
 
+import threading
+import time
+from collections.abc import Sequence
 from pathlib import Path
 
 from agent_reap.discover import (
+    Process,
+    ProcessSnapshot,
+    ProcessTree,
     ancestry,
     descendants,
+    discover_servers,
     find_sockets,
     list_panes,
     live_sockets,
     parse_etime,
     parse_teammate,
+    probe_server,
     process_table,
 )
 from agent_reap.runner import RecordingRunner, Result
 
 from .conftest import make_process, make_socket, pane_line
 
+# A teammate typed into a shell pane: no start command, a Claude-like command.
+TYPED_IN = (
+    "#{&&:#{==:#{pane_start_command},},"
+    "#{m/r:^(claude|node|[0-9]+[.][0-9.]+)$,#{pane_current_command}}}"
+)
+
 
 def test_find_sockets_covers_every_shape(short_tmp_path: Path) -> None:
     """All three real-world socket layouts are discovered, regular files are not."""
@@ -65,13 +79,123 @@ def test_find_sockets_collapses_symlinked_roots(short_tmp_path: Path) -> None:
 
 def test_live_sockets_drops_stale_socket_files() -> None:
     """A socket file whose server has exited is filtered out."""
+    row = pane_line("%1", "main", 1, 1, 10, 5, "zsh", "/tmp")
     runner = RecordingRunner(
-        responses={"tmux -S /live list-sessions": Result(0, "main: 1 windows")},
+        responses={"tmux -S /live list-panes": Result(0, row)},
         default=Result(1, stderr="no server running"),
     )
     assert live_sockets(["/live", "/dead"], runner) == ["/live"]
 
 
+def test_probe_server_lists_and_proves_liveness_in_one_spawn() -> None:
+    """One ``list-panes -a`` yields the panes and the session inventory."""
+    rows = "\n".join(
+        [
+            pane_line("%1", "main", 1, 1, 10, 5, "zsh", "/tmp", 2, 1),
+            pane_line("%2", "main", 2, 1, 11, 5, "zsh", "/tmp", 2, 1),
+            pane_line("%3", "scratch", 1, 1, 12, 5, "zsh", "/tmp", 1, 0),
+        ]
+    )
+    runner = RecordingRunner(responses={"tmux -S /s list-panes": Result(0, rows)})
+
+    server = probe_server("/s", runner)
+
+    assert server.live is True
+    assert [p.pane_id for p in server.panes] == ["%1", "%2", "%3"]
+    assert server.sessions == ["main: 2 windows (attached)", "scratch: 1 windows"]
+    assert len(runner.calls) == 1
+
+
+def test_wedged_server_is_reported_timed_out_within_the_budget() -> None:
+    """One silent server cannot stall discovery past the run's deadline."""
+    release = threading.Event()
+    live_row = pane_line("%1", "main", 1, 1, 10, 5, "zsh", "/tmp")
+    recorder = RecordingRunner(responses={"tmux -S /live": Result(0, live_row)})
+
+    def runner(argv: Sequence[str]) -> Result:
+        if argv[2] == "/wedged":
+            release.wait(5)
+        return recorder(argv)
+
+    start = time.monotonic()
+    servers = discover_servers(["/live", "/wedged"], runner, deadline_s=0.2)
+    elapsed = time.monotonic() - start
+    release.set()
+
+    assert [(s.socket, s.live, s.timed_out) for s in servers] == [
+        ("/live", True, False),
+        ("/wedged", False, True),
+    ]
+    assert elapsed < 2
+
+
+def test_probe_server_marks_a_dead_server() -> None:
+    """A failed listing means no server, and no panes."""
+    server = probe_server("/s", RecordingRunner(default=Result(1)))
+
+    assert server.live is False
+    assert server.panes == ()
+    assert server.sessions == []
+
+
+def test_team_probe_filters_on_the_server() -> None:
+    """A team-scoped listing asks tmux to drop every other pane itself."""
+    runner = RecordingRunner(default=Result(0))
+
+    probe_server("/s", runner, team="abc123")
+
+    argv = runner.calls[0]
+    assert argv[argv.index("-f") + 1] == (
+        f"#{{||:#{{m:*@session-abc123*,#{{pane_start_command}}}},{TYPED_IN}}}"
+    )
+
+
+def test_several_teams_share_one_filtered_listing() -> None:
+    """A coordinated batch ORs its teams' matches into a single filter."""
+    runner = RecordingRunner(default=Result(0))
+
+    probe_server("/s", runner, team=("a1", "b2", "c3"))
+
+    argv = runner.calls[0]
+    match = "#{{m:*@session-{}*,#{{pane_start_command}}}}".format
+    assert argv[argv.index("-f") + 1] == (
+        f"#{{||:{match('a1')},#{{||:{match('b2')},#{{||:{match('c3')},{TYPED_IN}}}}}}}"
+    )
+
+
+def test_team_probe_never_splices_an_unsafe_id() -> None:
+    """An id that could break the format gets the plain listing instead."""
+    runner = RecordingRunner(default=Result(0))
+
+    probe_server("/s", runner, team="abc,}*")
+
+    assert "-f" not in runner.calls[0]
+
+
+def test_team_probe_falls_back_when_tmux_lacks_filters() -> None:
+    """tmux before 3.2 rejects ``-f``; the server is listed in full, not lost."""
+    row = pane_line("%1", "main", 1, 1, 10, 5, "zsh", "/tmp")
+    runner = RecordingRunner(
+        responses={
+            "tmux -S /s list-panes -a -f": Result(1, stderr="unknown option -- f"),
+            "tmux -S /s list-panes -a -F": Result(0, row),
+        }
+    )
+
+    server = probe_server("/s", runner, team="abc123")
+
+    assert server.live is True
+    assert len(runner.calls) == 2
+
+
+def test_team_probe_of_a_dead_server_spawns_once() -> None:
+    """Only a rejected filter is retried; a missing server is just dead."""
+    runner = RecordingRunner(default=Result(1, stderr="no server running on /s"))
+
+    assert probe_server("/s", runner, team="abc123").live is False
+    assert len(runner.calls) == 1
+
+
 def test_list_panes_parses_every_field() -> None:
     """A well-formed row maps onto the Pane dataclass."""
     row = pane_line(
@@ -189,3 +313,125 @@ def test_descendants_walks_children_and_survives_cycles() -> None:
 
     assert descendants(200, table) == {201, 202}
     assert descendants(300, table) == {301}
+
+
+def _forest() -> dict[int, Process]:
+    """Two pane leaders with nested work, plus an unrelated daemon."""
+    rows = [
+        make_process(pid=1, ppid=0, rss_kb=10),
+        make_process(pid=200, ppid=1, rss_kb=100),
+        make_process(pid=201, ppid=200, rss_kb=20, pgid=201),
+        make_process(pid=202, ppid=201, rss_kb=3, pgid=201, state="R+"),
+        make_process(pid=300, ppid=1, rss_kb=50, tpgid=301),
+        make_process(pid=301, ppid=300, rss_kb=5),
+        make_process(pid=900, ppid=1, rss_kb=7, pgid=301),
+    ]
+    return {row.pid: row for row in rows}
+
+
+def test_process_tree_answers_subtree_questions() -> None:
+    """One index serves descendants, subtree RSS, and the liveness checks."""
+    tree = ProcessTree(_forest())
+
+    assert tree.descendants(200) == {201, 202}
+    assert tree.children(1) == [200, 300, 900]
+    assert tree.subtree_rss_kb(200) == 123
+    assert tree.subtree_rss_kb(1) == 195
+    assert tree.active_descendants(200) == [202]
+    assert tree.active_descendants(300) == []
+    assert tree.group(301) == [301, 900]
+    assert tree.ancestry(202) == {202, 201, 200, 1}
+
+
+def test_foreground_group_must_sit_inside_the_subtree() -> None:
+    """A same-group process elsewhere in the table is not the pane's foreground."""
+    table = _forest()
+    table[301] = make_process(pid=301, ppid=300, pgid=301)
+    tree = ProcessTree(table)
+
+    assert tree.foreground_descendants(300, 301) == [301]
+    assert tree.foreground_descendants(200, 301) == []
+    assert tree.foreground_descendants(300, 0) == []
+
+
+def test_process_tree_matches_a_plain_walk_under_cycles() -> None:
+    """Pids caught in a parent cycle still get a terminating, correct answer."""
+    table = {
+        200: make_process(pid=200, ppid=1),
+        201: make_process(pid=201, ppid=200, state="R"),
+        300: make_process(pid=300, ppid=301, rss_kb=1),
+        301: make_process(pid=301, ppid=300, rss_kb=2),
+    }
+    tree = ProcessTree(table)
+
+    assert tree.descendants(301) == {300}
+    assert tree.subtree_rss_kb(300) == 3
+    assert tree.active_descendants(200) == [201]
+    assert tree.subtree_rss_kb(999) == 0
+
+
+def test_snapshot_is_a_mapping_of_process_views() -> None:
+    """Column storage is invisible to callers: rows come back as ``Process``."""
+    snapshot = ProcessSnapshot()
+    snapshot.add(
+        200, 1, 200, 200, 1000, "Ss+", 60, b"claude\0--agent-id\0a@session-b\0"
+    )
+    snapshot.add(201, 200, 201, 201, 10, "R", 5, "node helper.js")
+
+    assert list(snapshot) == [200, 201]
+    assert 201 in snapshot and 999 not in snapshot
+    assert snapshot[200] == make_process(
+        pid=200,
+        ppid=1,
+        rss_kb=1000,
+        elapsed_s=60,
+        command="claude --agent-id a@session-b",
+    )
+    assert snapshot.get(999) is None
+    assert snapshot == {200: snapshot[200], 201: snapshot[201]}
+
+
+def test_snapshot_keeps_argv_raw_until_looked_up() -> None:
+    """Only rows a caller touches pay for decoding their command line."""
+    snapshot = ProcessSnapshot()
+    snapshot.add(7, 1, 7, 7, 1, "S", 0, b"sleep\x0030\x00")
+
+    assert bytes(snapshot._argv) == b"sleep\x0030\x00"
+    assert snapshot.command(7) == "sleep 30"
+
+
+def test_snapshot_replaces_a_repeated_pid() -> None:
+    """A pid listed twice keeps one row, holding the later values."""
+    snapshot = ProcessSnapshot()
+    snapshot.add(7, 1, 7, 7, 1, "S", 0, "old")
+    snapshot.add(7, 1, 7, 7, 2, "R", 0, "new")
+
+    assert len(snapshot) == 1
+    assert (snapshot[7].rss_kb, snapshot[7].state, snapshot[7].command) == (
+        2,
+        "R",
+        "new",
+    )
+
+
+def test_process_tree_reads_snapshot_columns() -> None:
+    """A tree over a snapshot answers exactly like a tree over plain rows."""
+    rows = _forest()
+    snapshot = ProcessSnapshot()
+    for row in rows.values():
+        snapshot.add(
+            row.pid,
+            row.ppid,
+            row.pgid,
+            row.tpgid,
+            row.rss_kb,
+            row.state,
+            0,
+            row.command,
+        )
+    plain, columnar = ProcessTree(rows), ProcessTree(snapshot)
+
+    for pid in rows:
+        assert columnar.descendants(pid) == plain.descendants(pid)
+        assert columnar.subtree_rss_kb(pid) == plain.subtree_rss_kb(pid)
+        assert columnar.active_descendants(pid) == plain.active_descendants(pid)
@@ -0,0 +1,151 @@
+"""SQLite history: recording, retention, and the per-day summary."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import time
+from pathlib import Path
+
+import pytest
+
+from agent_reap.classify import Report, Skipped
+from agent_reap.cli import cli
+from agent_reap.history import FULL_DETAIL_DAYS, History
+from agent_reap.reap import Outcome
+
+from .conftest import NOW, Machine, make_candidate, make_pane
+
+
+def _day(taken: float) -> str:
+    """Local calendar date of a timestamp, as the summary renders it."""
+    return time.strftime("%Y-%m-%d", time.localtime(taken))
+
+
+def _rows(path: Path, table: str) -> int:
+    """Count the rows of one table."""
+    with sqlite3.connect(path) as db:
+        return int(db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0])
+
+
+def test_time_to_reap_runs_from_first_reapable_sighting(tmp_path: Path) -> None:
+    """A pane seen reapable twice and then killed counts once, timed from the first."""
+    now = [NOW]
+    report = Report(candidates=(make_candidate(),))
+    with History(tmp_path / "h.sqlite3", 90, clock=lambda: now[0]) as store:
+        store.record_report(report, "report")
+        now[0] += 300
+        store.record_report(report, "report")
+        now[0] += 300
+        store.record_report(Report(), "reap")
+        store.record_outcomes([Outcome(make_candidate(), killed=True)])
+        (day,) = store.daily(1)
+
+    assert day.day == _day(NOW)
+    assert (day.snapshots, day.leaked, day.reaped) == (3, 1, 1)
+    assert day.reap_p50_s == day.reap_p90_s == 600
+    assert day.peak_reclaimable_kb == report.reclaimable_kb
+
+
+def test_a_kill_never_seen_reapable_has_no_wait(tmp_path: Path) -> None:
+    """A kill with no surviving sighting counts as reaped but not as 0 s."""
+    now = [NOW]
+    with History(tmp_path / "h.sqlite3", 90, clock=lambda: now[0]) as store:
+        store.record_report(Report(candidates=(make_candidate(),)), "report")
+        now[0] += 600
+        store.record_outcomes([Outcome(make_candidate(), killed=True)])
+        store.record_outcomes([Outcome(make_candidate("%7"), killed=True)])
+        (day,) = store.daily(1)
+
+    assert day.reaped == 2
+    assert day.reap_p50_s == day.reap_p90_s == 600
+
+
+def test_rows_are_interned(tmp_path: Path) -> None:
+    """Repeated panes and reasons differing only in numbers share one row."""
+    path = tmp_path / "h.sqlite3"
+    skipped = (
+        Skipped(make_pane("%4"), "team session active 93s ago"),
+        Skipped(make_pane("%5"), "team session active 12s ago"),
+    )
+    with History(path, 90, clock=lambda: NOW) as store:
+        for _ in range(3):
+            store.record_report(Report(skipped=skipped), "report")
+        store.record_outcomes(
+            [Outcome(make_candidate(), killed=False, detail="dry-run")]
+        )
+
+    assert _rows(path, "reasons") == 1
+    assert _rows(path, "panes") == 2
+    assert _rows(path, "observations") == 6
+    assert _rows(path, "outcomes") == 0
+
+
+def test_compaction_keeps_hourly_peaks_and_applies_retention(tmp_path: Path) -> None:
+    """Old snapshots thin to the largest per hour; expired ones go entirely."""
+    path = tmp_path / "h.sqlite3"
+    now = [NOW - 100 * 86400]
+    big = Report(candidates=(make_candidate(),))
+    with History(path, 90, clock=lambda: now[0]) as store:
+        store.record_report(big, "report")
+        now[0] = NOW - (FULL_DETAIL_DAYS + 1) * 86400
+        store.record_report(Report(), "report")
+        store.record_report(big, "report")
+        store.record_report(Report(), "report")
+        now[0] = NOW
+        store.record_report(Report(), "report")
+        # The last record ran compaction itself; a rerun finds nothing left.
+        assert store.compact(vacuum=True) == 0
+        peaks = [day.peak_reclaimable_kb for day in store.daily(30)]
+
+    assert _rows(path, "snapshots") == 2
+    assert peaks == [big.reclaimable_kb, 0]
+
+
+def test_compaction_runs_at_most_daily_while_recording(tmp_path: Path) -> None:
+    """Recording compacts once, then again only after a day has passed."""
+    path = tmp_path / "h.sqlite3"
+    now = [NOW - 200 * 86400]
+    with History(path, 90, clock=lambda: now[0]) as store:
+        store.record_report(Report(), "report")
+        now[0] = NOW
+        store.record_report(Report(), "report")
+        assert _rows(path, "snapshots") == 1
+
+
+def test_cli_records_only_when_enabled(
+    wired: Machine, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """``report`` and ``reap`` append once enabled; ``history`` reads them back."""
+    argv = ["--config", str(wired.config_path)]
+    store = tmp_path / "state" / "history.sqlite3"
+    assert cli([*argv, "report"], runner=wired.runner) == 0
+    assert not store.exists()
+    assert cli([*argv, "history"], runner=wired.runner) == 1
+
+    with wired.config_path.open("a", encoding="utf-8") as handle:
+        handle.write("\nhistory_enabled = true\n")
+    assert cli([*argv, "report"], runner=wired.runner) == 0
+    assert cli([*argv, "reap", "--kill"], runner=wired.runner) == 0
+    capsys.readouterr()
+
+    assert cli([*argv, "--json", "history", "--days", "1"], runner=wired.runner) == 0
+    (day,) = json.loads(capsys.readouterr().out)
+    assert (day["snapshots"], day["leaked"], day["reaped"]) == (2, 1, 1)
+    assert day["peak_reclaimable_kb"] == 400_000
+
+    assert cli([*argv, "history"], runner=wired.runner) == 0
+    assert "peak reclaimable" in capsys.readouterr().out
+
+
+def test_unwritable_history_never_fails_the_run(
+    wired: Machine, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """A broken store costs a warning, not the report."""
+    (tmp_path / "state").mkdir()
+    (tmp_path / "state" / "history.sqlite3").write_text("not a database")
+    with wired.config_path.open("a", encoding="utf-8") as handle:
+        handle.write("\nhistory_enabled = true\n")
+
+    assert cli(["--config", str(wired.config_path)], runner=wired.runner) == 0
+    assert "history: could not record" in capsys.readouterr().err
@@ -0,0 +1,109 @@
+"""Subtree PSS/USS accounting from smaps_rollup."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from agent_reap.classify import Candidate, Report
+from agent_reap.discover import Footprint, ProcessTree, Teammate
+from agent_reap.memory import attach_footprints, footprints
+from agent_reap.procfs import parse_smaps_rollup, smaps_rollups
+from agent_reap.teams import Inbox
+
+from .conftest import make_pane, make_process
+
+
+def rollup(pss: int, clean: int, dirty: int) -> bytes:
+    """Build ``smaps_rollup`` contents with the lines the reader uses.
+
+    Args:
+        pss: Proportional set size in kB.
+        clean: Private clean pages in kB.
+        dirty: Private dirty pages in kB.
+
+    Returns:
+        The raw file contents.
+    """
+    return (
+        "55d0c0000000-7ffd00000000 ---p 00000000 00:00 0    [rollup]\n"
+        f"Rss:              {pss * 2} kB\n"
+        f"Pss:              {pss} kB\n"
+        f"Pss_Anon:         {pss // 2} kB\n"
+        f"Shared_Clean:     {pss} kB\n"
+        f"Private_Clean:    {clean} kB\n"
+        f"Private_Dirty:    {dirty} kB\n"
+    ).encode()
+
+
+def write_rollup(root: Path, pid: int, data: bytes) -> None:
+    """Write one fake ``/proc/<pid>/smaps_rollup``."""
+    (root / str(pid)).mkdir(parents=True)
+    (root / str(pid) / "smaps_rollup").write_bytes(data)
+
+
+def _tree() -> ProcessTree:
+    """A teammate leader (200) with a shell (201) and an MCP server (202)."""
+    return ProcessTree(
+        {
+            200: make_process(pid=200, rss_kb=300_000),
+            201: make_process(pid=201, ppid=200, command="-zsh", rss_kb=5_000),
+            202: make_process(pid=202, ppid=201, command="node mcp", rss_kb=80_000),
+        }
+    )
+
+
+def test_parse_rollup_reads_pss_and_private_pages() -> None:
+    """USS is the private clean plus private dirty pages."""
+    assert parse_smaps_rollup(rollup(pss=1000, clean=100, dirty=600)) == (1000, 700)
+    assert parse_smaps_rollup(b"") is None
+
+
+def test_rollups_skip_unreadable_processes(tmp_path: Path) -> None:
+    """Another user's process, or one that exited, is simply absent."""
+    write_rollup(tmp_path, 200, rollup(pss=10, clean=1, dirty=2))
+    write_rollup(tmp_path, 201, b"")
+
+    assert smaps_rollups([200, 200, 201, 999], tmp_path) == {200: (10, 3)}
+
+
+def test_footprint_sums_the_whole_subtree(tmp_path: Path) -> None:
+    """Children count, and an unreadable one falls back to its RSS."""
+    write_rollup(tmp_path, 200, rollup(pss=120_000, clean=10_000, dirty=70_000))
+    write_rollup(tmp_path, 202, rollup(pss=60_000, clean=0, dirty=50_000))
+
+    measured = footprints([200, 999], _tree(), tmp_path)
+
+    assert measured == {
+        200: Footprint(
+            rss_kb=385_000,
+            pss_kb=185_000,
+            uss_kb=135_000,
+            processes=3,
+            estimated=1,
+        )
+    }
+
+
+def test_report_reclaims_pss_once_measured(tmp_path: Path) -> None:
+    """The reclaim estimate switches from leader RSS to subtree PSS."""
+    write_rollup(tmp_path, 200, rollup(pss=120_000, clean=10_000, dirty=70_000))
+    write_rollup(tmp_path, 201, rollup(pss=1_000, clean=0, dirty=1_000))
+    write_rollup(tmp_path, 202, rollup(pss=60_000, clean=0, dirty=50_000))
+    tree = _tree()
+    report = Report(
+        candidates=(
+            Candidate(
+                pane=make_pane(pid=200),
+                process=tree.table[200],
+                teammate=Teammate(agent_name="docs-readme", session_id="abc123"),
+                inbox=Inbox(path=tmp_path / "inbox.json", exists=True, size=2),
+                idle_s=3600.0,
+            ),
+        )
+    )
+    assert (report.reclaimable_kb, report.private_kb) == (300_000, None)
+
+    measured = attach_footprints(report, tree, tmp_path)
+
+    assert measured.reclaimable_kb == 181_000
+    assert measured.private_kb == 131_000
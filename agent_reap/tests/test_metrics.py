@@ -0,0 +1,172 @@
+"""OpenMetrics exposition, kill counters, and the scrape cache."""
+
+from __future__ import annotations
+
+import threading
+import urllib.request
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from agent_reap.classify import Report
+from agent_reap.cli import _scrape, cli
+from agent_reap.config import load_config
+from agent_reap.discover import Server
+from agent_reap.metrics import (
+    CONTENT_TYPE,
+    Counters,
+    Exposition,
+    load_counters,
+    record_outcomes,
+    render,
+    serve,
+)
+from agent_reap.reap import Outcome
+from agent_reap.runner import Result
+from agent_reap.strays import ControlMaster
+
+from .conftest import Machine, make_candidate, make_pane, make_socket
+
+
+def _samples(text: str) -> dict[str, str]:
+    """Map each sample line's name and labels to its value."""
+    return dict(
+        line.rsplit(" ", 1) for line in text.splitlines() if not line.startswith("#")
+    )
+
+
+def test_render_covers_every_family() -> None:
+    """Per-socket gauges are labelled; the exposition ends with ``# EOF``."""
+    servers = [
+        Server("/tmp/a", live=True, panes=(make_pane(), make_pane(pane_id="%3"))),
+        Server("/tmp/b", live=False, timed_out=True),
+    ]
+    masters = [
+        ControlMaster("/s/cm-1", socket_exists=True, pid=9),
+        ControlMaster("/s/cm-2", socket_exists=True),
+    ]
+    text = render(servers, Report(), masters, [], Counters(kills=4, failures=1), 0.25)
+
+    samples = _samples(text)
+    assert samples['agent_reap_panes{socket="/tmp/a"}'] == "2"
+    assert 'agent_reap_panes{socket="/tmp/b"}' not in samples
+    assert samples['agent_reap_server_timed_out{socket="/tmp/b"}'] == "1"
+    assert samples['agent_reap_control_masters{stale="true"}'] == "1"
+    assert samples["agent_reap_kills_total"] == "4"
+    assert samples["agent_reap_kill_failures_total"] == "1"
+    assert "# TYPE agent_reap_kills counter" in text
+    assert text.endswith("# EOF\n")
+
+
+def test_label_values_are_escaped() -> None:
+    """A quote or backslash in a socket path cannot break the line."""
+    text = render([Server('/tmp/"x\\', live=True)], Report(), [], [], Counters(), 0)
+    assert 'agent_reap_panes{socket="/tmp/\\"x\\\\"} 0' in text
+
+
+def test_counters_add_across_rounds_and_skip_dry_runs(tmp_path: Path) -> None:
+    """Each round adds to the file; a dry run leaves it untouched."""
+    path = tmp_path / "state" / "counters.json"
+    record_outcomes(path, [Outcome(make_candidate(), killed=False, detail="dry-run")])
+    assert not path.exists()
+
+    record_outcomes(path, [Outcome(make_candidate(), killed=True, detail="killed")])
+    record_outcomes(
+        path,
+        [
+            Outcome(make_candidate(), killed=True, detail="killed"),
+            Outcome(
+                make_candidate("%3"), killed=False, detail="revalidation failed: x"
+            ),
+        ],
+    )
+
+    assert load_counters(path) == Counters(kills=2, failures=1)
+
+
+def test_corrupt_counters_read_as_zero(tmp_path: Path) -> None:
+    """A damaged file costs the history, not the scrape."""
+    path = tmp_path / "counters.json"
+    path.write_text('{"kills": "many"}', encoding="utf-8")
+    assert load_counters(path) == Counters()
+
+
+def test_exposition_shares_one_scrape_per_interval() -> None:
+    """Requests inside the interval reuse the last scrape."""
+    now = [0.0]
+    scrapes: list[float] = []
+
+    def scrape() -> str:
+        scrapes.append(now[0])
+        return f"n {len(scrapes)}\n"
+
+    exposition = Exposition(scrape, min_interval_s=15, clock=lambda: now[0])
+    assert exposition.text() == exposition.text() == "n 1\n"
+    now[0] = 15.0
+    assert exposition.text() == "n 2\n"
+    assert scrapes == [0.0, 15.0]
+
+
+def test_server_answers_metrics_only() -> None:
+    """``GET /metrics`` returns the exposition with the OpenMetrics type."""
+    server = serve("127.0.0.1", 0, Exposition(lambda: "up 1\n# EOF\n", 15))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        host, port = server.server_address[:2]
+        base = f"http://{host!s}:{port}"
+        with urllib.request.urlopen(f"{base}/metrics", timeout=5) as response:
+            assert response.headers["Content-Type"] == CONTENT_TYPE
+            assert response.read() == b"up 1\n# EOF\n"
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(f"{base}/other", timeout=5)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_metrics_command_reads_one_snapshot(
+    wired: Machine,
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    """A scrape lists each server once, reads ps once, and sees prior kills."""
+    argv = ["--config", str(wired.config_path)]
+    assert cli([*argv, "reap", "--kill"], runner=wired.runner) == 0
+    capsys.readouterr()
+    wired.runner.calls.clear()
+
+    assert cli([*argv, "metrics"], runner=wired.runner) == 0
+
+    samples = _samples(capsys.readouterr().out)
+    assert samples[f'agent_reap_panes{{socket="{wired.socket}"}}'] == "1"
+    assert samples["agent_reap_candidates"] == "1"
+    assert samples["agent_reap_reclaimable_bytes"] == str(400_000 * 1024)
+    assert samples["agent_reap_kills_total"] == "1"
+    assert [call[0] for call in wired.runner.calls].count("ps") == 1
+    assert sum("list-panes" in call for call in wired.runner.calls) == 1
+
+    textfile = tmp_path / "textfile" / "agent_reap.prom"
+    assert (
+        cli([*argv, "metrics", "--textfile", str(textfile)], runner=wired.runner) == 0
+    )
+    assert textfile.read_text(encoding="utf-8").endswith("# EOF\n")
+
+
+def test_each_listener_scrape_probes_masters_again(
+    wired: Machine, short_tmp_path: Path
+) -> None:
+    """A long-lived listener never replays the first scrape's ssh checks."""
+    make_socket(short_tmp_path / "cm-github-abc")
+    config = replace(
+        load_config(wired.config_path).config,
+        ssh_dir=short_tmp_path,
+        ssh_check_cache_seconds=0,
+    )
+    wired.runner.responses["ssh -O check"] = Result(0)
+
+    _scrape(config, wired.runner)
+    _scrape(config, wired.runner)
+
+    assert [call[0] for call in wired.runner.calls].count("ssh") == 2
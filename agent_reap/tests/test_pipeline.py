@@ -0,0 +1,226 @@
+"""Async runner and discovery pipeline."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Sequence
+from dataclasses import replace
+
+import pytest
+
+from agent_reap.config import Config
+from agent_reap.discover import ProcessSnapshot
+from agent_reap.pipeline import discover_servers_async, snapshot
+from agent_reap.runner import (
+    AsyncRecordingRunner,
+    RecordingRunner,
+    Result,
+    async_subprocess_runner,
+    threaded,
+)
+from agent_reap.strays import ControlMaster
+
+from .conftest import pane_line, write_inbox
+
+LIVE_ROW = pane_line("%1", "main", 1, 1, 10, 5, "zsh", "/tmp")
+TEAMMATE_ROW = pane_line("%2", "devbox", 1, 2, 200, 10, "2.1.221", "/repo")
+PS_ROW = (
+    "200 100 200 200 400000 Ss+ 01:40:24 claude --agent-id docs-readme@session-abc123"
+)
+
+
+class _StuckProcess:
+    """Stands in for a child that never answers until killed."""
+
+    def __init__(self) -> None:
+        """Start running."""
+        self.returncode: int | None = None
+        self.killed = False
+
+    async def communicate(self) -> tuple[bytes, bytes]:
+        """Never answer within any test timeout."""
+        await asyncio.sleep(60)
+        return b"", b""
+
+    async def wait(self) -> int:
+        """Return the exit status, which only a kill sets."""
+        return -9 if self.returncode is None else self.returncode
+
+    def kill(self) -> None:
+        """Record the kill."""
+        self.killed = True
+        self.returncode = -9
+
+
+def test_async_subprocess_runner_reports_a_missing_executable(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A missing binary is a result, as with the synchronous runner."""
+
+    async def missing(*_argv: str, **_kwargs: object) -> None:
+        raise FileNotFoundError("tmux")
+
+    monkeypatch.setattr("asyncio.create_subprocess_exec", missing)
+
+    result = asyncio.run(async_subprocess_runner(["tmux", "ls"]))
+
+    assert result.returncode == 127
+
+
+def test_async_subprocess_runner_kills_a_stuck_child(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A timed-out command is killed, not left running behind the caller."""
+    child = _StuckProcess()
+
+    async def spawn(*_argv: str, **_kwargs: object) -> _StuckProcess:
+        return child
+
+    monkeypatch.setattr("asyncio.create_subprocess_exec", spawn)
+    monkeypatch.setattr("agent_reap.runner.COMMAND_TIMEOUT_SECONDS", 0.05)
+
+    result = asyncio.run(async_subprocess_runner(["tmux", "-S", "/stuck", "ls"]))
+
+    assert result.returncode == 124
+    assert child.killed
+
+
+def test_async_probe_shares_the_filter_fallback() -> None:
+    """The pipeline drives the same probe steps as ``probe_server``."""
+    runner = AsyncRecordingRunner(
+        responses={
+            "tmux -S /s list-panes -a -f": Result(1, stderr="unknown option -- f"),
+            "tmux -S /s list-panes -a -F": Result(0, LIVE_ROW),
+        }
+    )
+
+    (server,) = asyncio.run(discover_servers_async(["/s"], runner, team="abc123"))
+
+    assert server.live is True
+    assert len(runner.calls) == 2
+
+
+def test_wedged_server_is_cancelled_at_the_deadline() -> None:
+    """A silent server is reported timed out and the others still answer."""
+    runner = AsyncRecordingRunner(
+        responses={"tmux -S /live": Result(0, LIVE_ROW)},
+        delays={"tmux -S /wedged": 5.0},
+    )
+
+    start = time.monotonic()
+    servers = asyncio.run(
+        discover_servers_async(["/live", "/wedged"], runner, deadline_s=0.2)
+    )
+
+    assert [(s.socket, s.live, s.timed_out) for s in servers] == [
+        ("/live", True, False),
+        ("/wedged", False, True),
+    ]
+    assert time.monotonic() - start < 2
+
+
+class _Rendezvous(AsyncRecordingRunner):
+    """Answers tmux only once ps is running, and ps only once tmux is.
+
+    Run in sequence, the first program waits for a second that cannot start
+    until it returns; that wait is recorded as a miss instead of hanging.
+    """
+
+    def __init__(self) -> None:
+        """Serve a live server and one teammate process."""
+        super().__init__(
+            responses={"tmux -S": Result(0, LIVE_ROW), "ps -eo": Result(0, PS_ROW)}
+        )
+        self.arrived = {"tmux": asyncio.Event(), "ps": asyncio.Event()}
+        self.missed: list[str] = []
+
+    async def __call__(self, argv: Sequence[str]) -> Result:
+        """Wait for the other program to be in flight too, then answer."""
+        program = argv[0]
+        self.arrived[program].set()
+        other = self.arrived["ps" if program == "tmux" else "tmux"]
+        try:
+            await asyncio.wait_for(other.wait(), timeout=5.0)
+        except TimeoutError:
+            self.missed.append(program)
+        return await super().__call__(argv)
+
+
+def test_snapshot_overlaps_probes_and_the_process_table(config: Config) -> None:
+    """tmux probes and ps are in flight together, not one after the other."""
+    runner = _Rendezvous()
+
+    taken = snapshot(
+        replace(config, process_backend="ps"), runner, sockets=["/a", "/b", "/c"]
+    )
+
+    assert runner.missed == []
+    assert [s.live for s in taken.servers] == [True, True, True]
+    assert sorted(taken.processes) == [200]
+
+
+def test_snapshot_prefetches_teammate_inboxes(config: Config) -> None:
+    """Inbox stats are taken during discovery, for the sessions panes lead."""
+    inbox = write_inbox(config.teams_dir, "abc123", "docs-readme", mtime=1.0)
+    other = write_inbox(config.teams_dir, "def456", "docs-api", mtime=1.0)
+    runner = threaded(
+        RecordingRunner(
+            responses={
+                "tmux -S": Result(0, TEAMMATE_ROW),
+                "ps -eo": Result(
+                    0,
+                    f"{PS_ROW}\n201 100 201 201 1000 Ss 01:00 "
+                    "claude --agent-id docs-api@session-def456",
+                ),
+            }
+        )
+    )
+
+    taken = snapshot(replace(config, process_backend="ps"), runner, sockets=["/a"])
+    inbox.unlink()
+    other.unlink()
+
+    assert taken.teams.inbox("abc123", "docs-readme").exists
+    # No pane is led by the def456 teammate, so its inboxes were never read.
+    assert not taken.teams.inbox("def456", "docs-api").exists
+
+
+def test_snapshot_can_skip_the_inbox_prefetch(config: Config) -> None:
+    """A snapshot nothing will classify leaves teammate inboxes unread."""
+    inbox = write_inbox(config.teams_dir, "abc123", "docs-readme", mtime=1.0)
+    runner = threaded(
+        RecordingRunner(
+            responses={
+                "tmux -S": Result(0, TEAMMATE_ROW),
+                "ps -eo": Result(0, PS_ROW),
+            }
+        )
+    )
+
+    taken = snapshot(
+        replace(config, process_backend="ps"), runner, sockets=["/a"], inboxes=False
+    )
+    inbox.unlink()
+
+    assert not taken.teams.inbox("abc123", "docs-readme").exists
+
+
+def test_snapshot_runs_the_master_probe_on_the_table(config: Config) -> None:
+    """The control-master inventory sees the same process table."""
+    seen: list[Sequence[int]] = []
+
+    def inventory(table: ProcessSnapshot) -> list[ControlMaster]:
+        seen.append(sorted(table))
+        return []
+
+    runner = AsyncRecordingRunner(responses={"ps -eo": Result(0, PS_ROW)})
+
+    snapshot(
+        replace(config, process_backend="ps"),
+        runner,
+        sockets=[],
+        masters=inventory,
+    )
+
+    assert seen == [[200]]
@@ -0,0 +1,75 @@
+"""Bounded fan-out: ordering, concurrency limits, deadlines, and errors."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from agent_reap.pool import run_bounded
+
+
+def test_results_keep_input_order() -> None:
+    """Completion order does not leak into the result order."""
+    delays = [0.03, 0.0, 0.01]
+
+    def slow(delay: float) -> float:
+        time.sleep(delay)
+        return delay
+
+    assert run_bounded(slow, delays, workers=3) == delays
+
+
+def test_concurrency_never_exceeds_the_worker_bound() -> None:
+    """A large batch still runs at most ``workers`` calls at once."""
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+
+    def track(_item: int) -> int:
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.01)
+        with lock:
+            active -= 1
+        return 0
+
+    run_bounded(track, list(range(12)), workers=3)
+
+    assert peak <= 3
+
+
+def test_a_wedged_call_misses_the_deadline_without_blocking() -> None:
+    """The caller stops waiting at the budget; the straggler yields None."""
+    release = threading.Event()
+
+    def maybe_wedge(item: str) -> str:
+        if item == "wedged":
+            release.wait(5)
+        return item
+
+    start = time.monotonic()
+    results = run_bounded(maybe_wedge, ["ok", "wedged"], workers=2, deadline_s=0.2)
+    elapsed = time.monotonic() - start
+    release.set()
+
+    assert results == ["ok", None]
+    assert elapsed < 2
+
+
+def test_errors_are_reraised_in_the_caller() -> None:
+    """A failing call is not silently turned into a missing result."""
+
+    def boom(_item: int) -> int:
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError, match="boom"):
+        run_bounded(boom, [1])
+
+
+def test_empty_batch_spawns_nothing() -> None:
+    """No items, no threads, no waiting."""
+    assert run_bounded(str, []) == []
@@ -0,0 +1,124 @@
+"""Memory-pressure readings and the policy that acts on them."""
+
+from __future__ import annotations
+
+import json
+import time
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from agent_reap.cli import cli
+from agent_reap.config import Config
+from agent_reap.pressure import (
+    Pressure,
+    parse_meminfo,
+    parse_psi,
+    rank,
+    read_pressure,
+    tighten,
+)
+
+from .conftest import Machine, make_candidate, make_process, write_inbox
+
+MEMINFO = b"""MemTotal:       16000000 kB
+MemFree:          400000 kB
+MemAvailable:     800000 kB
+"""
+PSI = b"""some avg10=23.50 avg60=8.10 avg300=2.00 total=123456
+full avg10=4.00 avg60=1.00 avg300=0.50 total=23456
+"""
+
+
+def _missing() -> bytes:
+    raise FileNotFoundError("/proc/pressure/memory")
+
+
+def test_reading_parses_meminfo_and_psi() -> None:
+    """Both files are read through the injected readers."""
+    pressure = read_pressure(lambda: MEMINFO, lambda: PSI)
+    assert pressure == Pressure(16_000_000, 800_000, 23.5)
+    assert pressure.available_percent == 5.0
+
+
+def test_psi_is_optional_and_meminfo_is_not() -> None:
+    """A kernel without PSI still reads; a host without meminfo reads as None."""
+    pressure = read_pressure(lambda: MEMINFO, _missing)
+    assert pressure is not None and pressure.psi_some_avg10 is None
+    assert read_pressure(_missing, lambda: PSI) is None
+    assert parse_meminfo(b"MemTotal: 100 kB\n") is None
+    assert parse_psi(b"some avg10=oops\n") is None
+    assert parse_psi(b"\nsome avg10=1.50 avg60=0.00\n") == 1.5
+
+
+@pytest.mark.parametrize(
+    ("pressure", "expected"),
+    [
+        (Pressure(100, 50, 0.0), False),
+        (Pressure(100, 9, None), True),
+        (Pressure(100, 50, 10.0), True),
+        (Pressure(100, 50, 9.99), False),
+    ],
+)
+def test_either_line_signals_pressure(pressure: Pressure, expected: bool) -> None:
+    """Low available memory or a high stall share is enough on its own."""
+    assert pressure.under_pressure(Config()) is expected
+
+
+def test_tighten_only_ever_lowers_the_threshold() -> None:
+    """A pressure threshold above the normal one changes nothing."""
+    assert tighten(Config()).teammate_idle_minutes == 5
+    cautious = Config(teammate_idle_minutes=3, pressure_idle_minutes=5)
+    assert tighten(cautious).teammate_idle_minutes == 3
+
+
+def test_rank_weighs_memory_against_idle_risk() -> None:
+    """A big teammate idle long goes first; a small, barely idle one last."""
+    small_old = replace(
+        make_candidate("%2"), process=make_process(rss_kb=100_000), idle_s=7200.0
+    )
+    big_old = replace(
+        make_candidate("%3"), process=make_process(rss_kb=400_000), idle_s=7200.0
+    )
+    big_fresh = replace(
+        make_candidate("%4"), process=make_process(rss_kb=400_000), idle_s=360.0
+    )
+    ranked = rank((small_old, big_fresh, big_old), threshold_s=1800.0)
+    assert [c.pane.pane_id for c in ranked] == ["%3", "%2", "%4"]
+
+
+def test_pressure_makes_a_recent_teammate_reapable(
+    wired: Machine, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Only under pressure is a teammate drained ten minutes ago reaped."""
+    write_inbox(tmp_path / "teams", "abc123", "docs-readme", mtime=time.time() - 600)
+    with wired.config_path.open("a", encoding="utf-8") as handle:
+        handle.write("\npressure_policy = true\n")
+    argv = ["--config", str(wired.config_path), "--json"]
+
+    calm = Pressure(16_000_000, 8_000_000, 0.0)
+    assert cli([*argv, "report"], runner=wired.runner, pressure=lambda: calm) == 0
+    report = json.loads(capsys.readouterr().out)
+    assert report["candidates"] == []
+    assert report["pressure"]["under_pressure"] is False
+
+    squeezed = Pressure(16_000_000, 800_000, 23.5)
+    status = cli(
+        [*argv, "reap", "--kill"], runner=wired.runner, pressure=lambda: squeezed
+    )
+    assert status == 0
+    (outcome,) = json.loads(capsys.readouterr().out)
+    assert outcome["killed"] is True
+
+
+def test_policy_off_never_reads_pressure(wired: Machine) -> None:
+    """Without ``pressure_policy`` the reader is not called."""
+
+    def unread() -> Pressure | None:
+        raise AssertionError("pressure read with the policy off")
+
+    assert (
+        cli(["--config", str(wired.config_path)], runner=wired.runner, pressure=unread)
+        == 0
+    )
@@ -0,0 +1,165 @@
+"""The procfs process-table backend and backend selection."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from agent_reap.procfs import (
+    Identity,
+    identities,
+    parse_session,
+    parse_stat,
+    parse_status_uid,
+    proc_process_table,
+    proc_subtree_table,
+    process_snapshot,
+)
+from agent_reap.runner import RecordingRunner, Result
+
+from .conftest import stat_line, write_proc
+
+CLK_TCK = os.sysconf("SC_CLK_TCK")
+PAGE_KB = os.sysconf("SC_PAGE_SIZE") // 1024
+
+
+def test_parse_stat_matches_the_ps_row_shape() -> None:
+    """procfs rows carry the same values the ps backend would report."""
+    process = parse_stat(
+        200,
+        stat_line(200, ppid=100, pgid=200, tpgid=201, start_ticks=50, rss_pages=25),
+        b"claude\0--agent-id\0a@session-b\0",
+        uptime_s=6000.5,
+        clock_ticks=10,
+        page_kb=4,
+    )
+
+    assert process is not None
+    assert (process.ppid, process.pgid, process.tpgid) == (100, 200, 201)
+    assert process.rss_kb == 100
+    assert process.elapsed_s == 5995
+    assert process.command == "claude --agent-id a@session-b"
+    assert process.sleeping is True
+
+
+def test_parse_stat_survives_parentheses_in_comm() -> None:
+    """A comm like ``a) R (b`` cannot shift the fields that follow it."""
+    process = parse_stat(7, stat_line(7, comm="a) R (b", state="R"), b"", 0.0, 100, 4)
+
+    assert process is not None
+    assert process.state == "R"
+    assert process.command == "[a) R (b]"
+
+
+def test_parse_stat_rejects_truncated_lines() -> None:
+    """A short or garbled stat file is dropped, not guessed at."""
+    assert parse_stat(1, b"1 (x) S 0", b"", 0.0, 100, 4) is None
+    assert parse_stat(1, b"no parens at all", b"", 0.0, 100, 4) is None
+
+
+def test_proc_table_reads_every_pid_directory(tmp_path: Path) -> None:
+    """Numeric directories become rows; everything else under /proc is ignored."""
+    (tmp_path / "uptime").write_text("1000.00 2000.00\n", encoding="utf-8")
+    write_proc(tmp_path, 200, stat_line(200, start_ticks=0))
+    write_proc(tmp_path, 201, stat_line(201, ppid=200, state="R"), b"pytest\0")
+    (tmp_path / "self").mkdir()
+    (tmp_path / "202").mkdir()  # Exited between listdir and open.
+
+    table = proc_process_table(tmp_path)
+
+    assert sorted(table) == [200, 201]
+    assert table[200].command == "claude --ide"
+    assert table[200].elapsed_s == 1000
+    assert table[200].rss_kb == 1000 * PAGE_KB
+    assert table[201].sleeping is False
+
+
+def test_proc_table_is_empty_without_procfs(tmp_path: Path) -> None:
+    """A missing mount reads as no data, not as an exception."""
+    assert proc_process_table(tmp_path / "absent") == {}
+
+
+def test_auto_backend_falls_back_to_ps(tmp_path: Path) -> None:
+    """With no procfs mounted, ``auto`` asks ps like it always did."""
+    runner = RecordingRunner(
+        responses={"ps -eo": Result(0, "9 1 9 9 10 S 00:01 /bin/sleep 5")}
+    )
+
+    table = process_snapshot(runner, "auto", proc_root=tmp_path)
+
+    assert table[9].command == "/bin/sleep 5"
+    assert runner.calls[0][0] == "ps"
+
+
+def test_auto_backend_prefers_procfs(tmp_path: Path) -> None:
+    """When procfs is present no process is forked at all."""
+    (tmp_path / "uptime").write_text("10.0 0.0\n", encoding="utf-8")
+    write_proc(tmp_path, 5, stat_line(5))
+    runner = RecordingRunner()
+
+    table = process_snapshot(runner, "auto", proc_root=tmp_path)
+
+    assert list(table) == [5]
+    assert runner.calls == []
+
+
+def test_ps_backend_ignores_procfs(tmp_path: Path) -> None:
+    """An explicit ``ps`` backend is honored even on Linux."""
+    (tmp_path / "uptime").write_text("10.0 0.0\n", encoding="utf-8")
+    write_proc(tmp_path, 5, stat_line(5))
+    runner = RecordingRunner(responses={"ps -eo": Result(0, "")})
+
+    assert process_snapshot(runner, "ps", proc_root=tmp_path) == {}
+    assert runner.calls[0][0] == "ps"
+
+
+def write_children(root: Path, pid: int, *children: int) -> None:
+    """Publish a fake process's children list, as ``CONFIG_PROC_CHILDREN`` does.
+
+    Args:
+        root: Fake procfs root.
+        pid: Parent process id.
+        children: Its child pids.
+    """
+    task = root / str(pid) / "task" / str(pid)
+    task.mkdir(parents=True)
+    (task / "children").write_text(" ".join(map(str, children)), encoding="utf-8")
+
+
+def test_subtree_table_reads_only_the_leaders_and_the_caller(tmp_path: Path) -> None:
+    """A team teardown reads its panes' subtrees and its own ancestry, no more."""
+    (tmp_path / "uptime").write_text("10.0 0.0\n", encoding="utf-8")
+    for pid, ppid in [(1, 0), (50, 1), (200, 50), (201, 200), (300, 1), (400, 50)]:
+        write_proc(tmp_path, pid, stat_line(pid, ppid=ppid))
+    write_children(tmp_path, 200, 201)
+    write_children(tmp_path, 201)
+
+    table = proc_subtree_table([200], anchors=[300], proc_root=tmp_path)
+
+    assert table is not None
+    assert sorted(table) == [1, 200, 201, 300]
+
+
+def test_subtree_table_needs_children_lists(tmp_path: Path) -> None:
+    """Without ``children`` files the caller falls back to the full table."""
+    (tmp_path / "uptime").write_text("10.0 0.0\n", encoding="utf-8")
+    write_proc(tmp_path, 200, stat_line(200))
+    write_proc(tmp_path, 201, stat_line(201, ppid=200))
+
+    assert proc_subtree_table([200], proc_root=tmp_path) is None
+    table = process_snapshot(RecordingRunner(), "proc", tmp_path, roots=[200])
+    assert sorted(table) == [200, 201]
+
+
+def test_identity_fields_come_from_stat_status_and_exe(tmp_path: Path) -> None:
+    """Real uid, session, start time and the resolved binary; unreadable is out."""
+    write_proc(tmp_path, 300, stat_line(300, pgid=200, start_ticks=42))
+    (tmp_path / "300" / "status").write_bytes(b"Uid:\t501\t0\t0\t0\nGid:\t20\n")
+    (tmp_path / "300" / "exe").symlink_to("/nix/store/x/bin/node")
+    write_proc(tmp_path, 301, stat_line(301))  # no exe link: not ours to read
+
+    assert identities([300, 301, 302], tmp_path) == {
+        300: Identity(uid=501, session=200, start_ticks=42, exe="/nix/store/x/bin/node")
+    }
+    assert parse_session(b"1 (a) b) S 1 1 7 0 0") is None
+    assert parse_status_uid(b"Name:\tx\n") is None
@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
+import os
 import subprocess
+import threading
+from collections.abc import Sequence
 from pathlib import Path
 from typing import Never
 
@@ -16,31 +19,23 @@ from agent_reap.runner import (
     Result,
     subprocess_runner,
 )
-from agent_reap.strays import control_masters, disowned_descendants
-from agent_reap.teams import Inbox
-
-from .conftest import make_pane, make_process, make_socket
-
-
-def _candidate(pane_id: str = "%2", socket: str = "/tmp/s") -> Candidate:
-    """Build a candidate for kill-path tests.
-
-    Args:
-        pane_id: Stable pane id.
-        socket: Owning socket.
+from agent_reap.strays import (
+    ProbeCache,
+    control_masters,
+    disowned_descendants,
+    find_disowned,
+    kernel_disowned,
+)
 
-    Returns:
-        A candidate wrapping synthetic pane and process rows.
-    """
-    from agent_reap.discover import Teammate
-
-    return Candidate(
-        pane=make_pane(pane_id=pane_id, socket=socket),
-        process=make_process(),
-        teammate=Teammate(agent_name="docs-readme", session_id="abc123"),
-        inbox=Inbox(path=Path("/tmp/inbox.json"), exists=True, size=2, mtime=0.0),
-        idle_s=5400.0,
-    )
+from .conftest import (
+    make_candidate,
+    make_pane,
+    make_process,
+    make_socket,
+    pane_line,
+    stat_line,
+    write_proc,
+)
 
 
 def _valid(candidate: Candidate) -> tuple[bool, str]:
@@ -63,7 +58,7 @@ def test_dry_run_executes_nothing() -> None:
     """The default path must not touch tmux at all."""
     runner = RecordingRunner()
 
-    outcomes = reap((_candidate(),), runner, dry_run=True)
+    outcomes = reap((make_candidate(),), runner, dry_run=True)
 
     assert runner.calls == []
     assert [o.killed for o in outcomes] == [False]
@@ -75,21 +70,21 @@ def test_reap_kills_each_candidate_on_its_own_socket() -> None:
     runner = RecordingRunner(responses={"tmux -S": Result(0)})
 
     outcomes = reap(
-        (_candidate("%2", "/tmp/a"), _candidate("%9", "/tmp/b")),
+        (make_candidate("%2", "/tmp/a"), make_candidate("%9", "/tmp/b")),
         runner,
         dry_run=False,
         revalidator=_valid,
     )
 
     assert all(o.killed for o in outcomes)
-    assert [c[2] for c in runner.calls] == ["/tmp/a", "/tmp/b"]
+    assert sorted(c[2] for c in runner.calls) == ["/tmp/a", "/tmp/b"]
 
 
 def test_failed_kill_is_reported_not_swallowed() -> None:
     """A kill that fails surfaces its error text."""
     runner = RecordingRunner(default=Result(1, stderr="can't find pane"))
 
-    (outcome,) = reap((_candidate(),), runner, dry_run=False, revalidator=_valid)
+    (outcome,) = reap((make_candidate(),), runner, dry_run=False, revalidator=_valid)
 
     assert outcome.killed is False
     assert "can't find pane" in outcome.detail
@@ -99,7 +94,7 @@ def test_real_reap_fails_closed_without_revalidation() -> None:
     """No caller can accidentally bypass the immediate destructive safety check."""
     runner = RecordingRunner(responses={"tmux -S": Result(0)})
 
-    (outcome,) = reap((_candidate(),), runner, dry_run=False)
+    (outcome,) = reap((make_candidate(),), runner, dry_run=False)
 
     assert outcome.killed is False
     assert "revalidation unavailable" in outcome.detail
@@ -111,7 +106,7 @@ def test_revalidation_rejection_prevents_kill() -> None:
     runner = RecordingRunner(responses={"tmux -S": Result(0)})
 
     (outcome,) = reap(
-        (_candidate(),),
+        (make_candidate(),),
         runner,
         dry_run=False,
         revalidator=lambda _candidate: (False, "window became active"),
@@ -122,6 +117,89 @@ def test_revalidation_rejection_prevents_kill() -> None:
     assert runner.calls == []
 
 
+def test_batch_revalidation_runs_once_per_round() -> None:
+    """One verdict call covers every candidate; a rejected one is still spared."""
+    runner = RecordingRunner(responses={"tmux -S": Result(0)})
+    rounds: list[list[str]] = []
+
+    def verdicts(candidates: Sequence[Candidate]) -> list[tuple[bool, str]]:
+        rounds.append([c.pane.pane_id for c in candidates])
+        return [(c.pane.pane_id != "%9", "pane leader changed") for c in candidates]
+
+    outcomes = reap(
+        (make_candidate("%2"), make_candidate("%9"), make_candidate("%4")),
+        runner,
+        dry_run=False,
+        batch_revalidator=verdicts,
+    )
+
+    assert rounds == [["%2", "%9", "%4"]]
+    assert [o.killed for o in outcomes] == [True, False, True]
+    assert outcomes[1].detail == "revalidation failed: pane leader changed"
+    assert runner.calls == [
+        ["tmux", "-S", "/tmp/s", "kill-pane", "-t", "%2", ";", "kill-pane", "-t", "%4"]
+    ]
+
+
+def test_one_server_gets_one_chained_kill() -> None:
+    """A whole team on one socket goes out as one tmux command list."""
+    runner = RecordingRunner(responses={"tmux -S": Result(0)})
+
+    outcomes = reap(
+        tuple(make_candidate(f"%{n}") for n in range(5)), runner, False, _valid
+    )
+
+    assert all(o.killed for o in outcomes)
+    assert len(runner.calls) == 1
+    assert runner.calls[0].count("kill-pane") == 5
+
+
+def test_chain_failure_is_attributed_to_the_named_pane() -> None:
+    """tmux stops at the pane it cannot find; earlier kills stand, later ones rerun."""
+    runner = RecordingRunner(
+        responses={
+            "tmux -S /tmp/s kill-pane -t %1 ;": Result(1, stderr="can't find pane: %2"),
+            "tmux -S /tmp/s kill-pane -t %3": Result(0),
+        }
+    )
+
+    outcomes = reap(
+        tuple(make_candidate(f"%{n}") for n in (1, 2, 3, 4)), runner, False, _valid
+    )
+
+    assert [o.killed for o in outcomes] == [True, False, True, True]
+    assert outcomes[1].detail == "can't find pane: %2"
+    assert runner.calls[1][3:] == [
+        "kill-pane",
+        "-t",
+        "%3",
+        ";",
+        "kill-pane",
+        "-t",
+        "%4",
+    ]
+
+
+def test_unattributable_chain_failure_rechecks_survivors() -> None:
+    """Without a named pane, a re-listing decides who died and who is retried."""
+    runner = RecordingRunner(
+        responses={
+            "tmux -S /tmp/s kill-pane -t %1 ;": Result(1, stderr="server busy"),
+            "tmux -S /tmp/s list-panes": Result(
+                0, pane_line("%2", "devbox", 1, 2, 200, 10, "2.1.221", "/repo")
+            ),
+            "tmux -S /tmp/s kill-pane -t %2": Result(1, stderr="permission denied"),
+        }
+    )
+
+    outcomes = reap((make_candidate("%1"), make_candidate("%2")), runner, False, _valid)
+
+    assert [(o.killed, o.detail) for o in outcomes] == [
+        (True, ""),
+        (False, "permission denied"),
+    ]
+
+
 def test_subprocess_runner_bounds_a_stuck_tmux_client(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
@@ -188,6 +266,67 @@ def test_control_master_probe_records_responsiveness(short_tmp_path: Path) -> No
     assert master.responding is True
 
 
+def test_control_master_probes_share_one_deadline(short_tmp_path: Path) -> None:
+    """A hung master is marked timed out without holding up the others."""
+    hung = make_socket(short_tmp_path / "cm-hung")
+    make_socket(short_tmp_path / "cm-ok")
+    release = threading.Event()
+
+    def runner(argv: Sequence[str]) -> Result:
+        if f"ControlPath={hung}" in argv:
+            release.wait(5)
+        return Result(0)
+
+    try:
+        masters = control_masters(short_tmp_path, {}, runner, deadline_s=0.2)
+    finally:
+        release.set()
+
+    assert [(m.responding, m.timed_out) for m in masters] == [
+        (None, True),
+        (True, False),
+    ]
+
+
+def test_control_master_verdicts_are_cached_by_socket_identity(
+    short_tmp_path: Path,
+) -> None:
+    """A cached verdict is reused until the socket changes or the TTL passes."""
+    path = make_socket(short_tmp_path / "cm-x")
+    runner = RecordingRunner(responses={"ssh -O check": Result(0)})
+    now = [1000.0]
+    cache = ProbeCache(ttl_s=300, clock=lambda: now[0])
+
+    control_masters(short_tmp_path, {}, runner, cache=cache)
+    (master,) = control_masters(short_tmp_path, {}, runner, cache=cache)
+    assert master.responding is True
+    assert len(runner.calls) == 1
+
+    saved = short_tmp_path / "ssh-checks.json"
+    saved.write_text(cache.dumps(), encoding="utf-8")
+    restored = ProbeCache.load(saved, 300, clock=lambda: now[0])
+    control_masters(short_tmp_path, {}, runner, cache=restored)
+    assert len(runner.calls) == 1
+
+    os.utime(path, ns=(0, 12_345))
+    control_masters(short_tmp_path, {}, runner, cache=cache)
+    assert len(runner.calls) == 2
+
+    now[0] += 301
+    control_masters(short_tmp_path, {}, runner, cache=cache)
+    assert len(runner.calls) == 3
+
+
+def test_probe_cache_file_tolerates_damage(tmp_path: Path) -> None:
+    """A missing, corrupt, or mistyped file reads as an empty cache."""
+    path = tmp_path / "ssh-checks.json"
+    assert ProbeCache.load(path, 300).dumps() == "{}"
+    path.write_text('{"/s/cm-x": [1, 2, "later", true]}', encoding="utf-8")
+    assert ProbeCache.load(path, 300).get("/s/cm-x", 1, 2) is None
+    path.write_text("not json", encoding="utf-8")
+    assert ProbeCache.load(path, 300).dumps() == "{}"
+
+
 INTEREST = ("/Users/dev/", "/nix/store/")
 
 
@@ -253,3 +392,58 @@ def test_disowned_ignores_pane_leaders() -> None:
     """A pane leader is accounted for even when reparented."""
     processes = {9: make_process(pid=9, ppid=1, command="/Users/dev/.local/bin/claude")}
     assert disowned_descendants(processes, {9}, INTEREST) == []
+
+
+def _orphan(
+    root: Path,
+    pid: int,
+    session: int,
+    start: int = 500,
+    uid: int = 501,
+    exe: str = "/home/dev/.local/bin/tool",
+) -> None:
+    """Write the procfs files kernel detection reads for one process."""
+    write_proc(root, pid, stat_line(pid, ppid=1, pgid=session, start_ticks=start))
+    (root / str(pid) / "status").write_bytes(
+        f"Name:\ttool\nUid:\t{uid}\t{uid}\t{uid}\t{uid}\n".encode()
+    )
+    (root / str(pid) / "exe").symlink_to(exe)
+
+
+def test_kernel_detection_links_orphans_to_their_pane(tmp_path: Path) -> None:
+    """Session and start time tie an orphan to its pane; setsid daemons are out."""
+    write_proc(tmp_path, 200, stat_line(200, ppid=100, start_ticks=100))
+    _orphan(tmp_path, 300, session=200)  # escaped a live pane
+    _orphan(tmp_path, 301, session=250)  # outlived a closed one
+    _orphan(tmp_path, 302, session=302)  # a daemon leads its own session
+    _orphan(tmp_path, 306, session=0)  # never had a terminal session
+    _orphan(tmp_path, 303, session=200, uid=0)  # someone else's
+    _orphan(tmp_path, 304, session=200, start=50)  # predates the pane: pid reuse
+    _orphan(tmp_path, 305, session=250)  # adopted by systemd --user
+    pane = make_pane(pid=200)
+    processes = {
+        200: make_process(pid=200, ppid=100),
+        400: make_process(pid=400, ppid=1, command="/usr/lib/systemd/systemd --user"),
+        **{
+            pid: make_process(pid=pid, ppid=1, command="[renamed]")
+            for pid in (300, 301, 302, 303, 304, 306)
+        },
+        305: make_process(pid=305, ppid=400, command="sleep 999"),
+    }
+
+    strays = kernel_disowned(processes, [pane], uid=501, proc_root=tmp_path)
+
+    assert [(s.process.pid, s.session, s.pane) for s in strays] == [
+        (300, 200, pane),
+        (301, 250, None),
+        (304, 200, None),
+        (305, 250, None),
+    ]
+    assert strays[0].exe == "/home/dev/.local/bin/tool"
+
+
+def test_auto_backend_falls_back_to_the_allowlist(tmp_path: Path) -> None:
+    """Without procfs the argv allowlist still answers."""
+    processes = {5: make_process(pid=5, ppid=1, command="/nix/store/abc-uv/bin/uv run")}
+    strays = find_disowned(processes, [], "auto", INTEREST, proc_root=tmp_path)
+    assert [(s.process.pid, s.session) for s in strays] == [(5, None)]
@@ -0,0 +1,126 @@
+"""Socket registry: inotify-driven updates and the polling fallback."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from agent_reap.config import Config
+from agent_reap.registry import Inotify, SocketRegistry
+from agent_reap.runner import RecordingRunner, Result
+from agent_reap.watch import Watcher
+
+from .conftest import TEAMMATE, Clock, Pipes, make_evaluator, make_socket, write_inbox
+
+
+def _inotify_available() -> bool:
+    try:
+        Inotify().close()
+    except OSError:
+        return False
+    return True
+
+
+needs_inotify = pytest.mark.skipif(
+    not _inotify_available(), reason="inotify is Linux-only"
+)
+
+
+def test_polling_registry_globs_on_its_schedule(short_tmp_path: Path) -> None:
+    """Without inotify a new socket shows up at the next timed glob, not before."""
+    first = str(make_socket(short_tmp_path / "default"))
+    clock = Clock()
+    registry = SocketRegistry(
+        [f"{short_tmp_path}/*"], clock=clock, rescan_s=10, notify=False
+    )
+
+    assert not registry.incremental
+    assert registry.sockets() == [first]
+    second = str(make_socket(short_tmp_path / "work"))
+    assert registry.sockets() == [first]
+    clock.now += 10
+    assert registry.sockets() == [first, second]
+
+
+def test_wildcard_directory_falls_back_to_polling(short_tmp_path: Path) -> None:
+    """A glob whose directory part is a pattern cannot be watched."""
+    registry = SocketRegistry([f"{short_tmp_path}/*/default"])
+    assert not registry.incremental
+    registry.close()
+
+
+@needs_inotify
+def test_inotify_registry_tracks_binds_and_unlinks(short_tmp_path: Path) -> None:
+    """Sockets appear and vanish between globs; other files are ignored."""
+    clock = Clock()
+    registry = SocketRegistry([f"{short_tmp_path}/*"], clock=clock)
+    assert registry.incremental
+    assert registry.sockets() == []
+
+    socket = make_socket(short_tmp_path / "default")
+    (short_tmp_path / "notes").write_text("not a socket", encoding="utf-8")
+    assert registry.sockets() == [str(socket)]
+
+    socket.unlink()
+    assert registry.sockets() == []
+    registry.close()
+
+
+@needs_inotify
+def test_inotify_registry_notices_the_socket_directory_appearing(
+    short_tmp_path: Path,
+) -> None:
+    """tmux creates its socket directory on first start; the registry follows."""
+    directory = short_tmp_path / "tmux-501"
+    registry = SocketRegistry([f"{directory}/*"], clock=Clock())
+    assert registry.sockets() == []
+
+    directory.mkdir()
+    assert registry.sockets() == []
+    socket = make_socket(directory / "default")
+    assert registry.sockets() == [str(socket)]
+
+    socket.unlink()
+    directory.rmdir()
+    assert registry.sockets() == []
+    directory.mkdir()
+    socket = make_socket(directory / "default")
+    assert registry.sockets() == [str(socket)]
+    registry.close()
+
+
+@needs_inotify
+def test_watcher_attaches_new_server_without_waiting_for_a_rescan(
+    short_tmp_path: Path, teams_dir: Path
+) -> None:
+    """An inotify registry lets watch attach as soon as a socket is bound."""
+    write_inbox(teams_dir, "abc123", "docs-readme", mtime=1.0)
+    config = Config(
+        teams_dir=teams_dir,
+        teammate_idle_minutes=30,
+        socket_globs=(f"{short_tmp_path}/*",),
+    )
+    socket = str(short_tmp_path / "default")
+    runner = RecordingRunner(
+        responses={f"tmux -S {socket} list-panes": Result(0, TEAMMATE)}
+    )
+    clock = Clock()
+    pipes = Pipes()
+    watcher = Watcher(
+        config,
+        runner,
+        evaluate=make_evaluator(config, []),
+        spawn=pipes.spawn,
+        clock=clock,
+        registry=SocketRegistry(config.resolved_globs(), clock=clock),
+    )
+    assert watcher.step(timeout=0) == []
+
+    make_socket(short_tmp_path / "default")
+    changes = watcher.step(timeout=1)
+
+    assert watcher.sockets == (socket,)
+    assert [c.key for c in changes] == [(socket, "%2")]
+    watcher.close()
+    pipes.close()
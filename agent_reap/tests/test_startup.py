@@ -0,0 +1,71 @@
+"""What the SessionEnd hook's cold start loads."""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from agent_reap.config import load_config
+
+SRC = Path(__file__).parents[1] / "src"
+
+# Only subcommands other than a team teardown need these.
+HEAVY = (
+    "asyncio",
+    "ctypes",
+    "http.server",
+    "sqlite3",
+    "agent_reap.budget",
+    "agent_reap.history",
+    "agent_reap.memory",
+    "agent_reap.metrics",
+    "agent_reap.pipeline",
+    "agent_reap.pressure",
+    "agent_reap.registry",
+    "agent_reap.strays",
+    "agent_reap.watch",
+)
+
+
+def _loaded_after(statement: str) -> set[str]:
+    """Run a statement in a fresh interpreter and list what it imported.
+
+    Args:
+        statement: Python source to execute.
+
+    Returns:
+        The ``HEAVY`` modules present afterwards.
+    """
+    probe = f"import json, sys\n{statement}\nprint(json.dumps(sorted(sys.modules)))"
+    result = subprocess.run(
+        [sys.executable, "-c", probe],
+        env={"PYTHONPATH": str(SRC)},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(json.loads(result.stdout)) & set(HEAVY)
+
+
+def test_importing_the_cli_stays_light() -> None:
+    """Subcommand-only modules load where they are used, not at startup."""
+    assert _loaded_after("import agent_reap.cli") == set()
+
+
+def test_cached_config_load_skips_tomllib(tmp_path: Path, config_cache: Path) -> None:
+    """A warm hook neither imports the TOML parser nor reparses the file."""
+    path = tmp_path / "config.toml"
+    path.write_text("interactive_idle_minutes = 15\n", encoding="utf-8")
+    load_config(path)
+
+    statement = (
+        "import os\n"
+        f"os.environ['XDG_CACHE_HOME'] = {str(config_cache)!r}\n"
+        "from pathlib import Path\n"
+        "from agent_reap.config import load_config\n"
+        f"assert load_config(Path({str(path)!r})).config.interactive_idle_minutes == 15\n"
+        "assert 'tomllib' not in sys.modules"
+    )
+    assert _loaded_after(statement) == set()
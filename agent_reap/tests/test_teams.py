@@ -0,0 +1,109 @@
+"""Inbox state: per-file reads, the per-session index, and its cache."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from agent_reap.teams import TeamsCache, TeamsIndex, read_inbox, session_exists
+
+from .conftest import write_inbox
+
+
+class Ticks:
+    """Hand-advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        """Start at zero."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Return the current reading."""
+        return self.now
+
+
+@pytest.fixture
+def scans(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """Record every directory ``os.scandir`` is asked to list.
+
+    Args:
+        monkeypatch: Fixture used to wrap ``os.scandir``.
+
+    Returns:
+        Scanned paths, in order.
+    """
+    seen: list[str] = []
+    real = os.scandir
+
+    def counting(path: str | os.PathLike[str]) -> os._ScandirIterator[str]:
+        seen.append(os.fspath(path))
+        return real(path)
+
+    monkeypatch.setattr(os, "scandir", counting)
+    return seen
+
+
+def test_index_agrees_with_per_file_reads(teams_dir: Path) -> None:
+    """Existence, size, and mtime match what ``read_inbox`` reports."""
+    write_inbox(teams_dir, "abc123", "docs-readme", mtime=1000.0)
+    write_inbox(teams_dir, "abc123", "api", payload=[{"msg": "work"}], mtime=2000.0)
+    (teams_dir / "session-empty").mkdir()
+    index = TeamsIndex(teams_dir)
+
+    for session, agent in [
+        ("abc123", "docs-readme"),
+        ("abc123", "api"),
+        ("abc123", "missing"),
+        ("empty", "x"),
+        ("absent", "x"),
+    ]:
+        assert index.inbox(session, agent) == read_inbox(teams_dir, session, agent)
+    for session in ["abc123", "empty", "absent"]:
+        assert index.session_exists(session) == session_exists(teams_dir, session)
+
+
+def test_index_scans_each_session_once(teams_dir: Path, scans: list[str]) -> None:
+    """Many teammates in one team cost a single directory listing."""
+    for agent in ("a", "b", "c"):
+        write_inbox(teams_dir, "abc123", agent)
+    index = TeamsIndex(teams_dir)
+
+    assert all(index.inbox("abc123", agent).exists for agent in ("a", "b", "c"))
+    assert index.session_exists("abc123")
+    assert len(scans) == 1
+
+
+def test_cache_reuses_a_listing_until_the_directory_changes(
+    teams_dir: Path, scans: list[str]
+) -> None:
+    """Later reports skip the scan until an inbox is created or removed."""
+    write_inbox(teams_dir, "abc123", "a")
+    cache = TeamsCache(max_age_s=60, clock=Ticks())
+    TeamsIndex(teams_dir, cache).inbox("abc123", "a")
+    TeamsIndex(teams_dir, cache).inbox("abc123", "a")
+    assert len(scans) == 1
+
+    inboxes = teams_dir / "session-abc123" / "inboxes"
+    write_inbox(teams_dir, "abc123", "b")
+    os.utime(inboxes, ns=(0, inboxes.stat().st_mtime_ns + 1_000_000))
+
+    assert TeamsIndex(teams_dir, cache).inbox("abc123", "b").exists
+    assert len(scans) == 2
+
+
+def test_cache_expires_listings_rewritten_in_place(
+    teams_dir: Path, scans: list[str]
+) -> None:
+    """An in-place rewrite leaves the directory alone, so age forces a rescan."""
+    write_inbox(teams_dir, "abc123", "a")
+    clock = Ticks()
+    cache = TeamsCache(max_age_s=60, clock=clock)
+    assert TeamsIndex(teams_dir, cache).inbox("abc123", "a").drained
+
+    write_inbox(teams_dir, "abc123", "a", payload={"queued": "work"})
+    clock.now = 61
+
+    assert not TeamsIndex(teams_dir, cache).inbox("abc123", "a").drained
+    assert len(scans) == 2
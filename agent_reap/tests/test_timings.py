@@ -0,0 +1,55 @@
+"""Phase timing: collection, nesting, worker threads, and the no-op path."""
+
+from __future__ import annotations
+
+from agent_reap.pool import run_bounded
+from agent_reap.runner import RecordingRunner, Result
+from agent_reap.timings import collect, current, instrument, parsed, phase
+
+
+def test_phase_is_a_shared_no_op_without_a_collection() -> None:
+    """Disabled timing allocates nothing per phase and records nothing."""
+    assert current() is None
+    assert phase("a") is phase("b")
+    with phase("a"):
+        parsed(100)
+
+
+def test_nested_phases_record_paths_in_entry_order() -> None:
+    """A parent is listed before its children and counts every entry."""
+    with collect() as timings:
+        for _ in range(2):
+            with phase("classify"), phase("inboxes"):
+                parsed(10)
+
+    assert list(timings.phases) == ["classify", "classify/inboxes"]
+    assert timings.phases["classify"].calls == 2
+    assert timings.phases["classify/inboxes"].bytes == 20
+    assert timings.phases["classify"].bytes == 0
+    assert current() is None
+
+
+def test_spawns_on_worker_threads_land_in_the_enclosing_phase() -> None:
+    """``run_bounded`` carries the collection and phase onto its workers."""
+    runner = instrument(RecordingRunner(default=Result(0, "abcd")))
+
+    with collect() as timings, phase("list-panes"):
+        run_bounded(lambda socket: runner(["tmux", "-S", socket]), ["a", "b", "c"])
+
+    entry = timings.phases["list-panes"]
+    assert (entry.calls, entry.spawns, entry.bytes) == (1, 3, 12)
+
+
+def test_json_reports_each_phase() -> None:
+    """The serialized form carries wall time, calls, spawns, and bytes."""
+    runner = instrument(RecordingRunner(default=Result(0, "xy")))
+    with collect() as timings, phase("processes"):
+        runner(["ps"])
+
+    phases = timings.as_json()["phases"]
+    assert isinstance(phases, dict)
+    assert {k: v for k, v in phases["processes"].items() if k != "wall_ms"} == {
+        "calls": 1,
+        "spawns": 1,
+        "bytes": 2,
+    }
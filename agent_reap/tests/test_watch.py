@@ -0,0 +1,224 @@
+"""Control-mode watch: the pane model, notifications, and resync."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from agent_reap.cli import cli
+from agent_reap.config import Config
+from agent_reap.runner import RecordingRunner, Result
+from agent_reap.watch import Watcher, notification
+
+from .conftest import (
+    TEAMMATE,
+    Clock,
+    Pipes,
+    make_evaluator,
+    make_socket,
+    pane_line,
+    write_inbox,
+)
+
+SHELL = pane_line("%3", "devbox", 1, 3, 300, 10, "zsh", "/repo")
+
+
+def _watcher(
+    config: Config,
+    runner: RecordingRunner,
+    pipes: Pipes,
+    clock: Clock,
+    seen: list[list[str]],
+) -> Watcher:
+    """Build a watcher over fake channels."""
+    return Watcher(
+        config,
+        runner,
+        evaluate=make_evaluator(config, seen),
+        spawn=pipes.spawn,
+        clock=clock,
+        resync_s=60,
+        rescan_s=10_000,
+    )
+
+
+@pytest.fixture
+def server(short_tmp_path: Path, teams_dir: Path) -> tuple[str, Config]:
+    """One socket on disk, a drained inbox, and a config that finds both.
+
+    Args:
+        short_tmp_path: Directory short enough for a unix socket.
+        teams_dir: Fake teams root.
+
+    Returns:
+        The socket path and the config pointed at it.
+    """
+    socket = str(make_socket(short_tmp_path / "default"))
+    write_inbox(teams_dir, "abc123", "docs-readme", mtime=1.0)
+    wired = Config(
+        teams_dir=teams_dir,
+        teammate_idle_minutes=30,
+        socket_globs=(f"{short_tmp_path}/*",),
+    )
+    return socket, wired
+
+
+def test_notification_names_only_percent_lines() -> None:
+    """Command output inside a %begin/%end block is not a notification."""
+    assert notification("%layout-change @1 abcd,80x24,0,0") == "%layout-change"
+    assert notification("%exit") == "%exit"
+    assert notification("0: 1 windows") is None
+
+
+def test_first_step_lists_each_server_once(
+    server: tuple[str, Config], pipes: Pipes
+) -> None:
+    """Attaching lists the server and reports its teammate as a new candidate."""
+    socket, config = server
+    runner = RecordingRunner(
+        responses={f"tmux -S {socket} list-panes": Result(0, TEAMMATE)}
+    )
+    seen: list[list[str]] = []
+    watcher = _watcher(config, runner, pipes, Clock(), seen)
+
+    changes = watcher.step(timeout=0)
+
+    assert [(c.key, c.before, type(c.after).__name__) for c in changes] == [
+        ((socket, "%2"), None, "Candidate")
+    ]
+    assert sum("list-panes" in call for call in runner.calls) == 1
+    assert watcher.sockets == (socket,)
+    watcher.close()
+
+
+def test_quiet_server_is_not_relisted(server: tuple[str, Config], pipes: Pipes) -> None:
+    """Without a structural notification, a step costs no tmux call at all."""
+    socket, config = server
+    runner = RecordingRunner(
+        responses={f"tmux -S {socket} list-panes": Result(0, TEAMMATE)}
+    )
+    watcher = _watcher(config, runner, pipes, Clock(), [])
+    watcher.step(timeout=0)
+    calls = len(runner.calls)
+
+    pipes.send(socket, "%window-renamed @1 build", "%client-session-changed x $1 x")
+    assert watcher.step(timeout=0) == []
+
+    assert len(runner.calls) == calls
+    watcher.close()
+
+
+def test_layout_change_reclassifies_only_changed_panes(
+    server: tuple[str, Config], pipes: Pipes
+) -> None:
+    """A split relists the server but classifies just the new pane."""
+    socket, config = server
+    runner = RecordingRunner(
+        responses={f"tmux -S {socket} list-panes": Result(0, TEAMMATE)}
+    )
+    seen: list[list[str]] = []
+    watcher = _watcher(config, runner, pipes, Clock(), seen)
+    watcher.step(timeout=0)
+
+    runner.responses[f"tmux -S {socket} list-panes"] = Result(0, f"{TEAMMATE}\n{SHELL}")
+    pipes.send(socket, "%layout-change @1 abcd,80x24,0,0 abcd,80x24,0,0 *")
+    watcher.step(timeout=0)
+
+    assert seen == [["%2"], ["%3"]]
+    watcher.close()
+
+
+def test_pane_exit_leaves_the_report(server: tuple[str, Config], pipes: Pipes) -> None:
+    """A killed pane surfaces as a change with nothing after it."""
+    socket, config = server
+    runner = RecordingRunner(
+        responses={f"tmux -S {socket} list-panes": Result(0, TEAMMATE)}
+    )
+    watcher = _watcher(config, runner, pipes, Clock(), [])
+    watcher.step(timeout=0)
+
+    runner.responses[f"tmux -S {socket} list-panes"] = Result(0, "")
+    pipes.send(socket, "%window-close @1")
+    changes = watcher.step(timeout=0)
+
+    assert [(c.key, c.after) for c in changes] == [((socket, "%2"), None)]
+    assert watcher.report().candidates == ()
+    watcher.close()
+
+
+def test_server_exit_drops_its_panes(server: tuple[str, Config], pipes: Pipes) -> None:
+    """``%exit`` from a server that no longer answers forgets its panes."""
+    socket, config = server
+    runner = RecordingRunner(
+        responses={f"tmux -S {socket} list-panes": Result(0, TEAMMATE)}
+    )
+    watcher = _watcher(config, runner, pipes, Clock(), [])
+    watcher.step(timeout=0)
+
+    runner.responses[f"tmux -S {socket} list-panes"] = Result(1, stderr="no server")
+    pipes.send(socket, "%sessions-changed", "%exit")
+    changes = watcher.step(timeout=0)
+
+    assert [c.key for c in changes] == [(socket, "%2")]
+    assert watcher.sockets == ()
+    watcher.close()
+
+
+def test_client_exit_on_a_live_server_reattaches(
+    server: tuple[str, Config], pipes: Pipes
+) -> None:
+    """Destroying the session the client sat in must not blind the watcher."""
+    socket, config = server
+    runner = RecordingRunner(
+        responses={f"tmux -S {socket} list-panes": Result(0, f"{TEAMMATE}\n{SHELL}")}
+    )
+    watcher = _watcher(config, runner, pipes, Clock(), [])
+    watcher.step(timeout=0)
+    first = pipes.writers[socket]
+
+    runner.responses[f"tmux -S {socket} list-panes"] = Result(0, SHELL)
+    pipes.send(socket, "%exit")
+    changes = watcher.step(timeout=0)
+
+    assert [(c.key, c.after) for c in changes] == [((socket, "%2"), None)]
+    assert watcher.sockets == (socket,)
+    assert pipes.writers[socket] != first
+    os.close(first)
+    watcher.close()
+
+
+def test_resync_reclassifies_every_pane(
+    server: tuple[str, Config], pipes: Pipes
+) -> None:
+    """Idle thresholds are crossed by the clock, so resync revisits all panes."""
+    socket, config = server
+    runner = RecordingRunner(
+        responses={f"tmux -S {socket} list-panes": Result(0, f"{TEAMMATE}\n{SHELL}")}
+    )
+    seen: list[list[str]] = []
+    clock = Clock()
+    watcher = _watcher(config, runner, pipes, clock, seen)
+    watcher.step(timeout=0)
+
+    clock.now += 61
+    watcher.step(timeout=0)
+
+    assert seen == [["%2", "%3"], ["%2", "%3"]]
+    watcher.close()
+
+
+def test_watch_kill_requires_unattended_policy(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Nobody confirms a kill in watch mode, so it sits behind kill_enabled."""
+    config_path = tmp_path / "config.toml"
+    config_path.write_text(f'teams_dir = "{tmp_path}"\n', encoding="utf-8")
+    runner = RecordingRunner()
+
+    status = cli(["--config", str(config_path), "watch", "--kill"], runner=runner)
+
+    assert status == 2
+    assert "kill_enabled" in capsys.readouterr().err
+    assert runner.calls == []